@@ -1,42 +1,7 @@
 """WiiM Media Player integration for Home Assistant."""
 
-# ---------------------------------------------------------------------------
-# Test Environment Compatibility Shim
-# ---------------------------------------------------------------------------
-# When running unit tests outside of Home Assistant, the real "homeassistant"
-# package is typically not installed.  Attempting to import it will therefore
-# raise a ``ModuleNotFoundError`` long before pytest fixtures have a chance to
-# insert the stub package.  To make the component self-contained for testing we
-# fall back to the lightweight stubs located under the top-level *stubs/*
-# directory whenever the import fails.  This keeps the production codepath
-# untouched while allowing `pytest` to execute in a vanilla virtualenv.
-#
-# ``stubs/homeassistant/__init__.py`` intentionally registers **itself** and
-# all of the sub-modules the integration relies on into ``sys.modules``.  Once
-# that module has been imported exactly once, subsequent ``import homeassistant``
-# statements throughout the codebase succeed transparently.
-# ---------------------------------------------------------------------------
-
 from __future__ import annotations
 
-import sys
-from pathlib import Path
-
-try:
-    import homeassistant  # noqa: F401 – try real package first
-except ModuleNotFoundError:  # pragma: no cover – only executed in test env
-    # Add <repo-root>/stubs to ``sys.path`` and retry the import.  We cannot
-    # rely on relative imports here because the integration may live two or
-    # more levels deep inside *custom_components/*.
-    repo_root = Path(__file__).resolve().parents[2]
-    stubs_path = repo_root / "stubs"
-    sys.path.append(str(stubs_path))
-
-    # Import the stub package which will register itself in ``sys.modules``.
-    import importlib
-
-    importlib.import_module("homeassistant")
-
 import logging
 from typing import Any
 from urllib.parse import urlparse
@@ -46,19 +11,23 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+from homeassistant.helpers.importlib import async_import_module
 from pywiim import WiiMClient
-from pywiim.discovery import discover_devices
 from pywiim.exceptions import WiiMConnectionError, WiiMError, WiiMRequestError, WiiMTimeoutError
 
-# Import config_flow to make it available as a module attribute for tests
-from . import config_flow  # noqa: F401
+from .announce_cache import async_setup_announcement_cache
 from .const import (
     CONF_ENABLE_MAINTENANCE_BUTTONS,
+    CONF_PROMETHEUS_METRICS,
+    DATA_ADD_ROLLOUT_SENSOR,
     DOMAIN,
 )
 from .coordinator import WiiMCoordinator
+from .data import get_all_coordinators
+from .firmware_check import async_setup_firmware_check, get_firmware_check
+from .http_session import async_get_http_pool, client_session_kwargs
+from .services import async_setup_services
 from .version import (
     REQUIRED_PYWIIM_VERSION,
     async_ensure_pywiim_version,
@@ -131,8 +100,11 @@ async def _try_rebind_host_from_uuid(hass: HomeAssistant, entry: ConfigEntry) ->
         return None
 
     try:
+        # Only needed when a speaker stops answering at its address, so pywiim's
+        # SSDP discovery is imported on first use.
+        discovery = await async_import_module(hass, "pywiim.discovery")
         # Keep timeout short to avoid long setup delays on every retry.
-        discovered = await discover_devices(validate=True, ssdp_timeout=3)
+        discovered = await discovery.discover_devices(validate=True, ssdp_timeout=3)
     except Exception as err:  # noqa: BLE001
         _LOGGER.debug(
             "Host rebind discovery failed for %s (uuid=%s): %s",
@@ -280,8 +252,11 @@ async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     # Initialize domain data structure
     hass.data.setdefault(DOMAIN, {})
 
-    # Services are now registered via EntityServiceDescription pattern in media_player.py
-    # No need to register here - services are registered when entities are added
+    # Entity services are registered via EntityServiceDescription pattern in media_player.py
+    # when entities are added; only fleet-wide domain services are registered here.
+    await async_setup_services(hass)
+    await async_setup_announcement_cache(hass)
+    await async_setup_firmware_check(hass)
 
     _LOGGER.debug("WiiM integration async_setup completed")
     return True
@@ -312,7 +287,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     # Create client and coordinator with firmware capabilities
-    session = async_get_clientsession(hass)
+    pool = await async_get_http_pool(hass)
 
     # Check if we have a cached endpoint from previous discovery (optimized pattern)
     cached_endpoint = entry.data.get("endpoint")
@@ -332,7 +307,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     # Create client - pywiim handles capability detection
-    # Note: We pass Home Assistant's managed session to pywiim, but pywiim may create
+    # Note: We pass the integration's pooled session to pywiim, but pywiim may create
     # additional internal sessions for temporary operations (e.g., getting master name)
     # that aren't properly closed. This results in "Unclosed client session" warnings
     # which are harmless but should be fixed in pywiim itself.
@@ -368,7 +343,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         and not _capabilities_require_https(cached_capabilities)
     ):
         _LOGGER.info(
-            "Dropping stale HTTPS endpoint for %s; device prefers HTTP, letting pywiim " "re-probe (Issue #248)",
+            "Dropping stale HTTPS endpoint for %s; device prefers HTTP, letting pywiim re-probe (Issue #248)",
             entry.data["host"],
         )
         port = None
@@ -423,7 +398,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             temp_client_kwargs = {
                 "host": entry.data["host"],
                 "timeout": entry.data.get("timeout", 10),
-                "session": session,
+                **client_session_kwargs(pool),
             }
             if port is not None and protocol is not None:
                 temp_client_kwargs["port"] = port
@@ -507,7 +482,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             # Use empty capabilities - WiiMClient will handle it
             capabilities = {}
 
-    # Coordinator creates client and player internally using HA's shared session
+    # Coordinator creates client and player internally using the integration's connection pool
     # Pass port/protocol if we have a cached endpoint, otherwise let pywiim probe
     coordinator = WiiMCoordinator(
         hass,
@@ -801,6 +776,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up only enabled platforms
     await hass.config_entries.async_forward_entry_setups(entry, enabled_platforms)
 
+    if entry.options.get(CONF_PROMETHEUS_METRICS, False):
+        # Off by default, so the endpoint module loads with the first speaker that enables it.
+        metrics = await async_import_module(hass, f"{__package__}.metrics")
+        await metrics.async_setup_metrics(hass)
+
+    # Start the shared firmware check with the first entry (or after the last one
+    # unloaded); later speakers get a check for their model / firmware if uncached.
+    if (firmware_check := get_firmware_check(hass)) is not None:
+        firmware_check.async_speaker_added(coordinator)
+
     device_name = coordinator.player.name or entry.title or "WiiM Speaker"
     _LOGGER.info("WiiM ready: %s", device_name)
     _LOGGER.debug(
@@ -821,8 +806,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry_data = hass.data[DOMAIN].pop(entry.entry_id, {})
         coordinator = entry_data.get("coordinator")
         if coordinator:
+            coordinator.announcement_queue.async_cancel()
             device_name = coordinator.player.name or entry.title or "WiiM Speaker"
             _LOGGER.debug("Unloaded WiiM integration for %s", device_name)
+        # If this entry held the rollout sensor, the next loaded speaker adds it (no-op otherwise).
+        for other in hass.config_entries.async_entries(DOMAIN):
+            if add_rollout_sensor := hass.data[DOMAIN].get(other.entry_id, {}).get(DATA_ADD_ROLLOUT_SENSOR):
+                add_rollout_sensor()
+                break
+        if not get_all_coordinators(hass) and (firmware_check := get_firmware_check(hass)) is not None:
+            firmware_check.async_stop()
     return unload_ok
 
 
@@ -0,0 +1,243 @@
+"""Announcement helpers and the synchronized ``wiim.announce`` action.
+
+``async_resolve_media_url`` turns a ``media-source://`` id (TTS, local media)
+into an absolute URL the speaker can fetch; it is shared by
+``media_player.async_play_media`` and ``wiim.announce``.
+
+``wiim.announce`` resolves the media once, serves media-source audio from the
+announcement cache (or pre-warms it so Home Assistant has generated the TTS
+audio before any speaker asks for it), and
+then fires ``play_notification`` on every target in one concurrent burst.
+pywiim's source-aware routing (firmware prompt vs. ``play_url`` fallback) is
+unchanged; the per-speaker result is returned to the caller.
+
+Every announcement, from either path, goes through the speaker's
+``AnnouncementQueue`` (see ``announce_queue``) so overlapping automations
+wait their turn instead of cutting each other off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from homeassistant.components import media_source
+from homeassistant.components.media_player.browse_media import async_process_play_media_url
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .announce_cache import get_announcement_cache
+from .announce_queue import ANNOUNCEMENT_CANCELLED
+from .data import get_coordinator_from_entity_id
+from .entity import timed_command
+
+if TYPE_CHECKING:
+    from pywiim.player.media import NotificationPlaybackResult
+
+    from .coordinator import WiiMCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_MEDIA_CONTENT_ID = "media_content_id"
+ATTR_PRIORITY = "priority"
+
+# Pre-warm is best effort: a slow TTS engine should not hold the announcement forever.
+_PREWARM_TIMEOUT_SECONDS = 10
+
+
+async def async_resolve_media_url(hass: HomeAssistant, media_id: str, entity_id: str | None) -> str:
+    """Resolve ``media-source://`` ids to a single absolute, playable URL.
+
+    Plain URLs are returned unchanged. Never pass ``media-source://`` or a
+    relative HA path to the device.
+    """
+    if not media_id.startswith("media-source://"):
+        return media_id
+
+    _LOGGER.debug("[%s] Resolving media source: %s", entity_id, media_id)
+    try:
+        sourced_media = await media_source.async_resolve_media(hass, media_id, entity_id)
+        _LOGGER.debug(
+            "[%s] Resolved media source - url: %s, mime_type: %s",
+            entity_id,
+            sourced_media.url,
+            sourced_media.mime_type,
+        )
+        url = sourced_media.url
+        if not url:
+            _LOGGER.error(
+                "[%s] Media source resolved to empty URL. Original media_id: %s, mime_type: %s",
+                entity_id,
+                media_id,
+                sourced_media.mime_type,
+            )
+            raise HomeAssistantError(
+                f"Media source resolved to empty URL for: {media_id}. "
+                "This may indicate the media source is not playable or not properly configured."
+            )
+        try:
+            return async_process_play_media_url(hass, url)
+        except NoURLAvailableError as err:
+            _LOGGER.warning("[%s] Cannot build playable URL for TTS/announcement: %s", entity_id, err)
+            raise HomeAssistantError(
+                "Home Assistant could not build a URL the WiiM can use for this media. "
+                "Set Internal URL in Settings → System → Network to this instance's LAN address "
+                "(e.g. http://192.168.1.x:8123)."
+            ) from err
+    except HomeAssistantError:
+        raise
+    except Exception as err:
+        _LOGGER.error("[%s] Failed to resolve media source %s: %s", entity_id, media_id, err, exc_info=True)
+        raise HomeAssistantError(f"Failed to resolve media source: {err}") from err
+
+
+def cache_bust_url(url: str) -> str:
+    """Append a timestamp query param so the speaker does not replay stale cached audio."""
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}_={int(time.time() * 1000)}"
+
+
+async def async_announcement_url(hass: HomeAssistant, media_id: str, resolved_url: str) -> tuple[str, bool]:
+    """Return the URL to hand to ``play_notification`` and whether it is cached.
+
+    Media-source announcements (TTS, local chimes) are served from the
+    content-addressed announcement cache when it is available; those URLs are
+    unique per content, so they are not cache-busted. Anything else gets a
+    cache-busting timestamp so the speaker does not replay stale audio.
+    """
+    if media_id.startswith("media-source://") and (cache := get_announcement_cache(hass)) is not None:
+        cached_url = await cache.async_get_url(media_id, resolved_url)
+        if cached_url is not None:
+            return cached_url, True
+    return cache_bust_url(resolved_url), False
+
+
+async def async_queue_announcement(
+    hass: HomeAssistant,
+    coordinator: WiiMCoordinator,
+    media_id: str,
+    play_url: str,
+    priority: int = 0,
+    timing: dict[str, float] | None = None,
+) -> Any:
+    """Play ``play_url`` through the speaker's announcement queue.
+
+    Only the ``play_notification`` call is recorded as the ``play notification``
+    command; time spent waiting in the queue is reported by the queue.
+    When ``timing`` is given, the ``perf_counter`` values right before and
+    after ``play_notification`` are stored under ``started`` / ``finished``.
+    Returns the ``NotificationPlaybackResult``, None when the queue policy
+    dropped the announcement, or ``ANNOUNCEMENT_CANCELLED`` when unloading the
+    entry cancelled it.
+    """
+    stamps = timing if timing is not None else {}
+
+    async def _play() -> NotificationPlaybackResult:
+        async with timed_command(coordinator, "play notification"):
+            stamps["started"] = time.perf_counter()
+            try:
+                return await coordinator.player.play_notification(play_url)
+            finally:
+                stamps["finished"] = time.perf_counter()
+
+    cache = get_announcement_cache(hass)
+    return await coordinator.announcement_queue.async_announce(
+        media_id,
+        _play,
+        priority=priority,
+        hold=cache.duration(play_url) if cache else None,
+    )
+
+
+async def _async_prewarm(hass: HomeAssistant, url: str) -> None:
+    """Fetch ``url`` once so TTS generation happens before the speakers request it."""
+    session = async_get_clientsession(hass)
+    try:
+        async with asyncio.timeout(_PREWARM_TIMEOUT_SECONDS):
+            async with session.get(url) as response:
+                await response.read()
+                _LOGGER.debug("Pre-warmed announcement %s (HTTP %s)", url, response.status)
+    except (TimeoutError, aiohttp.ClientError) as err:
+        _LOGGER.debug("Announcement pre-warm failed for %s: %s", url, err)
+
+
+def _resolve_targets(hass: HomeAssistant, entity_ids: set[str]) -> dict[str, WiiMCoordinator]:
+    """Map target entity_ids to coordinators, one entry per physical speaker."""
+    targets: dict[str, WiiMCoordinator] = {}
+    seen: set[int] = set()
+    for entity_id in sorted(entity_ids):
+        coordinator = get_coordinator_from_entity_id(hass, entity_id)
+        # A speaker entity and its virtual group entity share one coordinator.
+        if coordinator is None or id(coordinator) in seen:
+            continue
+        seen.add(id(coordinator))
+        targets[entity_id] = coordinator
+    return targets
+
+
+async def async_handle_announce(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.announce``: play one announcement on many speakers at once."""
+    hass = call.hass
+    targets = _resolve_targets(hass, await async_extract_entity_ids(hass, call))
+    if not targets:
+        raise HomeAssistantError("No WiiM speakers found to announce on")
+
+    media_id: str = call.data[ATTR_MEDIA_CONTENT_ID]
+    priority: int = call.data[ATTR_PRIORITY]
+    url = await async_resolve_media_url(hass, media_id, next(iter(targets)))
+    play_url, cached = await async_announcement_url(hass, media_id, url)
+    if media_id.startswith("media-source://") and not cached:
+        # Only HA-served media (TTS, local media) benefits; never download a remote stream here.
+        await _async_prewarm(hass, play_url)
+
+    # Filled from inside the queue, so skew and elapsed time cover play_notification
+    # itself, not the wait behind an announcement that is already playing.
+    timings: dict[str, dict[str, float]] = {entity_id: {} for entity_id in targets}
+
+    # Coroutines are created up front so gather() starts them back-to-back.
+    results = await asyncio.gather(
+        *(
+            async_queue_announcement(hass, coordinator, media_id, play_url, priority, timings[entity_id])
+            for entity_id, coordinator in targets.items()
+        ),
+        return_exceptions=True,
+    )
+
+    speakers: dict[str, dict[str, Any]] = {}
+    for entity_id, result in zip(targets, results, strict=True):
+        # BaseException: a speaker task cancelled outside the queue comes back as CancelledError
+        if isinstance(result, BaseException):
+            error = "cancelled" if isinstance(result, asyncio.CancelledError) else str(result)
+            _LOGGER.warning("Announcement on %s failed: %s", entity_id, error)
+            speakers[entity_id] = {"error": error}
+            continue
+        if result is ANNOUNCEMENT_CANCELLED:
+            speakers[entity_id] = {"error": "cancelled"}
+            continue
+        if result is None:
+            speakers[entity_id] = {"dropped": True}
+            continue
+        speakers[entity_id] = {
+            "method_used": result.method_used,
+            "likely_interrupted": result.likely_interrupted,
+            "source_before": result.source_before,
+            "reason": result.reason,
+        }
+        timing = timings[entity_id]
+        if "finished" in timing:
+            # Missing when the announcement was merged into one queued by someone else
+            speakers[entity_id]["elapsed_ms"] = round((timing["finished"] - timing["started"]) * 1000, 1)
+
+    if all("error" in speaker for speaker in speakers.values()):
+        raise HomeAssistantError(f"Announcement failed on all {len(speakers)} speaker(s)")
+
+    started = [timing["started"] for timing in timings.values() if "started" in timing]
+    skew_ms = round((max(started) - min(started)) * 1000, 3) if started else 0.0
+    _LOGGER.debug("Announced %s on %d speaker(s), start skew %.3f ms", play_url, len(speakers), skew_ms)
+    return {"url": play_url, "skew_ms": skew_ms, "speakers": speakers}
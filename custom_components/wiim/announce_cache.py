@@ -0,0 +1,342 @@
+"""Content-addressed on-disk cache for announcement audio.
+
+Announcements resolved from ``media-source://`` (TTS, local chimes) are
+fetched from Home Assistant once, stored under the SHA-256 of their bytes and
+served to the speakers by ``AnnouncementCacheView`` as static files. Repeated
+phrases and chimes then skip the TTS pipeline entirely, and because the URL is
+derived from the content it never needs a cache-busting query parameter.
+
+The media-source id (engine + message + options for TTS) maps to a content
+hash; that index is persisted with ``Store`` so the cache survives restarts.
+Index entries expire after a day so a changed voice, engine or local file is
+picked up; a refetch that yields the same bytes reuses the stored file.
+Clip lengths are recorded so the announcement queue can hold a speaker until
+an announcement has finished.
+Total size is bounded; least recently used files are evicted first. All file
+I/O runs in the executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key holding the AnnouncementCache instance.
+DATA_ANNOUNCEMENT_CACHE = "announcement_cache"
+
+_STORAGE_KEY = f"{DOMAIN}.announcement_cache"
+_STORAGE_VERSION = 1
+_INDEX_SAVE_DELAY_SECONDS = 30
+
+_CACHE_DIR = Path(".cache") / DOMAIN / "announcements"
+_MAX_CACHE_BYTES = 50 * 1024 * 1024
+# Larger payloads are almost certainly streams or albums, not announcements.
+_MAX_ENTRY_BYTES = 10 * 1024 * 1024
+_FETCH_TIMEOUT_SECONDS = 30
+# How long a media id -> content mapping is trusted before it is fetched again.
+_INDEX_TTL_SECONDS = 24 * 60 * 60
+
+_VIEW_PATH = "/api/wiim/announce"
+_FILENAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{2,4}$")
+
+
+@dataclass
+class _CacheEntry:
+    """One cached file (several media ids may share it)."""
+
+    filename: str
+    size: int
+    last_used: float
+    duration: float | None = None  # seconds, when the audio header could be read
+
+
+@dataclass
+class CacheStats:
+    """Running counters exposed through diagnostics."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    fetch_failures: int = 0
+    bytes_served_from_cache: int = 0
+
+
+def _extension_for(content_type: str | None, source_url: str) -> str:
+    """Pick a file extension so aiohttp serves the right Content-Type."""
+    if content_type:
+        ext = mimetypes.guess_extension(content_type.split(";", 1)[0].strip())
+        if ext in (".mp3", ".wav", ".ogg", ".flac", ".aac", ".m4a"):
+            return ext.lstrip(".")
+    suffix = Path(source_url.split("?", 1)[0]).suffix.lstrip(".").lower()
+    return suffix if re.fullmatch(r"[a-z0-9]{2,4}", suffix) else "mp3"
+
+
+def _audio_duration(path: Path) -> float | None:
+    """Return the clip length in seconds, or None if it cannot be read (executor)."""
+    try:
+        import mutagen  # installed with Home Assistant's tts integration
+    except ImportError:
+        return None
+    try:
+        audio = mutagen.File(path)
+    except (mutagen.MutagenError, OSError):
+        return None
+    if audio is None or audio.info is None:
+        return None
+    return round(audio.info.length, 2) or None
+
+
+class AnnouncementCache:
+    """Size-bounded, content-addressed announcement store."""
+
+    def __init__(self, hass: HomeAssistant, max_bytes: int = _MAX_CACHE_BYTES) -> None:
+        """Initialize the cache (call async_load before use)."""
+        self.hass = hass
+        self.max_bytes = max_bytes
+        self.directory = Path(hass.config.path(str(_CACHE_DIR)))
+        self.stats = CacheStats()
+        self._store: Store[dict[str, Any]] = Store(hass, _STORAGE_VERSION, _STORAGE_KEY)
+        self._index: dict[str, str] = {}  # media id -> filename
+        self._indexed_at: dict[str, float] = {}  # media id -> when its content was fetched
+        self._entries: dict[str, _CacheEntry] = {}  # filename -> entry
+        self._pending: dict[str, asyncio.Task[str | None]] = {}
+
+    @property
+    def total_bytes(self) -> int:
+        """Return bytes currently stored on disk."""
+        return sum(entry.size for entry in self._entries.values())
+
+    async def async_load(self) -> None:
+        """Load the persisted index and drop entries whose files are gone."""
+        data = await self._store.async_load() or {}
+        on_disk = await self.hass.async_add_executor_job(self._scan_directory)
+        durations = data.get("durations", {})
+        self._entries = {
+            name: _CacheEntry(name, size, float(data.get("last_used", {}).get(name, mtime)), durations.get(name))
+            for name, (size, mtime) in on_disk.items()
+        }
+        self._index = {
+            media_id: filename for media_id, filename in data.get("index", {}).items() if filename in self._entries
+        }
+        # Mappings saved without a fetch time are treated as expired.
+        indexed_at = data.get("indexed_at", {})
+        self._indexed_at = {media_id: float(indexed_at.get(media_id, 0.0)) for media_id in self._index}
+
+    def _scan_directory(self) -> dict[str, tuple[int, float]]:
+        """Return {filename: (size, mtime)} for cached files (executor)."""
+        found: dict[str, tuple[int, float]] = {}
+        if not self.directory.is_dir():
+            return found
+        for path in self.directory.iterdir():
+            if _FILENAME_RE.match(path.name):
+                stat = path.stat()
+                found[path.name] = (stat.st_size, stat.st_mtime)
+        return found
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "index": dict(self._index),
+            "indexed_at": dict(self._indexed_at),
+            "last_used": {name: entry.last_used for name, entry in self._entries.items()},
+            "durations": {name: entry.duration for name, entry in self._entries.items() if entry.duration},
+        }
+
+    def file_path(self, filename: str) -> Path | None:
+        """Return the on-disk path for a served filename, or None if unknown."""
+        if not _FILENAME_RE.match(filename) or filename not in self._entries:
+            return None
+        return self.directory / filename
+
+    def duration(self, url: str) -> float | None:
+        """Return the clip length in seconds for a URL served by this cache."""
+        entry = self._entries.get(url.rsplit("/", 1)[-1])
+        return entry.duration if entry else None
+
+    def served_url(self, filename: str) -> str:
+        """Return the absolute URL a speaker on the LAN can fetch.
+
+        Prefers the internal URL (or the LAN IP); falls back to whatever URL
+        Home Assistant would hand out, as ``async_process_play_media_url`` does.
+        """
+        try:
+            base_url = get_url(self.hass, allow_external=False, prefer_external=False, allow_ip=True)
+        except NoURLAvailableError:
+            base_url = get_url(self.hass)
+        return f"{base_url}{_VIEW_PATH}/{filename}"
+
+    async def async_get_url(self, media_id: str, source_url: str) -> str | None:
+        """Return a cached URL for ``media_id``, filling the cache from ``source_url`` on a miss.
+
+        Returns None when the audio could not be cached; callers then play
+        ``source_url`` directly.
+        """
+        filename = self._index.get(media_id)
+        entry = self._entries.get(filename) if filename else None
+        if entry is not None and time.time() - self._indexed_at.get(media_id, 0.0) > _INDEX_TTL_SECONDS:
+            self.stats.expired += 1
+            entry = None
+        if entry is not None:
+            self.stats.hits += 1
+            self.stats.bytes_served_from_cache += entry.size
+            entry.last_used = time.time()
+            self._store.async_delay_save(self._data_to_save, _INDEX_SAVE_DELAY_SECONDS)
+        else:
+            self.stats.misses += 1
+            # Concurrent announcements of the same phrase share one fetch.
+            task = self._pending.get(media_id)
+            if task is None:
+                task = self.hass.async_create_task(self._async_fill(media_id, source_url), eager_start=True)
+                self._pending[media_id] = task
+                task.add_done_callback(lambda _t: self._pending.pop(media_id, None))
+            filename = await task
+            if filename is None:
+                return None
+        try:
+            return self.served_url(filename)
+        except NoURLAvailableError:
+            return None
+
+    async def _async_fill(self, media_id: str, source_url: str) -> str | None:
+        """Fetch, hash, store and index one announcement."""
+        session = async_get_clientsession(self.hass)
+        try:
+            async with asyncio.timeout(_FETCH_TIMEOUT_SECONDS):
+                async with session.get(source_url) as response:
+                    response.raise_for_status()
+                    chunks: list[bytes] = []
+                    size = 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        size += len(chunk)
+                        if size > _MAX_ENTRY_BYTES:
+                            _LOGGER.debug("Not caching %s: larger than %d bytes", media_id, _MAX_ENTRY_BYTES)
+                            return None
+                        chunks.append(chunk)
+                    content_type = response.headers.get("Content-Type")
+        except (TimeoutError, aiohttp.ClientError) as err:
+            self.stats.fetch_failures += 1
+            _LOGGER.debug("Announcement cache fetch failed for %s: %s", media_id, err)
+            return None
+        if not size:
+            return None
+
+        filename, duration = await self.hass.async_add_executor_job(
+            self._write_file, b"".join(chunks), _extension_for(content_type, source_url)
+        )
+        now = time.time()
+        self._entries[filename] = _CacheEntry(filename, size, now, duration)
+        self._index[media_id] = filename
+        self._indexed_at[media_id] = now
+        await self._async_evict()
+        self._store.async_delay_save(self._data_to_save, _INDEX_SAVE_DELAY_SECONDS)
+        return filename if filename in self._entries else None
+
+    def _write_file(self, content: bytes, extension: str) -> tuple[str, float | None]:
+        """Hash ``content``, write it atomically unless already stored and read its length (executor)."""
+        filename = f"{hashlib.sha256(content).hexdigest()}.{extension}"
+        path = self.directory / filename
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f".{filename}.tmp"
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)
+        return filename, _audio_duration(path)
+
+    async def _async_evict(self) -> None:
+        """Remove least recently used files until the cache fits ``max_bytes``."""
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return
+        victims: list[str] = []
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            victims.append(entry.filename)
+            total -= entry.size
+        for filename in victims:
+            del self._entries[filename]
+        self._index = {media_id: name for media_id, name in self._index.items() if name in self._entries}
+        self._indexed_at = {media_id: at for media_id, at in self._indexed_at.items() if media_id in self._index}
+        self.stats.evictions += len(victims)
+        await self.hass.async_add_executor_job(self._remove_files, victims)
+
+    def _remove_files(self, filenames: list[str]) -> None:
+        """Delete evicted files (executor)."""
+        for filename in filenames:
+            (self.directory / filename).unlink(missing_ok=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache metrics for diagnostics."""
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "entries": len(self._entries),
+            "indexed_media": len(self._index),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "expired": self.stats.expired,
+            "hit_rate": round(self.stats.hits / lookups, 3) if lookups else None,
+            "evictions": self.stats.evictions,
+            "fetch_failures": self.stats.fetch_failures,
+            "bytes_served_from_cache": self.stats.bytes_served_from_cache,
+        }
+
+
+class AnnouncementCacheView(HomeAssistantView):
+    """Serve cached announcement audio to the speakers.
+
+    No auth, like HA's own ``/api/tts_proxy``: speakers cannot send tokens, and
+    filenames are SHA-256 digests of content that was already reachable.
+    """
+
+    url = _VIEW_PATH + "/{filename}"
+    name = "api:wiim:announce"
+    requires_auth = False
+
+    def __init__(self, cache: AnnouncementCache) -> None:
+        """Initialize the view."""
+        self._cache = cache
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Return the cached file (aiohttp sets Content-Length / Range / Content-Type)."""
+        path = self._cache.file_path(filename)
+        if path is None:
+            return web.Response(status=404)
+        return web.FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+async def async_setup_announcement_cache(hass: HomeAssistant) -> None:
+    """Create the cache and register its view (skipped when HTTP is not loaded)."""
+    if hass.http is None:
+        _LOGGER.debug("HTTP component not loaded; announcement cache disabled")
+        return
+    cache = AnnouncementCache(hass)
+    await cache.async_load()
+    hass.http.register_view(AnnouncementCacheView(cache))
+    hass.data.setdefault(DOMAIN, {})[DATA_ANNOUNCEMENT_CACHE] = cache
+
+
+def get_announcement_cache(hass: HomeAssistant) -> AnnouncementCache | None:
+    """Return the announcement cache if it was set up."""
+    return hass.data.get(DOMAIN, {}).get(DATA_ANNOUNCEMENT_CACHE)
@@ -0,0 +1,226 @@
+"""Per-speaker announcement queue.
+
+``play_notification`` returns as soon as the device accepted the prompt, so
+two automations announcing on the same speaker a second apart cut each other
+off. Every coordinator owns one ``AnnouncementQueue`` that plays
+announcements one at a time and holds the speaker for the clip length before
+starting the next one. When the length is unknown (plain URLs, TTS that
+missed the announcement cache, audio without a readable header) the speaker
+is held for a conservative ``_DEFAULT_HOLD_SECONDS``.
+
+While an announcement is waiting, an identical one (same media id) is merged
+into it and both callers get the same result. What happens to waiting
+announcements is set per device in the options flow:
+
+- ``fifo``: play in arrival order; when the queue is full new ones are dropped.
+- ``latest_wins``: a new announcement replaces everything still waiting.
+- ``priority``: higher priority plays first; when full the lowest is dropped.
+
+Dropped announcements resolve to ``None`` and announcements cancelled by
+unloading the entry resolve to ``ANNOUNCEMENT_CANCELLED``, instead of raising,
+so a losing automation does not error out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+from homeassistant.util.async_ import create_eager_task
+
+from .const import (
+    ANNOUNCE_QUEUE_LATEST_WINS,
+    ANNOUNCE_QUEUE_POLICIES,
+    ANNOUNCE_QUEUE_PRIORITY,
+    DEFAULT_ANNOUNCE_QUEUE_POLICY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Result of an announcement cancelled by unloading the entry (dropped ones resolve to None).
+ANNOUNCEMENT_CANCELLED: Final = object()
+
+# Waiting announcements per speaker (the one currently playing is not counted).
+_MAX_PENDING = 5
+# Never hold a speaker longer than this for one clip, whatever its reported length.
+_MAX_HOLD_SECONDS = 60.0
+# Hold when the clip length is unknown; long enough for a typical TTS sentence or chime.
+_DEFAULT_HOLD_SECONDS = 10.0
+
+
+@dataclass
+class _PendingAnnouncement:
+    """One queued announcement and everyone waiting on it."""
+
+    key: str
+    play: Callable[[], Awaitable[Any]]
+    priority: int
+    hold: float
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: asyncio.Future[Any] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+    @property
+    def rank(self) -> tuple[int, int]:
+        """Sort key for the priority policy: highest priority, then oldest."""
+        return (-self.priority, self.seq)
+
+
+class AnnouncementQueue:
+    """Serialize announcements for one speaker."""
+
+    def __init__(
+        self,
+        name: str,
+        policy: str = DEFAULT_ANNOUNCE_QUEUE_POLICY,
+        max_pending: int = _MAX_PENDING,
+        default_hold: float = _DEFAULT_HOLD_SECONDS,
+    ) -> None:
+        """Initialize the queue; ``default_hold`` applies to clips of unknown length."""
+        if policy not in ANNOUNCE_QUEUE_POLICIES:
+            _LOGGER.warning("[%s] Unknown announcement queue policy '%s', using fifo", name, policy)
+            policy = DEFAULT_ANNOUNCE_QUEUE_POLICY
+        self.name = name
+        self.policy = policy
+        self.max_pending = max_pending
+        self.default_hold = default_hold
+        self._pending: list[_PendingAnnouncement] = []
+        self._current: _PendingAnnouncement | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._seq = itertools.count()
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+        self.last_wait_ms: float | None = None
+        self.max_wait_ms: float = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of announcements waiting (excluding the one playing)."""
+        return len(self._pending)
+
+    @property
+    def busy(self) -> bool:
+        """Return True while an announcement is playing or its hold is running."""
+        return self._current is not None
+
+    async def async_announce(
+        self,
+        key: str,
+        play: Callable[[], Awaitable[Any]],
+        *,
+        priority: int = 0,
+        hold: float | None = None,
+    ) -> Any:
+        """Queue ``play`` and return its result once it ran.
+
+        Returns None if the announcement was dropped and ``ANNOUNCEMENT_CANCELLED``
+        if the queue was cancelled before it finished.
+
+        ``key`` identifies the content (the media id before cache-busting) and
+        is used to merge duplicates. ``hold`` is the clip length in seconds
+        (None when unknown, which holds ``default_hold``); the next
+        announcement waits at least that long after ``play`` returns.
+        """
+        for waiting in self._pending:
+            if waiting.key == key:
+                self.merged += 1
+                waiting.priority = max(waiting.priority, priority)
+                if self.policy == ANNOUNCE_QUEUE_PRIORITY:
+                    # A raised priority can move the merged announcement ahead
+                    self._pending.sort(key=lambda entry: entry.rank)
+                _LOGGER.debug("[%s] Merged duplicate announcement %s", self.name, key)
+                return await asyncio.shield(waiting.future)
+
+        item = _PendingAnnouncement(
+            key=key,
+            play=play,
+            priority=priority,
+            hold=min(max(self.default_hold if hold is None else hold, 0.0), _MAX_HOLD_SECONDS),
+            seq=next(self._seq),
+        )
+        if self.policy == ANNOUNCE_QUEUE_LATEST_WINS:
+            while self._pending:
+                self._drop(self._pending.pop())
+        elif len(self._pending) >= self.max_pending:
+            if self.policy == ANNOUNCE_QUEUE_PRIORITY:
+                lowest = max([*self._pending, item], key=lambda entry: entry.rank)
+                if lowest is not item:
+                    self._pending.remove(lowest)
+                    self._drop(lowest)
+            if len(self._pending) >= self.max_pending:
+                self._drop(item)
+                return None
+
+        self._pending.append(item)
+        if self.policy == ANNOUNCE_QUEUE_PRIORITY:
+            self._pending.sort(key=lambda entry: entry.rank)
+        if self._worker is None or self._worker.done():
+            # Eager start: an idle speaker begins playing before this call yields.
+            self._worker = create_eager_task(self._async_run(), name=f"wiim announcement queue {self.name}")
+        return await asyncio.shield(item.future)
+
+    def _drop(self, item: _PendingAnnouncement) -> None:
+        """Resolve a discarded announcement with None."""
+        self.dropped += 1
+        _LOGGER.debug("[%s] Dropped announcement %s (policy %s)", self.name, item.key, self.policy)
+        if not item.future.done():
+            item.future.set_result(None)
+
+    def _cancel(self, item: _PendingAnnouncement) -> None:
+        """Resolve an announcement cut short by unloading the entry."""
+        _LOGGER.debug("[%s] Cancelled announcement %s", self.name, item.key)
+        if not item.future.done():
+            item.future.set_result(ANNOUNCEMENT_CANCELLED)
+
+    async def _async_run(self) -> None:
+        """Play waiting announcements one after another until the queue is empty."""
+        while self._pending:
+            item = self._current = self._pending.pop(0)
+            wait_ms = round((time.monotonic() - item.enqueued_at) * 1000, 1)
+            self.last_wait_ms = wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            try:
+                result = await item.play()
+            except Exception as err:  # surfaced to the caller
+                if not item.future.done():
+                    item.future.set_exception(err)
+                self._current = None
+                continue
+            self.played += 1
+            if not item.future.done():
+                item.future.set_result(result)
+            if item.hold:
+                await asyncio.sleep(item.hold)
+            self._current = None
+        self._current = None
+
+    def async_cancel(self) -> None:
+        """Stop the worker and resolve everything still waiting or playing as cancelled (entry unload)."""
+        for item in self._pending:
+            self._cancel(item)
+        self._pending.clear()
+        if self._current is not None:
+            self._cancel(self._current)
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
+        self._current = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue state for diagnostics."""
+        return {
+            "policy": self.policy,
+            "depth": self.depth,
+            "busy": self.busy,
+            "last_wait_ms": self.last_wait_ms,
+            "max_wait_ms": self.max_wait_ms,
+            "played": self.played,
+            "merged": self.merged,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,100 @@
+"""Per-device cache for the media browser tree.
+
+Browsing the root calls ``media_source.async_browse_media`` and the preset
+folder re-parses ``player.presets`` on every request, although neither
+changes between two clicks in the frontend. Results are cached by
+``(media_content_type, media_content_id)``:
+
+- entries carry a signature (e.g. the preset data they were built from) and
+  are rebuilt as soon as it differs;
+- anything that includes Home Assistant media sources also expires after a
+  short TTL, since other integrations can add or remove sources at any time.
+
+Browse latency (cache hits and misses) is tracked for diagnostics.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # Only for annotations: the coordinator owns this cache, and the media
+    # player component should load with the media player platform, not the package.
+    from homeassistant.components.media_player import BrowseMedia
+
+# Media-source listings are owned by other integrations; keep them briefly only.
+MEDIA_SOURCE_TTL_SECONDS = 30.0
+
+
+@dataclass
+class _CachedNode:
+    """One cached browse result."""
+
+    signature: Any
+    expires_at: float | None
+    node: BrowseMedia
+
+
+class BrowseCache:
+    """Cache browse results for one device and record browse latency."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._nodes: dict[tuple[str, str], _CachedNode] = {}
+        self.hits = 0
+        self.misses = 0
+        self.browse_count = 0
+        self.last_browse_ms: float | None = None
+        self.max_browse_ms = 0.0
+        self._total_browse_ms = 0.0
+
+    def get(self, content_type: str, content_id: str, signature: Any = None) -> BrowseMedia | None:
+        """Return the cached node if it is still valid for ``signature``."""
+        cached = self._nodes.get((content_type, content_id))
+        if (
+            cached is None
+            or cached.signature != signature
+            or (cached.expires_at is not None and time.monotonic() >= cached.expires_at)
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached.node
+
+    def put(
+        self,
+        content_type: str,
+        content_id: str,
+        node: BrowseMedia,
+        signature: Any = None,
+        ttl: float | None = None,
+    ) -> BrowseMedia:
+        """Store ``node`` and return it."""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._nodes[(content_type, content_id)] = _CachedNode(signature, expires_at, node)
+        return node
+
+    def invalidate(self) -> None:
+        """Drop every cached node."""
+        self._nodes.clear()
+
+    def record_browse(self, elapsed_ms: float) -> None:
+        """Record how long one frontend browse request took."""
+        self.browse_count += 1
+        self.last_browse_ms = round(elapsed_ms, 1)
+        self.max_browse_ms = max(self.max_browse_ms, self.last_browse_ms)
+        self._total_browse_ms += elapsed_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache and latency metrics for diagnostics."""
+        return {
+            "cached_nodes": len(self._nodes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "browse_count": self.browse_count,
+            "last_browse_ms": self.last_browse_ms,
+            "max_browse_ms": self.max_browse_ms,
+            "avg_browse_ms": round(self._total_browse_ms / self.browse_count, 1) if self.browse_count else None,
+        }
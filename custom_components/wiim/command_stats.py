@@ -0,0 +1,169 @@
+"""Per-device command latency table and metrics counters.
+
+``entity.timed_command`` (used by ``WiimEntity.wiim_command`` and around
+queued ``play_notification`` calls) reports every command here with its
+duration, outcome (``ok``, ``unreachable``, ``cancelled`` or the error type) and the device
+model and firmware. Per ``(operation, model)`` it keeps count, failures, average and
+maximum time; the most recent commands are kept individually so device
+diagnostics can show the slowest of them.
+
+Both tables are bounded: the least recently used operation is dropped once
+``_MAX_OPERATIONS`` is reached (operation names can include a source name).
+When a warning threshold is configured, slower commands are logged.
+
+``DeviceMetrics`` holds each coordinator's poll and command counters and
+duration histograms for the metrics endpoint (``metrics.py``). Recording
+happens on the event loop only, so plain integer increments are safe without
+locks. Histograms use fixed buckets in preallocated lists, so recording a
+sample allocates nothing.
+"""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_OPERATIONS = 50
+_MAX_RECENT = 50
+_SLOWEST_REPORTED = 10
+
+# Seconds; polls run several HTTP requests, commands usually one.
+POLL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COMMAND_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+OUTCOME_OK = "ok"
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are built when rendering)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize empty buckets; the last slot counts values above every bound."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one sample."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class DeviceMetrics:
+    """Poll and command counters for one device."""
+
+    def __init__(self) -> None:
+        """Initialize zeroed counters."""
+        self.polls: dict[str, int] = {OUTCOME_OK: 0}
+        self.poll_seconds = Histogram(POLL_BUCKETS)
+        self.consecutive_poll_failures = 0
+        self.commands: dict[str, int] = {OUTCOME_OK: 0}
+        self.command_seconds = Histogram(COMMAND_BUCKETS)
+
+    def record_poll(self, seconds: float, outcome: str = OUTCOME_OK) -> None:
+        """Record one coordinator poll; ``outcome`` is ``ok`` or an error class."""
+        self.polls[outcome] = self.polls.get(outcome, 0) + 1
+        self.poll_seconds.observe(seconds)
+        self.consecutive_poll_failures = 0 if outcome == OUTCOME_OK else self.consecutive_poll_failures + 1
+
+    def record_command(self, seconds: float, outcome: str = OUTCOME_OK) -> None:
+        """Record one entity command; ``outcome`` is ``ok`` or an error class."""
+        self.commands[outcome] = self.commands.get(outcome, 0) + 1
+        self.command_seconds.observe(seconds)
+
+
+@dataclass
+class _OperationStats:
+    """Aggregate timings for one operation on one model."""
+
+    count: int = 0
+    failures: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_error: str | None = None
+
+
+@dataclass
+class _CommandRecord:
+    """One recent command."""
+
+    operation: str
+    model: str
+    firmware: str | None
+    duration_ms: float
+    outcome: str
+    at: str
+
+
+class CommandStats:
+    """Record command latency for one device."""
+
+    def __init__(self, name: str, warn_ms: float = 0) -> None:
+        """Initialize; ``warn_ms`` of 0 disables slow-command warnings."""
+        self._name = name
+        self.warn_ms = warn_ms
+        self._operations: dict[tuple[str, str], _OperationStats] = {}
+        self._recent: deque[_CommandRecord] = deque(maxlen=_MAX_RECENT)
+
+    def record(self, operation: str, duration_ms: float, outcome: str, model: str | None, firmware: str | None) -> None:
+        """Record one finished command."""
+        model = model or "unknown"
+        key = (operation, model)
+        # Re-insert so dict order is least recently used first.
+        stats = self._operations.pop(key, None) or _OperationStats()
+        self._operations[key] = stats
+        if len(self._operations) > _MAX_OPERATIONS:
+            del self._operations[next(iter(self._operations))]
+
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        if outcome != "ok":
+            stats.failures += 1
+            stats.last_error = outcome
+        self._recent.append(
+            _CommandRecord(operation, model, firmware, round(duration_ms, 1), outcome, dt_util.utcnow().isoformat())
+        )
+
+        if self.warn_ms and duration_ms >= self.warn_ms:
+            _LOGGER.warning(
+                "[%s] %s took %.0f ms (threshold %.0f ms, model %s, firmware %s, outcome %s)",
+                self._name,
+                operation,
+                duration_ms,
+                self.warn_ms,
+                model,
+                firmware,
+                outcome,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the operation table and slowest recent commands for diagnostics."""
+        slowest = sorted(self._recent, key=lambda record: record.duration_ms, reverse=True)[:_SLOWEST_REPORTED]
+        return {
+            "warn_threshold_ms": self.warn_ms or None,
+            "operations": [
+                {
+                    "operation": operation,
+                    "model": model,
+                    "count": stats.count,
+                    "failures": stats.failures,
+                    "avg_ms": round(stats.total_ms / stats.count, 1),
+                    "max_ms": round(stats.max_ms, 1),
+                    "last_error": stats.last_error,
+                }
+                for (operation, model), stats in self._operations.items()
+            ],
+            "slowest_recent": [asdict(record) for record in slowest],
+        }
@@ -7,7 +7,9 @@ Simple discovery and setup flow following Home Assistant best practices.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from ipaddress import ip_address
 from typing import Any
 from urllib.parse import urlparse
@@ -25,15 +27,28 @@ from homeassistant.const import CONF_HOST
 from homeassistant.core import callback
 from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
-from pywiim.discovery import DiscoveredDevice, discover_devices, validate_device
+from pywiim.discovery import DiscoveredDevice, discover_devices, is_likely_non_linkplay, validate_device
 
 from .const import (
+    ANNOUNCE_QUEUE_POLICIES,
+    CONF_ANNOUNCE_QUEUE_POLICY,
     CONF_ENABLE_MAINTENANCE_BUTTONS,
+    CONF_PROMETHEUS_METRICS,
+    CONF_RECORDER_FRIENDLY_ATTRIBUTES,
+    CONF_SCAN_RANGE,
+    CONF_SLOW_COMMAND_WARNING_MS,
     CONF_VOLUME_STEP,
     CONF_VOLUME_STEP_PERCENT,
+    DEFAULT_ANNOUNCE_QUEUE_POLICY,
+    DEFAULT_SLOW_COMMAND_WARNING_MS,
     DEFAULT_VOLUME_STEP,
     DOMAIN,
+    SOURCE_SUBNET_SCAN,
 )
+from .http_session import async_get_http_pool, client_session_kwargs
+from .subnet_scan import ScanHit, async_scan_range, async_validate_hit, entry_data_for, scan_hosts
+from .validation_cache import VALIDATION_CONCURRENCY, get_validation_cache
+from .version import async_ensure_pywiim_version
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -74,6 +89,10 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize."""
         self._discovered_devices: list[DiscoveredDevice] = []
+        self._scan_hosts: list[str] = []
+        self._scan_task: asyncio.Task[list[dict[str, Any]]] | None = None
+        self._scan_error: str | None = None
+        self._scan_results: list[dict[str, Any]] = []
         self.data: dict[str, Any] = {}
 
     @staticmethod
@@ -152,9 +171,12 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             host = user_input[CONF_HOST].strip()
+            if "/" in host:
+                # A range such as 192.168.10.0/24 adds every speaker in it.
+                return await self.async_step_scan({CONF_SCAN_RANGE: host})
 
             try:
-                validated_device = await _validate_config_device(host)
+                validated_device = await self._async_validate(host, force=True)
             except Exception as err:
                 _LOGGER.debug("Device validation failed for manual host %s: %s", host, err)
                 errors["base"] = "cannot_connect"
@@ -180,26 +202,198 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
             description_placeholders={"example_ip": "192.168.1.100"},
         )
 
+    async def async_step_scan(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Ask for an IPv4 range to scan for speakers."""
+        errors: dict[str, str] = {}
+        if self._scan_error is not None:
+            # Back from a scan that found nothing new
+            errors["base"], self._scan_error = self._scan_error, None
+
+        if user_input is not None:
+            try:
+                self._scan_hosts = scan_hosts(user_input[CONF_SCAN_RANGE])
+            except ValueError as err:
+                _LOGGER.debug("Invalid scan range %s: %s", user_input[CONF_SCAN_RANGE], err)
+                errors["base"] = "invalid_scan_range"
+            else:
+                return await self.async_step_scan_progress()
+
+        schema = vol.Schema({vol.Required(CONF_SCAN_RANGE, description="Network range to scan"): str})
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"example_range": "192.168.1.0/24"},
+        )
+
+    async def async_step_scan_progress(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Run the scan as a background task while the frontend shows progress."""
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(self._async_scan(self._scan_hosts))
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan_progress",
+                progress_action="scan",
+                progress_task=self._scan_task,
+                description_placeholders={"count": str(len(self._scan_hosts))},
+            )
+
+        task, self._scan_task = self._scan_task, None
+        try:
+            self._scan_results = task.result()
+        except Exception as err:  # noqa: BLE001 - reported on the range form instead of failing the flow
+            _LOGGER.debug("Subnet scan failed: %s", err)
+            self._scan_results = []
+            self._scan_error = "cannot_connect"
+        else:
+            if self._scan_results:
+                return self.async_show_progress_done(next_step_id="scan_confirm")
+            self._scan_error = "no_devices_found"
+        return self.async_show_progress_done(next_step_id="scan")
+
+    async def async_step_scan_confirm(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Confirm the scan results, then add every speaker in one batch."""
+        if user_input is not None:
+            # One child flow per speaker, like the slaves of an added master
+            for scan_result in self._scan_results:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": SOURCE_SUBNET_SCAN},
+                        data=scan_result,
+                    )
+                )
+            return self.async_abort(
+                reason="scan_imported",
+                description_placeholders={"count": str(len(self._scan_results))},
+            )
+
+        devices = "\n".join(f"• {result['name']} ({result[CONF_HOST]})" for result in self._scan_results)
+        return self.async_show_form(
+            step_id="scan_confirm",
+            description_placeholders={"count": str(len(self._scan_results)), "devices": devices},
+        )
+
+    async def async_step_subnet_scan(self, scan_result: dict[str, Any]) -> ConfigFlowResult:
+        """Create an entry for a speaker the user confirmed from a subnet scan."""
+        data = dict(scan_result)
+        name = data.pop("name", None)
+        unique_id = data.pop("uuid", None) or data[CONF_HOST]
+
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: data[CONF_HOST]})
+
+        return self.async_create_entry(title=name or f"WiiM Device ({data[CONF_HOST]})", data=data)
+
+    async def _async_scan(self, hosts: list[str]) -> list[dict[str, Any]]:
+        """Probe and validate hosts; return child flow data for new speakers.
+
+        Each result carries the endpoint that answered and the detected
+        capabilities, so setup of the new entry skips protocol and capability
+        probing.
+        """
+        existing_entries = self._async_current_entries()
+        known_hosts = {entry.data[CONF_HOST] for entry in existing_entries}
+        known_uuids = {entry.unique_id for entry in existing_entries if entry.unique_id}
+
+        pool = await async_get_http_pool(self.hass)
+        hits: dict[str, ScanHit] = {
+            hit.host: hit
+            for hit in await async_scan_range(
+                pool.session, [host for host in hosts if host not in known_hosts], pool.ssl_context
+            )
+        }
+        # Validated on the endpoint that just answered, not through the validation
+        # cache: a cached device would come without the capabilities the entry needs.
+        semaphore = asyncio.Semaphore(VALIDATION_CONCURRENCY)
+
+        async def _validate(hit: ScanHit) -> tuple[DiscoveredDevice, dict[str, Any]] | None:
+            async with semaphore:
+                try:
+                    return await async_validate_hit(pool.session, hit, pool.ssl_context)
+                except Exception as err:  # noqa: BLE001 - non-WiiM hosts fail in many ways
+                    _LOGGER.debug("Validation failed for %s: %s", hit.host, err)
+                    return None
+
+        validated = {
+            host: result
+            for host, result in zip(hits, await asyncio.gather(*map(_validate, hits.values())), strict=True)
+            if result is not None
+        }
+        pywiim_version = await async_ensure_pywiim_version(self.hass)
+
+        results: list[dict[str, Any]] = []
+        seen_uuids = set(known_uuids)
+        for host, (device, capabilities) in validated.items():
+            unique_id = device.uuid or host
+            if unique_id in seen_uuids:
+                continue
+            seen_uuids.add(unique_id)
+            results.append(
+                {
+                    **entry_data_for(hits[host], capabilities, pywiim_version),
+                    "name": device.name or f"WiiM Device ({host})",
+                    "uuid": device.uuid,
+                }
+            )
+        _LOGGER.debug(
+            "Subnet scan: %d address(es), %d LinkPlay endpoint(s), %d new speaker(s)",
+            len(hosts),
+            len(hits),
+            len(results),
+        )
+        return results
+
+    async def _async_validate(self, host: str, *, force: bool = False) -> DiscoveredDevice:
+        """Validate host through the shared cache.
+
+        mDNS and SSDP usually announce a speaker within seconds of each other;
+        the second flow reuses the first validation. User-entered hosts pass
+        ``force`` so a speaker that was just powered on is not rejected from cache.
+        """
+        return await get_validation_cache(self.hass).async_validate(host, _validate_config_device, force=force)
+
     async def _discover_devices(self) -> list[DiscoveredDevice]:
-        """Discover WiiM devices using pywiim's discover_devices."""
+        """Discover WiiM devices via SSDP, then validate new candidates concurrently."""
         existing_entries = self._async_current_entries()
         known_hosts = {entry.data[CONF_HOST] for entry in existing_entries}
         known_uuids = {entry.unique_id for entry in existing_entries if entry.unique_id}
 
-        devices = await discover_devices(validate=True)
+        started = time.monotonic()
+        candidates = await discover_devices(validate=False)
+        ssdp_ms = (time.monotonic() - started) * 1000
+
+        # Configured hosts and obvious non-LinkPlay responders are not probed at all.
+        hosts = [
+            device.ip
+            for device in candidates
+            if device.ip
+            and device.ip not in known_hosts
+            and not (device.ssdp_response and is_likely_non_linkplay(device.ssdp_response))
+        ]
+        cache = get_validation_cache(self.hass)
+        hits_before = cache.stats.cache_hits
+        started = time.monotonic()
+        validated = await cache.async_validate_many(hosts, _validate_config_device)
+        validate_ms = (time.monotonic() - started) * 1000
+
         discovered = []
-        for device in devices:
-            if not device.ip:
-                continue
-            if not getattr(device, "validated", False):
-                continue
-            if device.ip in known_hosts:
-                continue
+        for device in validated.values():
             unique_id = device.uuid or device.ip
             if unique_id in known_uuids:
                 continue
             discovered.append(device)
 
+        _LOGGER.debug(
+            "Discovery: SSDP %.0f ms (%d candidate(s)), validation %.0f ms (%d host(s), %d from cache, %d new)",
+            ssdp_ms,
+            len(candidates),
+            validate_ms,
+            len(hosts),
+            cache.stats.cache_hits - hits_before,
+            len(discovered),
+        )
         return discovered
 
     async def async_step_zeroconf(self, discovery_info: ZeroconfServiceInfo) -> ConfigFlowResult:
@@ -216,7 +410,7 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
 
         # Validate device to get UUID
         try:
-            validated_device = await _validate_config_device(host)
+            validated_device = await self._async_validate(host)
         except Exception as err:
             _LOGGER.debug(
                 "Device validation failed for %s (not a WiiM/LinkPlay device): %s",
@@ -257,7 +451,7 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
         # HTTP validation: Call device HTTP API to confirm it's actually a WiiM/LinkPlay device
         # validate_device makes HTTP calls to the device to verify it responds as a LinkPlay/WiiM device
         try:
-            validated_device = await _validate_config_device(host)
+            validated_device = await self._async_validate(host)
         except Exception as err:
             # validate_device failed - device is not a WiiM/LinkPlay device or not reachable
             # Silently abort (following python-linkplay pattern of skipping invalid devices)
@@ -303,8 +497,14 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
             if entry.data.get(CONF_HOST) == host:
                 return self.async_abort(reason="already_configured")
 
+        # A known UUID (slaves found through their master) lets duplicates abort
+        # before any request is made.
+        if device_uuid:
+            await self.async_set_unique_id(device_uuid)
+            self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+
         try:
-            validated_device = await _validate_config_device(host)
+            validated_device = await self._async_validate(host)
         except Exception as err:
             _LOGGER.debug(
                 "Device validation failed for %s (not a WiiM/LinkPlay device): %s",
@@ -322,6 +522,8 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured(updates={CONF_HOST: host})
 
         self.data = {CONF_HOST: host, "name": final_name}
+        if endpoint := discovery_info.get("endpoint"):
+            self.data["endpoint"] = endpoint
         return await self.async_step_discovery_confirm()
 
     async def async_step_missing_device(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
@@ -334,7 +536,7 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
             host = user_input[CONF_HOST].strip()
 
             try:
-                validated_device = await _validate_config_device(host)
+                validated_device = await self._async_validate(host, force=True)
             except Exception as err:
                 _LOGGER.debug("Device validation failed for missing device host %s: %s", host, err)
                 errors["base"] = "cannot_connect"
@@ -372,6 +574,9 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
             entry_data = {CONF_HOST: self.data[CONF_HOST]}
             if "ssdp_info" in self.data:
                 entry_data["ssdp_info"] = self.data["ssdp_info"]
+            # Endpoint validated during discovery; setup skips the protocol probe
+            if "endpoint" in self.data:
+                entry_data["endpoint"] = self.data["endpoint"]
 
             # Trigger slave discovery in background
             self.hass.async_create_task(self._discover_slaves(self.data[CONF_HOST]))
@@ -406,64 +611,63 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
 
         When a master device is added, check if it has slaves and automatically
         trigger discovery flows for them (without unjoining the group).
+
+        The master was just validated, so its endpoint comes from the validation
+        cache and the slave list costs one ``getSlaveList`` request. New slaves
+        are validated together in one concurrent batch, and each child flow gets
+        the UUID, name and endpoint so it neither probes nor validates again.
         """
         try:
-            from homeassistant.helpers.aiohttp_client import async_get_clientsession
             from pywiim import WiiMClient
 
-            # Create a temporary client to check for slaves
-            # Let pywiim probe automatically - we don't have endpoint cached here
-            session = async_get_clientsession(self.hass)
-            client = WiiMClient(host=host, session=session)
-
-            # Get group info to see if this device is a master with slaves
-            group_info = await client.get_device_group_info()
-
-            if not group_info:
+            pool = await async_get_http_pool(self.hass)
+            cache = get_validation_cache(self.hass)
+            client_kwargs: dict[str, Any] = {"host": host, **client_session_kwargs(pool)}
+            if (master := cache.get(host)) is not None:
+                client_kwargs["port"] = master.port
+                client_kwargs["protocol"] = master.protocol
+            client = WiiMClient(**client_kwargs)
+
+            # multiroom:getSlaveList is empty for solo speakers and slaves
+            slaves = await client.get_slaves_info()
+            if not slaves:
                 return
 
-            # Check if this is a master with slaves
-            # DeviceGroupInfo is a Pydantic model, access attributes directly
-            if group_info.role != "master":
-                return
-
-            # slave_hosts is a list of IP addresses
-            slave_hosts = group_info.slave_hosts or []
-            if not slave_hosts:
-                return
+            # Check existing entries to avoid re-adding
+            existing_entries = self._async_current_entries()
+            known_hosts = {entry.data[CONF_HOST] for entry in existing_entries}
+            known_uuids = {entry.unique_id for entry in existing_entries if entry.unique_id}
 
+            new_hosts = [
+                slave["ip"]
+                for slave in slaves
+                if slave.get("ip") and slave["ip"] not in known_hosts and slave.get("uuid") not in known_uuids
+            ]
             _LOGGER.debug(
-                "Master device at %s has %d slave(s), triggering discovery for them",
+                "Master device at %s has %d slave(s), %d not configured yet",
                 host,
-                len(slave_hosts),
+                len(slaves),
+                len(new_hosts),
             )
+            if not new_hosts:
+                return
 
-            # Check existing entries to avoid re-adding
-            existing_entries = self._async_current_entries()
-            known_hosts = {entry.data[CONF_HOST] for entry in existing_entries}
-
-            # Trigger discovery for each slave
-            for slave_ip in slave_hosts:
-                if not slave_ip:
-                    continue
+            # WiFi Direct slaves (10.10.10.x) are not reachable and drop out here.
+            validated = await cache.async_validate_many(new_hosts, _validate_config_device)
 
-                # Skip if already configured
-                if slave_ip in known_hosts:
-                    _LOGGER.debug("Slave %s already configured, skipping", slave_ip)
+            for slave_ip, device in validated.items():
+                if device.uuid and device.uuid in known_uuids:
                     continue
-
                 _LOGGER.debug("Triggering discovery for slave: %s", slave_ip)
-
-                # Trigger integration discovery for this slave
-                # Note: We only have IP, UUID/name will be fetched during validation
                 self.hass.async_create_task(
                     self.hass.config_entries.flow.async_init(
                         DOMAIN,
                         context={"source": SOURCE_INTEGRATION_DISCOVERY},
                         data={
                             CONF_HOST: slave_ip,
-                            "device_name": f"WiiM Device ({slave_ip})",
-                            "device_uuid": None,
+                            "device_name": device.name or f"WiiM Device ({slave_ip})",
+                            "device_uuid": device.uuid,
+                            "endpoint": f"{device.protocol}://{slave_ip}:{device.port}",
                         },
                     )
                 )
@@ -480,7 +684,7 @@ class WiiMConfigFlow(ConfigFlow, domain=DOMAIN):
             host = user_input[CONF_HOST].strip()
 
             try:
-                validated_device = await _validate_config_device(host)
+                validated_device = await self._async_validate(host, force=True)
             except Exception as err:
                 _LOGGER.debug("Device validation failed for %s: %s", host, err)
                 errors["base"] = "cannot_connect"
@@ -575,6 +779,18 @@ class WiiMOptionsFlow(OptionsFlow):
                 if CONF_ENABLE_MAINTENANCE_BUTTONS in user_input:
                     options_data[CONF_ENABLE_MAINTENANCE_BUTTONS] = user_input[CONF_ENABLE_MAINTENANCE_BUTTONS]
 
+                if CONF_ANNOUNCE_QUEUE_POLICY in user_input:
+                    options_data[CONF_ANNOUNCE_QUEUE_POLICY] = user_input[CONF_ANNOUNCE_QUEUE_POLICY]
+
+                if CONF_SLOW_COMMAND_WARNING_MS in user_input:
+                    options_data[CONF_SLOW_COMMAND_WARNING_MS] = user_input[CONF_SLOW_COMMAND_WARNING_MS]
+
+                if CONF_RECORDER_FRIENDLY_ATTRIBUTES in user_input:
+                    options_data[CONF_RECORDER_FRIENDLY_ATTRIBUTES] = user_input[CONF_RECORDER_FRIENDLY_ATTRIBUTES]
+
+                if CONF_PROMETHEUS_METRICS in user_input:
+                    options_data[CONF_PROMETHEUS_METRICS] = user_input[CONF_PROMETHEUS_METRICS]
+
                 return self.async_create_entry(title="", data=options_data)
 
             # Populate form with current or default values
@@ -584,6 +800,10 @@ class WiiMOptionsFlow(OptionsFlow):
             volume_step_percent = int(current_volume_step_decimal * 100)
 
             current_maintenance_buttons = entry_options.get(CONF_ENABLE_MAINTENANCE_BUTTONS, False)
+            current_queue_policy = entry_options.get(CONF_ANNOUNCE_QUEUE_POLICY, DEFAULT_ANNOUNCE_QUEUE_POLICY)
+            current_slow_command_ms = entry_options.get(CONF_SLOW_COMMAND_WARNING_MS, DEFAULT_SLOW_COMMAND_WARNING_MS)
+            current_recorder_friendly = entry_options.get(CONF_RECORDER_FRIENDLY_ATTRIBUTES, False)
+            current_prometheus_metrics = entry_options.get(CONF_PROMETHEUS_METRICS, False)
 
             schema = vol.Schema(
                 {
@@ -591,6 +811,14 @@ class WiiMOptionsFlow(OptionsFlow):
                         vol.Coerce(int), vol.Range(min=1, max=50)
                     ),
                     vol.Optional(CONF_ENABLE_MAINTENANCE_BUTTONS, default=current_maintenance_buttons): bool,
+                    vol.Optional(CONF_ANNOUNCE_QUEUE_POLICY, default=current_queue_policy): vol.In(
+                        ANNOUNCE_QUEUE_POLICIES
+                    ),
+                    vol.Optional(CONF_SLOW_COMMAND_WARNING_MS, default=current_slow_command_ms): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=30000)
+                    ),
+                    vol.Optional(CONF_RECORDER_FRIENDLY_ATTRIBUTES, default=current_recorder_friendly): bool,
+                    vol.Optional(CONF_PROMETHEUS_METRICS, default=current_prometheus_metrics): bool,
                 }
             )
 
@@ -10,12 +10,37 @@ from homeassistant.const import CONF_HOST  # noqa: F401
 
 DOMAIN = "wiim"
 
+# hass.data[DOMAIN][entry_id] key holding the speaker's firmware update entity.
+DATA_FIRMWARE_UPDATE = "firmware_update"
+# hass.data[DOMAIN][entry_id] key holding a callback that adds the rollout sensor to that entry's sensor platform.
+DATA_ADD_ROLLOUT_SENSOR = "add_rollout_sensor"
+# hass.data[DOMAIN] keys holding the running (or last) firmware rollout and the
+# integration-wide rollout progress sensor.
+DATA_ROLLOUT = "firmware_rollout"
+DATA_ROLLOUT_SENSOR = "firmware_rollout_sensor"
+
 # HA-specific config option keys (not from pywiim)
 CONF_VOLUME_STEP = "volume_step"
 CONF_VOLUME_STEP_PERCENT = "volume_step_percent"
 CONF_ENABLE_MAINTENANCE_BUTTONS = "enable_maintenance_buttons"
 CONF_ENABLE_NETWORK_MONITORING = "enable_network_monitoring"
+CONF_ANNOUNCE_QUEUE_POLICY = "announce_queue_policy"
+CONF_SLOW_COMMAND_WARNING_MS = "slow_command_warning_ms"
+CONF_RECORDER_FRIENDLY_ATTRIBUTES = "recorder_friendly_attributes"
+CONF_PROMETHEUS_METRICS = "prometheus_metrics"
+CONF_SCAN_RANGE = "scan_range"
+
+# Config flow source of the child flows that add subnet scan results
+SOURCE_SUBNET_SCAN = "subnet_scan"
+
+# Announcement queue policies (what happens to announcements waiting for a busy speaker)
+ANNOUNCE_QUEUE_FIFO = "fifo"
+ANNOUNCE_QUEUE_LATEST_WINS = "latest_wins"
+ANNOUNCE_QUEUE_PRIORITY = "priority"
+ANNOUNCE_QUEUE_POLICIES = [ANNOUNCE_QUEUE_FIFO, ANNOUNCE_QUEUE_LATEST_WINS, ANNOUNCE_QUEUE_PRIORITY]
 
 # HA-specific defaults (not from pywiim)
 DEFAULT_VOLUME_STEP = 0.05
 DEFAULT_DEVICE_NAME = "WiiM Speaker"
+DEFAULT_ANNOUNCE_QUEUE_POLICY = ANNOUNCE_QUEUE_FIFO
+DEFAULT_SLOW_COMMAND_WARNING_MS = 0  # 0 = no slow-command warnings
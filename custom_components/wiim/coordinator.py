@@ -3,15 +3,29 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import timedelta
 from typing import Any
 
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from pywiim import Player, PollingStrategy, WiiMClient
 from pywiim.exceptions import WiiMConnectionError, WiiMError, WiiMTimeoutError
 
+from .announce_queue import AnnouncementQueue
+from .browse_cache import BrowseCache
+from .command_stats import CommandStats, DeviceMetrics
+from .const import (
+    CONF_ANNOUNCE_QUEUE_POLICY,
+    CONF_SLOW_COMMAND_WARNING_MS,
+    DEFAULT_ANNOUNCE_QUEUE_POLICY,
+    DEFAULT_SLOW_COMMAND_WARNING_MS,
+)
+from .http_session import client_session_kwargs, get_http_pool
+from .loop_monitor import monitored
+from .queue_cache import QueueCache
+from .single_flight import SingleFlight
+
 _LOGGER = logging.getLogger(__name__)
 _PYWIIM_MISC_LOGGER_NAME = "pywiim.api.misc"
 _LED_READ_FALLBACK_MESSAGE = "LED indicator read not available for device (no API or read failed); assuming on"
@@ -74,6 +88,13 @@ def _compact_wiim_error(err: Exception) -> str:
     return str(err)
 
 
+def wiim_error_class(err: Exception) -> str:
+    """Return a short, bounded error label for metrics (like ``_compact_wiim_error``)."""
+    if _is_expected_unreachable_error(err):
+        return "unreachable"
+    return type(err).__name__
+
+
 class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """WiiM coordinator - minimal glue between pywiim and Home Assistant."""
 
@@ -99,17 +120,19 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.entry = entry
         self._capabilities = capabilities or {}
 
-        # Get HA's shared aiohttp session (for connection pooling)
-        session = async_get_clientsession(hass)
-
-        # Create pywiim client with HA's session
+        # Create pywiim client on the integration's connection pool (keep-alive
+        # tuned for polling, shared SSL context so connections are reused,
+        # per-model adaptive rate limit)
+        pool = get_http_pool(hass)
+        self._rate_limits = pool.rate_limits
+        self._rate_limits.configure(host, capabilities)
         # Only pass port/protocol if we have a cached endpoint (optimized pattern)
         # Otherwise, let pywiim probe automatically (simplest pattern)
         client_kwargs = {
             "host": host,
             "timeout": timeout,
-            "session": session,
             "capabilities": capabilities,
+            **client_session_kwargs(pool),
         }
         if port is not None and protocol is not None:
             # We have a cached endpoint - use it for faster startup
@@ -139,6 +162,31 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._polling_strategy = PollingStrategy(self._capabilities) if self._capabilities else PollingStrategy({})
         self._refresh_in_progress = False
 
+        # Serializes play_notification so concurrent automations do not cut each other off
+        options = getattr(entry, "options", None) or {}
+        self.announcement_queue = AnnouncementQueue(
+            host, options.get(CONF_ANNOUNCE_QUEUE_POLICY, DEFAULT_ANNOUNCE_QUEUE_POLICY)
+        )
+        # Media browser tree (presets, media sources) and browse latency
+        self.browse_cache = BrowseCache()
+        # UPnP queue pages for wiim.get_queue and the Queue browse folder
+        self.queue_cache = QueueCache()
+        # Last successful poll (monotonic time, duration); system health reuses fresh polls
+        self.last_poll_at: float | None = None
+        self.last_poll_ms: float | None = None
+        # When pywiim last replaced its device info (monotonic); update entities prefer
+        # it over an older shared firmware check
+        self.device_info_at: float | None = None
+        self._seen_device_info: object | None = None
+        # Poll / command counters for the Prometheus endpoint
+        self.metrics = DeviceMetrics()
+        # Per-operation command latency for device diagnostics
+        self.command_stats = CommandStats(
+            host, options.get(CONF_SLOW_COMMAND_WARNING_MS, DEFAULT_SLOW_COMMAND_WARNING_MS)
+        )
+        # Identical concurrent reads (device info, subwoofer status) share one request
+        self.single_flight = SingleFlight()
+
     def update_capabilities(self, capabilities: dict[str, Any]) -> None:
         """Apply a refreshed capabilities mapping (e.g. after firmware change).
 
@@ -153,6 +201,7 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             client_caps.clear()
             client_caps.update(merged)
         self._polling_strategy = PollingStrategy(self._capabilities) if self._capabilities else PollingStrategy({})
+        self._rate_limits.configure(self.player.host, self._capabilities)
 
     def _player_finder(self, host_or_uuid: str) -> Player | None:
         """Find a Player object across all coordinators by host IP or UUID.
@@ -192,6 +241,7 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         return players
 
     @callback
+    @monitored()
     def _on_player_state_changed(self) -> None:
         """Callback when pywiim Player detects state changes.
 
@@ -215,6 +265,7 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update coordinator data - polls device following pywiim's PollingStrategy."""
+        started = time.monotonic()
         try:
             # Call player.refresh() to poll device and update cached state
             # PollingStrategy determines WHEN to poll (adaptive intervals)
@@ -223,6 +274,12 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 await self.player.refresh()
             finally:
                 self._refresh_in_progress = False
+            self.last_poll_at = time.monotonic()
+            self.last_poll_ms = (self.last_poll_at - started) * 1000
+            if (device_info := self.player.device_info) is not self._seen_device_info:
+                self._seen_device_info = device_info
+                self.device_info_at = self.last_poll_at
+            self.metrics.record_poll(self.last_poll_ms / 1000)
 
             # Update polling interval using pywiim's PollingStrategy
             role = self.player.role
@@ -247,6 +304,7 @@ class WiiMCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return result
 
         except WiiMError as err:
+            self.metrics.record_poll(time.monotonic() - started, wiim_error_class(err))
             if _is_expected_unreachable_error(err):
                 _LOGGER.debug("Update failed for %s: %s", self.player.host, _compact_wiim_error(err))
                 # Powered-off / unreachable devices must go unavailable so automations
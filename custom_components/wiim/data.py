@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 
 from .const import DOMAIN
 
@@ -17,6 +18,7 @@ _LOGGER = logging.getLogger(__name__)
 
 __all__ = [
     "get_coordinator_from_entry",
+    "get_coordinator_from_entity_id",
     "get_all_coordinators",
 ]
 
@@ -40,3 +42,36 @@ def get_all_coordinators(hass: HomeAssistant) -> list[WiiMCoordinator]:
         if entry.entry_id in hass.data.get(DOMAIN, {}):
             coordinators.append(get_coordinator_from_entry(hass, entry))
     return coordinators
+
+
+def get_coordinator_from_entity_id(hass: HomeAssistant, entity_id: str) -> WiiMCoordinator | None:
+    """Resolve a WiiM entity_id to its coordinator via the entity registry.
+
+    Looks up by config_entry_id rather than unique_id because entity unique_ids
+    (player UUID) do not always match config entry unique_ids (IP for manual adds).
+    Returns None (and logs why) when the entity does not belong to a loaded entry.
+    """
+    entity_entry = er.async_get(hass).async_get(entity_id)
+    if not entity_entry:
+        _LOGGER.warning("Entity %s not found in entity registry", entity_id)
+        return None
+
+    if not entity_entry.config_entry_id:
+        _LOGGER.warning("Entity %s has no config_entry_id", entity_id)
+        return None
+
+    config_entry = hass.config_entries.async_get_entry(entity_entry.config_entry_id)
+    if not config_entry:
+        _LOGGER.warning("Config entry not found for entity %s", entity_id)
+        return None
+
+    try:
+        coordinator = get_coordinator_from_entry(hass, config_entry)
+    except RuntimeError:
+        _LOGGER.warning("Coordinator not available for entity %s", entity_id)
+        return None
+
+    if not coordinator.player:
+        _LOGGER.warning("Coordinator player not available for entity %s", entity_id)
+        return None
+    return coordinator
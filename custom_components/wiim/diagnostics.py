@@ -11,8 +11,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
+from .announce_cache import get_announcement_cache
 from .capability_flags import client_has_capability, get_client_capability
 from .data import get_all_coordinators, get_coordinator_from_entry
+from .http_session import get_existing_http_pool
+from .loop_monitor import LOOP_MONITOR
 from .subwoofer_helpers import subwoofer_status_for_diagnostics
 
 _LOGGER = logging.getLogger(__name__)
@@ -100,6 +103,21 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
                 ),
                 "last_update_success": coordinator.last_update_success,
             },
+            "announcement_queue": coordinator.announcement_queue.as_dict(),
+            "media_browser": coordinator.browse_cache.as_dict(),
+            "announcement_cache": cache.as_dict() if (cache := get_announcement_cache(hass)) else None,
+            "loop_monitor": LOOP_MONITOR.as_dict(),
+            "http_pool": (
+                pool.as_dict(
+                    {
+                        coord.player.name or coord.player.host: coord.player.host
+                        for coord in all_coordinators
+                        if getattr(coord, "player", None)
+                    }
+                )
+                if (pool := get_existing_http_pool(hass))
+                else None
+            ),
             "entry_data": async_redact_data(entry.data, TO_REDACT),
             "entry_options": async_redact_data(entry.options, TO_REDACT),
         }
@@ -347,6 +365,8 @@ async def async_get_device_diagnostics(hass: HomeAssistant, entry: ConfigEntry,
             "firmware_update": firmware_update,
             "connection_info": connection_info,
             "coordinator_info": coordinator_info,
+            "command_latency": coordinator.command_stats.as_dict(),
+            "shared_reads": coordinator.single_flight.as_dict(),
             "raw_device_info": raw_device_info,
         }
 
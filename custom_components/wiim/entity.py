@@ -1,21 +1,49 @@
 """Base entity class for WiiM integration - minimal HA glue only."""
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, nullcontext
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from pywiim.exceptions import WiiMConnectionError, WiiMError, WiiMTimeoutError
 
 from .const import DOMAIN
-from .coordinator import WiiMCoordinator
+from .coordinator import WiiMCoordinator, wiim_error_class
+from .loop_monitor import monitored
 from .version import get_pywiim_version_label
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def timed_command(coordinator: WiiMCoordinator, operation: str):
+    """Record the duration and outcome of one device call in the device metrics and latency table."""
+    started = time.monotonic()
+    outcome = "ok"
+    try:
+        yield
+    except WiiMError as err:
+        outcome = wiim_error_class(err)
+        raise
+    except asyncio.CancelledError:
+        # Unload or an outer timeout; the command did not complete, so it is not "ok"
+        outcome = "cancelled"
+        raise
+    except Exception as err:
+        outcome = type(err).__name__
+        raise
+    finally:
+        elapsed = time.monotonic() - started
+        coordinator.metrics.record_command(elapsed, outcome)
+        player = coordinator.player
+        coordinator.command_stats.record(operation, elapsed * 1000, outcome, player.model, player.firmware)
+
+
 class WiimEntity(CoordinatorEntity):
     """Base class for all WiiM entities - minimal glue to coordinator."""
 
@@ -29,6 +57,12 @@ class WiimEntity(CoordinatorEntity):
         """Access pywiim Player directly."""
         return self.coordinator.player
 
+    @callback
+    @monitored()
+    def _handle_coordinator_update(self) -> None:
+        """Write state on coordinator updates (timed when the loop monitor is on)."""
+        super()._handle_coordinator_update()
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device info from player."""
@@ -67,14 +101,18 @@ class WiimEntity(CoordinatorEntity):
         return self.coordinator.last_update_success
 
     @asynccontextmanager
-    async def wiim_command(self, operation: str):
+    async def wiim_command(self, operation: str, *, timed: bool = True):
         """Context manager for consistent WiiM command error handling.
 
         Classifies errors into transient (connection/timeout) vs persistent
-        failures for better log hygiene.
+        failures for better log hygiene, and records duration and outcome in
+        the device metrics and the per-operation latency table. Pass
+        ``timed=False`` when the block does more than the device call (e.g.
+        waiting in the announcement queue) and the call is timed on its own.
         """
         try:
-            yield
+            async with timed_command(self.coordinator, operation) if timed else nullcontext():
+                yield
         except WiiMError as err:
             # Classification of errors is now minimal - pywiim is expected to
             # provide correct exception types.
@@ -0,0 +1,199 @@
+"""Shared firmware update availability checks for WiiM speakers.
+
+Whether an update is available comes from device info (``VersionUpdate`` /
+``NewVer`` in ``getStatusEx``). pywiim only fetches device info on a full
+refresh, so without help every speaker would need its own periodic full
+device-info poll to notice a new release.
+
+Speakers of the same model running the same firmware get the same answer, so
+the check is done once per ``(model, firmware)``: on a slow schedule one
+reachable speaker of each pair is asked, and the result is applied to every
+matching firmware update entity. The schedule starts with the first config
+entry and its first check runs in the background once Home Assistant has
+started; speakers set up later get a check for their pair if it has no result.
+A speaker whose own device info was fetched after the shared check keeps using
+its own answer.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
+
+from .const import DATA_FIRMWARE_UPDATE, DOMAIN
+from .data import get_all_coordinators
+from .single_flight import async_shared_read
+
+if TYPE_CHECKING:
+    from .coordinator import WiiMCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key holding the FirmwareCheckCache instance.
+DATA_FIRMWARE_CHECK = "firmware_check"
+
+CHECK_INTERVAL = timedelta(hours=6)
+
+_NO_VERSION = {"", "0", "-"}
+
+
+@dataclass
+class FirmwareCheckResult:
+    """Update availability for one model / firmware pair."""
+
+    update_available: bool
+    latest_version: str | None
+    checked_at: float  # monotonic time of the check
+    checked_host: str
+
+
+class FirmwareCheckCache:
+    """Update availability per ``(model, firmware)``, refreshed by one check per pair."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty cache."""
+        self.hass = hass
+        self.results: dict[tuple[str, str], FirmwareCheckResult] = {}
+        self.checks = 0
+        self.failures = 0
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    def get(self, model: str | None, firmware: str | None) -> FirmwareCheckResult | None:
+        """Return the cached result for a model / firmware pair, if any."""
+        if not model or not firmware:
+            return None
+        return self.results.get((model, firmware))
+
+    def _group_speakers(self) -> dict[tuple[str, str], list[WiiMCoordinator]]:
+        """Group reachable speakers with an idle update entity by model and firmware."""
+        groups: dict[tuple[str, str], list[WiiMCoordinator]] = {}
+        for coordinator in get_all_coordinators(self.hass):
+            entity = self.hass.data[DOMAIN][coordinator.entry.entry_id].get(DATA_FIRMWARE_UPDATE)
+            if entity is None or entity.in_progress or not coordinator.last_update_success:
+                continue
+            model = coordinator.player.model
+            firmware = entity.installed_version
+            if model and firmware:
+                groups.setdefault((model, firmware), []).append(coordinator)
+        return groups
+
+    async def async_refresh(self, _now: datetime | None = None) -> None:
+        """Check each model / firmware pair on one speaker and notify all matching speakers."""
+        for key, coordinators in self._group_speakers().items():
+            await self._async_refresh_pair(key, coordinators)
+
+    async def _async_refresh_pair(self, key: tuple[str, str], coordinators: list[WiiMCoordinator]) -> None:
+        """Check one model / firmware pair and notify its speakers when it was answered."""
+        try:
+            checked = await self._async_check(key, coordinators)
+        except Exception as err:  # noqa: BLE001 - one model must not stop the others
+            _LOGGER.warning("Firmware check for %s %s failed: %s", key[0], key[1], err)
+            return
+        if checked:
+            for coordinator in coordinators:
+                coordinator.async_update_listeners()
+
+    async def _async_check(self, key: tuple[str, str], coordinators: list[WiiMCoordinator]) -> bool:
+        """Ask speakers of one pair in turn until one answers; return True on success."""
+        for coordinator in coordinators:
+            player = coordinator.player
+            self.checks += 1
+            try:
+                info = await async_shared_read(coordinator, "get_device_info")
+            except Exception as err:  # noqa: BLE001 - aiohttp / OS / timeout errors also mean "ask the next one"
+                self.failures += 1
+                _LOGGER.debug("Firmware check on %s failed: %s", player.host, err)
+                continue
+            latest = str(info.latest_version or "").strip()
+            result = FirmwareCheckResult(
+                update_available=str(info.version_update or "").strip() == "1",
+                latest_version=None if latest in _NO_VERSION else latest,
+                checked_at=time.monotonic(),
+                checked_host=player.host,
+            )
+            # The speaker may have updated since its last poll; file the answer
+            # under the firmware it reports now.
+            firmware = str(info.firmware or "").strip() or key[1]
+            self.results[(key[0], firmware)] = result
+            _LOGGER.debug(
+                "Firmware check for %s %s via %s: update_available=%s latest=%s (%d speaker(s))",
+                key[0],
+                firmware,
+                player.host,
+                result.update_available,
+                result.latest_version,
+                len(coordinators),
+            )
+            return firmware == key[1]
+        return False
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule a first check once Home Assistant has started, then the slow periodic refresh."""
+        if self._unsubs:
+            return
+        self._unsubs = [
+            async_at_started(self.hass, self._async_start_refresh),
+            async_track_time_interval(
+                self.hass,
+                self.async_refresh,
+                CHECK_INTERVAL,
+                name="wiim firmware check",
+                cancel_on_shutdown=True,
+            ),
+        ]
+
+    @callback
+    def async_speaker_added(self, coordinator: WiiMCoordinator) -> None:
+        """Start the schedule with the first speaker, or check a later one's pair if it has no result.
+
+        Called once the entry's platforms are set up, so the speaker's update
+        entity is registered. A speaker that sets up after startup (a new entry,
+        or a ``ConfigEntryNotReady`` retry) would otherwise wait for the next
+        periodic check.
+        """
+        if not self._unsubs:
+            self.async_start()
+            return
+        if not self.hass.is_running:
+            # The check scheduled for startup covers it.
+            return
+        entity = self.hass.data[DOMAIN].get(coordinator.entry.entry_id, {}).get(DATA_FIRMWARE_UPDATE)
+        if entity is None or self.get(coordinator.player.model, entity.installed_version) is not None:
+            return
+        key = (coordinator.player.model, entity.installed_version)
+        if (coordinators := self._group_speakers().get(key)) is None:
+            return
+        self.hass.async_create_background_task(self._async_refresh_pair(key, coordinators), "wiim firmware check")
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scheduled refreshes (the last config entry was unloaded)."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def _async_start_refresh(self, _hass: HomeAssistant) -> None:
+        """Run a check in the background so startup does not wait for the speakers."""
+        self.hass.async_create_background_task(self.async_refresh(), "wiim firmware check")
+
+
+async def async_setup_firmware_check(hass: HomeAssistant) -> None:
+    """Create the shared firmware check cache.
+
+    Its schedule starts with the first config entry (``async_speaker_added``),
+    so a first check never runs before any speaker exists.
+    """
+    hass.data.setdefault(DOMAIN, {})[DATA_FIRMWARE_CHECK] = FirmwareCheckCache(hass)
+
+
+def get_firmware_check(hass: HomeAssistant) -> FirmwareCheckCache | None:
+    """Return the firmware check cache if it was set up."""
+    return hass.data.get(DOMAIN, {}).get(DATA_FIRMWARE_CHECK)
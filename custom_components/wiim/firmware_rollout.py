@@ -0,0 +1,314 @@
+"""Fleet firmware rollout for WiiM speakers (``wiim.firmware_rollout`` action).
+
+Installs firmware on many speakers without taking the whole house offline:
+
+1. a canary speaker is updated on its own first;
+2. the remaining speakers are updated in waves of at most ``max_parallel``;
+3. before every wave the canary must answer a refresh again, and the rollout
+   halts on the first failed install (remaining speakers are skipped).
+
+Each install goes through the speaker's firmware update entity, so the usual
+OTA tracking applies (coordinator polling paused, full refresh until the
+firmware string changes). The rollout runs as a background task; the action
+returns the plan immediately. Aggregate progress is shown on the single
+``WiiM Firmware Rollout`` sensor (one per integration, see ``sensor.py``), and
+``wiim.firmware_rollout_status`` returns per-speaker progress as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .const import DATA_FIRMWARE_UPDATE, DATA_ROLLOUT, DATA_ROLLOUT_SENSOR, DOMAIN
+from .data import get_all_coordinators, get_coordinator_from_entity_id
+
+if TYPE_CHECKING:
+    from .coordinator import WiiMCoordinator
+    from .update import WiiMFirmwareUpdateEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_CANARY = "canary"
+
+DEFAULT_MAX_PARALLEL = 2
+
+# How often aggregate progress is republished while installs are running.
+_PROGRESS_INTERVAL_SECONDS = 10
+
+STATUS_PENDING = "pending"
+STATUS_INSTALLING = "installing"
+STATUS_UPDATED = "updated"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+_STATUSES = (STATUS_PENDING, STATUS_INSTALLING, STATUS_UPDATED, STATUS_FAILED, STATUS_SKIPPED)
+
+
+@dataclass
+class RolloutDevice:
+    """One speaker in a rollout."""
+
+    name: str
+    coordinator: WiiMCoordinator
+    entity: WiiMFirmwareUpdateEntity
+    status: str = STATUS_PENDING
+    from_version: str | None = None
+    to_version: str | None = None
+    error: str | None = None
+
+    @property
+    def progress(self) -> float:
+        """Return install progress 0..1 (flash percentage while installing)."""
+        if self.status == STATUS_INSTALLING:
+            return (self.entity.update_percentage or 0) / 100
+        return 0.0 if self.status == STATUS_PENDING else 1.0
+
+
+class FirmwareRollout:
+    """Install firmware on a canary, then on the remaining speakers in waves."""
+
+    def __init__(self, hass: HomeAssistant, canary: RolloutDevice, waves: list[list[RolloutDevice]]) -> None:
+        """Initialize the rollout plan."""
+        self.hass = hass
+        self.canary = canary
+        self.waves = waves
+        self.phase = "pending"
+        self.wave = 0
+
+    @property
+    def devices(self) -> list[RolloutDevice]:
+        """Return every speaker in install order."""
+        return [self.canary, *(device for wave in self.waves for device in wave)]
+
+    @property
+    def running(self) -> bool:
+        """Return True until the rollout reaches a final phase."""
+        return self.phase not in ("completed", "halted", "cancelled")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the plan, aggregate progress and per-speaker status."""
+        devices = self.devices
+        return {
+            "phase": self.phase,
+            "progress": round(100 * sum(device.progress for device in devices) / len(devices)),
+            "canary": self.canary.name,
+            "wave": self.wave,
+            "waves": len(self.waves),
+            "counts": {status: sum(1 for device in devices if device.status == status) for status in _STATUSES},
+            # Keyed by config entry: speaker names are not unique
+            "devices": {
+                device.coordinator.entry.entry_id: {
+                    "name": device.name,
+                    "status": device.status,
+                    "from_version": device.from_version,
+                    "to_version": device.to_version,
+                    "error": device.error,
+                }
+                for device in devices
+            },
+        }
+
+    def sensor_attributes(self) -> dict[str, Any]:
+        """Return the phase, current wave and per-status speaker counts for the rollout sensor."""
+        summary = self.as_dict()
+        counts = summary["counts"]
+        return {
+            "phase": summary["phase"],
+            "canary": summary["canary"],
+            "wave": summary["wave"],
+            "waves": summary["waves"],
+            "done": counts[STATUS_UPDATED],
+            "failed": counts[STATUS_FAILED],
+            "remaining": counts[STATUS_PENDING] + counts[STATUS_INSTALLING],
+            "skipped": counts[STATUS_SKIPPED],
+            "installing_devices": [device.name for device in self.devices if device.status == STATUS_INSTALLING],
+            "failed_devices": [device.name for device in self.devices if device.status == STATUS_FAILED],
+        }
+
+    async def async_run(self) -> None:
+        """Run the canary, then every wave, halting on the first failure."""
+        try:
+            self.phase = "canary"
+            await self._async_install_wave([self.canary])
+            for index, wave in enumerate(self.waves, start=1):
+                if any(device.status == STATUS_FAILED for device in self.devices):
+                    self._halt("install failed")
+                    return
+                if not await self._async_canary_online():
+                    self._halt(f"canary {self.canary.name} did not reconnect")
+                    return
+                self.phase = f"wave {index}/{len(self.waves)}"
+                self.wave = index
+                await self._async_install_wave(wave)
+            if any(device.status == STATUS_FAILED for device in self.devices):
+                self._halt("install failed")
+                return
+            self.phase = "completed"
+            _LOGGER.info("Firmware rollout completed on %d speaker(s)", len(self.devices))
+        except asyncio.CancelledError:
+            self.phase = "cancelled"
+            for device in self.devices:
+                if device.status == STATUS_INSTALLING:
+                    # The install task was cancelled with the rollout; the speaker may be mid-flash.
+                    device.status = STATUS_FAILED
+                    device.error = "rollout cancelled before the install finished"
+            self._skip_pending()
+            raise
+        finally:
+            self.publish()
+
+    def publish(self) -> None:
+        """Write aggregate progress to the rollout sensor, if it is loaded."""
+        sensor = self.hass.data[DOMAIN].get(DATA_ROLLOUT_SENSOR)
+        if sensor is not None and sensor.hass is not None:
+            sensor.async_write_ha_state()
+
+    def _halt(self, reason: str) -> None:
+        self.phase = "halted"
+        self._skip_pending()
+        _LOGGER.warning("Firmware rollout halted: %s", reason)
+
+    def _skip_pending(self) -> None:
+        for device in self.devices:
+            if device.status == STATUS_PENDING:
+                device.status = STATUS_SKIPPED
+
+    async def _async_canary_online(self) -> bool:
+        """Return True when the canary answers a fresh coordinator refresh."""
+        coordinator = self.canary.coordinator
+        await coordinator.async_refresh()
+        return coordinator.last_update_success
+
+    async def _async_install_wave(self, wave: list[RolloutDevice]) -> None:
+        """Install on every speaker of a wave concurrently, publishing progress."""
+        for device in wave:
+            device.status = STATUS_INSTALLING
+            device.from_version = device.entity.installed_version
+        self.publish()
+        pending = {asyncio.create_task(self._async_install(device)) for device in wave}
+        try:
+            while pending:
+                _done, pending = await asyncio.wait(pending, timeout=_PROGRESS_INTERVAL_SECONDS)
+                self.publish()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _async_install(self, device: RolloutDevice) -> None:
+        """Install on one speaker and wait for its firmware string to change."""
+        try:
+            changed = await device.entity.async_install_and_wait()
+        except Exception as err:  # noqa: BLE001
+            # Any failure (HA, pywiim, network, entity) fails the speaker so the rollout halts.
+            device.status = STATUS_FAILED
+            device.error = str(err) or type(err).__name__
+        else:
+            device.to_version = device.entity.installed_version
+            if changed:
+                device.status = STATUS_UPDATED
+            else:
+                device.status = STATUS_FAILED
+                device.error = "firmware did not change before the install timeout"
+        if device.status == STATUS_FAILED:
+            _LOGGER.warning("Firmware rollout: install failed on %s: %s", device.name, device.error)
+
+
+def _update_entity(hass: HomeAssistant, coordinator: WiiMCoordinator) -> WiiMFirmwareUpdateEntity | None:
+    return hass.data[DOMAIN].get(coordinator.entry.entry_id, {}).get(DATA_FIRMWARE_UPDATE)
+
+
+def _device_name(coordinator: WiiMCoordinator) -> str:
+    return coordinator.player.name or coordinator.entry.title or coordinator.player.host
+
+
+def _resolve(hass: HomeAssistant, entity_ids: set[str]) -> list[WiiMCoordinator]:
+    """Return targeted coordinators (all speakers if none), one per config entry."""
+    if entity_ids:
+        coordinators = [
+            coordinator
+            for entity_id in sorted(entity_ids)
+            if (coordinator := get_coordinator_from_entity_id(hass, entity_id)) is not None
+        ]
+    else:
+        coordinators = get_all_coordinators(hass)
+    return list({coordinator.entry.entry_id: coordinator for coordinator in coordinators}.values())
+
+
+def plan_rollout(
+    hass: HomeAssistant,
+    coordinators: list[WiiMCoordinator],
+    max_parallel: int,
+    canary: WiiMCoordinator | None = None,
+) -> tuple[FirmwareRollout, list[str]]:
+    """Split speakers with a ready update into canary and waves.
+
+    Returns the rollout and the names of targeted speakers without an update.
+    """
+    eligible: list[RolloutDevice] = []
+    not_eligible: list[str] = []
+    for coordinator in sorted(coordinators, key=_device_name):
+        entity = _update_entity(hass, coordinator)
+        if entity is None or not entity.update_available or entity.in_progress:
+            not_eligible.append(_device_name(coordinator))
+        else:
+            eligible.append(RolloutDevice(_device_name(coordinator), coordinator, entity))
+    if not eligible:
+        raise HomeAssistantError("No targeted WiiM speaker has a firmware update ready to install")
+
+    first = eligible[0]
+    if canary is not None:
+        first = next((device for device in eligible if device.coordinator is canary), None)
+        if first is None:
+            raise HomeAssistantError(f"Canary {_device_name(canary)} has no firmware update ready to install")
+    rest = [device for device in eligible if device is not first]
+    waves = [rest[index : index + max_parallel] for index in range(0, len(rest), max_parallel)]
+    return FirmwareRollout(hass, first, waves), not_eligible
+
+
+async def async_handle_firmware_rollout(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.firmware_rollout``: start a background rollout and return its plan."""
+    hass = call.hass
+    current: FirmwareRollout | None = hass.data[DOMAIN].get(DATA_ROLLOUT)
+    if current is not None and current.running:
+        raise HomeAssistantError(f"A firmware rollout is already running ({current.phase})")
+
+    canary = None
+    if canary_entity_id := call.data.get(ATTR_CANARY):
+        canary = get_coordinator_from_entity_id(hass, canary_entity_id)
+        if canary is None:
+            raise HomeAssistantError(f"Canary {canary_entity_id} is not a loaded WiiM speaker")
+
+    coordinators = _resolve(hass, await async_extract_entity_ids(hass, call))
+    if canary is not None and all(coordinator is not canary for coordinator in coordinators):
+        coordinators.append(canary)
+    rollout, not_eligible = plan_rollout(hass, coordinators, call.data[ATTR_MAX_PARALLEL], canary)
+
+    hass.data[DOMAIN][DATA_ROLLOUT] = rollout
+    rollout.publish()
+    hass.async_create_background_task(rollout.async_run(), "wiim firmware rollout")
+    _LOGGER.info(
+        "Firmware rollout started: canary %s, then %d wave(s) of up to %d",
+        rollout.canary.name,
+        len(rollout.waves),
+        call.data[ATTR_MAX_PARALLEL],
+    )
+    return {
+        "canary": rollout.canary.name,
+        "waves": [[device.name for device in wave] for wave in rollout.waves],
+        "not_eligible": not_eligible,
+    }
+
+
+async def async_handle_firmware_rollout_status(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.firmware_rollout_status``: return progress of the running (or last) rollout."""
+    rollout: FirmwareRollout | None = call.hass.data[DOMAIN].get(DATA_ROLLOUT)
+    if rollout is None:
+        return {"phase": "none"}
+    return rollout.as_dict()
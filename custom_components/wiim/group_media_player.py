@@ -27,6 +27,7 @@ from pywiim.exceptions import WiiMConnectionError, WiiMError, WiiMTimeoutError
 from .const import CONF_VOLUME_STEP, DEFAULT_VOLUME_STEP, DOMAIN
 from .coordinator import WiiMCoordinator
 from .entity import WiimEntity
+from .loop_monitor import monitored
 from .media_player_base import WiiMMediaPlayerMixin
 
 _LOGGER = logging.getLogger(__name__)
@@ -615,6 +616,7 @@ class WiiMGroupMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         return await super().async_get_media_image()
 
     @callback
+    @monitored()
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self._update_position_from_coordinator()
@@ -624,6 +626,7 @@ class WiiMGroupMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
     # No mutation in property getters - following LinkPlay pattern
 
     @property
+    @monitored()
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes for the virtual group coordinator.
 
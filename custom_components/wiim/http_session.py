@@ -0,0 +1,225 @@
+"""Integration-owned HTTP connection pool for speaker requests.
+
+Speakers used to share Home Assistant's default ``aiohttp`` session. Its
+connector keeps idle connections for 15 seconds, exactly the idle poll
+interval of legacy LinkPlay firmware, so those speakers reconnected on most
+polls. Every pywiim client also built its own permissive SSL context, and
+aiohttp pools connections per SSL context object, so the config flow, the
+capability probe in setup and the coordinator never reused each other's
+connections and every HTTPS client paid its own TLS handshake.
+
+``WiimHttpPool`` owns one session whose connector
+
+* keeps idle connections for ``KEEPALIVE_SECONDS`` (longer than any routine
+  poll interval),
+* opens at most ``CONNECTIONS_PER_HOST`` connections to one speaker, since
+  the embedded web servers handle only a few sockets,
+* caps all connections at Home Assistant's own limit (``MAX_CONNECTIONS``),
+  so a large fleet refreshing at once, as at startup, is not queued behind
+  the cap until requests time out, and
+* is used with a single shared WiiM SSL context, so every client of a host
+  lands on the same pooled connection.
+
+pywiim asks for ``Connection: close`` on every request, which would defeat
+any pool; requests made through this session drop that header. aiohttp
+retries an idempotent request once when a pooled connection turns out to
+have been closed by the speaker, so idle timeouts on the device side cost a
+reconnect, not an error.
+
+A trace config counts new versus reused connections per host for
+diagnostics, and makes every request wait for its host's adaptive rate
+limit (see ``rate_limit``).
+"""
+
+from __future__ import annotations
+
+import logging
+import ssl
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from pywiim.api.ssl import create_wiim_ssl_context
+
+from .const import DOMAIN
+from .rate_limit import HostRateLimits, is_overload_error
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key holding the WiimHttpPool instance.
+DATA_HTTP_POOL = "http_pool"
+
+# Longer than the slowest routine poll (15 s idle on legacy firmware).
+KEEPALIVE_SECONDS = 30.0
+CONNECTIONS_PER_HOST = 4
+# Same overall cap as Home Assistant's shared session; the per-host limit protects speakers.
+MAX_CONNECTIONS = 4096
+
+
+@dataclass
+class HostConnectionStats:
+    """New and reused connections for one host."""
+
+    created: int = 0
+    reused: int = 0
+
+    @property
+    def reuse_rate(self) -> float | None:
+        """Return the share of requests served by a pooled connection."""
+        total = self.created + self.reused
+        return round(self.reused / total, 3) if total else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {"created": self.created, "reused": self.reused, "reuse_rate": self.reuse_rate}
+
+
+class _KeepAliveRequest(aiohttp.ClientRequest):
+    """Client request that leaves connection persistence to the connector."""
+
+    def update_headers(self, headers: Any) -> None:
+        """Set headers, dropping a per-request ``Connection: close``."""
+        super().update_headers(headers)
+        if self.headers.get(hdrs.CONNECTION, "").lower() == "close":
+            del self.headers[hdrs.CONNECTION]
+
+
+class WiimHttpPool:
+    """One aiohttp session, connector and SSL context for all speakers."""
+
+    def __init__(self) -> None:
+        """Create the session; must be called from the event loop."""
+        self.stats: dict[str, HostConnectionStats] = {}
+        self.ssl_context: ssl.SSLContext | None = None
+        self.rate_limits = HostRateLimits()
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_create_end.append(self._on_connection_created)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=MAX_CONNECTIONS,
+                limit_per_host=CONNECTIONS_PER_HOST,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+            ),
+            trace_configs=[trace],
+            request_class=_KeepAliveRequest,
+        )
+
+    async def async_ssl_context(self) -> ssl.SSLContext:
+        """Return the shared WiiM SSL context, building it on first use."""
+        if self.ssl_context is None:
+            self.ssl_context = await create_wiim_ssl_context()
+        return self.ssl_context
+
+    def host_stats(self, host: str) -> HostConnectionStats:
+        """Return the counters for host (zeroed if it was never contacted)."""
+        return self.stats.get(host, HostConnectionStats())
+
+    def as_dict(self, devices: Mapping[str, str]) -> dict[str, Any]:
+        """Return pool settings and counters for diagnostics.
+
+        ``devices`` maps a display name to its host; hosts are redacted in
+        diagnostics, so per-device counters are keyed by name.
+        """
+        total = HostConnectionStats(
+            created=sum(stats.created for stats in self.stats.values()),
+            reused=sum(stats.reused for stats in self.stats.values()),
+        )
+        return {
+            "keepalive_seconds": KEEPALIVE_SECONDS,
+            "connections_per_host": CONNECTIONS_PER_HOST,
+            "total": total.as_dict(),
+            "devices": {name: self._device_dict(host) for name, host in sorted(devices.items())},
+        }
+
+    def _device_dict(self, host: str) -> dict[str, Any]:
+        return {**self.host_stats(host).as_dict(), "rate_limit": self.rate_limits.host_dict(host)}
+
+    async def async_close(self) -> None:
+        """Close the session and every pooled connection."""
+        await self.session.close()
+
+    # aiohttp passes one trace context per request to every signal, so the
+    # host recorded at request start identifies the connection events.
+    # Request start is awaited before connecting, which is where the rate
+    # limit applies.
+    async def _on_request_start(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, params: aiohttp.TraceRequestStartParams
+    ) -> None:
+        ctx.wiim_host = params.url.host
+        ctx.wiim_bucket = None
+        if ctx.wiim_host:
+            ctx.wiim_bucket = self.rate_limits.bucket(ctx.wiim_host, params.url.port)
+            await ctx.wiim_bucket.async_acquire()
+
+    async def _on_request_end(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: aiohttp.TraceRequestEndParams
+    ) -> None:
+        if ctx.wiim_bucket is not None:
+            ctx.wiim_bucket.record_success()
+
+    async def _on_request_exception(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams
+    ) -> None:
+        if ctx.wiim_bucket is not None and is_overload_error(params.exception):
+            ctx.wiim_bucket.record_overload()
+
+    async def _on_connection_created(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: aiohttp.TraceConnectionCreateEndParams
+    ) -> None:
+        self._host_stats_for(ctx).created += 1
+
+    async def _on_connection_reused(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: aiohttp.TraceConnectionReuseconnParams
+    ) -> None:
+        self._host_stats_for(ctx).reused += 1
+
+    def _host_stats_for(self, ctx: SimpleNamespace) -> HostConnectionStats:
+        host = getattr(ctx, "wiim_host", None) or "unknown"
+        if (stats := self.stats.get(host)) is None:
+            stats = self.stats[host] = HostConnectionStats()
+        return stats
+
+
+@callback
+def get_http_pool(hass: HomeAssistant) -> WiimHttpPool:
+    """Return the domain HTTP pool, creating it on first use.
+
+    Config flows can start before the integration is set up, so the pool is
+    created lazily rather than in ``async_setup``. It is closed when Home
+    Assistant closes, like the shared sessions of ``aiohttp_client``.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (pool := domain_data.get(DATA_HTTP_POOL)) is None:
+        pool = domain_data[DATA_HTTP_POOL] = WiimHttpPool()
+
+        async def _async_close(_event: Event) -> None:
+            await pool.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return pool
+
+
+def get_existing_http_pool(hass: HomeAssistant) -> WiimHttpPool | None:
+    """Return the HTTP pool if something already created it."""
+    return hass.data.get(DOMAIN, {}).get(DATA_HTTP_POOL)
+
+
+async def async_get_http_pool(hass: HomeAssistant) -> WiimHttpPool:
+    """Return the domain HTTP pool with its shared SSL context built."""
+    pool = get_http_pool(hass)
+    await pool.async_ssl_context()
+    return pool
+
+
+def client_session_kwargs(pool: WiimHttpPool) -> dict[str, Any]:
+    """Return the WiiMClient keyword arguments that route a client through the pool."""
+    return {"session": pool.session, "ssl_context": pool.ssl_context}
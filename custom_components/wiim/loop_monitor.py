@@ -0,0 +1,201 @@
+"""Opt-in detector for slow synchronous work on the event loop.
+
+Callbacks such as ``_on_player_state_changed`` and ``_handle_coordinator_update``
+and the properties read on every state write run on Home Assistant's event
+loop; anything slow there delays every other integration. Home Assistant only
+reports that generically, without pointing at a WiiM call site.
+
+Functions decorated with :func:`monitored` are timed while the monitor is
+enabled (``wiim.loop_monitor`` action). Per call site it keeps call count,
+total and maximum time, plus a bounded buffer of the slowest individual calls
+with a short stack summary of who called them.
+
+The wrapper stays installed while the monitor is off, because callbacks are
+registered as bound methods long before anyone enables it. Every call then
+pays one extra Python frame and a flag check, about 0.1 µs. In
+``tests/benchmarks/test_media_player_hot_paths.py`` that is lost in the noise
+for ``source`` and ``extra_state_attributes`` (30-350 µs per call), and only
+shows on ``group_members`` of a solo speaker (about 0.1 µs -> 0.2 µs).
+
+Only the outermost monitored call is timed. Monitored calls made inside it
+(``WiiMMediaPlayer._handle_coordinator_update`` calling the base class
+handler, or the property reads of the state write it triggers) are part of
+the outer call's time and are not counted again.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import time
+import traceback
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, TypeVar
+
+from homeassistant.core import ServiceCall, ServiceResponse
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+ATTR_ENABLED = "enabled"
+ATTR_RESET = "reset"
+
+# Slowest individual calls kept with stack summaries.
+_MAX_SLOW_CALLS = 20
+# Caller frames kept per slow call.
+_STACK_DEPTH = 6
+# A call this slow is logged as it happens (Home Assistant itself warns at 100 ms).
+_WARN_MS = 50.0
+
+
+@dataclass
+class _SiteStats:
+    """Aggregate timings of one call site."""
+
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+@dataclass(order=True)
+class _SlowCall:
+    """One slow call and where it came from."""
+
+    duration_ms: float
+    site: str = field(compare=False)
+    owner: str | None = field(compare=False)
+    at: str = field(compare=False)
+    stack: list[str] = field(compare=False)
+
+
+class LoopMonitor:
+    """Collect synchronous execution times of monitored call sites."""
+
+    def __init__(self, max_slow_calls: int = _MAX_SLOW_CALLS) -> None:
+        """Initialize a disabled monitor."""
+        self.enabled = False
+        self.max_slow_calls = max_slow_calls
+        self.enabled_at: str | None = None
+        self._sites: dict[str, _SiteStats] = {}
+        self._slowest: list[_SlowCall] = []
+        # Monitored calls currently on the stack; only depth 0 is timed.
+        self._depth = 0
+
+    def enable(self) -> None:
+        """Start timing monitored call sites."""
+        if not self.enabled:
+            self.enabled = True
+            self.enabled_at = dt_util.utcnow().isoformat()
+            _LOGGER.info("WiiM loop monitor enabled")
+
+    def disable(self) -> None:
+        """Stop timing; collected data is kept until ``reset``."""
+        if self.enabled:
+            self.enabled = False
+            _LOGGER.info("WiiM loop monitor disabled")
+
+    def reset(self) -> None:
+        """Drop all collected timings."""
+        self._sites.clear()
+        self._slowest.clear()
+        if self.enabled:
+            self.enabled_at = dt_util.utcnow().isoformat()
+
+    def record(self, site: str, duration_ms: float, owner: Any = None) -> None:
+        """Record one call of ``site`` that took ``duration_ms``."""
+        stats = self._sites.get(site)
+        if stats is None:
+            stats = self._sites[site] = _SiteStats()
+        stats.calls += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+
+        owner_name = getattr(owner, "entity_id", None) or getattr(owner, "name", None)
+        if duration_ms >= _WARN_MS:
+            _LOGGER.warning("%s (%s) blocked the event loop for %.1f ms", site, owner_name, duration_ms)
+        if len(self._slowest) >= self.max_slow_calls and duration_ms <= self._slowest[-1].duration_ms:
+            return
+        self._slowest.append(
+            _SlowCall(
+                duration_ms=round(duration_ms, 3),
+                site=site,
+                owner=str(owner_name) if owner_name is not None else None,
+                at=dt_util.utcnow().isoformat(),
+                stack=_caller_summary(),
+            )
+        )
+        self._slowest.sort(reverse=True)
+        del self._slowest[self.max_slow_calls :]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return collected timings for diagnostics and the debug action."""
+        sites = sorted(self._sites.items(), key=lambda item: item[1].max_ms, reverse=True)
+        return {
+            "enabled": self.enabled,
+            "enabled_at": self.enabled_at,
+            "sites": {
+                site: {
+                    "calls": stats.calls,
+                    "total_ms": round(stats.total_ms, 3),
+                    "avg_ms": round(stats.total_ms / stats.calls, 3),
+                    "max_ms": round(stats.max_ms, 3),
+                }
+                for site, stats in sites
+            },
+            "slowest_calls": [asdict(call) for call in self._slowest],
+        }
+
+
+def _caller_summary() -> list[str]:
+    """Return ``file:line function`` for the frames that led to the monitored call."""
+    # Drop this helper, LoopMonitor.record and the decorator wrapper.
+    frames = traceback.extract_stack(limit=_STACK_DEPTH + 3)[:-3]
+    return [f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}" for frame in reversed(frames)]
+
+
+LOOP_MONITOR = LoopMonitor()
+
+
+def monitored(site: str | None = None) -> Callable[[_F], _F]:
+    """Time calls of the decorated function while ``LOOP_MONITOR`` is enabled.
+
+    ``site`` defaults to the function's qualified name. The first positional
+    argument (``self``) names the owner of slow calls. Calls nested inside
+    another monitored call are not timed.
+    """
+
+    def decorator(func: _F) -> _F:
+        name = site or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not LOOP_MONITOR.enabled or LOOP_MONITOR._depth:
+                return func(*args, **kwargs)
+            LOOP_MONITOR._depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration_ms = (time.perf_counter() - started) * 1000
+                LOOP_MONITOR._depth -= 1
+                LOOP_MONITOR.record(name, duration_ms, args[0] if args else None)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+async def async_handle_loop_monitor(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.loop_monitor``: optionally reset/toggle the monitor, return its report."""
+    if call.data.get(ATTR_RESET):
+        LOOP_MONITOR.reset()
+    enabled = call.data.get(ATTR_ENABLED)
+    if enabled is True:
+        LOOP_MONITOR.enable()
+    elif enabled is False:
+        LOOP_MONITOR.disable()
+    return LOOP_MONITOR.as_dict()
@@ -24,24 +24,29 @@ from homeassistant.components.media_player import (
     MediaType,
     RepeatMode,
 )
-from homeassistant.components.media_player.browse_media import async_process_play_media_url
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.helpers.importlib import async_import_module
 
-from .const import CONF_VOLUME_STEP, DEFAULT_VOLUME_STEP, DOMAIN
+from .announce_queue import ANNOUNCEMENT_CANCELLED
+from .browse_cache import MEDIA_SOURCE_TTL_SECONDS
+from .const import CONF_RECORDER_FRIENDLY_ATTRIBUTES, CONF_VOLUME_STEP, DEFAULT_VOLUME_STEP, DOMAIN
 from .coordinator import WiiMCoordinator
 from .entity import WiimEntity
 from .group_media_player import WiiMGroupMediaPlayer
+from .loop_monitor import monitored
 from .media_player_base import WiiMMediaPlayerMixin
 from .services import register_media_player_services
 
 _LOGGER = logging.getLogger(__name__)
 
+# Queue items per page in the media browser ("Queue" directory).
+QUEUE_BROWSE_PAGE_SIZE = 50
+
 
 def media_source_filter(item: BrowseMedia) -> bool:
     """Filter media items to include audio and DLNA sources."""
@@ -64,10 +69,15 @@ async def async_setup_entry(
     from homeassistant.helpers import entity_platform
 
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    # Changing options reloads the entry, so the class is picked once per setup
+    if config_entry.options.get(CONF_RECORDER_FRIENDLY_ATTRIBUTES, False):
+        player_class: type[WiiMMediaPlayer] = WiiMRecorderFriendlyMediaPlayer
+    else:
+        player_class = WiiMMediaPlayer
     # Create both individual media player and virtual group coordinator
     async_add_entities(
         [
-            WiiMMediaPlayer(coordinator, config_entry),
+            player_class(coordinator, config_entry),
             WiiMGroupMediaPlayer(coordinator, config_entry),
         ]
     )
@@ -117,7 +127,10 @@ async def async_setup_entry(
     )
     platform.async_register_entity_service(
         "get_queue",
-        schema=None,
+        {
+            vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+            vol.Optional("limit", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+        },
         func="async_get_queue",
         supports_response=SupportsResponse.ONLY,
     )
@@ -360,6 +373,7 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
     # ===== SOURCE =====
 
     @property
+    @monitored()
     def source(self) -> str | None:
         """Return current source (properly capitalized for display).
 
@@ -490,6 +504,7 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         return self._get_metadata_player().media_album
 
     @callback
+    @monitored()
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self._update_position_from_coordinator()
@@ -507,52 +522,10 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         # Resolve media_source IDs once at the start (Sonos-style) so both announce and
         # normal play receive a single, absolute, playable URL. Never pass media_source://
         # or raw media_content_id to the device.
-        if media_id.startswith("media-source://"):
-            original_media_id = media_id
-            _LOGGER.debug("[%s] Resolving media source: %s", self.name, original_media_id)
-            try:
-                sourced_media = await media_source.async_resolve_media(self.hass, media_id, self.entity_id)
-                _LOGGER.debug(
-                    "[%s] Resolved media source - url: %s, mime_type: %s",
-                    self.name,
-                    sourced_media.url,
-                    sourced_media.mime_type,
-                )
-                media_id = sourced_media.url
-                if not media_id:
-                    _LOGGER.error(
-                        "[%s] Media source resolved to empty URL. Original media_id: %s, mime_type: %s",
-                        self.name,
-                        original_media_id,
-                        sourced_media.mime_type,
-                    )
-                    raise HomeAssistantError(
-                        f"Media source resolved to empty URL for: {original_media_id}. "
-                        "This may indicate the media source is not playable or not properly configured."
-                    )
-                try:
-                    media_id = async_process_play_media_url(self.hass, media_id)
-                except NoURLAvailableError as err:
-                    _LOGGER.warning(
-                        "[%s] Cannot build playable URL for TTS/announcement: %s",
-                        self.name,
-                        err,
-                    )
-                    raise HomeAssistantError(
-                        "Home Assistant could not build a URL the WiiM can use for this media. "
-                        "Set Internal URL in Settings → System → Network to this instance's LAN address (e.g. http://192.168.1.x:8123)."
-                    ) from err
-            except HomeAssistantError:
-                raise
-            except Exception as err:
-                _LOGGER.error(
-                    "[%s] Failed to resolve media source %s: %s",
-                    self.name,
-                    original_media_id,
-                    err,
-                    exc_info=True,
-                )
-                raise HomeAssistantError(f"Failed to resolve media source: {err}") from err
+        original_media_id = media_id
+        # The announce helpers are loaded with the first play_media, not with the platform
+        announce_helpers = await async_import_module(self.hass, f"{__package__}.announce")
+        media_id = await announce_helpers.async_resolve_media_url(self.hass, media_id, self.entity_id)
 
         # Announce path:
         # pywiim's play_notification() handles source-aware routing:
@@ -568,13 +541,23 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         #   - Must be reachable from the device's network (not localhost)
         announce = kwargs.get(ATTR_MEDIA_ANNOUNCE, False)
         if announce:
-            kwargs.get(ATTR_MEDIA_EXTRA, {})  # e.g. volume; use when library supports it
-            # Add cache-busting query param to avoid WiiM returning cached audio
-            bust = f"?_={int(time.time() * 1000)}" if "?" not in media_id else f"&_={int(time.time() * 1000)}"
-            play_url = media_id + bust
+            extra = kwargs.get(ATTR_MEDIA_EXTRA) or {}  # e.g. volume; use when library supports it
+            # Cached TTS/chimes get a stable content-addressed URL; anything else is
+            # cache-busted to avoid WiiM returning stale cached audio.
+            play_url, _cached = await announce_helpers.async_announcement_url(self.hass, original_media_id, media_id)
             _LOGGER.debug("[%s] Playing announcement: %s", self.name, play_url)
-            async with self.wiim_command("play notification"):
-                result = await self.coordinator.player.play_notification(play_url)
+            # The device call is timed inside the queue, so the queue wait is not counted as latency
+            async with self.wiim_command("play notification", timed=False):
+                # Queued so overlapping announcements on this speaker do not cut each other off
+                result = await announce_helpers.async_queue_announcement(
+                    self.hass, self.coordinator, original_media_id, play_url, int(extra.get("priority", 0))
+                )
+            if result is None:
+                _LOGGER.debug("[%s] Announcement dropped by the announcement queue policy", self.name)
+                return
+            if result is ANNOUNCEMENT_CANCELLED:
+                _LOGGER.debug("[%s] Announcement cancelled by unloading the entry", self.name)
+                return
             if result.likely_interrupted:
                 _LOGGER.debug(
                     "[%s] Announcement played via %s (source was '%s'). Original media was likely interrupted%s.",
@@ -592,6 +575,11 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
                 )
             return
 
+        # Queue items picked in the media browser: jump to that queue position
+        if media_type == "queue_item":
+            await self.async_play_queue(int(media_id))
+            return
+
         # Handle preset numbers (presets don't support queue management)
         if media_type == "preset":
             preset_num = int(media_id)
@@ -605,10 +593,12 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
             if enqueue == MediaPlayerEnqueue.ADD:
                 async with self.wiim_command("add media to queue"):
                     await self.coordinator.player.add_to_queue(media_id)
+                self.coordinator.queue_cache.invalidate()
                 return
             if enqueue == MediaPlayerEnqueue.NEXT:
                 async with self.wiim_command("insert media into queue"):
                     await self.coordinator.player.insert_next(media_id)
+                self.coordinator.queue_cache.invalidate()
                 return
             if enqueue == MediaPlayerEnqueue.PLAY:
                 async with self.wiim_command("play media immediately"):
@@ -626,6 +616,7 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         media_content_id: str | None = None,
     ) -> BrowseMedia:
         """Implement media browsing."""
+        started = time.perf_counter()
         try:
             return await self._async_browse_media_impl(
                 media_content_type, media_content_id
@@ -635,6 +626,8 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         except Exception as err:
             _LOGGER.exception("[%s] Media browsing failed", self.player.name or "WiiM")
             raise BrowseError(str(err)) from err
+        finally:
+            self.coordinator.browse_cache.record_browse((time.perf_counter() - started) * 1000)
 
     async def _async_browse_media_impl(
         self,
@@ -642,18 +635,32 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         media_content_id: str | None,
     ) -> BrowseMedia:
         """Implementation of media browsing (called by async_browse_media)."""
+        browse_cache = self.coordinator.browse_cache
+
         # Handle media source browsing
         if media_content_id and media_source.is_media_source_id(media_content_id):
-            return await media_source.async_browse_media(
-                self.hass,
+            if (cached := browse_cache.get("media_source", media_content_id)) is not None:
+                return cached
+            return browse_cache.put(
+                "media_source",
                 media_content_id,
-                content_filter=media_source_filter,
+                await media_source.async_browse_media(
+                    self.hass,
+                    media_content_id,
+                    content_filter=media_source_filter,
+                ),
+                ttl=MEDIA_SOURCE_TTL_SECONDS,
             )
 
         # Root level - show Presets directory and media sources
         if media_content_id is None or media_content_id == "":
             # Only show root if we don't have a specific content type
             if not media_content_type or media_content_type == "":
+                device_name = self.player.name or self._config_entry.title or "WiiM Speaker"
+                root_signature = (device_name, bool(self._get_player().supports_queue_browse))
+                if (cached := browse_cache.get("", "", root_signature)) is not None:
+                    return cached
+
                 children: list[BrowseMedia] = [
                     BrowseMedia(
                         title="Presets",
@@ -679,28 +686,51 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
                     elif browse is not None:
                         children.append(browse)
 
+                if self._get_player().supports_queue_browse:
+                    children.append(
+                        BrowseMedia(
+                            title="Queue",
+                            media_class=MediaClass.DIRECTORY,
+                            media_content_id="0",
+                            media_content_type="queue",
+                            can_play=False,
+                            can_expand=True,
+                        )
+                    )
+
                 # If there's only one child, return it directly (skip root level)
                 if len(children) == 1 and children[0].can_expand:
-                    return await self.async_browse_media(
+                    return await self._async_browse_media_impl(
                         children[0].media_content_type,
                         children[0].media_content_id,
                     )
 
-                device_name = self.player.name or self._config_entry.title or "WiiM Speaker"
-                return BrowseMedia(
-                    title=device_name,
-                    media_class=MediaClass.DIRECTORY,
-                    media_content_id="",
-                    media_content_type="",
-                    can_play=False,
-                    can_expand=True,
-                    children=children,
+                # Root embeds the media-source overview, so it shares that TTL
+                return browse_cache.put(
+                    "",
+                    "",
+                    BrowseMedia(
+                        title=device_name,
+                        media_class=MediaClass.DIRECTORY,
+                        media_content_id="",
+                        media_content_type="",
+                        can_play=False,
+                        can_expand=True,
+                        children=children,
+                    ),
+                    root_signature,
+                    MEDIA_SOURCE_TTL_SECONDS,
                 )
 
         # Presets directory - show individual presets (1-20)
         if media_content_type == "presets":
-            preset_children: list[BrowseMedia] = []
             player = self._get_player()
+            # Rebuilt only when pywiim reports different preset data
+            preset_signature = repr(player.presets) if player.supports_presets and player.presets_full_data else None
+            if (cached := browse_cache.get("presets", "", preset_signature)) is not None:
+                return cached
+
+            preset_children: list[BrowseMedia] = []
 
             # Get preset names from pywiim
             # Only available if presets_full_data is True (WiiM devices, not LinkPlay)
@@ -730,16 +760,25 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
                         can_expand=False,
                     )
                 )
-            return BrowseMedia(
-                title="Presets",
-                media_class=MediaClass.DIRECTORY,
-                media_content_id="",
-                media_content_type="presets",
-                can_play=False,
-                can_expand=True,
-                children=preset_children,
+            return browse_cache.put(
+                "presets",
+                "",
+                BrowseMedia(
+                    title="Presets",
+                    media_class=MediaClass.DIRECTORY,
+                    media_content_id="",
+                    media_content_type="presets",
+                    can_play=False,
+                    can_expand=True,
+                    children=preset_children,
+                ),
+                preset_signature,
             )
 
+        # Queue directory - one page of queue items, plus a link to the next page
+        if media_content_type == "queue":
+            return await self._async_browse_queue(int(media_content_id or 0))
+
         # Unknown content type
         device_name = self.player.name or self._config_entry.title or "WiiM Speaker"
         return BrowseMedia(
@@ -752,16 +791,62 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
             children=[],
         )
 
+    async def _async_browse_queue(self, offset: int) -> BrowseMedia:
+        """Return one page of the device queue for the media browser."""
+        if not self._get_player().supports_queue_browse:
+            raise BrowseError("Queue browsing not available on this device")
+        # One extra item tells us whether a next page exists without a count query
+        items = await self.coordinator.queue_cache.async_get_page(
+            self.coordinator.player, offset, QUEUE_BROWSE_PAGE_SIZE + 1
+        )
+        children = [
+            BrowseMedia(
+                title=" - ".join(part for part in (item.get("title"), item.get("artist")) if part)
+                or item.get("media_content_id")
+                or f"Track {item.get('position', offset + index) + 1}",
+                media_class=MediaClass.TRACK,
+                media_content_id=str(item.get("position", offset + index)),
+                media_content_type="queue_item",
+                can_play=True,
+                can_expand=False,
+                thumbnail=item.get("image_url"),
+            )
+            for index, item in enumerate(items[:QUEUE_BROWSE_PAGE_SIZE])
+        ]
+        if len(items) > QUEUE_BROWSE_PAGE_SIZE:
+            children.append(
+                BrowseMedia(
+                    title="More…",
+                    media_class=MediaClass.DIRECTORY,
+                    media_content_id=str(offset + QUEUE_BROWSE_PAGE_SIZE),
+                    media_content_type="queue",
+                    can_play=False,
+                    can_expand=True,
+                )
+            )
+        return BrowseMedia(
+            title="Queue" if offset == 0 else f"Queue from {offset + 1}",
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=str(offset),
+            media_content_type="queue",
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=MediaClass.TRACK,
+        )
+
     async def async_clear_playlist(self) -> None:
         """Clear the current playlist and UPnP queue (if available)."""
         async with self.wiim_command("clear playlist"):
             await self.coordinator.player.clear_playlist()
             if self._get_player().supports_upnp:
                 await self.coordinator.player.clear_queue()
+        self.coordinator.queue_cache.invalidate()
 
     # ===== GROUPING =====
 
     @property
+    @monitored()
     def group_members(self) -> list[str] | None:
         """Return list of entity IDs in the current group - using pywiim Player.group.
 
@@ -880,9 +965,8 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         < v4.2.8020, Router mode for newer devices). Audio Pro Gen1 devices
         (A26, C10, C5a) are now supported.
         """
-        from .data import get_coordinator_from_entry
+        from .data import get_coordinator_from_entity_id
 
-        entity_registry = er.async_get(self.hass)
         master_player = self.coordinator.player
         if master_player is None:
             raise HomeAssistantError("Master player is not ready")
@@ -922,30 +1006,9 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
                 # Skip self (already the master)
                 continue
 
-            entity_entry = entity_registry.async_get(entity_id)
-            if not entity_entry:
-                _LOGGER.warning("Entity %s not found when joining group", entity_id)
-                continue
-
             # Look up coordinator by config_entry_id (most reliable method)
-            # This avoids issues where entity unique_id (UUID) doesn't match config entry unique_id (IP)
-            if not entity_entry.config_entry_id:
-                _LOGGER.warning("Entity %s has no config_entry_id", entity_id)
-                continue
-
-            config_entry = self.hass.config_entries.async_get_entry(entity_entry.config_entry_id)
-            if not config_entry:
-                _LOGGER.warning("Config entry not found for entity %s", entity_id)
-                continue
-
-            try:
-                coordinator = get_coordinator_from_entry(self.hass, config_entry)
-            except RuntimeError:
-                _LOGGER.warning("Coordinator not available for entity %s", entity_id)
-                continue
-
-            if not coordinator.player:
-                _LOGGER.warning("Coordinator player not available for entity %s", entity_id)
+            coordinator = get_coordinator_from_entity_id(self.hass, entity_id)
+            if coordinator is None:
                 continue
 
             # pywiim handles joining groups, including slaves leaving their current group
@@ -1099,9 +1162,15 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         async with self.wiim_command("remove from queue"):
             await self.coordinator.player.remove_from_queue(queue_position)
             # State updates automatically via callback - no manual refresh needed
+        self.coordinator.queue_cache.invalidate()
+
+    async def async_get_queue(self, offset: int = 0, limit: int = 0) -> ServiceResponse:
+        """Handle get_queue service call - returns one page of queue contents.
 
-    async def async_get_queue(self) -> ServiceResponse:
-        """Handle get_queue service call - returns queue contents."""
+        ``limit`` 0 returns everything from ``offset`` on. Pages are cached until
+        the device reports a different queue_count/queue_position or the queue is
+        modified through this entity.
+        """
         # get_queue requires supports_queue_browse (ContentDirectory or PlayQueue BrowseQueue)
         if not self._get_player().supports_queue_browse:
             raise HomeAssistantError(
@@ -1109,9 +1178,14 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
                 "UPnP ContentDirectory or PlayQueue BrowseQueue."
             )
         async with self.wiim_command("get queue"):
-            queue = await self.coordinator.player.get_queue()
+            queue = await self.coordinator.queue_cache.async_get_page(self.coordinator.player, offset, limit)
             # Return queue items in Home Assistant service response format
-            return {"queue": queue}
+            return {
+                "queue": queue,
+                "offset": offset,
+                "limit": limit,
+                "total": self._get_player().queue_count,
+            }
 
     # ===== SLEEP TIMER & ALARMS =====
 
@@ -1301,23 +1375,36 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
             ) from exc
 
     @property
+    @monitored()
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
+        """Return extra state attributes.
+
+        With the recorder-friendly option, static device details (model, firmware,
+        IP, MAC, capabilities) are left out; they remain in device diagnostics and
+        the device registry. The playback flags are always present; only
+        ``WiiMRecorderFriendlyMediaPlayer`` keeps them out of the recorder.
+        """
         player = self.player
-        mac_address = None
-        if player.device_info and hasattr(player.device_info, "mac"):
-            mac_address = player.device_info.mac
-
-        attrs = {
-            "device_model": player.model or "WiiM Speaker",
-            "firmware_version": player.firmware,
-            "ip_address": player.host,
-            "mac_address": mac_address,
-            "group_role": player.role,
-            "is_group_coordinator": self._get_player().is_master if self._get_player() else False,
-            "music_assistant_compatible": True,
-            "integration_purpose": "individual_speaker_control",
-        }
+        static_attributes = not self._config_entry.options.get(CONF_RECORDER_FRIENDLY_ATTRIBUTES, False)
+
+        attrs: dict[str, Any] = {}
+        if static_attributes:
+            mac_address = None
+            if player.device_info and hasattr(player.device_info, "mac"):
+                mac_address = player.device_info.mac
+            attrs.update(
+                {
+                    "device_model": player.model or "WiiM Speaker",
+                    "firmware_version": player.firmware,
+                    "ip_address": player.host,
+                    "mac_address": mac_address,
+                }
+            )
+        attrs["group_role"] = player.role
+        attrs["is_group_coordinator"] = self._get_player().is_master if self._get_player() else False
+        if static_attributes:
+            attrs["music_assistant_compatible"] = True
+            attrs["integration_purpose"] = "individual_speaker_control"
 
         # Add shuffle state (always include for visibility)
         shuffle_state = self.shuffle
@@ -1351,23 +1438,22 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
             attrs["group_state"] = "solo"
 
         # Add capability flags for debugging/automations
-        attrs["capabilities"] = {
-            "eq": player.supports_eq,
-            "presets": player.supports_presets,
-            "audio_output": player.supports_audio_output,
-            "queue_browse": player.supports_queue_browse,
-            "queue_add": player.supports_queue_add,
-            "alarms": player.supports_alarms,
-            "sleep_timer": player.supports_sleep_timer,
-            "upnp": player.supports_upnp,
-            "subwoofer": player.supports_subwoofer,
-            "trigger_out": bool(player.client.capabilities.get("supports_trigger_out"))
-            if player.client
-            else None,
-            "display_config": bool(player.client.capabilities.get("supports_display_config"))
-            if player.client
-            else None,
-        }
+        if static_attributes:
+            attrs["capabilities"] = {
+                "eq": player.supports_eq,
+                "presets": player.supports_presets,
+                "audio_output": player.supports_audio_output,
+                "queue_browse": player.supports_queue_browse,
+                "queue_add": player.supports_queue_add,
+                "alarms": player.supports_alarms,
+                "sleep_timer": player.supports_sleep_timer,
+                "upnp": player.supports_upnp,
+                "subwoofer": player.supports_subwoofer,
+                "trigger_out": bool(player.client.capabilities.get("supports_trigger_out")) if player.client else None,
+                "display_config": bool(player.client.capabilities.get("supports_display_config"))
+                if player.client
+                else None,
+            }
 
         # Add playback state attributes for debugging/automations
         # These match what _derive_state_from_player uses internally
@@ -1382,3 +1468,15 @@ class WiiMMediaPlayer(WiiMMediaPlayerMixin, WiimEntity, MediaPlayerEntity):
         attrs["queue_count"] = player.queue_count
 
         return attrs
+
+
+class WiiMRecorderFriendlyMediaPlayer(WiiMMediaPlayer):
+    """WiiM media player for speakers with the recorder-friendly option on.
+
+    Playback flags and queue position change with every track or pause; keeping
+    them out of the recorder stops each change from storing a new attributes row.
+    """
+
+    _unrecorded_attributes = frozenset(
+        {"is_playing", "is_paused", "is_buffering", "play_state", "queue_position", "queue_count"}
+    )
@@ -0,0 +1,188 @@
+"""Prometheus metrics for WiiM integration internals.
+
+Each coordinator owns a ``DeviceMetrics`` (``command_stats.py``) that records
+poll and command outcomes and latency; this module only renders them. It is
+imported when the first speaker with the option is set up.
+
+``WiimMetricsView`` renders the metrics of every speaker with the
+*Prometheus Metrics* option, plus its browse and queue cache counters and the
+announcement cache counters, in the Prometheus text exposition format at
+``/api/wiim/metrics``. The view is registered when the first such speaker is
+set up and answers 404 while no loaded speaker has the option. It requires a
+Home Assistant access token (Prometheus ``authorization: credentials:
+<long-lived token>``).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .announce_cache import get_announcement_cache
+from .command_stats import DeviceMetrics, Histogram
+from .const import CONF_PROMETHEUS_METRICS, DOMAIN
+from .data import get_all_coordinators
+
+if TYPE_CHECKING:
+    from .coordinator import WiiMCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key set once the metrics view is registered.
+DATA_METRICS_VIEW = "metrics_view"
+
+_VIEW_PATH = "/api/wiim/metrics"
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, Any]) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Writer:
+    """Collect samples per metric family so each family is emitted once."""
+
+    def __init__(self) -> None:
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def sample(self, name: str, kind: str, help_text: str, labels: dict[str, Any], value: float) -> None:
+        family = self._families.setdefault(name, (kind, help_text, []))
+        family[2].append(f"{name}{_labels(labels)} {value:g}")
+
+    def histogram(self, name: str, help_text: str, labels: dict[str, Any], histogram: Histogram) -> None:
+        family = self._families.setdefault(name, ("histogram", help_text, []))
+        cumulative = 0
+        for bound, count in zip((*histogram.bounds, "+Inf"), histogram.counts, strict=True):
+            cumulative += count
+            family[2].append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+        family[2].append(f"{name}_sum{_labels(labels)} {histogram.sum:g}")
+        family[2].append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+    def lines(self) -> Iterable[str]:
+        for name, (kind, help_text, samples) in self._families.items():
+            yield f"# HELP {name} {help_text}"
+            yield f"# TYPE {name} {kind}"
+            yield from samples
+
+
+def _exported_coordinators(hass: HomeAssistant) -> list[WiiMCoordinator]:
+    """Return the loaded speakers whose entry enables the metrics endpoint."""
+    return [
+        coordinator
+        for coordinator in get_all_coordinators(hass)
+        if coordinator.entry is not None and coordinator.entry.options.get(CONF_PROMETHEUS_METRICS, False)
+    ]
+
+
+def render_metrics(hass: HomeAssistant) -> str:
+    """Return the metrics of every exported speaker in the Prometheus text format."""
+    writer = _Writer()
+    for coordinator in _exported_coordinators(hass):
+        player = coordinator.player
+        device = {"device": player.host, "name": player.name or player.host}
+        metrics: DeviceMetrics = coordinator.metrics
+
+        for outcome, count in metrics.polls.items():
+            writer.sample(
+                "wiim_polls_total", "counter", "Coordinator polls by outcome.", {**device, "outcome": outcome}, count
+            )
+        writer.histogram("wiim_poll_duration_seconds", "Coordinator poll duration.", device, metrics.poll_seconds)
+        writer.sample(
+            "wiim_consecutive_poll_failures",
+            "gauge",
+            "Failed polls since the last successful one.",
+            device,
+            metrics.consecutive_poll_failures,
+        )
+        writer.sample(
+            "wiim_poll_interval_seconds",
+            "gauge",
+            "Current adaptive polling interval.",
+            device,
+            coordinator.update_interval.total_seconds() if coordinator.update_interval else 0,
+        )
+        writer.sample(
+            "wiim_available", "gauge", "1 if the last poll succeeded.", device, int(coordinator.last_update_success)
+        )
+
+        for outcome, count in metrics.commands.items():
+            writer.sample(
+                "wiim_commands_total", "counter", "Entity commands by outcome.", {**device, "outcome": outcome}, count
+            )
+        writer.histogram("wiim_command_duration_seconds", "Entity command duration.", device, metrics.command_seconds)
+
+        for method, stats in coordinator.single_flight.stats.items():
+            labels = {**device, "method": method}
+            writer.sample("wiim_reads_total", "counter", "Device reads sent, by method.", labels, stats.requests)
+            writer.sample(
+                "wiim_shared_reads_total",
+                "counter",
+                "Reads that joined an identical read already in flight.",
+                labels,
+                stats.shared,
+            )
+
+        browse = coordinator.browse_cache
+        writer.sample("wiim_browse_cache_hits_total", "counter", "Media browser cache hits.", device, browse.hits)
+        writer.sample("wiim_browse_cache_misses_total", "counter", "Media browser cache misses.", device, browse.misses)
+        queue = coordinator.queue_cache
+        writer.sample("wiim_queue_cache_hits_total", "counter", "Queue page cache hits.", device, queue.hits)
+        writer.sample("wiim_queue_cache_misses_total", "counter", "Queue page cache misses.", device, queue.misses)
+        writer.sample(
+            "wiim_announcement_queue_depth",
+            "gauge",
+            "Announcements waiting to play.",
+            device,
+            coordinator.announcement_queue.depth,
+        )
+
+    if (cache := get_announcement_cache(hass)) is not None:
+        stats = cache.stats
+        for name, help_text, value in (
+            ("wiim_announcement_cache_hits_total", "Announcement cache hits.", stats.hits),
+            ("wiim_announcement_cache_misses_total", "Announcement cache misses.", stats.misses),
+            ("wiim_announcement_cache_evictions_total", "Announcement cache evictions.", stats.evictions),
+            ("wiim_announcement_cache_fetch_failures_total", "Announcement fetches that failed.", stats.fetch_failures),
+        ):
+            writer.sample(name, "counter", help_text, {}, value)
+        writer.sample(
+            "wiim_announcement_cache_bytes", "gauge", "Announcement cache size on disk.", {}, cache.total_bytes
+        )
+
+    return "\n".join(writer.lines()) + "\n"
+
+
+class WiimMetricsView(HomeAssistantView):
+    """Serve WiiM metrics to Prometheus (authenticated)."""
+
+    url = _VIEW_PATH
+    name = "api:wiim:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the current metrics (404 while no speaker enables the endpoint)."""
+        hass = request.app[KEY_HASS]
+        if not _exported_coordinators(hass):
+            return web.Response(status=404)
+        return web.Response(body=render_metrics(hass).encode(), headers={"Content-Type": _CONTENT_TYPE})
+
+
+async def async_setup_metrics(hass: HomeAssistant) -> None:
+    """Register the metrics view once (skipped when HTTP is not loaded)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_METRICS_VIEW):
+        return
+    if hass.http is None:
+        _LOGGER.debug("HTTP component not loaded; WiiM metrics endpoint disabled")
+        return
+    hass.http.register_view(WiimMetricsView())
+    domain_data[DATA_METRICS_VIEW] = True
@@ -16,6 +16,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .const import DOMAIN
 from .coordinator import WiiMCoordinator
 from .entity import WiimEntity
+from .single_flight import async_shared_read
 from .subwoofer_helpers import subwoofer_level_from_status
 
 _LOGGER = logging.getLogger(__name__)
@@ -88,7 +89,7 @@ class WiiMSubwooferLevelNumber(WiimEntity, NumberEntity):
         """Fetch current subwoofer level from device."""
         try:
             # Use async method for fresh data
-            status = await self.coordinator.player.get_subwoofer_status()
+            status = await async_shared_read(self.coordinator, "get_subwoofer_status")
             level = subwoofer_level_from_status(status)
             if level is not None:
                 self._value = level
@@ -0,0 +1,119 @@
+"""On-demand cProfile capture for the WiiM integration (``wiim.profile`` action).
+
+The profiler is only attached for the requested window; outside it there is no
+instrumentation at all. Everything that runs on the event loop thread is
+recorded (that is where the integration and pywiim run), then the report is
+narrowed to ``custom_components.wiim`` and ``pywiim`` frames.
+
+Two files are written to the config directory per run:
+
+- ``wiim_profile_<timestamp>.prof``: the full profile, for snakeviz / pstats;
+- ``wiim_profile_<timestamp>.txt``: WiiM / pywiim functions by cumulative time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILER = "profiler_running"
+
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+
+# Frames that belong to this integration or the library it wraps.
+_WIIM_FRAMES = re.compile(r"custom_components[/\\]wiim[/\\]|[/\\]pywiim[/\\]")
+
+
+def _is_wiim_frame(filename: str) -> bool:
+    return _WIIM_FRAMES.search(filename) is not None
+
+
+def summarize_profile(profile: cProfile.Profile, top: int) -> dict[str, Any]:
+    """Return the ``top`` WiiM / pywiim functions by cumulative time."""
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, lineno, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        if _is_wiim_frame(filename):
+            rows.append((cumtime, tottime, calls, f"{_short_path(filename)}:{lineno}({name})"))
+    rows.sort(reverse=True)
+    return {
+        "total_calls": stats.total_calls,
+        "total_seconds": round(stats.total_tt, 3),
+        "wiim_functions": len(rows),
+        "top_functions": [
+            {
+                "function": function,
+                "calls": calls,
+                "own_ms": round(tottime * 1000, 3),
+                "cumulative_ms": round(cumtime * 1000, 3),
+            }
+            for cumtime, tottime, calls, function in rows[:top]
+        ],
+    }
+
+
+def _short_path(filename: str) -> str:
+    """Trim a frame's path to the package-relative part."""
+    match = _WIIM_FRAMES.search(filename)
+    return filename[match.start() :].lstrip("/\\") if match else os.path.basename(filename)
+
+
+def _write_profile(profile: cProfile.Profile, base_path: str) -> None:
+    """Dump the full profile and a filtered text report (runs in the executor)."""
+    profile.dump_stats(f"{base_path}.prof")
+    report = io.StringIO()
+    stats = pstats.Stats(profile, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_WIIM_FRAMES.pattern)
+    with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+        file.write(report.getvalue())
+
+
+async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.profile``: profile the event loop for N seconds and report WiiM hot spots."""
+    hass: HomeAssistant = call.hass
+    duration: float = call.data[ATTR_DURATION]
+    top: int = call.data[ATTR_TOP]
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_PROFILER):
+        raise HomeAssistantError("A WiiM profile is already running")
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError as err:
+        # Python 3.12+ allows one profiler at a time (e.g. the Profiler integration).
+        raise HomeAssistantError(f"Cannot start profiler: {err}") from err
+
+    domain_data[DATA_PROFILER] = True
+    _LOGGER.info("Profiling WiiM integration for %s seconds", duration)
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profile.disable()
+        domain_data[DATA_PROFILER] = False
+
+    base_path = hass.config.path(f"wiim_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}")
+    await hass.async_add_executor_job(_write_profile, profile, base_path)
+    summary = await hass.async_add_executor_job(summarize_profile, profile, top)
+    _LOGGER.info("WiiM profile written to %s.prof", base_path)
+    return {
+        "duration_seconds": duration,
+        "profile_file": f"{base_path}.prof",
+        "report_file": f"{base_path}.txt",
+        **summary,
+    }
@@ -0,0 +1,76 @@
+"""Per-device cache of UPnP queue pages.
+
+``Player.get_queue`` browses the device's ContentDirectory (or vendor
+PlayQueue) over UPnP, which is slow for long playlists. Pages are cached by
+``(offset, limit)`` and dropped as soon as the queue could have changed:
+
+- ``queue_count`` or ``queue_position`` reported by the device differ from
+  when the page was fetched, or
+- the integration itself added, inserted, removed or cleared items
+  (``invalidate``).
+
+The PlayQueue backend ignores pagination and always returns the whole queue;
+that full list is cached once and later pages are sliced from it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pywiim import Player
+
+# Cache key for a response that holds the entire queue.
+_FULL_QUEUE = (0, 0)
+
+
+class QueueCache:
+    """Cache queue pages for one device."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._pages: dict[tuple[int, int], list[dict[str, Any]]] = {}
+        self._signature: tuple[Any, Any] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self) -> None:
+        """Drop all cached pages (call after modifying the queue)."""
+        self._pages.clear()
+        self._signature = None
+
+    async def async_get_page(self, player: Player, offset: int = 0, limit: int = 0) -> list[dict[str, Any]]:
+        """Return queue items ``offset`` .. ``offset + limit`` (``limit`` 0 = to the end)."""
+        signature = (player.queue_count, player.queue_position)
+        if signature != self._signature:
+            self._pages.clear()
+            self._signature = signature
+
+        if (offset, limit) in self._pages:
+            self.hits += 1
+            return self._pages[(offset, limit)]
+        if _FULL_QUEUE in self._pages:
+            self.hits += 1
+            return _slice(self._pages[_FULL_QUEUE], offset, limit)
+
+        self.misses += 1
+        items = await player.get_queue(starting_index=offset, requested_count=limit)
+        if _is_full_queue(items, offset, limit):
+            # Backend ignored pagination (PlayQueue); keep everything for later pages.
+            self._pages[_FULL_QUEUE] = items
+            return _slice(items, offset, limit)
+        self._pages[(offset, limit)] = items
+        return items
+
+
+def _is_full_queue(items: list[dict[str, Any]], offset: int, limit: int) -> bool:
+    """Return True when ``items`` is the whole queue rather than the requested page."""
+    if offset == 0 and limit == 0:
+        return True
+    if limit and len(items) > limit:
+        return True
+    return bool(offset and items and items[0].get("position") == 0)
+
+
+def _slice(items: list[dict[str, Any]], offset: int, limit: int) -> list[dict[str, Any]]:
+    """Return one page of a full queue listing."""
+    return items[offset : offset + limit] if limit else items[offset:]
@@ -0,0 +1,234 @@
+"""Per-speaker adaptive request rate limits.
+
+Some LinkPlay firmware (first-generation Audio Pro, other legacy devices)
+starts resetting or refusing connections when it gets many requests in a
+short window, which shows up as "device unreachable" and availability
+flapping. Every request through the integration's HTTP pool first takes a
+token from its host's bucket:
+
+* the bucket refills at ``rate`` tokens per second up to ``burst``; a
+  request that finds it empty waits, at most ``MAX_WAIT_SECONDS``. The
+  default profile (WiiM and current firmware) only starts limiting after the
+  first back-off and stops again once the rate has fully recovered, so
+  healthy speakers never wait;
+* a connection reset or refusal halves the rate (at most once per
+  ``DECREASE_COOLDOWN_SECONDS``, so one failed burst counts once), down to
+  the profile's minimum. Endpoints that never answered are left alone: a
+  port nobody listens on (UPnP on a speaker without it, a probe of the wrong
+  API port) refuses connections without being overloaded, and once it has
+  refused, its requests are not delayed either;
+* while requests succeed, the rate grows back by a tenth of the profile rate
+  every ``RECOVERY_INTERVAL_SECONDS``.
+
+Buckets are kept per endpoint (host and port; pywiim sticks to one endpoint
+per speaker once it has found it). Defaults depend on the model (see
+``PROFILES``) and are set per host; hosts without known capabilities, such as
+config flow probes, use the default profile.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_WAIT_SECONDS = 3.0
+DECREASE_COOLDOWN_SECONDS = 1.0
+RECOVERY_INTERVAL_SECONDS = 30.0
+_RECOVERY_STEP = 0.1
+_DECREASE_FACTOR = 0.5
+
+
+@dataclass(frozen=True)
+class RateLimitProfile:
+    """Request rate (per second), burst size and lowest adapted rate.
+
+    With ``limit_after_overload`` the rate only applies while backed off.
+    """
+
+    rate: float
+    burst: float
+    min_rate: float
+    limit_after_overload: bool = False
+
+
+PROFILE_DEFAULT = "default"
+PROFILE_LEGACY = "legacy"
+PROFILE_AUDIO_PRO_ORIGINAL = "audio_pro_original"
+
+PROFILES: dict[str, RateLimitProfile] = {
+    # WiiM and current LinkPlay firmware keep up; limit only once one struggles.
+    PROFILE_DEFAULT: RateLimitProfile(rate=20.0, burst=40.0, min_rate=1.0, limit_after_overload=True),
+    # Older firmware: a full refresh still fits in the burst.
+    PROFILE_LEGACY: RateLimitProfile(rate=4.0, burst=12.0, min_rate=0.5),
+    # First-generation Audio Pro speakers reset connections under bursts.
+    PROFILE_AUDIO_PRO_ORIGINAL: RateLimitProfile(rate=2.0, burst=6.0, min_rate=0.25),
+}
+
+
+def profile_for_capabilities(capabilities: Mapping[str, Any] | None) -> str:
+    """Return the profile name for a speaker's pywiim capabilities."""
+    if not capabilities:
+        return PROFILE_DEFAULT
+    if capabilities.get("vendor") == "audio_pro" and capabilities.get("audio_pro_generation") == "original":
+        return PROFILE_AUDIO_PRO_ORIGINAL
+    if capabilities.get("is_legacy_device"):
+        return PROFILE_LEGACY
+    return PROFILE_DEFAULT
+
+
+def is_overload_error(err: BaseException) -> bool:
+    """Return True for errors a struggling speaker produces (reset / refused)."""
+    if isinstance(err, (ConnectionResetError, ConnectionRefusedError, aiohttp.ServerDisconnectedError)):
+        return True
+    return isinstance(err, aiohttp.ClientOSError) and err.errno in (errno.ECONNRESET, errno.ECONNREFUSED)
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose rate backs off on overload errors and recovers slowly."""
+
+    def __init__(self, profile_name: str = PROFILE_DEFAULT) -> None:
+        """Initialize a full bucket for the profile."""
+        self.profile_name = profile_name
+        self.profile = PROFILES[profile_name]
+        self.rate = self.profile.rate
+        self.tokens = self.profile.burst
+        self.limited = not self.profile.limit_after_overload
+        self._updated_at = time.monotonic()
+        self._rate_changed_at = self._updated_at
+        self.requests = 0
+        self.answered = 0
+        self.delayed = 0
+        self.wait_seconds = 0.0
+        self.overload_errors = 0
+        self.backoffs = 0
+
+    def set_profile(self, profile_name: str) -> None:
+        """Switch to another profile (e.g. once capabilities are known)."""
+        if profile_name == self.profile_name:
+            return
+        backed_off = self.rate < self.profile.rate
+        self.profile_name = profile_name
+        self.profile = PROFILES[profile_name]
+        # Keep a backed-off rate (it recovers on its own); otherwise start at the new rate.
+        self.rate = min(self.rate, self.profile.rate) if backed_off else self.profile.rate
+        self.tokens = min(self.tokens, self.profile.burst)
+        self.limited = backed_off or not self.profile.limit_after_overload
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.profile.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def async_acquire(self) -> float:
+        """Take a token, waiting if the bucket is empty; return the seconds waited."""
+        self.requests += 1
+        if self.overload_errors and not self.answered:
+            # Nothing listens here; waiting would only delay the refusal.
+            return 0.0
+        if not self.limited:
+            return 0.0
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        wait = min(-self.tokens / self.rate, MAX_WAIT_SECONDS)
+        # Debt beyond the longest wait would only delay later requests further.
+        self.tokens = max(self.tokens, -self.rate * MAX_WAIT_SECONDS)
+        self.delayed += 1
+        self.wait_seconds += wait
+        await asyncio.sleep(wait)
+        return wait
+
+    def record_success(self) -> None:
+        """Grow the rate back towards the profile rate, one step per interval."""
+        self.answered += 1
+        if self.rate >= self.profile.rate:
+            return
+        now = time.monotonic()
+        if now - self._rate_changed_at >= RECOVERY_INTERVAL_SECONDS:
+            self.rate = min(self.profile.rate, self.rate + self.profile.rate * _RECOVERY_STEP)
+            self._rate_changed_at = now
+            if self.rate >= self.profile.rate and self.profile.limit_after_overload:
+                self.limited = False
+
+    def record_overload(self) -> None:
+        """Halve the rate after a reset or refused connection and stop bursting."""
+        self.overload_errors += 1
+        if not self.answered:
+            return
+        now = time.monotonic()
+        if now - self._rate_changed_at < DECREASE_COOLDOWN_SECONDS and self.rate < self.profile.rate:
+            return
+        if not self.limited:
+            # Start limiting from a full bucket at the profile rate.
+            self.limited = True
+            self.tokens = self.profile.burst
+            self._updated_at = now
+        self._refill(now)
+        self.rate = max(self.profile.min_rate, self.rate * _DECREASE_FACTOR)
+        self.tokens = min(self.tokens, 1.0)
+        self._rate_changed_at = now
+        self.backoffs += 1
+        _LOGGER.debug("Request rate lowered to %.2f/s after a connection reset or refusal", self.rate)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the bucket state for diagnostics."""
+        return {
+            "profile": self.profile_name,
+            "rate_per_second": round(self.rate, 3),
+            "profile_rate_per_second": self.profile.rate,
+            "burst": self.profile.burst,
+            "limited": self.limited,
+            "tokens": round(self.tokens, 2),
+            "requests": self.requests,
+            "answered": self.answered,
+            "delayed": self.delayed,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "overload_errors": self.overload_errors,
+            "backoffs": self.backoffs,
+        }
+
+
+class HostRateLimits:
+    """Adaptive token buckets keyed by endpoint, with model profiles per host."""
+
+    def __init__(self) -> None:
+        """Initialize with no hosts."""
+        self._profiles: dict[str, str] = {}
+        self._buckets: dict[tuple[str, int | None], AdaptiveTokenBucket] = {}
+
+    def bucket(self, host: str, port: int | None) -> AdaptiveTokenBucket:
+        """Return the bucket for an endpoint, creating it on first use."""
+        if (bucket := self._buckets.get((host, port))) is None:
+            bucket = self._buckets[(host, port)] = AdaptiveTokenBucket(self._profiles.get(host, PROFILE_DEFAULT))
+        return bucket
+
+    def get(self, host: str, port: int | None) -> AdaptiveTokenBucket | None:
+        """Return the bucket for an endpoint if it exists."""
+        return self._buckets.get((host, port))
+
+    def configure(self, host: str, capabilities: Mapping[str, Any] | None) -> None:
+        """Apply the model profile for a speaker's capabilities to its endpoints."""
+        profile_name = self._profiles[host] = profile_for_capabilities(capabilities)
+        for (bucket_host, _port), bucket in self._buckets.items():
+            if bucket_host == host:
+                bucket.set_profile(profile_name)
+
+    def host_dict(self, host: str) -> dict[str, Any]:
+        """Return the profile and per-port bucket state of host for diagnostics."""
+        return {
+            "profile": self._profiles.get(host, PROFILE_DEFAULT),
+            "endpoints": {
+                str(port): bucket.as_dict()
+                for (bucket_host, port), bucket in sorted(self._buckets.items(), key=lambda item: str(item[0][1]))
+                if bucket_host == host
+            },
+        }
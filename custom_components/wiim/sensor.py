@@ -7,20 +7,25 @@ Only creates sensors that users actually need, with advanced diagnostics optiona
 from __future__ import annotations
 
 import logging
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .capability_flags import client_has_capability, get_client_capability
-from .const import DOMAIN
+from .const import DATA_ADD_ROLLOUT_SENSOR, DATA_ROLLOUT, DATA_ROLLOUT_SENSOR, DOMAIN
 from .coordinator import WiiMCoordinator
 from .entity import WiimEntity
 from .version import get_pywiim_version
 
+if TYPE_CHECKING:
+    # Loaded by the first wiim.firmware_rollout call, not with the sensor platform
+    from .firmware_rollout import FirmwareRollout
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -69,6 +74,16 @@ async def async_setup_entry(
         entities.append(WiiMBitDepthSensor(coordinator, config_entry))
         entities.append(WiiMBitRateSensor(coordinator, config_entry))
 
+    # One firmware rollout sensor per integration, owned by the first entry set up.
+    # Every entry keeps a way to add it so the sensor moves to another speaker when its owner unloads.
+    if DATA_ROLLOUT_SENSOR not in hass.data[DOMAIN]:
+        rollout_sensor = WiiMFirmwareRolloutSensor()
+        hass.data[DOMAIN][DATA_ROLLOUT_SENSOR] = rollout_sensor
+        entities.append(rollout_sensor)
+    hass.data[DOMAIN][config_entry.entry_id][DATA_ADD_ROLLOUT_SENSOR] = partial(
+        _async_add_rollout_sensor, hass, async_add_entities
+    )
+
     async_add_entities(entities)
     device_name = coordinator.player.name or config_entry.title or "WiiM Speaker"
     _LOGGER.debug(
@@ -78,6 +93,16 @@ async def async_setup_entry(
     )
 
 
+@callback
+def _async_add_rollout_sensor(hass: HomeAssistant, async_add_entities: AddEntitiesCallback) -> None:
+    """Add the integration-wide rollout sensor unless another entry already has it."""
+    if DATA_ROLLOUT_SENSOR in hass.data[DOMAIN]:
+        return
+    rollout_sensor = WiiMFirmwareRolloutSensor()
+    hass.data[DOMAIN][DATA_ROLLOUT_SENSOR] = rollout_sensor
+    async_add_entities([rollout_sensor])
+
+
 class WiiMRoleSensor(WiimEntity, SensorEntity):
     """Device role sensor for multiroom group monitoring.
 
@@ -239,6 +264,16 @@ class WiiMDiagnosticSensor(WiimEntity, SensorEntity):
                 }
             )
 
+        # Announcement queue (serializes play_notification on this speaker)
+        queue = self.coordinator.announcement_queue
+        attrs.update(
+            {
+                "announcement_queue_depth": queue.depth,
+                "announcement_queue_last_wait_ms": queue.last_wait_ms,
+                "announcement_queue_max_wait_ms": queue.max_wait_ms,
+            }
+        )
+
         # Prune None values for cleanliness
         return {k: v for k, v in attrs.items() if v is not None}
 
@@ -307,6 +342,43 @@ class WiiMFirmwareSensor(WiimEntity, SensorEntity):
         return {k: v for k, v in attrs.items() if v is not None}
 
 
+class WiiMFirmwareRolloutSensor(SensorEntity):
+    """Fleet firmware rollout progress - state = overall percent, attributes = phase and counts.
+
+    Integration-wide rather than per speaker, so it has no device. The running
+    rollout writes its state; see ``firmware_rollout.FirmwareRollout.publish``.
+    """
+
+    _attr_icon = "mdi:update"
+    _attr_name = "WiiM Firmware Rollout"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_should_poll = False
+    _attr_unique_id = f"{DOMAIN}_firmware_rollout"
+
+    @property
+    def _rollout(self) -> FirmwareRollout | None:
+        return self.hass.data[DOMAIN].get(DATA_ROLLOUT)
+
+    @property  # type: ignore[override]
+    def native_value(self) -> int | None:
+        """Return overall rollout progress (unknown before the first rollout)."""
+        if (rollout := self._rollout) is None:
+            return None
+        return rollout.as_dict()["progress"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the phase, current wave and per-status speaker counts."""
+        if (rollout := self._rollout) is None:
+            return {"phase": "none"}
+        return rollout.sensor_attributes()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release the sensor so another entry can add it once its owner unloads."""
+        if self.hass.data[DOMAIN].get(DATA_ROLLOUT_SENSOR) is self:
+            self.hass.data[DOMAIN].pop(DATA_ROLLOUT_SENSOR)
+
+
 # -----------------------------------------------------------------------------
 # Utility helpers (local – simple, avoids polluting other modules)
 # -----------------------------------------------------------------------------
@@ -1,20 +1,25 @@
-"""Support to interface with WiiM players - platform entity actions.
+"""Support to interface with WiiM players - platform entity and domain actions.
 
 This module provides entity service descriptions for WiiM-specific services.
-Services are registered via EntityServiceDescription pattern in media_player.py.
+Entity services are registered via EntityServiceDescription pattern in media_player.py;
+fleet-wide domain services are registered once from async_setup via async_setup_services.
 """
 
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Final
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.helpers.typing import VolDictType, VolSchemaType
 
+from .const import DOMAIN
+
 # Service names
 SERVICE_SET_SLEEP_TIMER = "set_sleep_timer"
 SERVICE_CLEAR_SLEEP_TIMER = "clear_sleep_timer"
@@ -23,6 +28,13 @@ SERVICE_REBOOT_DEVICE = "reboot_device"
 SERVICE_SYNC_TIME = "sync_time"
 SERVICE_SCAN_BLUETOOTH = "scan_bluetooth"
 SERVICE_SET_CHANNEL_BALANCE = "set_channel_balance"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+SERVICE_ANNOUNCE = "announce"
+SERVICE_LOOP_MONITOR = "loop_monitor"
+SERVICE_PROFILE = "profile"
+SERVICE_FIRMWARE_ROLLOUT = "firmware_rollout"
+SERVICE_FIRMWARE_ROLLOUT_STATUS = "firmware_rollout_status"
 
 # Attribute names
 ATTR_SLEEP_TIME = "sleep_time"
@@ -32,6 +44,19 @@ ATTR_TRIGGER = "trigger"
 ATTR_OPERATION = "operation"
 ATTR_DURATION = "duration"
 ATTR_BALANCE = "balance"
+ATTR_TOP = "top"
+ATTR_MEDIA_CONTENT_ID = "media_content_id"
+ATTR_PRIORITY = "priority"
+ATTR_NAME = "name"
+ATTR_ENABLED = "enabled"
+ATTR_RESET = "reset"
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_CANARY = "canary"
+
+DEFAULT_PROFILE_SECONDS = 30
+DEFAULT_PROFILE_TOP = 20
+DEFAULT_SNAPSHOT_NAME = "default"
+DEFAULT_MAX_PARALLEL = 2
 
 # Service schemas
 SCHEMA_SET_SLEEP_TIMER: Final[VolDictType] = {
@@ -53,6 +78,48 @@ SCHEMA_SET_CHANNEL_BALANCE: Final[VolDictType] = {
     vol.Required(ATTR_BALANCE): vol.All(vol.Coerce(float), vol.Range(min=-1.0, max=1.0))
 }
 
+# Domain service schemas (target is optional: no target means every WiiM speaker)
+SCHEMA_SNAPSHOT: Final = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+    }
+)
+
+SCHEMA_ANNOUNCE: Final = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_MEDIA_CONTENT_ID): cv.string,
+        vol.Optional(ATTR_PRIORITY, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+    }
+)
+
+SCHEMA_LOOP_MONITOR: Final = vol.Schema(
+    {
+        vol.Optional(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_RESET, default=False): cv.boolean,
+    }
+)
+
+
+SCHEMA_PROFILE: Final = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_SECONDS): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+SCHEMA_FIRMWARE_ROLLOUT: Final = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_MAX_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+        vol.Optional(ATTR_CANARY): cv.entity_id,
+    }
+)
+
 
 @dataclass(frozen=True)
 class EntityServiceDescription:
@@ -127,11 +194,77 @@ def register_media_player_services(platform: entity_platform.EntityPlatform | No
         service.async_register(platform)
 
 
+def _lazy_handler(module: str, handler: str) -> Callable[[ServiceCall], Awaitable[ServiceResponse]]:
+    """Return a service handler that imports ``module`` on the first call.
+
+    Snapshots, announcements, fleet rollouts and the debug actions are rarely
+    used, so their modules (and what they pull in: Home Assistant's media
+    source component, cProfile / pstats) are not imported with the
+    integration. The first call imports them in Home Assistant's import
+    executor rather than on the event loop.
+    """
+    name = f"{__package__}.{module}"
+
+    async def _async_handle(call: ServiceCall) -> ServiceResponse:
+        loaded = await async_import_module(call.hass, name)
+        return await getattr(loaded, handler)(call)
+
+    return _async_handle
+
+
 async def async_setup_services(hass: HomeAssistant) -> None:
-    """Legacy function for backward compatibility.
+    """Register WiiM domain services (called once from async_setup).
 
-    Services are now registered via register_media_player_services() in media_player.py.
-    This function is kept for API compatibility but does nothing.
+    Per-speaker actions are entity services registered by media_player.py. Actions
+    that span the whole fleet are domain services so a single call can fan out
+    to every speaker concurrently.
     """
-    # Services are registered via EntityServiceDescription pattern in media_player.py
-    pass
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        _lazy_handler("snapshot", "async_handle_snapshot"),
+        schema=SCHEMA_SNAPSHOT,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        _lazy_handler("snapshot", "async_handle_restore"),
+        schema=SCHEMA_SNAPSHOT,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ANNOUNCE,
+        _lazy_handler("announce", "async_handle_announce"),
+        schema=SCHEMA_ANNOUNCE,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LOOP_MONITOR,
+        _lazy_handler("loop_monitor", "async_handle_loop_monitor"),
+        schema=SCHEMA_LOOP_MONITOR,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _lazy_handler("profiler", "async_handle_profile"),
+        schema=SCHEMA_PROFILE,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIRMWARE_ROLLOUT,
+        _lazy_handler("firmware_rollout", "async_handle_firmware_rollout"),
+        schema=SCHEMA_FIRMWARE_ROLLOUT,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIRMWARE_ROLLOUT_STATUS,
+        _lazy_handler("firmware_rollout", "async_handle_firmware_rollout_status"),
+        schema=vol.Schema({}),
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,74 @@
+"""Single-flight de-duplication for concurrent pywiim reads.
+
+Several code paths read the same thing from a speaker at the same moment:
+the subwoofer switches and level number all fetch ``get_subwoofer_status``
+when they are added, and the system health probe, the shared firmware check
+and OTA verification can all ask for ``get_device_info`` together. Each
+coordinator owns a ``SingleFlight``; an identical read (same method and
+arguments) that starts while one is running waits for that request and gets
+its result or error instead of sending another.
+
+The request runs in its own task, so a caller that is cancelled does not
+cancel it for the others. Nothing is cached once the request completes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from .coordinator import WiiMCoordinator
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _ReadStats:
+    """Requests sent and calls that shared one, for one method."""
+
+    requests: int = 0
+    shared: int = 0
+
+
+class SingleFlight:
+    """Share one in-flight request between identical concurrent reads."""
+
+    def __init__(self) -> None:
+        """Initialize with nothing in flight."""
+        self._in_flight: dict[tuple[str, tuple[Hashable, ...]], asyncio.Task[Any]] = {}
+        self.stats: dict[str, _ReadStats] = {}
+
+    async def async_call(self, method: str, call: Callable[..., Awaitable[_T]], *args: Hashable) -> _T:
+        """Return ``call(*args)``, joining an identical read that is already running."""
+        key = (method, args)
+        stats = self.stats.get(method)
+        if stats is None:
+            stats = self.stats[method] = _ReadStats()
+
+        if (task := self._in_flight.get(key)) is not None:
+            stats.shared += 1
+        else:
+            stats.requests += 1
+            task = asyncio.ensure_future(call(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: tuple[str, tuple[Hashable, ...]], task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody waited for is not logged as unhandled.
+            task.exception()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return per-method counters for diagnostics."""
+        return {method: asdict(stats) for method, stats in sorted(self.stats.items())}
+
+
+async def async_shared_read(coordinator: WiiMCoordinator, method: str, *args: Hashable) -> Any:
+    """Call ``coordinator.player.<method>(*args)`` through the coordinator's single-flight layer."""
+    return await coordinator.single_flight.async_call(method, getattr(coordinator.player, method), *args)
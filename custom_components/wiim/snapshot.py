@@ -0,0 +1,286 @@
+"""Fleet scene snapshot and restore for WiiM speakers.
+
+``wiim.snapshot`` captures volume, mute, source, EQ preset, group topology and
+the playing URL of every targeted speaker in one pass. It reads pywiim's cached
+Player state only, so it costs no device I/O.
+
+``wiim.restore`` diffs a snapshot against current Player state and sends only
+the commands that are actually needed. Commands run concurrently across
+speakers in dependency order: group topology first (sources and volume on a
+slave follow its master), then sources / URLs, then volume, mute and EQ.
+Topology runs in two steps so joins never race a group that is still being
+taken apart: every speaker that has to leave its current group (including a
+snapshot master that is currently someone's slave) leaves first, then the
+slaves join their snapshot masters.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .const import DOMAIN
+from .data import get_all_coordinators, get_coordinator_from_entity_id
+
+if TYPE_CHECKING:
+    from .coordinator import WiiMCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key holding named snapshots (entry_id keys hold coordinators).
+DATA_SNAPSHOTS = "snapshots"
+
+ATTR_NAME = "name"
+DEFAULT_SNAPSHOT_NAME = "default"
+
+# Volume is reported in 1% steps; anything closer than half a step is "same".
+_VOLUME_TOLERANCE = 0.005
+
+
+@dataclass(frozen=True)
+class SpeakerSnapshot:
+    """Captured state of one speaker."""
+
+    name: str | None
+    volume: float | None
+    muted: bool | None
+    source: str | None
+    eq_preset: str | None
+    master: str | None  # Speaker key of the group master when this speaker is a slave
+    media_url: str | None  # URL started via play_url(), only when playing/paused
+    playing: bool
+
+
+def _speaker_key(player: Any) -> str:
+    """Return the identifier used to match a Player across snapshot/restore."""
+    return str(player.uuid or player.host)
+
+
+def _master_key(player: Any) -> str | None:
+    """Return the master's speaker key when ``player`` is a slave, else None."""
+    if not player.is_slave or not player.group or not player.group.master:
+        return None
+    return _speaker_key(player.group.master)
+
+
+def _normalize_source(source: str) -> str:
+    """Fold case and separators so "Line In", "line-in" and "line_in" compare equal."""
+    return re.sub(r"[\s_-]", "", source.lower())
+
+
+def _is_source_selectable(player: Any, source: str) -> bool:
+    """Return True when ``source`` can be re-applied via switchmode.
+
+    Streaming contexts (Spotify, AirPlay, ...) show up as the current source but
+    are not selectable; restoring them is skipped instead of failing the scene.
+    """
+    wanted = _normalize_source(source)
+    return any(_normalize_source(str(s)) == wanted for s in player.available_sources or [])
+
+
+def capture_speaker(player: Any) -> SpeakerSnapshot:
+    """Capture restorable state from a Player's cached properties."""
+    playing = bool(player.is_playing or player.is_paused)
+    return SpeakerSnapshot(
+        name=player.name,
+        volume=player.volume_level,
+        muted=player.is_muted,
+        source=player.source,
+        eq_preset=player.eq_preset if player.supports_eq else None,
+        master=_master_key(player),
+        media_url=player.media_content_id if playing else None,
+        playing=bool(player.is_playing),
+    )
+
+
+def _resolve_coordinators(hass: HomeAssistant, entity_ids: set[str]) -> dict[str, WiiMCoordinator]:
+    """Map speaker keys to coordinators for the targeted entities (all speakers if none)."""
+    if entity_ids:
+        coordinators = [
+            coordinator
+            for entity_id in sorted(entity_ids)
+            if (coordinator := get_coordinator_from_entity_id(hass, entity_id)) is not None
+        ]
+    else:
+        coordinators = get_all_coordinators(hass)
+    # A speaker entity and its virtual group entity share one coordinator.
+    return {_speaker_key(coordinator.player): coordinator for coordinator in coordinators}
+
+
+def _plan_leave(snap: SpeakerSnapshot | None, player: Any) -> tuple[str, Callable[[], Awaitable[None]]] | None:
+    """Return the leave needed before ``player`` can reach its snapshot group, if any.
+
+    ``snap`` is None for a snapshot master outside the targets: it only has to
+    stop being someone else's slave.
+    """
+    current = _master_key(player)
+    wanted = snap.master if snap is not None else None
+    if current == wanted:
+        return None
+    if wanted is None:
+        return ("leave group", player.leave_group) if current is not None else None
+    # Moving to another master: leave the current group (or disband the one it leads) first.
+    if current is not None or player.is_master:
+        return "leave group", player.leave_group
+    return None
+
+
+def _plan_join(
+    key: str,
+    snap: SpeakerSnapshot,
+    player: Any,
+    players_by_key: dict[str, Any],
+) -> tuple[str, Callable[[], Awaitable[None]]] | None:
+    """Return the join needed to reach ``snap.master``, if any."""
+    if snap.master is None or _master_key(player) == snap.master:
+        return None
+    master = players_by_key.get(snap.master)
+    if master is None:
+        _LOGGER.warning("Snapshot master %s for %s is no longer configured; skipping join", snap.master, key)
+        return None
+    return "join group", lambda: player.join_group(master)
+
+
+def _plan_source(snap: SpeakerSnapshot, player: Any) -> tuple[str, Callable[[], Awaitable[None]]] | None:
+    """Return the source/URL change needed on a non-slave speaker, if any."""
+    if snap.master is not None:
+        # Slaves play whatever their master plays.
+        return None
+    if snap.media_url and snap.playing:
+        if player.is_playing and player.media_content_id == snap.media_url:
+            return None
+        url = snap.media_url
+        return "play url", lambda: player.play_url(url)
+    if not snap.source or (player.source and _normalize_source(player.source) == _normalize_source(snap.source)):
+        return None
+    if not _is_source_selectable(player, snap.source):
+        _LOGGER.debug("Skipping restore of non-selectable source '%s' on %s", snap.source, player.name)
+        return None
+    source = snap.source
+    return "set source", lambda: player.set_source(source)
+
+
+def _plan_levels(snap: SpeakerSnapshot, player: Any) -> list[tuple[str, Callable[[], Awaitable[None]]]]:
+    """Return volume, mute and EQ changes needed on a speaker."""
+    steps: list[tuple[str, Callable[[], Awaitable[None]]]] = []
+    volume = snap.volume
+    if volume is not None and (player.volume_level is None or abs(player.volume_level - volume) > _VOLUME_TOLERANCE):
+        steps.append(("set volume", lambda: player.set_volume(volume)))
+    muted = snap.muted
+    if muted is not None and player.is_muted != muted:
+        steps.append(("set mute", lambda: player.set_mute(muted)))
+    eq_preset = snap.eq_preset
+    if eq_preset and player.supports_eq and str(player.eq_preset or "").lower() != eq_preset.lower():
+        steps.append(("set EQ", lambda: player.set_eq_preset(eq_preset)))
+    return steps
+
+
+async def _run_phase(
+    phase: str,
+    steps: list[tuple[str, str, Callable[[], Awaitable[None]]]],
+    changed: dict[str, list[str]],
+    failed: dict[str, list[str]],
+) -> None:
+    """Run one dependency phase concurrently, recording per-speaker outcomes."""
+    if not steps:
+        return
+    results = await asyncio.gather(*(call() for _key, _label, call in steps), return_exceptions=True)
+    for (key, label, _call), result in zip(steps, results, strict=True):
+        if isinstance(result, Exception):
+            _LOGGER.warning("Snapshot restore %s: %s failed on %s: %s", phase, label, key, result)
+            failed.setdefault(key, []).append(f"{label}: {result}")
+        else:
+            changed.setdefault(key, []).append(label)
+
+
+async def async_restore_snapshot(
+    hass: HomeAssistant,
+    speakers: dict[str, SpeakerSnapshot],
+    coordinators: dict[str, WiiMCoordinator],
+) -> dict[str, Any]:
+    """Apply the minimal set of changes to bring ``coordinators`` back to ``speakers``."""
+    players_by_key = {_speaker_key(c.player): c.player for c in get_all_coordinators(hass)}
+    targets = {key: (snap, coordinators[key].player) for key, snap in speakers.items() if key in coordinators}
+
+    changed: dict[str, list[str]] = {}
+    failed: dict[str, list[str]] = {}
+
+    leaves = [
+        (key, *step) for key, (snap, player) in targets.items() if (step := _plan_leave(snap, player)) is not None
+    ]
+    # Snapshot masters that are not targeted still have to be free to accept slaves.
+    for master_key in sorted({snap.master for snap, _player in targets.values() if snap.master} - set(targets)):
+        if (master := players_by_key.get(master_key)) is not None and (step := _plan_leave(None, master)) is not None:
+            leaves.append((master_key, *step))
+    await _run_phase("leave", leaves, changed, failed)
+
+    # Planned after the leaves so joins see the topology those left behind.
+    joins = [
+        (key, *step)
+        for key, (snap, player) in targets.items()
+        if (step := _plan_join(key, snap, player, players_by_key)) is not None
+    ]
+    await _run_phase("join", joins, changed, failed)
+
+    sources = [
+        (key, *step) for key, (snap, player) in targets.items() if (step := _plan_source(snap, player)) is not None
+    ]
+    await _run_phase("sources", sources, changed, failed)
+
+    levels = [(key, *step) for key, (snap, player) in targets.items() for step in _plan_levels(snap, player)]
+    await _run_phase("levels", levels, changed, failed)
+
+    return {
+        "changed": changed,
+        "failed": failed,
+        "unchanged": sorted(key for key in targets if key not in changed and key not in failed),
+        "missing": sorted(key for key in speakers if key not in coordinators),
+    }
+
+
+async def async_handle_snapshot(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.snapshot``: capture targeted (or all) speakers under a name."""
+    hass = call.hass
+    name: str = call.data[ATTR_NAME]
+    coordinators = _resolve_coordinators(hass, await async_extract_entity_ids(hass, call))
+    if not coordinators:
+        raise HomeAssistantError("No WiiM speakers found to snapshot")
+
+    speakers = {key: capture_speaker(coordinator.player) for key, coordinator in coordinators.items()}
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SNAPSHOTS, {})[name] = speakers
+    _LOGGER.debug("Captured snapshot '%s' of %d speaker(s)", name, len(speakers))
+    return {"name": name, "speakers": {key: asdict(snap) for key, snap in speakers.items()}}
+
+
+async def async_handle_restore(call: ServiceCall) -> ServiceResponse:
+    """Handle ``wiim.restore``: re-apply a named snapshot to targeted (or all) speakers."""
+    hass = call.hass
+    name: str = call.data[ATTR_NAME]
+    speakers: dict[str, SpeakerSnapshot] | None = hass.data.get(DOMAIN, {}).get(DATA_SNAPSHOTS, {}).get(name)
+    if speakers is None:
+        raise HomeAssistantError(f"No WiiM snapshot named '{name}'")
+
+    entity_ids = await async_extract_entity_ids(hass, call)
+    if entity_ids:
+        coordinators = _resolve_coordinators(hass, entity_ids)
+        speakers = {key: snap for key, snap in speakers.items() if key in coordinators}
+    else:
+        coordinators = _resolve_coordinators(hass, set())
+
+    result = await async_restore_snapshot(hass, speakers, coordinators)
+    _LOGGER.debug(
+        "Restored snapshot '%s': %d changed, %d unchanged, %d failed",
+        name,
+        len(result["changed"]),
+        len(result["unchanged"]),
+        len(result["failed"]),
+    )
+    return {"name": name, **result}
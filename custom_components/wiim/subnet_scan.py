@@ -0,0 +1,178 @@
+"""Subnet scan for adding many speakers at once (config flow ``scan`` step).
+
+SSDP does not cross VLANs and adding a large fleet one IP at a time is slow.
+The scan walks a user-given IPv4 range:
+
+1. every address gets a short TCP connect on the LinkPlay API ports
+   (HTTPS 443 / 4443, then HTTP 80), at most ``SCAN_CONCURRENCY`` at once;
+2. an open port gets one ``getStatusEx`` request, which must answer with a
+   JSON object. HTTPS ports use the shared pool's SSL context, so speakers
+   that require the client certificate (Audio Pro MkII on 4443) answer too;
+3. hits are validated once more on the endpoint that answered (capability
+   detection plus device info), so the new config entries start with a
+   cached endpoint and capabilities and skip probing on first setup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import ssl
+import time
+from dataclasses import dataclass
+from ipaddress import IPv4Network, ip_network
+from typing import Any
+
+import aiohttp
+from homeassistant.const import CONF_HOST
+from pywiim import WiiMClient
+from pywiim.discovery import DiscoveredDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# /22 - a large home or small office network; bigger ranges are refused.
+MAX_SCAN_HOSTS = 1024
+SCAN_CONCURRENCY = 32
+_CONNECT_TIMEOUT_SECONDS = 1.0
+_REQUEST_TIMEOUT_SECONDS = 3.0
+_VALIDATE_TIMEOUT_SECONDS = 5
+# LinkPlay API endpoints in pywiim's probe order.
+_PROBE_PORTS: tuple[tuple[int, str], ...] = ((443, "https"), (4443, "https"), (80, "http"))
+
+
+@dataclass
+class ScanHit:
+    """An address that answered ``getStatusEx`` with JSON."""
+
+    host: str
+    port: int
+    protocol: str
+
+    @property
+    def endpoint(self) -> str:
+        """Return the endpoint URL pywiim expects in config entry data."""
+        return f"{self.protocol}://{self.host}:{self.port}"
+
+
+def scan_hosts(cidr: str) -> list[str]:
+    """Return the host addresses of an IPv4 range.
+
+    Raises ValueError for invalid, non-IPv4 or too large ranges.
+    """
+    network = ip_network(cidr.strip(), strict=False)
+    if not isinstance(network, IPv4Network):
+        raise ValueError("only IPv4 ranges can be scanned")
+    if network.num_addresses > MAX_SCAN_HOSTS:
+        raise ValueError(f"range has {network.num_addresses} addresses, at most {MAX_SCAN_HOSTS} can be scanned")
+    return [str(address) for address in network.hosts()]
+
+
+async def _async_port_open(host: str, port: int) -> bool:
+    """Return True when a TCP connection to host:port succeeds quickly."""
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), _CONNECT_TIMEOUT_SECONDS)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
+
+async def async_probe_host(
+    session: aiohttp.ClientSession,
+    host: str,
+    ssl_context: ssl.SSLContext | None = None,
+) -> ScanHit | None:
+    """Return the first LinkPlay endpoint answering on host, or None."""
+    for port, protocol in _PROBE_PORTS:
+        if not await _async_port_open(host, port):
+            continue
+        url = f"{protocol}://{host}:{port}/httpapi.asp?command=getStatusEx"
+        try:
+            async with session.get(
+                url,
+                ssl=ssl_context if protocol == "https" and ssl_context is not None else False,
+                timeout=aiohttp.ClientTimeout(total=_REQUEST_TIMEOUT_SECONDS),
+            ) as resp:
+                if resp.status != 200:
+                    continue
+                # LinkPlay firmware often answers JSON as text/html.
+                data = await resp.json(content_type=None)
+        except (aiohttp.ClientError, TimeoutError, ValueError):
+            continue
+        if isinstance(data, dict) and data:
+            return ScanHit(host, port, protocol)
+    return None
+
+
+async def async_scan_range(
+    session: aiohttp.ClientSession,
+    hosts: list[str],
+    ssl_context: ssl.SSLContext | None = None,
+    *,
+    limit: int = SCAN_CONCURRENCY,
+) -> list[ScanHit]:
+    """Probe hosts with at most ``limit`` in flight; return hits in address order."""
+    semaphore = asyncio.Semaphore(limit)
+    started = time.monotonic()
+
+    async def _probe(host: str) -> ScanHit | None:
+        async with semaphore:
+            return await async_probe_host(session, host, ssl_context)
+
+    hits = [hit for hit in await asyncio.gather(*(_probe(host) for host in hosts)) if hit is not None]
+    _LOGGER.debug(
+        "Subnet scan probed %d address(es) in %.0f ms: %d LinkPlay endpoint(s)",
+        len(hosts),
+        (time.monotonic() - started) * 1000,
+        len(hits),
+    )
+    return hits
+
+
+async def async_validate_hit(
+    session: aiohttp.ClientSession,
+    hit: ScanHit,
+    ssl_context: ssl.SSLContext | None = None,
+) -> tuple[DiscoveredDevice, dict[str, Any]]:
+    """Validate a hit on its known endpoint; return the device and its capabilities.
+
+    Raises what pywiim raises when the speaker does not answer.
+    """
+    client = WiiMClient(
+        host=hit.host,
+        port=hit.port,
+        protocol=hit.protocol,
+        timeout=_VALIDATE_TIMEOUT_SECONDS,
+        session=session,
+        ssl_context=ssl_context,
+    )
+    capabilities = await client._detect_capabilities() or {}  # noqa: SLF001 - same call as async_setup_entry
+    info = await client.get_device_info_model()
+    device = DiscoveredDevice(
+        ip=hit.host,
+        port=hit.port,
+        protocol=hit.protocol,
+        name=info.name,
+        uuid=info.uuid,
+        model=info.model,
+        firmware=info.firmware,
+        mac=info.mac,
+        discovery_method="scan",
+        validated=True,
+    )
+    return device, capabilities
+
+
+def entry_data_for(hit: ScanHit, capabilities: dict[str, Any], pywiim_version: str) -> dict[str, Any]:
+    """Return config entry data with the endpoint and capability caches prefilled."""
+    data: dict[str, Any] = {CONF_HOST: hit.host, "endpoint": hit.endpoint}
+    if capabilities:
+        data["capabilities"] = capabilities
+        data["capabilities_cache_meta"] = {
+            "pywiim_version": pywiim_version,
+            "firmware_version": capabilities.get("firmware_version"),
+        }
+    return data
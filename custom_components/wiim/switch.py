@@ -16,6 +16,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .const import DOMAIN
 from .coordinator import WiiMCoordinator
 from .entity import WiimEntity
+from .single_flight import async_shared_read
 from .subwoofer_helpers import main_speaker_bass_from_status, subwoofer_enabled_from_status
 
 _LOGGER = logging.getLogger(__name__)
@@ -149,7 +150,7 @@ class WiiMSubwooferSwitch(WiimEntity, SwitchEntity):
     async def _update_state(self) -> None:
         """Fetch current subwoofer state from device."""
         try:
-            status = await self.coordinator.player.get_subwoofer_status()
+            status = await async_shared_read(self.coordinator, "get_subwoofer_status")
             enabled = subwoofer_enabled_from_status(status)
             if enabled is not None:
                 self._is_on = bool(enabled)
@@ -221,7 +222,7 @@ class WiiMMainSpeakerBassSwitch(WiimEntity, SwitchEntity):
     async def _update_state(self) -> None:
         """Fetch current main-speaker bass state from the device."""
         try:
-            status = await self.coordinator.player.get_subwoofer_status()
+            status = await async_shared_read(self.coordinator, "get_subwoofer_status")
             enabled = main_speaker_bass_from_status(status)
             if enabled is not None:
                 self._is_on = bool(enabled)
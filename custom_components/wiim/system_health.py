@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import math
+import statistics
+import time
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components import system_health
@@ -10,6 +15,26 @@ from homeassistant.core import HomeAssistant, callback
 from .const import DOMAIN
 from .data import get_all_coordinators
 from .diagnostics import _get_pywiim_version
+from .single_flight import async_shared_read
+
+# Devices probed at once, and the deadline for the whole fleet probe
+PROBE_CONCURRENCY = 8
+PROBE_DEADLINE_SECONDS = 5.0
+# A successful poll this recent counts as the probe (no extra request)
+FRESH_POLL_SECONDS = 10.0
+# Devices listed under slowest_devices
+SLOWEST_COUNT = 3
+
+
+@dataclass
+class DeviceProbe:
+    """Result of probing one device."""
+
+    name: str
+    ok: bool
+    latency_ms: float | None = None
+    error: str | None = None
+    reused_poll: bool = False
 
 
 @callback
@@ -23,9 +48,6 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     entries = hass.config_entries.async_entries(DOMAIN)
     coordinators = get_all_coordinators(hass)
 
-    # Count reachable devices
-    reachable_count = sum(1 for coord in coordinators if coord.last_update_success)
-
     # Count multiroom groups using player properties
     masters = []
     slaves = []
@@ -38,32 +60,93 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
                 elif player.is_slave:
                     slaves.append(coord)
 
-    # Check first device API health (async)
-    first_device_health = None
-    if coordinators:
-        first_coordinator = coordinators[0]
-        first_device_health = await _check_device_health(first_coordinator)
+    probes = await _probe_fleet(coordinators)
+    reachable = [probe for probe in probes if probe.ok]
+    # Reused polls time a full refresh, not a single request; keep them apart from probe latency
+    latencies = sorted(
+        probe.latency_ms for probe in reachable if probe.latency_ms is not None and not probe.reused_poll
+    )
+    poll_latencies = [probe.latency_ms for probe in reachable if probe.latency_ms is not None and probe.reused_poll]
 
     # Get pywiim version (metadata read runs in executor; see diagnostics._get_pywiim_version)
     pywiim_version = await _get_pywiim_version(hass)
 
     return {
         "configured_devices": len(entries),
-        "reachable_devices": f"{reachable_count}/{len(coordinators)}",
+        "reachable_devices": f"{len(reachable)}/{len(coordinators)}",
         "multiroom_masters": len(masters),
         "multiroom_slaves": len(slaves),
-        "first_device_api": first_device_health,  # This will be async
+        "probe_latency_median_ms": round(statistics.median(latencies)) if latencies else None,
+        "probe_latency_p95_ms": round(latencies[math.ceil(0.95 * len(latencies)) - 1]) if latencies else None,
+        "probe_reused_polls": sum(1 for probe in probes if probe.reused_poll),
+        "reused_poll_median_ms": round(statistics.median(poll_latencies)) if poll_latencies else None,
+        "slowest_devices": _describe_slowest(probes),
         "integration_version": "2.0.0",  # Your current version
         "pywiim_version": pywiim_version,
     }
 
 
-async def _check_device_health(coordinator) -> str:
-    """Check health of a specific device."""
+async def _probe_fleet(coordinators: list) -> list[DeviceProbe]:
+    """Probe every device with bounded concurrency and one overall deadline.
+
+    Devices still pending at the deadline are reported as timed out.
+    """
+    if not coordinators:
+        return []
+    semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+
+    async def _bounded(coordinator) -> DeviceProbe:
+        async with semaphore:
+            return await _check_device_health(coordinator)
+
+    tasks = [asyncio.create_task(_bounded(coordinator)) for coordinator in coordinators]
+    await asyncio.wait(tasks, timeout=PROBE_DEADLINE_SECONDS)
+    probes = []
+    for coordinator, task in zip(coordinators, tasks, strict=True):
+        if task.done():
+            probes.append(task.result())
+        else:
+            task.cancel()
+            probes.append(DeviceProbe(_device_name(coordinator), ok=False, error="timed out"))
+    return probes
+
+
+async def _check_device_health(coordinator) -> DeviceProbe:
+    """Check health of a specific device, reusing a fresh successful poll."""
+    name = _device_name(coordinator)
+    last_poll_at = getattr(coordinator, "last_poll_at", None)
+    if (
+        coordinator.last_update_success
+        and isinstance(last_poll_at, float)
+        and time.monotonic() - last_poll_at < FRESH_POLL_SECONDS
+    ):
+        return DeviceProbe(name, ok=True, latency_ms=coordinator.last_poll_ms, reused_poll=True)
+
+    started = time.monotonic()
     try:
         # Quick API test
-        await coordinator.player.get_device_info()
-        polling_interval = coordinator.update_interval.total_seconds()
-        return f"OK (polling: {polling_interval}s)"
+        await async_shared_read(coordinator, "get_device_info")
     except Exception as err:
-        return f"Error: {str(err)[:50]}"
+        return DeviceProbe(name, ok=False, error=str(err)[:50])
+    return DeviceProbe(name, ok=True, latency_ms=(time.monotonic() - started) * 1000)
+
+
+def _device_name(coordinator) -> str:
+    player = coordinator.player
+    name = getattr(player, "name", None)
+    return name if isinstance(name, str) and name else str(getattr(player, "host", coordinator.name))
+
+
+def _describe_slowest(probes: list[DeviceProbe]) -> str | None:
+    """Summarize failed devices first, then the slowest responders."""
+    ranked = sorted(probes, key=lambda probe: (probe.ok, -(probe.latency_ms or 0.0)))
+    parts = [_describe_probe(probe) for probe in ranked[:SLOWEST_COUNT] if not probe.ok or probe.latency_ms is not None]
+    return ", ".join(parts) or None
+
+
+def _describe_probe(probe: DeviceProbe) -> str:
+    if not probe.ok:
+        return f"{probe.name} ({probe.error})"
+    if probe.reused_poll:
+        return f"{probe.name} (last poll {round(probe.latency_ms)} ms)"
+    return f"{probe.name} ({round(probe.latency_ms)} ms)"
@@ -8,12 +8,16 @@ pywiim provides firmware update support via Player properties/methods:
 - `player.client.capabilities["supports_firmware_install"]`: whether install via API is supported (WiiM only)
 - `await player.install_firmware_update()`: start installation (WiiM only)
 
+Availability is re-checked once per model / firmware pair by ``firmware_check``;
+a cached result there takes precedence over the speaker's own device info.
+
 This integration stays thin: we only expose pywiim's state and call its APIs.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 from datetime import timedelta
 from typing import Any
@@ -29,14 +33,30 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .capability_flags import client_has_capability
-from .const import DOMAIN
+from .const import DATA_FIRMWARE_UPDATE, DOMAIN
 from .coordinator import WiiMCoordinator
 from .entity import WiimEntity
+from .firmware_check import FirmwareCheckResult, get_firmware_check
+from .single_flight import async_shared_read
 
 _LOGGER = logging.getLogger(__name__)
 
 _INSTALL_POLL_INTERVAL_SECONDS = 10
 _INSTALL_TIMEOUT_SECONDS = 20 * 60  # 20 minutes
+_TCP_PROBE_TIMEOUT_SECONDS = 2
+# While still "downloading", check the firmware version this often (in polls) in
+# case the speaker flashed and rebooted without ever reporting progress.
+_VERIFY_EVERY_POLLS = 6
+# Failed status polls in a row (with the port still open) before assuming a reboot.
+_STATUS_FAILURES_BEFORE_REBOOT = 3
+
+# Install tracking phases
+PHASE_DOWNLOADING = "downloading"
+PHASE_FLASHING = "flashing"
+PHASE_REBOOTING = "rebooting"
+PHASE_VERIFYING = "verifying"
+
+_INVALID_FIRMWARE = {"", "0", "-", "unknown"}
 
 
 async def async_setup_entry(
@@ -67,7 +87,10 @@ async def async_setup_entry(
         )
         return
 
-    async_add_entities([WiiMFirmwareUpdateEntity(coordinator, config_entry)])
+    entity = WiiMFirmwareUpdateEntity(coordinator, config_entry)
+    # wiim.firmware_rollout installs through this entity to reuse OTA tracking.
+    hass.data[DOMAIN][config_entry.entry_id][DATA_FIRMWARE_UPDATE] = entity
+    async_add_entities([entity])
     device_name = player.name or config_entry.title or "WiiM Speaker"
     _LOGGER.debug("Created firmware update entity for %s", device_name)
 
@@ -100,7 +123,10 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
         self._attr_supported_features = UpdateEntityFeature.INSTALL | UpdateEntityFeature.PROGRESS
         self._installing = False
         self._install_percentage: int | None = None
-        self._install_task: asyncio.Task[None] | None = None
+        self._install_task: asyncio.Task[bool] | None = None
+        self._install_phase: str | None = None
+        self._status_failures = 0
+        self._next_verify_poll = 0
         self._saved_update_interval: timedelta | None = None
 
     @property
@@ -118,18 +144,33 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
             firmware = self.player.device_info.firmware
             if firmware:
                 fw = str(firmware).strip()
-                if fw and fw not in {"", "0", "-", "unknown"}:
+                if fw and fw not in _INVALID_FIRMWARE:
                     return fw
 
         # Fall back to player.firmware (direct attribute)
         firmware = getattr(self.player, "firmware", None)
         if firmware:
             fw = str(firmware).strip()
-            if fw and fw not in {"", "0", "-", "unknown"}:
+            if fw and fw not in _INVALID_FIRMWARE:
                 return fw
 
         return None
 
+    @property
+    def _firmware_check(self) -> FirmwareCheckResult | None:
+        """Return the shared check result for this model and installed firmware.
+
+        None when there is no result or the speaker's own device info is newer
+        than it; the player's update fields are used then.
+        """
+        cache = get_firmware_check(self.hass) if self.hass is not None else None
+        if cache is None or (check := cache.get(self.player.model, self.installed_version)) is None:
+            return None
+        device_info_at = self.coordinator.device_info_at
+        if device_info_at is not None and device_info_at > check.checked_at:
+            return None
+        return check
+
     @property
     def latest_version(self) -> str | None:  # type: ignore[override]
         """Return the latest available firmware version (if known).
@@ -137,13 +178,15 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
         If no update is available, return installed_version to ensure state is never None.
         This matches the pattern used by other Home Assistant update integrations.
         """
+        if (check := self._firmware_check) is not None:
+            return check.latest_version or self.installed_version
         latest = getattr(self.player, "latest_firmware_version", None)
         if latest is None:
             # Return installed_version when no update info available
             # This ensures UpdateEntity.state is never None (which shows as "Unavailable")
             return self.installed_version
         latest_str = str(latest).strip()
-        if latest_str in {"", "0", "-", "unknown"}:
+        if latest_str in _INVALID_FIRMWARE:
             # Invalid latest version, fall back to installed_version
             return self.installed_version
         return latest_str
@@ -151,6 +194,8 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
     @property
     def update_available(self) -> bool:  # type: ignore[override]
         """Return True if an update is available and ready (per pywiim)."""
+        if (check := self._firmware_check) is not None:
+            return check.update_available
         return bool(getattr(self.player, "firmware_update_available", False))
 
     @property
@@ -170,6 +215,18 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
             return None
         return self._install_percentage
 
+    @property
+    def install_phase(self) -> str | None:
+        """Return the install tracking phase, or None when not installing."""
+        return self._install_phase if self._installing else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Expose the install phase while an install is tracked."""
+        if self.install_phase is None:
+            return None
+        return {"install_phase": self.install_phase}
+
     @property
     def available(self) -> bool:
         """Return True while firmware install is running.
@@ -221,18 +278,35 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
             eager_start=False,
         )
 
-    def _apply_install_progress(self, status: dict[str, Any]) -> None:
-        """Surface flash progress from pywiim when the device is actually burning.
+    async def async_install_and_wait(self) -> bool:
+        """Start installation and wait until tracking stops (``wiim.firmware_rollout``).
 
-        Idle/downloading devices report ``progress: "0"``; treating that as 0%
-        would look stuck. HA shows an indeterminate bar when percentage is None.
+        Returns True when the installed firmware string changed.
         """
+        await self.async_install(None, False)
+        if self._install_task is None:
+            return False
+        return await self._install_task
+
+    @staticmethod
+    def _burn_progress(status: dict[str, Any]) -> int | None:
+        """Return the ``progress`` field of a burn-status reply as an int, if present."""
         progress_raw = status.get("progress")
         if progress_raw is None:
-            return
+            return None
         try:
-            progress = int(str(progress_raw).strip())
+            return int(str(progress_raw).strip())
         except ValueError:
+            return None
+
+    def _apply_install_progress(self, status: dict[str, Any]) -> None:
+        """Surface flash progress from pywiim when the device is actually burning.
+
+        Idle/downloading devices report ``progress: "0"``; treating that as 0%
+        would look stuck. HA shows an indeterminate bar when percentage is None.
+        """
+        progress = self._burn_progress(status)
+        if progress is None:
             return
         if 1 <= progress <= 100 and progress != self._install_percentage:
             self._install_percentage = progress
@@ -266,48 +340,144 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
             return
         self.coordinator.update_interval = saved
 
-    async def _async_track_install(self) -> None:
-        """Poll pywiim for install progress until firmware version changes."""
+    def _set_install_phase(self, phase: str) -> None:
+        if phase != self._install_phase:
+            _LOGGER.debug("[%s] Firmware install phase: %s", self.player.name or self.player.host, phase)
+            self._install_phase = phase
+            self.async_write_ha_state()
+
+    async def _async_port_open(self) -> bool:
+        """Return True when the speaker accepts a TCP connection (no HTTP request)."""
+        try:
+            async with asyncio.timeout(_TCP_PROBE_TIMEOUT_SECONDS):
+                _reader, writer = await asyncio.open_connection(self.player.host, self.player.port)
+        except (OSError, TimeoutError):
+            return False
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+        return True
+
+    async def _async_read_firmware(self) -> str | None:
+        """Read the firmware version with one device-info request (None if unreachable)."""
+        try:
+            info = await async_shared_read(self.coordinator, "get_device_info")
+        except Exception:  # noqa: BLE001
+            return None
+        firmware = str(getattr(info, "firmware", None) or "").strip()
+        return None if firmware in _INVALID_FIRMWARE else firmware
+
+    async def _async_status_lost(self, requests: dict[str, int]) -> bool:
+        """Return True when a failed status poll means the speaker went down to reboot.
+
+        A single timeout while the speaker is busy flashing is common, so it only
+        counts as a reboot once the port is closed too, or after repeated failures.
+        """
+        self._status_failures += 1
+        requests["tcp_probe"] += 1
+        port_open = await self._async_port_open()
+        return not port_open or self._status_failures >= _STATUS_FAILURES_BEFORE_REBOOT
+
+    async def _async_install_step(self, start_firmware: str | None, poll: int, requests: dict[str, int]) -> bool:
+        """Advance the install state machine by one poll; return True once new firmware is seen.
+
+        downloading -> flashing -> rebooting -> verifying, using the cheapest call
+        per phase: the burn-progress status while the speaker is up, a TCP connect
+        while it reboots, and one device-info request to confirm the version.
+        """
+        phase = self._install_phase
+        if phase in (PHASE_DOWNLOADING, PHASE_FLASHING):
+            requests["status"] += 1
+            try:
+                status = await self.player.get_update_install_status()
+            except Exception:  # noqa: BLE001
+                if await self._async_status_lost(requests):
+                    self._set_install_phase(PHASE_REBOOTING)
+                return False
+            self._status_failures = 0
+            if not isinstance(status, dict):
+                status = {}
+            self._apply_install_progress(status)
+            progress = self._burn_progress(status)
+            if progress is not None and 1 <= progress <= 100:
+                self._set_install_phase(PHASE_FLASHING)
+                return False
+            if phase == PHASE_FLASHING:
+                # Idle again after flashing: the speaker rebooted between polls.
+                # Re-check the version at most every few polls if it has not.
+                if poll < self._next_verify_poll:
+                    return False
+                self._set_install_phase(PHASE_VERIFYING)
+            elif not poll or poll % _VERIFY_EVERY_POLLS:
+                return False
+            else:
+                # No burn progress reported for a while: check whether it already updated.
+                requests["device_info"] += 1
+                firmware = await self._async_read_firmware()
+                return bool(firmware and start_firmware and firmware != start_firmware)
+
+        if phase == PHASE_REBOOTING:
+            requests["tcp_probe"] += 1
+            if not await self._async_port_open():
+                return False
+            self._set_install_phase(PHASE_VERIFYING)
+
+        requests["device_info"] += 1
+        firmware = await self._async_read_firmware()
+        if firmware and start_firmware and firmware != start_firmware:
+            return True
+        if firmware is None:
+            # Port open but HTTP not answering yet: keep probing until it does.
+            self._set_install_phase(PHASE_REBOOTING)
+        else:
+            # Up and still on the old version, so it has not rebooted into the new
+            # one yet: go back to reading burn progress.
+            self._status_failures = 0
+            self._next_verify_poll = poll + _VERIFY_EVERY_POLLS
+            self._set_install_phase(PHASE_FLASHING)
+        return False
+
+    async def _async_track_install(self) -> bool:
+        """Follow the install until the speaker reports a new firmware version.
+
+        Returns True when the new version was seen. Regular coordinator polls skip
+        device info, so one full refresh runs at the end to update cached state.
+        """
         start_firmware = self.installed_version
         device_name = self.player.name or self._config_entry.title or "WiiM Speaker"
         # Re-assert after HA's async_install_with_progress finally cleared _attr_in_progress.
         self._set_install_progress_state(True, self._install_percentage)
+        self._install_phase = PHASE_DOWNLOADING
+        self._status_failures = 0
+        self._next_verify_poll = 0
         self._pause_coordinator_polling()
+        requests = {"status": 0, "tcp_probe": 0, "device_info": 0}
+        updated = False
 
         try:
             async with asyncio.timeout(_INSTALL_TIMEOUT_SECONDS):
-                while True:
-                    try:
-                        status = await self.player.get_update_install_status()
-                        if isinstance(status, dict):
-                            self._apply_install_progress(status)
-                    except Exception:  # noqa: BLE001
-                        # Device may be rebooting/unreachable; keep polling.
-                        pass
-
-                    try:
-                        # Regular coordinator polls skip device_info (firmware / VersionUpdate).
-                        # A full refresh is required to see the new firmware after OTA.
-                        await self.player.refresh(full=True)
-                        self.coordinator.async_set_updated_data({"player": self.player})
-                    except Exception:  # noqa: BLE001
-                        pass
-
-                    current_firmware = self.installed_version
-                    if current_firmware and start_firmware and current_firmware != start_firmware:
-                        _LOGGER.info(
-                            "Firmware installation finished for %s (%s -> %s)",
-                            device_name,
-                            start_firmware,
-                            current_firmware,
-                        )
-                        return
-
+                poll = 0
+                while not await self._async_install_step(start_firmware, poll, requests):
+                    poll += 1
                     await asyncio.sleep(_INSTALL_POLL_INTERVAL_SECONDS)
+            updated = True
+            try:
+                await self.player.refresh(full=True)
+                self.coordinator.async_set_updated_data({"player": self.player})
+            except Exception:  # noqa: BLE001
+                # The next coordinator poll picks the new state up instead.
+                pass
+            _LOGGER.info(
+                "Firmware installation finished for %s (%s -> %s)",
+                device_name,
+                start_firmware,
+                self.installed_version,
+            )
         except TimeoutError:
             _LOGGER.warning(
-                "[%s] Firmware install tracking timed out (still on %s)",
+                "[%s] Firmware install tracking timed out in phase %s (still on %s)",
                 device_name,
+                self._install_phase,
                 self.installed_version,
             )
         except asyncio.CancelledError:
@@ -315,12 +485,17 @@ class WiiMFirmwareUpdateEntity(WiimEntity, UpdateEntity):
             raise
         finally:
             self._resume_coordinator_polling()
+            self._install_phase = None
             self._set_install_progress_state(False)
             _LOGGER.debug(
-                "Firmware install tracking stopped for %s (installed %s)",
+                "Firmware install tracking stopped for %s (installed %s; %d status, %d TCP probe, %d device-info requests)",
                 device_name,
                 self.installed_version,
+                requests["status"],
+                requests["tcp_probe"],
+                requests["device_info"],
             )
+        return updated
 
     # Some HA type-checkers/pylint versions expect a synchronous `install` method.
     # Provide it as a thin wrapper to satisfy tooling without changing behavior.
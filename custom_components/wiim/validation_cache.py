@@ -0,0 +1,148 @@
+"""Short-lived, de-duplicated device validation for config flows.
+
+mDNS, SSDP and the integration's own discovery often announce the same speaker
+within seconds of each other, and every resulting flow used to validate the
+host from scratch (capability detection plus two HTTP requests). Validation
+results are kept per host for a short time, and callers that ask for a host
+while it is already being validated wait for that validation instead of
+starting another one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant
+from pywiim.discovery import DiscoveredDevice
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key holding the ValidationCache instance.
+DATA_VALIDATION_CACHE = "validation_cache"
+
+VALIDATION_TTL_SECONDS = 60
+# Failures are kept briefly: long enough to absorb an mDNS + SSDP burst, short
+# enough that a speaker that was just powered on is picked up again.
+FAILURE_TTL_SECONDS = 10
+VALIDATION_CONCURRENCY = 8
+
+Validator = Callable[[str], Awaitable[DiscoveredDevice]]
+
+
+@dataclass
+class _CachedValidation:
+    expires_at: float
+    device: DiscoveredDevice | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class ValidationStats:
+    """Counters for logs and tests."""
+
+    validations: int = 0
+    cache_hits: int = 0
+    joined_in_flight: int = 0
+
+
+class ValidationCache:
+    """Per-host validation results with a short TTL and in-flight de-duplication."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._results: dict[str, _CachedValidation] = {}
+        self._in_flight: dict[str, asyncio.Future[DiscoveredDevice]] = {}
+        self.stats = ValidationStats()
+
+    def get(self, host: str) -> DiscoveredDevice | None:
+        """Return a cached successful validation for host, if still fresh."""
+        cached = self._results.get(host)
+        if cached is None or cached.expires_at <= time.monotonic():
+            return None
+        return cached.device
+
+    def invalidate(self, host: str) -> None:
+        """Drop any cached result for host."""
+        self._results.pop(host, None)
+
+    async def async_validate(self, host: str, validate: Validator, *, force: bool = False) -> DiscoveredDevice:
+        """Return the validated device for host, raising what validate raised.
+
+        With ``force`` a cached result is ignored (a validation that is already
+        running is still shared).
+        """
+        if not force and (cached := self._results.get(host)) is not None:
+            if cached.expires_at > time.monotonic():
+                self.stats.cache_hits += 1
+                if cached.error is not None:
+                    raise cached.error
+                assert cached.device is not None
+                return cached.device
+            del self._results[host]
+
+        if (future := self._in_flight.get(host)) is not None:
+            self.stats.joined_in_flight += 1
+            # Shield so one cancelled caller does not abort the shared validation.
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[host] = future
+        self.stats.validations += 1
+        started = time.monotonic()
+        try:
+            device = await validate(host)
+        except Exception as err:
+            self._results[host] = _CachedValidation(time.monotonic() + FAILURE_TTL_SECONDS, error=err)
+            future.set_exception(err)
+            # Mark retrieved so an unjoined failure does not log "exception never retrieved".
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            self._results[host] = _CachedValidation(time.monotonic() + VALIDATION_TTL_SECONDS, device=device)
+            future.set_result(device)
+            return device
+        finally:
+            del self._in_flight[host]
+            _LOGGER.debug("Validated %s in %.0f ms", host, (time.monotonic() - started) * 1000)
+
+    async def async_validate_many(
+        self,
+        hosts: Iterable[str],
+        validate: Validator,
+        *,
+        limit: int = VALIDATION_CONCURRENCY,
+    ) -> dict[str, DiscoveredDevice]:
+        """Validate hosts with at most ``limit`` running at once; failures are left out."""
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _one(host: str) -> tuple[str, DiscoveredDevice | None]:
+            async with semaphore:
+                try:
+                    return host, await self.async_validate(host, validate)
+                except Exception as err:  # noqa: BLE001 - non-WiiM hosts fail in many ways
+                    _LOGGER.debug("Validation failed for %s: %s", host, err)
+                    return host, None
+
+        results = await asyncio.gather(*(_one(host) for host in dict.fromkeys(hosts)))
+        return {host: device for host, device in results if device is not None}
+
+
+def get_validation_cache(hass: HomeAssistant) -> ValidationCache:
+    """Return the domain validation cache, creating it on first use.
+
+    Config flows can start before the integration is set up, so the cache is
+    created lazily rather than in ``async_setup``.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (cache := domain_data.get(DATA_VALIDATION_CACHE)) is None:
+        cache = domain_data[DATA_VALIDATION_CACHE] = ValidationCache()
+    return cache
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+WiiM Integration - LinkPlay Device Simulator
+Run a fleet of simulated LinkPlay/WiiM speakers on this machine.
+
+Each speaker answers the httpapi.asp commands pywiim uses (status, player
+status, multiroom, EQ, presets, subwoofer, firmware update) on its own port.
+Point Home Assistant or a load test at the printed addresses.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests.simulator import FaultProfile, SimulatorFleet  # noqa: E402
+
+
+def _window(value: str) -> tuple[float, float]:
+    start, _, end = value.partition("-")
+    return float(start), float(end)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    faults = FaultProfile(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        loss=args.loss,
+        timeout=args.timeout,
+        offline_windows=args.offline,
+    )
+    async with SimulatorFleet(
+        args.count, faults=faults, distinct_hosts=args.distinct_hosts, port=args.port, seed=args.seed
+    ) as fleet:
+        for speaker in fleet.speakers:
+            print(f"{speaker.name}\t{speaker.address}\t{speaker.uuid}")
+        print(f"\n{len(fleet.speakers)} speakers running, Ctrl+C to stop", file=sys.stderr)
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run simulated LinkPlay/WiiM speakers")
+    parser.add_argument("--count", type=int, default=10, help="number of speakers (default: 10)")
+    parser.add_argument(
+        "--distinct-hosts",
+        action="store_true",
+        help="bind each speaker to its own 127.0.x.y address (Linux only)",
+    )
+    parser.add_argument("--port", type=int, default=0, help="port to bind (default: OS-assigned per speaker)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency per request")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability a request is dropped (0-1)")
+    parser.add_argument("--timeout", type=float, default=0.0, help="probability a request never answers (0-1)")
+    parser.add_argument(
+        "--offline",
+        type=_window,
+        action="append",
+        default=[],
+        metavar="START-END",
+        help="seconds after start during which speakers are offline (repeatable)",
+    )
+    parser.add_argument("--seed", type=int, help="random seed for reproducible faults")
+    args = parser.parse_args()
+    if args.port and not args.distinct_hosts and args.count > 1:
+        parser.error("--port needs --distinct-hosts when running more than one speaker")
+
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
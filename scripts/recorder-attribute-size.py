@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+WiiM Integration - Recorder Attribute Size
+Estimate how much one WiiM media player adds to the recorder database per hour.
+
+Simulates a playing speaker with the realistic Player mock from
+tests/fixtures: a state write every --interval seconds (position updates),
+a new track every --track-seconds and a one-minute pause every 20 minutes.
+Each write is filtered the way the recorder does it: the entity's unrecorded
+attributes and attribution / restored / supported_features are dropped. A new
+state_attributes row is counted only for attribute sets not seen before,
+because the recorder shares identical rows.
+
+Two modes are compared:
+  default           option off: all extra attributes recorded
+  recorder_friendly option on: static device attributes removed, playback
+                    flags and queue position unrecorded
+
+Run from the repository root with the development requirements installed:
+  python scripts/recorder-attribute-size.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.const import ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES  # noqa: E402
+from homeassistant.helpers.json import json_bytes_strip_null  # noqa: E402
+
+from custom_components.wiim.announce_queue import AnnouncementQueue  # noqa: E402
+from custom_components.wiim.browse_cache import BrowseCache  # noqa: E402
+from custom_components.wiim.const import CONF_RECORDER_FRIENDLY_ATTRIBUTES  # noqa: E402
+from custom_components.wiim.media_player import WiiMMediaPlayer, WiiMRecorderFriendlyMediaPlayer  # noqa: E402
+from tests.fixtures.realistic_player import create_realistic_player  # noqa: E402
+
+# Rough size of one row in the states table (ids, timestamps, context) without attributes.
+STATE_ROW_BYTES = 120
+
+_ALWAYS_EXCLUDED = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
+MODES = ("default", "recorder_friendly")
+
+
+def _entity(recorder_friendly: bool) -> tuple[WiiMMediaPlayer, MagicMock]:
+    player = create_realistic_player(play_state="play", source="spotify")
+    player.name = "Living Room"
+    player.device_info = MagicMock(mac="AA:BB:CC:DD:EE:FF")
+    player.available_sources = ["Spotify", "Bluetooth", "Line In", "Optical", "AirPlay"]
+    player.queue_count = 50
+    player.is_buffering = False
+    for capability in ("presets", "audio_output", "queue_browse", "queue_add", "alarms", "sleep_timer", "upnp"):
+        setattr(player, f"supports_{capability}", True)
+    player.supports_subwoofer = False
+    player.client.capabilities = {}
+
+    coordinator = MagicMock()
+    coordinator.data = {"player": player}
+    coordinator.player = player
+    coordinator.last_update_success = True
+    coordinator.announcement_queue = AnnouncementQueue(player.name)
+    coordinator.browse_cache = BrowseCache()
+
+    entry = MagicMock(title=player.name, unique_id="simulated-uuid")
+    entry.options = {CONF_RECORDER_FRIENDLY_ATTRIBUTES: recorder_friendly}
+    # The platform picks the class the same way from the option
+    player_class = WiiMRecorderFriendlyMediaPlayer if recorder_friendly else WiiMMediaPlayer
+    entity = player_class(coordinator, entry)
+    entity.entity_id = "media_player.living_room"
+    return entity, player
+
+
+def _simulate(mode: str, hours: float, interval: float, track_seconds: float) -> dict[str, float]:
+    entity, player = _entity(mode == "recorder_friendly")
+    excluded = _ALWAYS_EXCLUDED | entity._Entity__combined_unrecorded_attributes
+
+    seen: set[bytes] = set()
+    writes = attribute_rows = attribute_bytes = 0
+    elapsed = 0.0
+    while elapsed < hours * 3600:
+        track = int(elapsed // track_seconds)
+        paused = elapsed % 1200 >= 1140  # last minute of every 20
+        player.play_state = "pause" if paused else "play"
+        player.is_playing, player.is_paused = not paused, paused
+        player.queue_position = track % player.queue_count + 1
+        player.media_title = f"Track {track}"
+        player.media_artist = f"Artist {track // 4}"
+        player.media_album = f"Album {track // 4}"
+        # Position and duration are cached on the entity by the coordinator callback
+        entity._attr_media_duration = int(track_seconds)
+        entity._attr_media_position = int(elapsed % track_seconds)
+
+        attributes = entity._async_calculate_state().attributes
+        shared = json_bytes_strip_null({key: value for key, value in attributes.items() if key not in excluded})
+        writes += 1
+        if shared not in seen:
+            seen.add(shared)
+            attribute_rows += 1
+            attribute_bytes += len(shared)
+        elapsed += interval
+
+    per_hour = 1 / hours
+    return {
+        "state_rows": writes * per_hour,
+        "attribute_rows": attribute_rows * per_hour,
+        "attribute_bytes": attribute_bytes * per_hour,
+        "avg_attribute_row": attribute_bytes / attribute_rows,
+        "total_bytes": (writes * STATE_ROW_BYTES + attribute_bytes) * per_hour,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated playback time (default 1)")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between state writes (default 5)")
+    parser.add_argument("--track-seconds", type=float, default=240.0, help="track length (default 240)")
+    args = parser.parse_args()
+
+    results = {mode: _simulate(mode, args.hours, args.interval, args.track_seconds) for mode in MODES}
+    print(f"{'mode':<18} {'states/h':>9} {'attr rows/h':>12} {'attr bytes/h':>13} {'avg row':>8} {'total bytes/h':>14}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<18} {result['state_rows']:>9.0f} {result['attribute_rows']:>12.0f} "
+            f"{result['attribute_bytes']:>13.0f} {result['avg_attribute_row']:>8.0f} {result['total_bytes']:>14.0f}"
+        )
+    default, friendly = results["default"], results["recorder_friendly"]
+    attributes_saved = 1 - friendly["attribute_bytes"] / default["attribute_bytes"]
+    total_saved = 1 - friendly["total_bytes"] / default["total_bytes"]
+    print(f"recorder_friendly: {attributes_saved:.0%} fewer attribute bytes, {total_saved:.0%} fewer bytes overall")
+    print(f"(states rows estimated at {STATE_ROW_BYTES} bytes each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""JSON baselines and regression checks for the benchmark suites.
+
+Each suite writes its results to ``build/benchmarks/<suite>.json``, appends
+them to ``build/benchmarks/<suite>.history.jsonl`` (one line per run, so
+trends can be plotted from CI artifacts) and compares them with
+``tests/benchmarks/baselines/<suite>.json``. A metric regresses when it
+exceeds the baseline by more than the threshold (default 50 %,
+``WIIM_BENCHMARK_THRESHOLD=0.25`` for 25 %). Timings depend on the
+machine, so baselines should be regenerated on the CI runner that checks
+them: ``WIIM_BENCHMARK_UPDATE=1`` rewrites the baseline from the current run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+RESULTS_DIR = Path(__file__).resolve().parents[2] / "build" / "benchmarks"
+DEFAULT_THRESHOLD = 0.5
+
+# Metrics below this absolute value are noise (sub-millisecond / sub-microsecond jitter).
+_NOISE_FLOOR = {"ms": 0.5, "us": 1.0, "kb": 64.0}
+
+
+def _noise_floor(metric: str) -> float:
+    return next((floor for suffix, floor in _NOISE_FLOOR.items() if metric.endswith(f"_{suffix}")), 0.0)
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """Return one message per metric that regressed beyond ``threshold``.
+
+    Only metrics present in both runs are compared; new cases or metrics pass.
+    """
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(case, {}).get(metric)
+            if base is None:
+                continue
+            limit = max(base * (1 + threshold), base + _noise_floor(metric))
+            if value > limit:
+                regressions.append(f"{case}.{metric}: {value:g} > {limit:g} (baseline {base:g})")
+    return regressions
+
+
+def check_against_baseline(suite: str, results: dict[str, dict[str, float]]) -> list[str]:
+    """Store ``results`` and return regressions against the suite's baseline."""
+    report = {
+        "suite": suite,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    (RESULTS_DIR / f"{suite}.json").write_text(json.dumps(report, indent=2) + "\n")
+    with (RESULTS_DIR / f"{suite}.history.jsonl").open("a") as history:
+        history.write(json.dumps(report) + "\n")
+
+    baseline_file = BASELINE_DIR / f"{suite}.json"
+    baseline: dict[str, Any] = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+    if os.environ.get("WIIM_BENCHMARK_UPDATE") == "1" or not baseline:
+        if "before" in baseline:
+            # Reference numbers from before an optimization stay next to the new ones.
+            report["before"] = baseline["before"]
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        baseline_file.write_text(json.dumps(report, indent=2) + "\n")
+        return []
+
+    threshold = float(os.environ.get("WIIM_BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD))
+    return compare(results, baseline.get("results", {}), threshold)
@@ -0,0 +1,15 @@
+"""Benchmarks are opt-in: set ``WIIM_BENCHMARK=1`` to run them."""
+
+import os
+
+import pytest
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip benchmarks unless explicitly requested."""
+    if os.environ.get("WIIM_BENCHMARK") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with WIIM_BENCHMARK=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,155 @@
+"""How coordinators scale with speaker count (N = 1, 10, 50, 200).
+
+Every speaker is a ``WiiMCoordinator`` with a real pywiim ``Player`` talking
+HTTP to the local device simulator (``tests/simulator``), which runs in a
+child process (``SimulatorProcess``) so CPU time and memory cover the
+coordinator side only. Per N this measures:
+
+- ``refresh_cpu_ms`` / ``refresh_wall_ms``: event-loop (CPU) and wall time for
+  one refresh cycle of every coordinator;
+- ``state_writes_per_cycle``: entity updates one cycle triggers, counted with
+  ``ENTITIES_PER_SPEAKER`` listeners per coordinator (each listener stands for
+  one entity's ``async_write_ha_state``);
+- ``callback_cpu_ms``: one ``_on_player_state_changed`` burst across all
+  speakers (what a wave of UPnP events costs);
+- ``group_cycle_cpu_ms``: a refresh cycle right after half of the speakers
+  joined groups of five, which resolves slaves through ``_player_finder``;
+- ``player_finder_us``: one worst-case ``_player_finder`` lookup;
+- ``peak_memory_kb``: tracemalloc peak while building the coordinators and
+  running their first refresh.
+
+Home Assistant's test harness runs the loop in debug mode, which records a
+stack for every future; the benchmark turns that off to time what users run.
+
+Run with ``WIIM_BENCHMARK=1 pytest tests/benchmarks``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.coordinator import WiiMCoordinator
+from tests.simulator import RemoteSpeaker, SimulatorProcess
+
+from .baseline import check_against_baseline
+
+pytestmark = pytest.mark.benchmark
+
+SPEAKER_COUNTS = (1, 10, 50, 200)
+CYCLES = 3
+ENTITIES_PER_SPEAKER = 12
+GROUP_SIZE = 5
+
+
+@pytest.fixture(autouse=True)
+def _allow_loopback(socket_enabled):
+    """The simulator listens on real loopback sockets."""
+
+
+async def _build(hass: HomeAssistant, speakers: list[RemoteSpeaker]) -> tuple[list[WiiMCoordinator], list[int]]:
+    """Register one coordinator per simulated speaker, each with entity-like listeners."""
+    coordinators: list[WiiMCoordinator] = []
+    writes = [0]
+
+    def _write() -> None:
+        writes[0] += 1
+
+    for speaker in speakers:
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={"host": speaker.address}, unique_id=speaker.uuid, pref_disable_polling=True
+        )
+        entry.add_to_hass(hass)
+        coordinator = WiiMCoordinator(hass, speaker.host, entry=entry, port=speaker.port, protocol="http", timeout=5)
+        # The benchmark drives every refresh; at N=200 a cycle outlasts the poll
+        # interval and the coordinator's own timer would add overlapping refreshes.
+        coordinator.config_entry = entry
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {"coordinator": coordinator}
+        for _ in range(ENTITIES_PER_SPEAKER):
+            coordinator.async_add_listener(_write)
+        coordinators.append(coordinator)
+    return coordinators, writes
+
+
+async def _cycle(coordinators: list[WiiMCoordinator]) -> tuple[float, float]:
+    """Refresh every coordinator once; return (cpu_ms, wall_ms)."""
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+    return (time.process_time() - cpu) * 1000, (time.perf_counter() - wall) * 1000
+
+
+async def _measure(hass: HomeAssistant, count: int) -> dict[str, float]:
+    with SimulatorProcess(count, seed=count) as simulator:
+        speakers = simulator.speakers
+        gc.collect()
+        tracemalloc.start()
+        try:
+            coordinators, writes = await _build(hass, speakers)
+            # Warm-up: the first refresh detects capabilities and tries UPnP.
+            await _cycle(coordinators)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        cpu_total = wall_total = 0.0
+        writes[0] = 0
+        for _ in range(CYCLES):
+            cpu, wall = await _cycle(coordinators)
+            cpu_total += cpu
+            wall_total += wall
+        state_writes = writes[0] / CYCLES
+
+        started = time.process_time()
+        for coordinator in coordinators:
+            coordinator._on_player_state_changed()
+        callback_ms = (time.process_time() - started) * 1000
+
+        for start in range(0, count // 2, GROUP_SIZE):
+            master = speakers[start]
+            for speaker in speakers[start + 1 : start + GROUP_SIZE]:
+                await simulator.async_join(speaker, master)
+        group_cpu, _ = await _cycle(coordinators)
+
+        finder = coordinators[0]._player_finder
+        target = speakers[-1].uuid if count > 1 else "missing"
+        lookups = 200
+        started = time.perf_counter()
+        for _ in range(lookups):
+            finder(target)
+        finder_us = (time.perf_counter() - started) / lookups * 1_000_000
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+
+    return {
+        "refresh_cpu_ms": round(cpu_total / CYCLES, 2),
+        "refresh_wall_ms": round(wall_total / CYCLES, 2),
+        "state_writes_per_cycle": state_writes,
+        "callback_cpu_ms": round(callback_ms, 3),
+        "group_cycle_cpu_ms": round(group_cpu, 2),
+        "player_finder_us": round(finder_us, 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+async def test_coordinator_scale(hass: HomeAssistant) -> None:
+    """Measure refresh, callback, grouping and lookup cost as speaker count grows."""
+    asyncio.get_running_loop().set_debug(False)
+    results = {}
+    for count in SPEAKER_COUNTS:
+        results[f"n{count}"] = await _measure(hass, count)
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            await hass.config_entries.async_remove(entry.entry_id)
+        hass.data.pop(DOMAIN, None)
+
+    for count in SPEAKER_COUNTS:
+        assert results[f"n{count}"]["state_writes_per_cycle"] <= count * ENTITIES_PER_SPEAKER
+    regressions = check_against_baseline("coordinator_scale", results)
+    assert not regressions, "Coordinator scale regressions:\n" + "\n".join(regressions)
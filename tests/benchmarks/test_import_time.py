@@ -0,0 +1,100 @@
+"""Cost of importing the integration the way Home Assistant does.
+
+Home Assistant imports ``custom_components.wiim`` together with the
+platforms it preloads (``config_flow``, ``diagnostics``, ``system_health``)
+in one executor job, then imports the entity platforms when the first config
+entry forwards its setup. Each case runs in a fresh interpreter that has
+already imported the Home Assistant modules every installation loads (plus
+``http``, which the manifest depends on), and records the best wall time of
+``REPEATS`` runs and the number of modules the case added.
+
+Results are checked against ``tests/benchmarks/baselines/import_time.json``,
+which also keeps the numbers measured before the lazy-loading work under
+``before`` for comparison. Rarely used modules (snapshots, announcements,
+firmware rollout, the debug actions and the option-gated metrics endpoint)
+must not be imported with the integration or its entity platforms.
+
+Run with ``WIIM_BENCHMARK=1 pytest tests/benchmarks``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from .baseline import check_against_baseline
+
+pytestmark = pytest.mark.benchmark
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REPEATS = 5
+
+_PACKAGE = "custom_components.wiim"
+_PRELOADED = ("config_flow", "diagnostics", "system_health")
+_ENTITY_PLATFORMS = ("media_player", "sensor", "number", "light", "select", "button", "switch", "update")
+
+# Imported on first use, never with the integration.
+DEFERRED = tuple(f"{_PACKAGE}.{name}" for name in ("snapshot", "announce", "firmware_rollout", "profiler", "metrics"))
+
+# Case -> (modules imported untimed first, modules timed).
+CASES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "integration": ((), (_PACKAGE, *(f"{_PACKAGE}.{name}" for name in _PRELOADED))),
+    "entity_platforms": (
+        (_PACKAGE, *(f"{_PACKAGE}.{name}" for name in _PRELOADED)),
+        tuple(f"{_PACKAGE}.{name}" for name in _ENTITY_PLATFORMS),
+    ),
+}
+
+_PROBE = """
+import importlib, json, sys, time
+import homeassistant.components.http, homeassistant.config_entries, homeassistant.core
+import homeassistant.helpers.device_registry
+for name in {setup!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+started = time.perf_counter()
+for name in {timed!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def _probe(setup: tuple[str, ...], timed: tuple[str, ...]) -> dict[str, Any]:
+    """Import ``timed`` (after ``setup``) in a fresh interpreter and return its cost."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (str(REPO_ROOT), os.environ.get("PYTHONPATH"))))}
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(setup=setup, timed=timed)],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+        env=env,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_time() -> None:
+    """Time the integration import with its preloaded platforms, then the entity platforms."""
+    results = {}
+    loaded: dict[str, list[str]] = {}
+    for case, (setup, timed) in CASES.items():
+        runs = [_probe(setup, timed) for _ in range(REPEATS)]
+        loaded[case] = runs[-1]["modules"]
+        results[case] = {
+            "import_ms": round(min(run["ms"] for run in runs), 2),
+            "modules_loaded": len(loaded[case]),
+        }
+
+    for case, modules in loaded.items():
+        eager = [name for name in modules if name in DEFERRED]
+        assert not eager, f"Imported with {case}: {eager}"
+
+    regressions = check_against_baseline("import_time", results)
+    assert not regressions, "Import time regressions:\n" + "\n".join(regressions)
@@ -0,0 +1,118 @@
+"""Per-call cost of media player properties read on every state write.
+
+Home Assistant reads these whenever a WiiM media player writes its state, so
+their cost is paid on every poll and every UPnP event. Each property is
+timed for a solo speaker, a group master and a slave, using the realistic
+Player mocks from ``tests/fixtures/realistic_player.py`` and real entity
+registry entries (``group_members`` resolves members through the registry).
+
+Results are microseconds per call (best of ``REPEATS`` runs of
+``ITERATIONS`` calls) and are checked against
+``tests/benchmarks/baselines/media_player_hot_paths.json``.
+
+Run with ``WIIM_BENCHMARK=1 pytest tests/benchmarks``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wiim.announce_queue import AnnouncementQueue
+from custom_components.wiim.browse_cache import BrowseCache
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.media_player import WiiMMediaPlayer
+from custom_components.wiim.queue_cache import QueueCache
+from tests.fixtures.realistic_player import create_realistic_group, create_realistic_player
+
+from .baseline import check_against_baseline
+
+pytestmark = pytest.mark.benchmark
+
+ITERATIONS = 2000
+REPEATS = 5
+
+HOT_PATHS: dict[str, Callable[[WiiMMediaPlayer], Any]] = {
+    "source": lambda entity: entity.source,
+    "source_list": lambda entity: entity.source_list,
+    "group_members": lambda entity: entity.group_members,
+    "media_image_hash": lambda entity: entity.media_image_hash,
+    "extra_state_attributes": lambda entity: entity.extra_state_attributes,
+    "update_position": lambda entity: entity._update_position_from_coordinator(),
+}
+
+
+def _entity(hass: HomeAssistant, player: MagicMock, name: str) -> WiiMMediaPlayer:
+    """Create a registered media player entity for ``player``."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": player.host}, unique_id=player.uuid)
+    entry.add_to_hass(hass)
+    player.name = name
+    player.device_info = None
+    player.source = "spotify"
+    player.available_sources = ["Spotify", "Bluetooth", "Line In", "Optical", "AirPlay"]
+    player.media_image_url = f"http://{player.host}/cover.jpg"
+    player.media_position = 42
+    player.media_duration = 240
+
+    coordinator = MagicMock()
+    coordinator.data = {"player": player}
+    coordinator.player = player
+    coordinator.last_update_success = True
+    coordinator.announcement_queue = AnnouncementQueue(name, default_hold=0)
+    coordinator.browse_cache = BrowseCache()
+    coordinator.queue_cache = QueueCache()
+
+    entity = WiiMMediaPlayer(coordinator, entry)
+    entity.hass = hass
+    entity.entity_id = (
+        er.async_get(hass)
+        .async_get_or_create("media_player", DOMAIN, player.uuid, config_entry=entry, suggested_object_id=name)
+        .entity_id
+    )
+    return entity
+
+
+def _per_call_us(func: Callable[[WiiMMediaPlayer], Any], entity: WiiMMediaPlayer) -> float:
+    """Return the best average time of one call in microseconds."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for _ in range(ITERATIONS):
+            func(entity)
+        best = min(best, time.perf_counter() - started)
+    return round(best / ITERATIONS * 1_000_000, 2)
+
+
+async def test_media_player_hot_paths(hass: HomeAssistant, caplog: pytest.LogCaptureFixture) -> None:
+    """Time each hot property for solo, master and slave speakers."""
+    # The test harness logs at DEBUG; time what users run.
+    caplog.set_level(logging.INFO, logger="custom_components.wiim")
+    solo = create_realistic_player(host="192.168.1.100", role="solo", play_state="play")
+    master = create_realistic_player(host="192.168.1.101", role="master", play_state="play")
+    slave = create_realistic_player(host="192.168.1.102", role="slave", play_state="play")
+    for player, uuid in ((solo, "solo-uuid"), (master, "master-uuid"), (slave, "slave-uuid")):
+        player.uuid = uuid
+    create_realistic_group(master, [slave])
+
+    entities = {
+        "solo": _entity(hass, solo, "solo"),
+        "master": _entity(hass, master, "master"),
+        "slave": _entity(hass, slave, "slave"),
+    }
+    assert entities["slave"].group_members == ["media_player.master", "media_player.slave"]
+
+    results = {
+        role: {f"{name}_us": _per_call_us(func, entity) for name, func in HOT_PATHS.items()}
+        for role, entity in entities.items()
+    }
+
+    regressions = check_against_baseline("media_player_hot_paths", results)
+    assert not regressions, "Media player hot path regressions:\n" + "\n".join(regressions)
@@ -19,7 +19,11 @@ if str(STUBS_DIR) not in sys.path:
     sys.path.insert(0, str(STUBS_DIR))
 
 # Import WiiM components at module level
-from custom_components.wiim.const import DOMAIN  # noqa: E402
+from custom_components.wiim.announce_queue import AnnouncementQueue  # noqa: E402
+from custom_components.wiim.browse_cache import BrowseCache  # noqa: E402
+from custom_components.wiim.const import DATA_FIRMWARE_UPDATE, DOMAIN  # noqa: E402
+from custom_components.wiim.queue_cache import QueueCache  # noqa: E402
+from custom_components.wiim.single_flight import SingleFlight  # noqa: E402
 
 from .const import MOCK_DEVICE_DATA, MOCK_STATUS_RESPONSE  # noqa: E402
 
@@ -172,6 +176,7 @@ def mock_wiim_client_fixture():
 def mock_coordinator_fixture():
     """Mock WiiM coordinator with standard data structure."""
     coordinator = MagicMock()
+    coordinator.single_flight = SingleFlight()
     # Create the proper data structure that matches what the real coordinator returns
     mock_status = MOCK_STATUS_RESPONSE.copy()
     mock_status["volume_level"] = 0.5  # Add parsed volume_level
@@ -193,9 +198,59 @@ def mock_coordinator_fixture():
     coordinator.player.host = "192.168.1.100"
     coordinator.player._host = "192.168.1.100"
     coordinator.ha_group_members = set()
+    coordinator.announcement_queue = AnnouncementQueue("192.168.1.100", default_hold=0)
+    coordinator.browse_cache = BrowseCache()
+    coordinator.queue_cache = QueueCache()
     return coordinator
 
 
+@pytest.fixture(name="register_speaker")
+def register_speaker_fixture(hass):
+    """Return a factory that registers a loaded speaker in ``hass.data[DOMAIN]``.
+
+    ``register_speaker(entry_id, player=None, model="WiiM_Pro", firmware=None,
+    update_available=False)`` stores a mock coordinator whose config entry has
+    ``entry_id``, the way ``async_setup_entry`` lays out ``hass.data``. Without
+    ``player`` a MagicMock player named ``entry_id`` is used. With ``firmware``
+    a firmware update entity on that version is stored under
+    ``DATA_FIRMWARE_UPDATE`` as well. Returns the coordinator.
+    """
+
+    def _register(
+        entry_id: str,
+        *,
+        player: MagicMock | None = None,
+        model: str = "WiiM_Pro",
+        firmware: str | None = None,
+        update_available: bool = False,
+    ) -> MagicMock:
+        if player is None:
+            player = MagicMock()
+            player.name = entry_id
+            player.host = f"{entry_id}.local"
+            player.model = model
+        coordinator = MagicMock()
+        coordinator.player = player
+        coordinator.single_flight = SingleFlight()
+        coordinator.last_update_success = True
+        coordinator.async_refresh = AsyncMock()
+        coordinator.entry = MagicMock(spec=ConfigEntry)
+        coordinator.entry.entry_id = entry_id
+
+        entry_data = {"coordinator": coordinator, "entry": coordinator.entry}
+        if firmware is not None:
+            entity = MagicMock()
+            entity.installed_version = firmware
+            entity.in_progress = False
+            entity.update_available = update_available
+            entity.update_percentage = None
+            entry_data[DATA_FIRMWARE_UPDATE] = entity
+        hass.data.setdefault(DOMAIN, {})[entry_id] = entry_data
+        return coordinator
+
+    return _register
+
+
 # ============================================================================
 # Error Simulation Fixtures (for testing error handling and API bypass)
 # ============================================================================
@@ -392,12 +447,6 @@ def bypass_get_data_fixture(hass):
             new_callable=AsyncMock,
             return_value=mock_capabilities,
         ),
-        # Also patch where it's imported in the integration module
-        patch(
-            "custom_components.wiim.__init__.WiiMClient._detect_capabilities",
-            new_callable=AsyncMock,
-            return_value=mock_capabilities,
-        ),
         patch(
             "pywiim.WiiMClient.get_player_status",
             return_value=mock_status,  # Use merged status instead of original
@@ -552,11 +601,15 @@ def wiim_coordinator(wiim_client):
 
     # Create coordinator with simplified data structure
     coordinator = MagicMock()
+    coordinator.single_flight = SingleFlight()
     coordinator.player = mock_player  # Remove dead code assignment
     coordinator.data = {"player": mock_player}
     coordinator.last_update_success = True
     coordinator.async_request_refresh = AsyncMock()
     coordinator.record_user_command = MagicMock()
+    coordinator.announcement_queue = AnnouncementQueue("192.168.1.100", default_hold=0)
+    coordinator.browse_cache = BrowseCache()
+    coordinator.queue_cache = QueueCache()
     return coordinator
 
 
@@ -584,6 +637,7 @@ def wiim_coordinator_slave(hass):
 
     # Create mock coordinator for slave
     slave_coordinator = MagicMock()
+    slave_coordinator.single_flight = SingleFlight()
     slave_coordinator.player = slave_player
     slave_coordinator.data = {"player": slave_player}
     slave_coordinator.last_update_success = True
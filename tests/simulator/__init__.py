@@ -0,0 +1,6 @@
+"""Local LinkPlay/WiiM HTTP device simulator for load and regression tests."""
+
+from .device import VirtualSpeaker
+from .server import FaultProfile, RemoteSpeaker, SimulatorFleet, SimulatorProcess
+
+__all__ = ["FaultProfile", "RemoteSpeaker", "SimulatorFleet", "SimulatorProcess", "VirtualSpeaker"]
@@ -0,0 +1,360 @@
+"""State and command handling for one simulated LinkPlay/WiiM speaker.
+
+Only the ``httpapi.asp`` commands pywiim issues during setup, polling,
+grouping and firmware updates are modelled; anything else answers
+``unknown command`` like real firmware does. Responses are built from plain
+state so tests can poke at ``VirtualSpeaker`` attributes directly.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+OK = "OK"
+UNKNOWN_COMMAND = "unknown command"
+
+EQ_PRESETS = ["Flat", "Acoustic", "Bass Booster", "Classical", "Dance", "Jazz", "Pop", "Rock", "Vocal"]
+
+# Firmware update timeline (seconds after getMvRemoteUpdateStart).
+UPDATE_DOWNLOAD_SECONDS = 2.0
+UPDATE_INSTALL_SECONDS = 4.0
+UPDATE_REBOOT_SECONDS = 3.0
+
+
+def _hex(text: str) -> str:
+    """Encode metadata the way LinkPlay firmware does in getPlayerStatusEx."""
+    return text.encode().hex().upper()
+
+
+@dataclass
+class VirtualSpeaker:
+    """One simulated speaker; ``host``/``port`` are filled in when it starts."""
+
+    index: int
+    name: str = ""
+    uuid: str = ""
+    mac: str = ""
+    project: str = "WiiM_Pro_with_gc4a"
+    firmware: str = "4.8.618000"
+    new_firmware: str | None = None
+    host: str = "127.0.0.1"
+    port: int = 0
+    shared_host: bool = True
+    volume: int = 30
+    mute: bool = False
+    play_state: str = "stop"
+    mode: str = "10"
+    loop_mode: int = 0
+    title: str = ""
+    artist: str = ""
+    album: str = ""
+    eq_enabled: bool = False
+    eq_preset: str = "Flat"
+    presets: list[dict[str, Any]] = field(default_factory=list)
+    subwoofer: dict[str, Any] = field(
+        default_factory=lambda: {
+            "status": 0,
+            "plugged": 0,
+            "cross": 80,
+            "phase": 0,
+            "level": 0,
+            "sub_delay": 0,
+            "main_filter": 0,
+            "sub_filter": 0,
+        }
+    )
+    master: VirtualSpeaker | None = None
+    slaves: list[VirtualSpeaker] = field(default_factory=list)
+    offline: bool = False
+    requests: Counter[str] = field(default_factory=Counter)
+    _update_started: float | None = None
+
+    def __post_init__(self) -> None:
+        """Derive stable identifiers from the index."""
+        self.name = self.name or f"Sim Speaker {self.index:03d}"
+        self.uuid = self.uuid or f"5153494D{self.index:016X}"
+        suffix = f"{self.index:06X}"
+        self.mac = self.mac or f"02:53:49:{suffix[0:2]}:{suffix[2:4]}:{suffix[4:6]}"
+        if not self.presets:
+            self.presets = [
+                {"number": n, "name": f"Station {n}", "url": f"http://radio.invalid/{n}", "picurl": "unknow"}
+                for n in range(1, 7)
+            ]
+
+    @property
+    def ip(self) -> str:
+        """Return the address reported to clients and used for group joins.
+
+        Speakers sharing 127.0.0.1 are told apart by port, so they report
+        ``host:port``; speakers with their own loopback address report it alone.
+        """
+        return self.address if self.shared_host else self.host
+
+    @property
+    def address(self) -> str:
+        """Return ``host:port`` as accepted by ``WiiMClient``."""
+        return f"{self.host}:{self.port}"
+
+    # ------------------------------------------------------------------
+    # Firmware update timeline
+    # ------------------------------------------------------------------
+
+    def _update_elapsed(self) -> float | None:
+        """Return seconds since the update started, finishing it when done."""
+        if self._update_started is None:
+            return None
+        elapsed = time.monotonic() - self._update_started
+        if elapsed >= UPDATE_DOWNLOAD_SECONDS + UPDATE_INSTALL_SECONDS + UPDATE_REBOOT_SECONDS:
+            self.firmware = self.new_firmware or self.firmware
+            self.new_firmware = None
+            self._update_started = None
+            return None
+        return elapsed
+
+    @property
+    def rebooting(self) -> bool:
+        """Return True while the simulated post-update reboot is running."""
+        elapsed = self._update_elapsed()
+        return elapsed is not None and elapsed >= UPDATE_DOWNLOAD_SECONDS + UPDATE_INSTALL_SECONDS
+
+    def _download_status(self) -> dict[str, str]:
+        elapsed = self._update_elapsed()
+        if elapsed is None:
+            return {"status": "0"}
+        if elapsed < UPDATE_DOWNLOAD_SECONDS / 2:
+            return {"status": "25"}
+        if elapsed < UPDATE_DOWNLOAD_SECONDS:
+            return {"status": "27"}
+        return {"status": "30"}
+
+    def _install_status(self) -> dict[str, str]:
+        elapsed = self._update_elapsed()
+        if elapsed is None or elapsed < UPDATE_DOWNLOAD_SECONDS:
+            return {"status": "0", "progress": "0"}
+        progress = min(100, int((elapsed - UPDATE_DOWNLOAD_SECONDS) / UPDATE_INSTALL_SECONDS * 100))
+        return {"status": "1", "progress": str(progress)}
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+
+    def status_ex(self) -> dict[str, Any]:
+        """Return the getStatusEx / getDeviceInfo payload."""
+        self._update_elapsed()
+        in_group = self.master is not None
+        return {
+            "uuid": self.uuid,
+            "DeviceName": self.name,
+            "ssid": self.name,
+            "firmware": self.firmware,
+            "hardware": "A98",
+            "project": self.project,
+            "priv_prj": self.project,
+            "Release": "20250101",
+            "MAC": self.mac,
+            "STA_MAC": self.mac,
+            "ip": self.ip,
+            "wmrm_version": "4.2",
+            "group": "1" if in_group else "0",
+            "master_uuid": self.master.uuid if in_group else "",
+            "master_ip": self.master.ip if in_group else "",
+            "VersionUpdate": "1" if self.new_firmware else "0",
+            "NewVer": self.new_firmware or "0",
+            "preset_key": str(len(self.presets)),
+            "RSSI": "-48",
+            "WifiChannel": "36",
+        }
+
+    def player_status(self) -> dict[str, Any]:
+        """Return the getPlayerStatusEx payload."""
+        return {
+            "type": "0",
+            "ch": "0",
+            "mode": "99" if self.master is not None else self.mode,
+            "loop": str(self.loop_mode),
+            "eq": "0",
+            "status": self.play_state,
+            "curpos": "0",
+            "offset_pts": "0",
+            "totlen": "0",
+            "Title": _hex(self.title),
+            "Artist": _hex(self.artist),
+            "Album": _hex(self.album),
+            "alarmflag": "0",
+            "plicount": "0",
+            "plicurr": "0",
+            "vol": str(self.volume),
+            "mute": "1" if self.mute else "0",
+        }
+
+    def slave_list(self) -> dict[str, Any]:
+        """Return the multiroom:getSlaveList payload."""
+        return {
+            "slaves": len(self.slaves),
+            "slave_list": [
+                {
+                    "name": slave.name,
+                    "uuid": slave.uuid,
+                    "ip": slave.ip,
+                    "volume": slave.volume,
+                    "mute": int(slave.mute),
+                    "channel": 0,
+                }
+                for slave in self.slaves
+            ],
+        }
+
+    # ------------------------------------------------------------------
+    # Grouping
+    # ------------------------------------------------------------------
+
+    def join(self, master: VirtualSpeaker) -> None:
+        """Join ``master``'s group, leaving any previous group first."""
+        self.leave()
+        if master is self:
+            return
+        self.master = master
+        master.slaves.append(self)
+
+    def leave(self) -> None:
+        """Leave the current group; a master dissolves its whole group."""
+        if self.master is not None:
+            if self in self.master.slaves:
+                self.master.slaves.remove(self)
+            self.master = None
+        for slave in list(self.slaves):
+            slave.master = None
+        self.slaves.clear()
+
+    # ------------------------------------------------------------------
+    # Command dispatch
+    # ------------------------------------------------------------------
+
+    def handle(self, command: str, resolve: Callable[[str], VirtualSpeaker | None]) -> str | dict[str, Any] | list:
+        """Apply ``command`` and return a JSON-able payload or a plain-text body.
+
+        ``resolve`` maps an IP address to another speaker of the fleet; it is
+        used for group joins and kick-outs.
+        """
+        name, _, arg = command.partition(":")
+        self.requests[name if name != "setPlayerCmd" else f"setPlayerCmd:{arg.partition(':')[0]}"] += 1
+
+        if name in ("getStatusEx", "getDeviceInfo", "getStatus"):
+            return self.status_ex()
+        if name == "getPlayerStatusEx":
+            return self.player_status()
+        if name == "getMetaInfo":
+            return {"metaData": {"title": self.title, "artist": self.artist, "album": self.album}}
+        if name == "getMAC":
+            return {"MAC": self.mac}
+        if name == "getFirmwareVersion":
+            return {"firmware": self.firmware}
+        if name == "setPlayerCmd":
+            return self._player_cmd(arg)
+        if name == "multiroom":
+            return self._multiroom(arg, resolve)
+        if name == "ConnectMasterAp":
+            # ConnectMasterAp:JoinGroupMaster:eth<master_ip>:wifi0.0.0.0
+            _, _, rest = arg.partition("JoinGroupMaster:eth")
+            master = resolve(rest.rpartition(":wifi")[0]) if rest else None
+            if master is None:
+                return UNKNOWN_COMMAND
+            self.join(master)
+            return OK
+        if name == "EQGetBand":
+            return {"EQStat": "On" if self.eq_enabled else "Off", "Name": self.eq_preset}
+        if name == "EQGetStat":
+            return {"EQStat": "On" if self.eq_enabled else "Off"}
+        if name == "EQGetList":
+            return list(EQ_PRESETS)
+        if name == "EQLoad":
+            if arg not in EQ_PRESETS:
+                return {"status": "Failed"}
+            self.eq_preset, self.eq_enabled = arg, True
+            return {"status": "OK"}
+        if name in ("EQOn", "EQOff"):
+            self.eq_enabled = name == "EQOn"
+            return {"status": "OK"}
+        if name == "getPresetInfo":
+            return {"preset_num": len(self.presets), "preset_list": self.presets}
+        if name == "MCUKeyShortClick":
+            preset = next((p for p in self.presets if str(p["number"]) == arg), None)
+            if preset is None:
+                return UNKNOWN_COMMAND
+            self.title, self.play_state = preset["name"], "play"
+            return OK
+        if name == "getSubLPF":
+            return dict(self.subwoofer)
+        if name == "setSubLPF":
+            key, _, value = arg.partition(":")
+            if key not in self.subwoofer:
+                return UNKNOWN_COMMAND
+            self.subwoofer[key] = int(value)
+            return OK
+        if name == "getMvRemoteUpdateStartCheck":
+            return {"status": "1" if self.new_firmware else "0", "new_version": self.new_firmware or ""}
+        if name == "getMvRemoteUpdateStart":
+            if not self.new_firmware:
+                return {"status": "0"}
+            self._update_started = time.monotonic()
+            return OK
+        if name == "getMvRemoteUpdateStatus":
+            return self._download_status()
+        if name == "getMvRomBurnPrecent":
+            return self._install_status()
+        return UNKNOWN_COMMAND
+
+    def _player_cmd(self, arg: str) -> str:
+        action, _, value = arg.partition(":")
+        if action in ("play", "resume") and not value:
+            self.play_state = "play"
+        elif action == "play":
+            self.title, self.play_state = value, "play"
+        elif action == "playPromptUrl":
+            pass  # the prompt plays over the current stream
+        elif action in ("pause", "onepause"):
+            self.play_state = "pause"
+        elif action == "stop":
+            self.play_state = "stop"
+        elif action in ("next", "prev", "seek", "clear_playlist"):
+            pass
+        elif action == "vol":
+            self.volume = max(0, min(100, int(value)))
+        elif action == "mute":
+            self.mute = value == "1"
+        elif action == "loopmode":
+            self.loop_mode = int(value)
+        elif action == "switchmode":
+            self.mode = value
+        else:
+            return UNKNOWN_COMMAND
+        return OK
+
+    def _multiroom(self, arg: str, resolve: Callable[[str], VirtualSpeaker | None]) -> str | dict[str, Any]:
+        action, _, value = arg.partition(":")
+        if action == "getSlaveList":
+            return self.slave_list()
+        if action == "Ungroup":
+            self.leave()
+            return OK
+        # multiroom:<action>:<slave_ip>[:<setting>]; a shared-host ip contains a port.
+        if action == "SlaveKickout":
+            slave_ip, setting = value, ""
+        else:
+            slave_ip, _, setting = value.rpartition(":")
+        slave = resolve(slave_ip) if slave_ip else None
+        if slave is None or slave not in self.slaves:
+            return UNKNOWN_COMMAND
+        if action == "SlaveKickout":
+            slave.leave()
+        elif action == "SlaveVolume":
+            slave.volume = max(0, min(100, int(setting)))
+        elif action == "SlaveMute":
+            slave.mute = setting == "1"
+        else:
+            return UNKNOWN_COMMAND
+        return OK
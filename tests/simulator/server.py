@@ -0,0 +1,249 @@
+"""aiohttp server running a fleet of simulated speakers with fault injection.
+
+All speakers share one ``web.Application`` and one ``AppRunner``; each gets
+its own ``TCPSite`` and the handler picks the speaker by the socket the
+request arrived on. That keeps 100+ speakers cheap enough for CI.
+
+By default every speaker listens on 127.0.0.1 with an OS-assigned port and
+reports ``127.0.0.1:<port>`` as its IP, which is what group joins and slave
+lists then carry. With ``distinct_hosts=True`` speaker *n* binds its own
+loopback address (127.0.x.y, Linux only) on the same port and reports a
+plain IP, like real speakers do; Home Assistant's test plugin only allows
+127.0.0.1, so unit tests use the default.
+
+``SimulatorProcess`` runs a fleet in a child process
+(``scripts/linkplay-simulator.py``), so benchmarks measure the client side
+alone: the simulator's request handling neither adds to the process' CPU time
+nor competes for the GIL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from .device import VirtualSpeaker
+
+_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "linkplay-simulator.py"
+
+
+@dataclass
+class FaultProfile:
+    """Network faults applied to every request of a speaker.
+
+    ``latency`` and ``jitter`` are seconds. ``loss`` is the probability that
+    the connection is dropped without a response; ``timeout`` the probability
+    that the response is held for ``timeout_delay`` seconds (longer than any
+    client timeout). ``offline_windows`` are ``(start, end)`` offsets in
+    seconds from fleet start during which every request is dropped.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    loss: float = 0.0
+    timeout: float = 0.0
+    timeout_delay: float = 60.0
+    offline_windows: list[tuple[float, float]] = field(default_factory=list)
+
+    def is_offline(self, elapsed: float) -> bool:
+        """Return True if ``elapsed`` falls inside an offline window."""
+        return any(start <= elapsed < end for start, end in self.offline_windows)
+
+
+def _loopback_host(index: int) -> str:
+    """Return a distinct loopback address for speaker ``index``."""
+    return f"127.0.{index // 254 + 1}.{index % 254 + 1}"
+
+
+class SimulatorFleet:
+    """Start, look up and stop a set of simulated speakers.
+
+    Use as an async context manager::
+
+        async with SimulatorFleet(100, faults=FaultProfile(latency=0.02)) as fleet:
+            client = WiiMClient(fleet.speakers[0].address, protocol="http")
+    """
+
+    def __init__(
+        self,
+        count: int,
+        *,
+        faults: FaultProfile | None = None,
+        distinct_hosts: bool = False,
+        port: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        """Create ``count`` speakers; nothing listens until ``async_start``."""
+        if distinct_hosts and not sys.platform.startswith("linux"):
+            raise RuntimeError("distinct_hosts needs the whole 127.0.0.0/8 range (Linux)")
+        self.speakers = [
+            VirtualSpeaker(index, host=_loopback_host(index), shared_host=False)
+            if distinct_hosts
+            else VirtualSpeaker(index)
+            for index in range(count)
+        ]
+        self.default_faults = faults or FaultProfile()
+        self.faults: dict[str, FaultProfile] = {}
+        self._port = port
+        self._random = random.Random(seed)
+        self._by_socket: dict[tuple[str, int], VirtualSpeaker] = {}
+        self._runner: web.AppRunner | None = None
+        self._started_at = 0.0
+
+    async def __aenter__(self) -> SimulatorFleet:
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.async_stop()
+
+    def faults_for(self, speaker: VirtualSpeaker) -> FaultProfile:
+        """Return the fault profile of ``speaker`` (per-speaker override or fleet default)."""
+        return self.faults.get(speaker.uuid, self.default_faults)
+
+    def set_faults(self, speaker: VirtualSpeaker, faults: FaultProfile) -> None:
+        """Override the fault profile of one speaker."""
+        self.faults[speaker.uuid] = faults
+
+    def resolve(self, ip: str) -> VirtualSpeaker | None:
+        """Return the speaker reporting ``ip``, or None."""
+        return next((speaker for speaker in self.speakers if speaker.ip == ip), None)
+
+    async def async_start(self) -> None:
+        """Bind every speaker and start serving."""
+        app = web.Application()
+        app.router.add_get("/httpapi.asp", self._handle)
+        self._runner = web.AppRunner(app, access_log=None, handle_signals=False)
+        await self._runner.setup()
+        for speaker in self.speakers:
+            site = web.TCPSite(self._runner, speaker.host, self._port, reuse_address=True)
+            await site.start()
+            server = site._server  # noqa: SLF001 - only way to learn an OS-assigned port
+            sockname = server.sockets[0].getsockname()  # type: ignore[union-attr]
+            speaker.port = sockname[1]
+            self._by_socket[(speaker.host, speaker.port)] = speaker
+        self._started_at = time.monotonic()
+
+    async def async_stop(self) -> None:
+        """Stop serving and close all sockets."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self._by_socket.clear()
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        sockname = request.transport.get_extra_info("sockname") if request.transport else None
+        speaker = self._by_socket.get((sockname[0], sockname[1])) if sockname else None
+        if speaker is None:
+            raise web.HTTPNotFound
+
+        faults = self.faults_for(speaker)
+        if speaker.offline or speaker.rebooting or faults.is_offline(time.monotonic() - self._started_at):
+            return self._drop(request)
+        if faults.loss and self._random.random() < faults.loss:
+            return self._drop(request)
+        if faults.timeout and self._random.random() < faults.timeout:
+            await asyncio.sleep(faults.timeout_delay)
+        delay = faults.latency + (self._random.uniform(0, faults.jitter) if faults.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        payload: Any = speaker.handle(request.query.get("command", ""), self.resolve)
+        if isinstance(payload, str):
+            return web.Response(text=payload)
+        return web.Response(text=json.dumps(payload), content_type="text/html")
+
+    @staticmethod
+    def _drop(request: web.Request) -> web.StreamResponse:
+        """Close the connection without answering (looks like packet loss to the client)."""
+        if request.transport is not None:
+            request.transport.abort()
+        return web.Response(status=503)
+
+
+@dataclass(frozen=True)
+class RemoteSpeaker:
+    """A speaker served by a ``SimulatorProcess``, as printed by the simulator script."""
+
+    name: str
+    host: str
+    port: int
+    uuid: str
+
+    @property
+    def address(self) -> str:
+        """Return ``host:port`` as accepted by ``WiiMClient``."""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def ip(self) -> str:
+        """Return the address used for group joins (speakers share 127.0.0.1)."""
+        return self.address
+
+
+class SimulatorProcess:
+    """Run a fleet of ``count`` speakers in a child process.
+
+    Speakers are changed over HTTP, the way the integration changes real ones::
+
+        with SimulatorProcess(200, seed=1) as simulator:
+            master, slave = simulator.speakers[:2]
+            await simulator.async_join(slave, master)
+    """
+
+    def __init__(self, count: int, *, seed: int | None = None) -> None:
+        """Prepare the fleet; nothing runs until entered."""
+        self.count = count
+        self.seed = seed
+        self.speakers: list[RemoteSpeaker] = []
+        self._process: subprocess.Popen[str] | None = None
+
+    def __enter__(self) -> SimulatorProcess:
+        args = [sys.executable, "-u", str(_SCRIPT), "--count", str(self.count)]
+        if self.seed is not None:
+            args += ["--seed", str(self.seed)]
+        self._process = subprocess.Popen(args, stdout=subprocess.PIPE, text=True)
+        assert self._process.stdout is not None
+        try:
+            # One "name<TAB>host:port<TAB>uuid" line per speaker once all are listening.
+            for _ in range(self.count):
+                line = self._process.stdout.readline()
+                if not line:
+                    raise RuntimeError(f"Simulator exited with {self._process.wait()}")
+                name, address, uuid = line.rstrip("\n").split("\t")
+                host, _, port = address.rpartition(":")
+                self.speakers.append(RemoteSpeaker(name, host, int(port), uuid))
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+            if process.stdout is not None:
+                process.stdout.close()
+
+    async def async_command(self, speaker: RemoteSpeaker, command: str) -> str:
+        """Send one ``httpapi.asp`` command to ``speaker`` and return the raw answer."""
+        async with (
+            aiohttp.ClientSession() as session,
+            session.get(f"http://{speaker.address}/httpapi.asp", params={"command": command}) as response,
+        ):
+            return await response.text()
+
+    async def async_join(self, speaker: RemoteSpeaker, master: RemoteSpeaker) -> None:
+        """Make ``speaker`` a slave of ``master``."""
+        await self.async_command(speaker, f"ConnectMasterAp:JoinGroupMaster:eth{master.ip}:wifi0.0.0.0")
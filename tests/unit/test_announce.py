@@ -0,0 +1,221 @@
+"""Unit tests for WiiM announce helpers and the wiim.announce action."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from pywiim.exceptions import WiiMConnectionError
+from pywiim.player.media import NotificationPlaybackResult
+
+from custom_components.wiim.announce import async_resolve_media_url, cache_bust_url
+from custom_components.wiim.announce_queue import AnnouncementQueue
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.services import SERVICE_ANNOUNCE, async_setup_services
+
+
+def _coordinator(result: NotificationPlaybackResult | Exception) -> MagicMock:
+    coordinator = MagicMock()
+    coordinator.announcement_queue = AnnouncementQueue("test", default_hold=0)
+    if isinstance(result, Exception):
+        coordinator.player.play_notification = AsyncMock(side_effect=result)
+    else:
+        coordinator.player.play_notification = AsyncMock(return_value=result)
+    return coordinator
+
+
+@pytest.fixture
+async def speakers(hass: HomeAssistant):
+    """Two speakers (plus a group entity sharing the kitchen coordinator)."""
+    kitchen = _coordinator(
+        NotificationPlaybackResult(method_used="prompt", source_before="wifi", likely_interrupted=False)
+    )
+    office = _coordinator(
+        NotificationPlaybackResult(
+            method_used="play_url", source_before="spotify", likely_interrupted=True, reason="unsupported source"
+        )
+    )
+    lookup = {
+        "media_player.kitchen": kitchen,
+        "media_player.kitchen_group": kitchen,
+        "media_player.office": office,
+    }
+    await async_setup_services(hass)
+    with patch(
+        "custom_components.wiim.announce.get_coordinator_from_entity_id",
+        side_effect=lambda _hass, entity_id: lookup.get(entity_id),
+    ):
+        yield kitchen, office
+
+
+class TestAnnounceHelpers:
+    """Test URL helpers shared with media_player."""
+
+    def test_cache_bust_url_appends_query(self):
+        """Timestamp is added as a new query or an extra param."""
+        assert "?_=" in cache_bust_url("http://ha/tts.mp3")
+        assert "&_=" in cache_bust_url("http://ha/tts.mp3?voice=a")
+
+    @pytest.mark.asyncio
+    async def test_resolve_plain_url_is_unchanged(self, hass: HomeAssistant):
+        """Non media-source ids are passed straight through."""
+        assert await async_resolve_media_url(hass, "http://ha/a.mp3", None) == "http://ha/a.mp3"
+
+
+class TestAnnounceAction:
+    """Test the wiim.announce domain action."""
+
+    @pytest.mark.asyncio
+    async def test_announce_fires_all_targets_with_same_url(self, hass: HomeAssistant, speakers):
+        """Every speaker gets one play_notification with the same cache-busted URL."""
+        kitchen, office = speakers
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_ANNOUNCE,
+            {
+                "entity_id": ["media_player.kitchen", "media_player.kitchen_group", "media_player.office"],
+                "media_content_id": "http://example.com/chime.mp3",
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+        kitchen.player.play_notification.assert_awaited_once()
+        office.player.play_notification.assert_awaited_once()
+        url = kitchen.player.play_notification.call_args.args[0]
+        assert url == office.player.play_notification.call_args.args[0] == response["url"]
+        assert url.startswith("http://example.com/chime.mp3?_=")
+
+        assert set(response["speakers"]) == {"media_player.kitchen", "media_player.office"}
+        assert response["speakers"]["media_player.kitchen"]["method_used"] == "prompt"
+        assert response["speakers"]["media_player.office"]["likely_interrupted"] is True
+        assert response["skew_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_announce_media_source_resolved_and_prewarmed_once(self, hass: HomeAssistant, speakers):
+        """media-source ids are resolved and pre-warmed once for the whole burst."""
+        resolve = AsyncMock(return_value="http://192.168.1.2:8123/api/tts_proxy/abc.mp3")
+        prewarm = AsyncMock()
+        with (
+            patch("custom_components.wiim.announce.async_resolve_media_url", resolve),
+            patch("custom_components.wiim.announce._async_prewarm", prewarm),
+        ):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_ANNOUNCE,
+                {
+                    "entity_id": ["media_player.kitchen", "media_player.office"],
+                    "media_content_id": "media-source://tts/demo?message=hi",
+                },
+                blocking=True,
+            )
+
+        resolve.assert_awaited_once()
+        prewarm.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_announce_reports_partial_failure(self, hass: HomeAssistant, speakers):
+        """A failing speaker is reported without stopping the others."""
+        kitchen, _office = speakers
+        kitchen.player.play_notification = AsyncMock(side_effect=WiiMConnectionError("offline"))
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_ANNOUNCE,
+            {"entity_id": ["media_player.kitchen", "media_player.office"], "media_content_id": "http://x/a.mp3"},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert "offline" in response["speakers"]["media_player.kitchen"]["error"]
+        assert response["speakers"]["media_player.office"]["method_used"] == "play_url"
+
+    @pytest.mark.asyncio
+    async def test_announce_reports_cancelled_speaker(self, hass: HomeAssistant, speakers):
+        """A speaker whose announcement is cancelled is reported instead of breaking the response."""
+        kitchen, _office = speakers
+        kitchen.announcement_queue.async_announce = AsyncMock(side_effect=asyncio.CancelledError)
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_ANNOUNCE,
+            {"entity_id": ["media_player.kitchen", "media_player.office"], "media_content_id": "http://x/a.mp3"},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert response["speakers"]["media_player.kitchen"] == {"error": "cancelled"}
+        assert response["speakers"]["media_player.office"]["method_used"] == "play_url"
+
+    @pytest.mark.asyncio
+    async def test_announce_reports_speaker_unloaded_mid_announcement(self, hass: HomeAssistant, speakers):
+        """An announcement cancelled by unloading the entry is reported as cancelled, not dropped."""
+        kitchen, _office = speakers
+
+        started = asyncio.Event()
+
+        async def _play_forever(_url):
+            started.set()
+            await asyncio.Event().wait()
+
+        kitchen.player.play_notification = AsyncMock(side_effect=_play_forever)
+
+        call = hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_ANNOUNCE,
+                {"entity_id": ["media_player.kitchen", "media_player.office"], "media_content_id": "http://x/a.mp3"},
+                blocking=True,
+                return_response=True,
+            )
+        )
+        await started.wait()
+        kitchen.announcement_queue.async_cancel()
+        response = await call
+
+        assert response["speakers"]["media_player.kitchen"] == {"error": "cancelled"}
+        assert response["speakers"]["media_player.office"]["method_used"] == "play_url"
+
+    @pytest.mark.asyncio
+    async def test_announce_times_play_not_queue_wait(self, hass: HomeAssistant, speakers):
+        """A speaker busy with an earlier announcement reports play time, and the skew shows its late start."""
+        _kitchen, office = speakers
+        release = asyncio.Event()
+        busy = hass.async_create_task(office.announcement_queue.async_announce("earlier", release.wait))
+        await asyncio.sleep(0)
+        assert office.announcement_queue.busy
+
+        announce = hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_ANNOUNCE,
+                {"entity_id": ["media_player.kitchen", "media_player.office"], "media_content_id": "http://x/a.mp3"},
+                blocking=True,
+                return_response=True,
+            )
+        )
+        await asyncio.sleep(0.1)
+        release.set()
+        response = await announce
+        await busy
+
+        assert response["speakers"]["media_player.office"]["elapsed_ms"] < 100
+        assert response["speakers"]["media_player.kitchen"]["elapsed_ms"] < 100
+        assert response["skew_ms"] >= 100
+
+    @pytest.mark.asyncio
+    async def test_announce_all_failed_raises(self, hass: HomeAssistant, speakers):
+        """When no speaker accepted the announcement the action fails."""
+        kitchen, office = speakers
+        kitchen.player.play_notification = AsyncMock(side_effect=WiiMConnectionError("offline"))
+        office.player.play_notification = AsyncMock(side_effect=WiiMConnectionError("offline"))
+
+        with pytest.raises(HomeAssistantError, match="failed on all 2"):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_ANNOUNCE,
+                {"entity_id": ["media_player.kitchen", "media_player.office"], "media_content_id": "http://x/a.mp3"},
+                blocking=True,
+            )
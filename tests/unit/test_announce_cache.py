@@ -0,0 +1,174 @@
+"""Unit tests for the WiiM announcement cache and its HTTP view."""
+
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.wiim.announce import async_announcement_url
+from custom_components.wiim.announce_cache import (
+    DATA_ANNOUNCEMENT_CACHE,
+    AnnouncementCache,
+    AnnouncementCacheView,
+)
+from custom_components.wiim.const import DOMAIN
+
+TTS_ID = "media-source://tts/demo?message=Doorbell"
+TTS_URL = "http://192.168.1.2:8123/api/tts_proxy/abc.mp3"
+CHIME_BYTES = b"ID3" + b"\x00" * 2048
+
+
+@pytest.fixture
+async def cache(hass: HomeAssistant, tmp_path):
+    """Loaded cache in a temp config dir with a known internal URL."""
+    hass.config.config_dir = str(tmp_path)
+    hass.config.internal_url = "http://192.168.1.2:8123"
+    cache = AnnouncementCache(hass)
+    await cache.async_load()
+    hass.data.setdefault(DOMAIN, {})[DATA_ANNOUNCEMENT_CACHE] = cache
+    return cache
+
+
+class TestAnnouncementCache:
+    """Test cache fill, hits, dedup and eviction."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit_fetches_once(self, hass: HomeAssistant, cache, aioclient_mock):
+        """Second lookup is served from disk without another fetch."""
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES, headers={"Content-Type": "audio/mpeg"})
+
+        first = await cache.async_get_url(TTS_ID, TTS_URL)
+        second = await cache.async_get_url(TTS_ID, TTS_URL)
+
+        assert first == second
+        assert first.startswith("http://192.168.1.2:8123/api/wiim/announce/")
+        assert first.endswith(".mp3")
+        assert aioclient_mock.call_count == 1
+        stats = cache.as_dict()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["total_bytes"] == len(CHIME_BYTES)
+
+        filename = first.rsplit("/", 1)[1]
+        path = cache.file_path(filename)
+        assert await hass.async_add_executor_job(path.read_bytes) == CHIME_BYTES
+
+    @pytest.mark.asyncio
+    async def test_identical_content_shares_one_file(self, cache, aioclient_mock):
+        """Different media ids with the same bytes are stored once."""
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES)
+        aioclient_mock.get("http://192.168.1.2:8123/local/chime.mp3", content=CHIME_BYTES)
+
+        first = await cache.async_get_url(TTS_ID, TTS_URL)
+        second = await cache.async_get_url(
+            "media-source://media_source/local/chime.mp3", "http://192.168.1.2:8123/local/chime.mp3"
+        )
+
+        assert first == second
+        assert cache.as_dict()["entries"] == 1
+        assert cache.as_dict()["indexed_media"] == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_keeps_size_bounded(self, hass: HomeAssistant, aioclient_mock, tmp_path):
+        """Least recently used files are evicted once max_bytes is exceeded."""
+        hass.config.config_dir = str(tmp_path)
+        hass.config.internal_url = "http://192.168.1.2:8123"
+        cache = AnnouncementCache(hass, max_bytes=2500)
+        await cache.async_load()
+        for name in ("a", "b", "c"):
+            aioclient_mock.get(f"http://ha/{name}.mp3", content=name.encode() * 1000)
+
+        await cache.async_get_url("media-source://a", "http://ha/a.mp3")
+        await cache.async_get_url("media-source://b", "http://ha/b.mp3")
+        await cache.async_get_url("media-source://a", "http://ha/a.mp3")  # a is now most recent
+        await cache.async_get_url("media-source://c", "http://ha/c.mp3")
+
+        stats = cache.as_dict()
+        assert stats["evictions"] == 1
+        assert stats["total_bytes"] <= 2500
+        assert await cache.async_get_url("media-source://a", "http://ha/a.mp3") is not None
+        assert stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_clip_duration_recorded(self, cache, aioclient_mock):
+        """The clip length is stored so the announcement queue can hold the speaker."""
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES)
+
+        with patch("custom_components.wiim.announce_cache._audio_duration", return_value=2.5):
+            url = await cache.async_get_url(TTS_ID, TTS_URL)
+
+        assert cache.duration(url) == 2.5
+        assert cache.duration("http://x/unknown.mp3") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_mapping_is_fetched_again(self, cache, aioclient_mock):
+        """A media id older than the index TTL is refetched; changed audio gets a new URL."""
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES)
+        first = await cache.async_get_url(TTS_ID, TTS_URL)
+
+        aioclient_mock.clear_requests()
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES + b"\x01")
+        with patch("custom_components.wiim.announce_cache._INDEX_TTL_SECONDS", -1):
+            second = await cache.async_get_url(TTS_ID, TTS_URL)
+
+        assert second != first
+        assert aioclient_mock.call_count == 1
+        stats = cache.as_dict()
+        assert stats["expired"] == 1
+        assert stats["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_served_url_prefers_internal_url(self, hass: HomeAssistant, cache, aioclient_mock):
+        """Speakers get the LAN URL even when HA serves SSL and has an external URL."""
+        hass.config.external_url = "https://example.ui.nabu.casa"
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES)
+
+        with patch.object(hass.config, "api", MagicMock(use_ssl=True)):
+            url = await cache.async_get_url(TTS_ID, TTS_URL)
+
+        assert url.startswith("http://192.168.1.2:8123/api/wiim/announce/")
+
+    @pytest.mark.asyncio
+    async def test_fetch_failure_falls_back(self, cache, aioclient_mock):
+        """A failed fetch returns None so the caller plays the source URL."""
+        aioclient_mock.get(TTS_URL, status=HTTPStatus.NOT_FOUND)
+
+        assert await cache.async_get_url(TTS_ID, TTS_URL) is None
+        assert cache.as_dict()["fetch_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_announcement_url_skips_cache_busting_when_cached(self, hass: HomeAssistant, cache, aioclient_mock):
+        """Cached announcements use the stable content URL; plain URLs are busted."""
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES)
+
+        cached_url, cached = await async_announcement_url(hass, TTS_ID, TTS_URL)
+        plain_url, plain_cached = await async_announcement_url(hass, "http://x/a.mp3", "http://x/a.mp3")
+
+        assert cached is True
+        assert "_=" not in cached_url
+        assert plain_cached is False
+        assert plain_url.startswith("http://x/a.mp3?_=")
+
+
+class TestAnnouncementCacheView:
+    """Test the HTTP view that serves cached files."""
+
+    @pytest.mark.asyncio
+    async def test_view_serves_cached_file(self, hass: HomeAssistant, cache, aioclient_mock, hass_client_no_auth):
+        """Cached audio is served with Content-Length; unknown names are 404."""
+        await async_setup_component(hass, "http", {})
+        hass.http.register_view(AnnouncementCacheView(cache))
+        aioclient_mock.get(TTS_URL, content=CHIME_BYTES, headers={"Content-Type": "audio/mpeg"})
+        url = await cache.async_get_url(TTS_ID, TTS_URL)
+        path = url.split("8123", 1)[1]
+
+        client = await hass_client_no_auth()
+        response = await client.get(path)
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Content-Length"] == str(len(CHIME_BYTES))
+        assert await response.read() == CHIME_BYTES
+
+        missing = await client.get("/api/wiim/announce/" + "0" * 64 + ".mp3")
+        assert missing.status == HTTPStatus.NOT_FOUND
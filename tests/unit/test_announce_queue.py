@@ -0,0 +1,199 @@
+"""Unit tests for the per-speaker announcement queue."""
+
+import asyncio
+
+import pytest
+
+from custom_components.wiim.announce_queue import ANNOUNCEMENT_CANCELLED, AnnouncementQueue
+from custom_components.wiim.const import (
+    ANNOUNCE_QUEUE_FIFO,
+    ANNOUNCE_QUEUE_LATEST_WINS,
+    ANNOUNCE_QUEUE_PRIORITY,
+)
+
+
+class _Speaker:
+    """Records announcements; the first one blocks until released."""
+
+    def __init__(self) -> None:
+        self.played: list[str] = []
+        self.release = asyncio.Event()
+
+    def play(self, key: str):
+        async def _play() -> str:
+            if not self.played:
+                self.played.append(key)
+                await self.release.wait()
+            else:
+                self.played.append(key)
+            return f"played {key}"
+
+        return _play
+
+
+async def _enqueue(queue: AnnouncementQueue, speaker: _Speaker, key: str, **kwargs) -> asyncio.Task:
+    # Clip lengths are known (and zero) unless a test says otherwise.
+    kwargs.setdefault("hold", 0)
+    task = asyncio.ensure_future(queue.async_announce(key, speaker.play(key), **kwargs))
+    await asyncio.sleep(0)
+    return task
+
+
+class TestAnnouncementQueue:
+    """Test serialization, merging and drop policies."""
+
+    @pytest.mark.asyncio
+    async def test_announcements_play_one_at_a_time(self):
+        """A second announcement waits until the first has played."""
+        queue = AnnouncementQueue("test")
+        speaker = _Speaker()
+
+        first = await _enqueue(queue, speaker, "a")
+        second = await _enqueue(queue, speaker, "b")
+        assert speaker.played == ["a"]
+        assert queue.depth == 1
+        assert queue.busy is True
+
+        speaker.release.set()
+        assert await first == "played a"
+        assert await second == "played b"
+        assert speaker.played == ["a", "b"]
+        assert queue.as_dict()["played"] == 2
+        assert queue.last_wait_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_hold_delays_next_announcement(self):
+        """The next announcement waits for the previous clip length."""
+        queue = AnnouncementQueue("test")
+        speaker = _Speaker()
+        speaker.release.set()
+
+        await queue.async_announce("a", speaker.play("a"), hold=0.05)
+        second = await _enqueue(queue, speaker, "b")
+        assert speaker.played == ["a"]
+
+        await second
+        assert speaker.played == ["a", "b"]
+        assert queue.max_wait_ms >= 40
+
+    @pytest.mark.asyncio
+    async def test_unknown_length_holds_default(self):
+        """Without a clip length the speaker is held for the conservative default."""
+        queue = AnnouncementQueue("test", default_hold=0.05)
+        speaker = _Speaker()
+        speaker.release.set()
+
+        await queue.async_announce("a", speaker.play("a"))
+        second = await _enqueue(queue, speaker, "b")
+        assert speaker.played == ["a"]
+        await second
+
+        assert speaker.played == ["a", "b"]
+        assert queue.max_wait_ms >= 40
+
+    @pytest.mark.asyncio
+    async def test_identical_pending_announcements_merge(self):
+        """Callers announcing the same media while it waits share one playback."""
+        queue = AnnouncementQueue("test")
+        speaker = _Speaker()
+
+        first = await _enqueue(queue, speaker, "a")
+        dup_one = await _enqueue(queue, speaker, "doorbell")
+        dup_two = await _enqueue(queue, speaker, "doorbell")
+        speaker.release.set()
+
+        results = await asyncio.gather(first, dup_one, dup_two)
+        assert results[1] == results[2] == "played doorbell"
+        assert speaker.played == ["a", "doorbell"]
+        assert queue.merged == 1
+
+    @pytest.mark.asyncio
+    async def test_fifo_drops_new_when_full(self):
+        """FIFO keeps arrival order and rejects announcements beyond max_pending."""
+        queue = AnnouncementQueue("test", ANNOUNCE_QUEUE_FIFO, max_pending=2)
+        speaker = _Speaker()
+
+        tasks = [await _enqueue(queue, speaker, key) for key in ("a", "b", "c", "d")]
+        speaker.release.set()
+
+        assert await asyncio.gather(*tasks) == ["played a", "played b", "played c", None]
+        assert queue.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_latest_wins_replaces_waiting(self):
+        """Only the newest waiting announcement survives."""
+        queue = AnnouncementQueue("test", ANNOUNCE_QUEUE_LATEST_WINS)
+        speaker = _Speaker()
+
+        tasks = [await _enqueue(queue, speaker, key) for key in ("a", "b", "c")]
+        speaker.release.set()
+
+        assert await asyncio.gather(*tasks) == ["played a", None, "played c"]
+        assert speaker.played == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_priority_orders_and_evicts_lowest(self):
+        """Higher priority plays first; the lowest is dropped when full."""
+        queue = AnnouncementQueue("test", ANNOUNCE_QUEUE_PRIORITY, max_pending=2)
+        speaker = _Speaker()
+
+        playing = await _enqueue(queue, speaker, "a")
+        low = await _enqueue(queue, speaker, "low", priority=1)
+        mid = await _enqueue(queue, speaker, "mid", priority=5)
+        high = await _enqueue(queue, speaker, "high", priority=9)
+        speaker.release.set()
+
+        await asyncio.gather(playing, mid, high)
+        assert await low is None
+        assert speaker.played == ["a", "high", "mid"]
+
+    @pytest.mark.asyncio
+    async def test_priority_merge_moves_duplicate_ahead(self):
+        """A duplicate with a higher priority raises the waiting one and plays it sooner."""
+        queue = AnnouncementQueue("test", ANNOUNCE_QUEUE_PRIORITY)
+        speaker = _Speaker()
+
+        playing = await _enqueue(queue, speaker, "a")
+        chime = await _enqueue(queue, speaker, "chime", priority=1)
+        alarm = await _enqueue(queue, speaker, "alarm", priority=5)
+        urgent_chime = await _enqueue(queue, speaker, "chime", priority=9)
+        speaker.release.set()
+
+        await asyncio.gather(playing, chime, alarm, urgent_chime)
+        assert speaker.played == ["a", "chime", "alarm"]
+        assert queue.merged == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_caller_and_queue_continues(self):
+        """A failing announcement raises for its caller only."""
+        queue = AnnouncementQueue("test")
+
+        async def _fail():
+            raise RuntimeError("offline")
+
+        async def _ok():
+            return "ok"
+
+        with pytest.raises(RuntimeError, match="offline"):
+            await queue.async_announce("a", _fail, hold=0)
+        assert await queue.async_announce("b", _ok, hold=0) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancel_resolves_waiting_as_cancelled(self):
+        """Unloading the entry resolves waiting and playing announcements as cancelled, not dropped."""
+        queue = AnnouncementQueue("test")
+        speaker = _Speaker()
+
+        playing = await _enqueue(queue, speaker, "a")
+        waiting = await _enqueue(queue, speaker, "b")
+        queue.async_cancel()
+
+        assert await waiting is ANNOUNCEMENT_CANCELLED
+        assert await playing is ANNOUNCEMENT_CANCELLED
+        assert queue.dropped == 0
+        assert queue.depth == 0
+        assert queue.busy is False
+
+    def test_unknown_policy_falls_back_to_fifo(self):
+        """A stale option value does not break the speaker."""
+        assert AnnouncementQueue("test", "bogus").policy == ANNOUNCE_QUEUE_FIFO
@@ -0,0 +1,53 @@
+"""Unit tests for the per-device media browser cache."""
+
+from unittest.mock import patch
+
+from homeassistant.components.media_player import BrowseMedia, MediaClass
+
+from custom_components.wiim.browse_cache import BrowseCache
+
+
+def _node(title: str) -> BrowseMedia:
+    return BrowseMedia(
+        title=title,
+        media_class=MediaClass.DIRECTORY,
+        media_content_id="",
+        media_content_type="presets",
+        can_play=False,
+        can_expand=True,
+    )
+
+
+class TestBrowseCache:
+    """Test signatures, TTL and latency metrics."""
+
+    def test_signature_mismatch_is_a_miss(self):
+        """A node built from different source data is not reused."""
+        cache = BrowseCache()
+        node = cache.put("presets", "", _node("Presets"), signature="a")
+
+        assert cache.get("presets", "", "a") is node
+        assert cache.get("presets", "", "b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_ttl_expires_entry(self):
+        """Entries with a TTL are rebuilt once it has passed."""
+        cache = BrowseCache()
+        with patch("custom_components.wiim.browse_cache.time.monotonic", return_value=100.0):
+            cache.put("media_source", "media-source://x", _node("X"), ttl=30)
+        with patch("custom_components.wiim.browse_cache.time.monotonic", return_value=129.0):
+            assert cache.get("media_source", "media-source://x") is not None
+        with patch("custom_components.wiim.browse_cache.time.monotonic", return_value=130.0):
+            assert cache.get("media_source", "media-source://x") is None
+
+    def test_latency_metrics(self):
+        """Browse latency is summarised for diagnostics."""
+        cache = BrowseCache()
+        cache.record_browse(12.0)
+        cache.record_browse(4.0)
+
+        stats = cache.as_dict()
+        assert stats["browse_count"] == 2
+        assert stats["last_browse_ms"] == 4.0
+        assert stats["max_browse_ms"] == 12.0
+        assert stats["avg_browse_ms"] == 8.0
@@ -0,0 +1,134 @@
+"""Unit tests for the per-device command latency table."""
+
+import asyncio
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from pywiim.exceptions import WiiMConnectionError
+
+from custom_components.wiim import command_stats
+from custom_components.wiim.announce import async_queue_announcement
+from custom_components.wiim.announce_queue import AnnouncementQueue
+from custom_components.wiim.command_stats import CommandStats, DeviceMetrics
+from custom_components.wiim.entity import WiimEntity
+
+
+def test_operations_are_aggregated_per_model():
+    """Count, failures, average and max are kept per (operation, model)."""
+    stats = CommandStats("Kitchen")
+    stats.record("set volume", 100.0, "ok", "WiiM Pro", "4.8.1")
+    stats.record("set volume", 300.0, "unreachable", "WiiM Pro", "4.8.1")
+    stats.record("set volume", 50.0, "ok", "WiiM Mini", "4.6.0")
+
+    operations = {(row["operation"], row["model"]): row for row in stats.as_dict()["operations"]}
+    pro = operations[("set volume", "WiiM Pro")]
+    assert (pro["count"], pro["failures"], pro["avg_ms"], pro["max_ms"]) == (2, 1, 200.0, 300.0)
+    assert pro["last_error"] == "unreachable"
+    assert operations[("set volume", "WiiM Mini")]["count"] == 1
+
+
+def test_tables_are_bounded(monkeypatch):
+    """The least recently used operation is evicted; only the slowest recent commands are reported."""
+    monkeypatch.setattr(command_stats, "_MAX_OPERATIONS", 3)
+    stats = CommandStats("Kitchen")
+    for index in range(60):
+        stats.record(f"select source '{index % 4}'", float(index), "ok", "WiiM Pro", None)
+    stats.record("select source '1'", 1.0, "ok", "WiiM Pro", None)
+
+    report = stats.as_dict()
+    assert [row["operation"] for row in report["operations"]] == [
+        "select source '2'",
+        "select source '3'",
+        "select source '1'",
+    ]
+    assert len(report["slowest_recent"]) == 10
+    assert report["slowest_recent"][0]["duration_ms"] == 59.0
+
+
+def test_slow_command_warning(caplog: pytest.LogCaptureFixture):
+    """Commands at or above the threshold are logged; 0 disables the warning."""
+    with caplog.at_level(logging.WARNING):
+        CommandStats("Kitchen").record("play", 5000.0, "ok", "WiiM Pro", "4.8.1")
+        CommandStats("Kitchen", warn_ms=1000).record("play", 999.0, "ok", "WiiM Pro", "4.8.1")
+        CommandStats("Kitchen", warn_ms=1000).record("seek", 1200.0, "ok", "WiiM Pro", "4.8.1")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 1
+    assert "[Kitchen] seek took 1200 ms" in messages[0]
+    assert "firmware 4.8.1" in messages[0]
+
+
+async def test_wiim_command_records_outcome():
+    """wiim_command records successes and classified failures with the device model."""
+    coordinator = MagicMock()
+    coordinator.metrics = DeviceMetrics()
+    coordinator.command_stats = CommandStats("Kitchen")
+    coordinator.player.model = "WiiM Amp"
+    coordinator.player.firmware = "5.0.1"
+    entity = WiimEntity(coordinator, MagicMock())
+
+    async with entity.wiim_command("set mute"):
+        pass
+    with pytest.raises(HomeAssistantError):
+        async with entity.wiim_command("set mute"):
+            raise WiiMConnectionError("Cannot connect to host")
+
+    (row,) = coordinator.command_stats.as_dict()["operations"]
+    assert (row["operation"], row["model"], row["count"], row["failures"]) == ("set mute", "WiiM Amp", 2, 1)
+    assert row["last_error"] == "unreachable"
+    assert coordinator.metrics.commands == {"ok": 1, "unreachable": 1}
+
+
+async def test_cancelled_command_is_not_recorded_as_ok():
+    """A command cancelled mid-call (unload, outer timeout) is recorded as cancelled and still raises."""
+    coordinator = MagicMock()
+    coordinator.metrics = DeviceMetrics()
+    coordinator.command_stats = CommandStats("Kitchen")
+    coordinator.player.model = "WiiM Amp"
+    coordinator.player.firmware = "5.0.1"
+    entity = WiimEntity(coordinator, MagicMock())
+
+    async def _command() -> None:
+        async with entity.wiim_command("play"):
+            await asyncio.Event().wait()
+
+    task = asyncio.create_task(_command())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    (row,) = coordinator.command_stats.as_dict()["operations"]
+    assert (row["count"], row["failures"], row["last_error"]) == (1, 1, "cancelled")
+    assert coordinator.metrics.commands == {"ok": 0, "cancelled": 1}
+
+
+async def test_queued_announcement_times_only_the_device_call(hass):
+    """Waiting behind another announcement is not counted as play notification latency."""
+    coordinator = MagicMock()
+    coordinator.metrics = DeviceMetrics()
+    coordinator.command_stats = CommandStats("Kitchen")
+    coordinator.announcement_queue = AnnouncementQueue("Kitchen", "fifo", 5, default_hold=0)
+    coordinator.player.model = "WiiM Pro"
+    coordinator.player.firmware = "4.8.1"
+    release = asyncio.Event()
+
+    async def _play_notification(url: str) -> str:
+        if url == "http://ha/first.mp3":
+            await release.wait()
+        return url
+
+    coordinator.player.play_notification = _play_notification
+    first = asyncio.create_task(async_queue_announcement(hass, coordinator, "first", "http://ha/first.mp3"))
+    second = asyncio.create_task(async_queue_announcement(hass, coordinator, "second", "http://ha/second.mp3"))
+    await asyncio.sleep(0.05)
+    release.set()
+    assert await asyncio.gather(first, second) == ["http://ha/first.mp3", "http://ha/second.mp3"]
+
+    (row,) = coordinator.command_stats.as_dict()["operations"]
+    assert (row["operation"], row["count"]) == ("play notification", 2)
+    slowest = coordinator.command_stats.as_dict()["slowest_recent"]
+    assert slowest[0]["duration_ms"] >= 40
+    assert slowest[1]["duration_ms"] < 40
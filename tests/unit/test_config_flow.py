@@ -9,11 +9,15 @@ from pywiim.discovery import DiscoveredDevice
 
 from custom_components.wiim.config_flow import WiiMConfigFlow, WiiMOptionsFlow
 from custom_components.wiim.const import (
+    CONF_ANNOUNCE_QUEUE_POLICY,
     CONF_ENABLE_MAINTENANCE_BUTTONS,
     CONF_HOST,
+    CONF_RECORDER_FRIENDLY_ATTRIBUTES,
+    CONF_SLOW_COMMAND_WARNING_MS,
     CONF_VOLUME_STEP,
     CONF_VOLUME_STEP_PERCENT,
     DOMAIN,
+    SOURCE_SUBNET_SCAN,
 )
 
 
@@ -61,6 +65,30 @@ class TestWiiMOptionsFlow:
         assert result["type"] == "create_entry"
         assert result["data"][CONF_VOLUME_STEP] == 0.1  # Converted to decimal
 
+    @pytest.mark.asyncio
+    async def test_options_flow_saves_announce_queue_policy(self, options_flow, mock_config_entry):
+        """Test that options flow saves the announcement queue policy."""
+        result = await options_flow.async_step_init({CONF_ANNOUNCE_QUEUE_POLICY: "latest_wins"})
+
+        assert result["type"] == "create_entry"
+        assert result["data"][CONF_ANNOUNCE_QUEUE_POLICY] == "latest_wins"
+
+    @pytest.mark.asyncio
+    async def test_options_flow_saves_slow_command_warning(self, options_flow, mock_config_entry):
+        """Test that options flow saves the slow-command warning threshold."""
+        result = await options_flow.async_step_init({CONF_SLOW_COMMAND_WARNING_MS: 1500})
+
+        assert result["type"] == "create_entry"
+        assert result["data"][CONF_SLOW_COMMAND_WARNING_MS] == 1500
+
+    @pytest.mark.asyncio
+    async def test_options_flow_saves_recorder_friendly_attributes(self, options_flow, mock_config_entry):
+        """Test that options flow saves the recorder-friendly attributes option."""
+        result = await options_flow.async_step_init({CONF_RECORDER_FRIENDLY_ATTRIBUTES: True})
+
+        assert result["type"] == "create_entry"
+        assert result["data"][CONF_RECORDER_FRIENDLY_ATTRIBUTES] is True
+
     @pytest.mark.asyncio
     async def test_options_flow_reads_existing_options(self, options_flow, mock_config_entry):
         """Test that options flow reads existing options."""
@@ -196,6 +224,123 @@ class TestWiiMConfigFlow:
         assert result["step_id"] == "manual"
         assert result["errors"]["base"] == "cannot_connect"
 
+    @pytest.mark.asyncio
+    async def test_manual_range_scans_and_imports_all_speakers(self, config_flow, hass):
+        """A CIDR range on the manual step scans it and imports every new speaker at once."""
+        from custom_components.wiim.subnet_scan import ScanHit
+
+        hits = [ScanHit("192.168.1.20", 443, "https"), ScanHit("192.168.1.21", 80, "http")]
+
+        async def _validate_hit(_session, hit, _ssl_context=None):
+            device = DiscoveredDevice(ip=hit.host, uuid=f"uuid-{hit.host}", name=f"Speaker {hit.host}", validated=True)
+            return device, {"firmware_version": "4.8.1"}
+
+        with (
+            patch("custom_components.wiim.config_flow.async_scan_range", AsyncMock(return_value=hits)) as mock_scan,
+            patch("custom_components.wiim.config_flow.async_validate_hit", side_effect=_validate_hit),
+            patch("custom_components.wiim.config_flow.async_ensure_pywiim_version", AsyncMock(return_value="2.3.6")),
+        ):
+            result = await config_flow.async_step_manual({CONF_HOST: "192.168.1.0/28"})
+            assert result["type"] == FlowResultType.SHOW_PROGRESS
+            assert result["progress_action"] == "scan"
+            assert result["description_placeholders"] == {"count": "14"}
+            await result["progress_task"]
+            result = await config_flow.async_step_scan_progress()
+
+        assert len(mock_scan.await_args.args[1]) == 14
+        assert result["type"] == FlowResultType.SHOW_PROGRESS_DONE
+        assert result["step_id"] == "scan_confirm"
+
+        result = await config_flow.async_step_scan_confirm()
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "scan_confirm"
+        assert result["description_placeholders"]["count"] == "2"
+
+        with patch.object(hass.config_entries.flow, "async_init", AsyncMock()) as mock_init:
+            result = await config_flow.async_step_scan_confirm({})
+            await hass.async_block_till_done()
+
+        assert result["type"] == FlowResultType.ABORT
+        assert result["reason"] == "scan_imported"
+        assert mock_init.await_count == 2
+        first = mock_init.await_args_list[0]
+        assert first.kwargs["context"] == {"source": SOURCE_SUBNET_SCAN}
+        assert first.kwargs["data"]["endpoint"] == "https://192.168.1.20:443"
+        assert first.kwargs["data"]["capabilities_cache_meta"]["pywiim_version"] == "2.3.6"
+        assert first.kwargs["data"]["uuid"] == "uuid-192.168.1.20"
+
+    @pytest.mark.asyncio
+    async def test_scan_keeps_capabilities_of_recently_validated_speaker(self, config_flow, hass):
+        """A speaker already in the validation cache still gets its capabilities in the entry data."""
+        from custom_components.wiim.subnet_scan import ScanHit
+        from custom_components.wiim.validation_cache import get_validation_cache
+
+        hit = ScanHit("192.168.1.20", 443, "https")
+        device = DiscoveredDevice(ip=hit.host, uuid="uuid-kitchen", name="Kitchen", validated=True)
+        await get_validation_cache(hass).async_validate(hit.host, AsyncMock(return_value=device))
+
+        with (
+            patch("custom_components.wiim.config_flow.async_scan_range", AsyncMock(return_value=[hit])),
+            patch(
+                "custom_components.wiim.config_flow.async_validate_hit",
+                AsyncMock(return_value=(device, {"supports_eq": True})),
+            ),
+            patch("custom_components.wiim.config_flow.async_ensure_pywiim_version", AsyncMock(return_value="2.3.6")),
+        ):
+            results = await config_flow._async_scan([hit.host])
+
+        assert results[0]["capabilities"] == {"supports_eq": True}
+
+    @pytest.mark.asyncio
+    async def test_scan_without_new_speakers_returns_to_range_form(self, config_flow, hass):
+        """A scan that finds nothing new ends its progress and shows the range form with an error."""
+        with patch("custom_components.wiim.config_flow.async_scan_range", AsyncMock(return_value=[])):
+            result = await config_flow.async_step_scan({"scan_range": "192.168.1.0/30"})
+            await result["progress_task"]
+            result = await config_flow.async_step_scan_progress()
+
+        assert result["type"] == FlowResultType.SHOW_PROGRESS_DONE
+        assert result["step_id"] == "scan"
+
+        result = await config_flow.async_step_scan()
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {"base": "no_devices_found"}
+
+    @pytest.mark.asyncio
+    async def test_scan_step_rejects_oversized_range(self, config_flow, hass):
+        """Ranges larger than the scan limit are refused before probing."""
+        with patch("custom_components.wiim.config_flow.async_scan_range") as mock_scan:
+            result = await config_flow.async_step_scan({"scan_range": "10.0.0.0/16"})
+
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"]["base"] == "invalid_scan_range"
+        mock_scan.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_subnet_scan_step_creates_entry_with_cached_endpoint(self, config_flow, hass):
+        """Entries added from a scan keep the scan's endpoint and capabilities."""
+        config_flow.async_set_unique_id = AsyncMock()
+        config_flow._abort_if_unique_id_configured = MagicMock(return_value=None)
+
+        result = await config_flow.async_step_subnet_scan(
+            {
+                CONF_HOST: "192.168.1.20",
+                "endpoint": "https://192.168.1.20:443",
+                "capabilities": {"supports_eq": True},
+                "name": "Kitchen",
+                "uuid": "uuid-kitchen",
+            }
+        )
+
+        config_flow.async_set_unique_id.assert_awaited_once_with("uuid-kitchen")
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert result["title"] == "Kitchen"
+        assert result["data"] == {
+            CONF_HOST: "192.168.1.20",
+            "endpoint": "https://192.168.1.20:443",
+            "capabilities": {"supports_eq": True},
+        }
+
     @pytest.mark.asyncio
     async def test_discovery_step(self, config_flow, hass):
         """Test discovery step."""
@@ -255,6 +400,75 @@ class TestWiiMConfigFlow:
         assert result["type"] == FlowResultType.ABORT
         assert result["reason"] == "not_wiim_device"
 
+    @pytest.mark.asyncio
+    async def test_zeroconf_and_ssdp_for_same_host_validate_once(self, hass):
+        """mDNS and SSDP announcing one speaker share a single validation."""
+        from ipaddress import IPv4Address
+
+        from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
+        from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
+
+        zeroconf_info = ZeroconfServiceInfo(
+            ip_address=IPv4Address("192.168.1.100"),
+            ip_addresses=[IPv4Address("192.168.1.100")],
+            hostname="test-wiim.local",
+            name="Test WiiM",
+            port=8080,
+            properties={},
+            type="_wiim._tcp.local.",
+        )
+        ssdp_info = SsdpServiceInfo(
+            ssdp_location="http://192.168.1.100:49152/description.xml",
+            ssdp_st="upnp:rootdevice",
+            ssdp_usn="uuid:test-uuid::upnp:rootdevice",
+            upnp={},
+        )
+        flows = []
+        for _ in range(2):
+            flow = WiiMConfigFlow()
+            flow.hass = hass
+            flow.async_set_unique_id = AsyncMock()
+            flow._abort_if_unique_id_configured = MagicMock(return_value=None)
+            flow.async_step_discovery_confirm = AsyncMock(return_value={"type": FlowResultType.FORM})
+            flows.append(flow)
+
+        with patch("custom_components.wiim.config_flow.validate_device") as mock_validate:
+            mock_validate.return_value = DiscoveredDevice(
+                ip="192.168.1.100", uuid="test-uuid", name="Test WiiM", validated=True
+            )
+            await flows[0].async_step_zeroconf(zeroconf_info)
+            await flows[1].async_step_ssdp(ssdp_info)
+
+        assert mock_validate.await_count == 1
+        assert flows[1].data["name"] == "Test WiiM"
+
+    @pytest.mark.asyncio
+    async def test_discover_devices_validates_only_new_candidates(self, config_flow, hass):
+        """The scan skips configured hosts and non-LinkPlay responders before probing."""
+        existing_entry = MagicMock(spec=ConfigEntry)
+        existing_entry.data = {CONF_HOST: "192.168.1.100"}
+        existing_entry.unique_id = "known-uuid"
+        candidates = [
+            DiscoveredDevice(ip="192.168.1.100"),
+            DiscoveredDevice(ip="192.168.1.101"),
+            DiscoveredDevice(ip="192.168.1.102", ssdp_response={"SERVER": "Linux UPnP/1.0 Sonos/70.3"}),
+            DiscoveredDevice(ip="192.168.1.103"),
+        ]
+
+        async def _validate(device: DiscoveredDevice) -> DiscoveredDevice:
+            return DiscoveredDevice(ip=device.ip, uuid=f"uuid-{device.ip}", validated=device.ip != "192.168.1.103")
+
+        with (
+            patch.object(config_flow, "_async_current_entries", return_value=[existing_entry]),
+            patch("custom_components.wiim.config_flow.discover_devices", return_value=candidates) as mock_discover,
+            patch("custom_components.wiim.config_flow.validate_device", side_effect=_validate) as mock_validate,
+        ):
+            devices = await config_flow._discover_devices()
+
+        mock_discover.assert_awaited_once_with(validate=False)
+        assert [call.args[0].ip for call in mock_validate.await_args_list] == ["192.168.1.101", "192.168.1.103"]
+        assert [device.ip for device in devices] == ["192.168.1.101"]
+
     @pytest.mark.asyncio
     async def test_discovery_step_handles_duplicate(self, config_flow, hass):
         """Test discovery step handles duplicate entries."""
@@ -409,6 +623,80 @@ class TestWiiMConfigFlow:
         assert result["type"] == FlowResultType.ABORT
         assert result["reason"] == "not_wiim_device"
 
+    @pytest.mark.asyncio
+    async def test_discover_slaves_reuses_master_endpoint_and_batches_validation(self, config_flow, hass):
+        """Slaves are listed on the master's validated endpoint and validated once, together."""
+        from custom_components.wiim.validation_cache import get_validation_cache
+
+        existing_entry = MagicMock(spec=ConfigEntry)
+        existing_entry.data = {CONF_HOST: "192.168.1.100"}
+        existing_entry.unique_id = "master-uuid"
+        master = DiscoveredDevice(ip="192.168.1.100", uuid="master-uuid", port=443, protocol="https", validated=True)
+
+        async def _cached_master(host):
+            return master
+
+        await get_validation_cache(hass).async_validate("192.168.1.100", _cached_master)
+        client = MagicMock()
+        client.get_slaves_info = AsyncMock(
+            return_value=[
+                {"ip": "192.168.1.101", "uuid": "kitchen-uuid", "name": "Kitchen"},
+                {"ip": "192.168.1.102", "uuid": "den-uuid", "name": "Den"},
+                {"ip": "192.168.1.100", "uuid": "master-uuid", "name": "Master"},
+            ]
+        )
+
+        async def _validate(device: DiscoveredDevice) -> DiscoveredDevice:
+            return DiscoveredDevice(
+                ip=device.ip, uuid=f"uuid-{device.ip}", name=f"Speaker {device.ip}", port=80, validated=True
+            )
+
+        with (
+            patch.object(config_flow, "_async_current_entries", return_value=[existing_entry]),
+            patch("pywiim.WiiMClient", return_value=client) as mock_client,
+            patch("custom_components.wiim.config_flow.validate_device", side_effect=_validate) as mock_validate,
+            patch.object(hass.config_entries.flow, "async_init", AsyncMock()) as mock_init,
+        ):
+            await config_flow._discover_slaves("192.168.1.100")
+            await hass.async_block_till_done()
+
+        assert mock_client.call_args.kwargs["port"] == 443
+        assert mock_client.call_args.kwargs["protocol"] == "https"
+        client.get_slaves_info.assert_awaited_once()
+        assert sorted(call.args[0].ip for call in mock_validate.await_args_list) == ["192.168.1.101", "192.168.1.102"]
+        data = sorted((call.kwargs["data"] for call in mock_init.await_args_list), key=lambda item: item[CONF_HOST])
+        assert data[0] == {
+            CONF_HOST: "192.168.1.101",
+            "device_name": "Speaker 192.168.1.101",
+            "device_uuid": "uuid-192.168.1.101",
+            "endpoint": "http://192.168.1.101:80",
+        }
+
+    @pytest.mark.asyncio
+    async def test_integration_discovery_for_slave_reuses_batch_validation(self, config_flow, hass):
+        """A child flow from slave discovery validates from cache and keeps the endpoint."""
+        config_flow.async_set_unique_id = AsyncMock()
+        config_flow._abort_if_unique_id_configured = MagicMock(return_value=None)
+        config_flow.async_step_discovery_confirm = AsyncMock(return_value={"type": FlowResultType.FORM})
+
+        with patch("custom_components.wiim.config_flow.validate_device") as mock_validate:
+            mock_validate.return_value = DiscoveredDevice(
+                ip="192.168.1.101", uuid="kitchen-uuid", name="Kitchen", validated=True
+            )
+            await config_flow._async_validate("192.168.1.101")
+            await config_flow.async_step_integration_discovery(
+                {
+                    CONF_HOST: "192.168.1.101",
+                    "device_name": "Kitchen",
+                    "device_uuid": "kitchen-uuid",
+                    "endpoint": "http://192.168.1.101:80",
+                }
+            )
+
+        assert mock_validate.await_count == 1
+        config_flow.async_set_unique_id.assert_any_await("kitchen-uuid")
+        assert config_flow.data["endpoint"] == "http://192.168.1.101:80"
+
     @pytest.mark.asyncio
     async def test_missing_device_step_uuid_mismatch(self, config_flow, hass):
         """Test missing_device step with UUID mismatch."""
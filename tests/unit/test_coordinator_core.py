@@ -114,7 +114,7 @@ class TestWiiMCoordinator:
 
         with (
             patch("custom_components.wiim.coordinator.Player", return_value=mock_player),
-            patch("custom_components.wiim.coordinator.async_get_clientsession"),
+            patch("custom_components.wiim.coordinator.get_http_pool"),
         ):
             coordinator = WiiMCoordinator(
                 hass,
@@ -186,6 +186,21 @@ class TestWiiMCoordinator:
         assert "group_info" not in data
         assert "metadata" not in data
 
+    @pytest.mark.asyncio
+    async def test_device_info_time_tracks_new_device_info(self, coordinator, mock_player):
+        """device_info_at moves only when pywiim replaces its device info."""
+        mock_player.device_info = object()
+        await coordinator._async_update_data()
+        first = coordinator.device_info_at
+        assert first == coordinator.last_poll_at
+
+        await coordinator._async_update_data()
+        assert coordinator.device_info_at == first
+
+        mock_player.device_info = object()
+        await coordinator._async_update_data()
+        assert coordinator.device_info_at == coordinator.last_poll_at
+
     @pytest.mark.asyncio
     async def test_refresh_callback_does_not_notify_listeners_twice(self, coordinator, mock_player):
         """pywiim callbacks during coordinator refresh do not publish a second listener wave."""
@@ -463,7 +478,7 @@ class TestWiiMCoordinator:
         # Create coordinator with player that might be None initially
         with (
             patch("custom_components.wiim.coordinator.Player", return_value=None),
-            patch("custom_components.wiim.coordinator.async_get_clientsession"),
+            patch("custom_components.wiim.coordinator.get_http_pool"),
         ):
             # This should not raise during initialization
             coordinator = WiiMCoordinator(
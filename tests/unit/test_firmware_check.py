@@ -0,0 +1,192 @@
+"""Unit tests for the shared per-model firmware availability check."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pywiim.exceptions import WiiMConnectionError
+
+from custom_components.wiim.const import DATA_FIRMWARE_UPDATE, DOMAIN
+from custom_components.wiim.firmware_check import (
+    DATA_FIRMWARE_CHECK,
+    FirmwareCheckCache,
+    async_setup_firmware_check,
+    get_firmware_check,
+)
+
+
+def _device_info(firmware: str = "4.8.1", new: str | None = "4.8.2") -> SimpleNamespace:
+    return SimpleNamespace(firmware=firmware, version_update="1" if new else "0", latest_version=new or "0")
+
+
+def _make_speaker(register_speaker, name: str, model: str = "WiiM_Pro", firmware: str = "4.8.1"):
+    """Register a speaker on ``firmware`` whose device info offers 4.8.2."""
+    coordinator = register_speaker(name, model=model, firmware=firmware)
+    coordinator.player.get_device_info = AsyncMock(return_value=_device_info(firmware))
+    return coordinator
+
+
+async def _refresh(hass: HomeAssistant, coordinators: list) -> FirmwareCheckCache:
+    cache = FirmwareCheckCache(hass)
+    with patch.object(hass.config_entries, "async_entries", return_value=[c.entry for c in coordinators]):
+        await cache.async_refresh()
+    return cache
+
+
+class TestFirmwareCheckCache:
+    """One check per model / firmware pair."""
+
+    @pytest.mark.asyncio
+    async def test_one_check_per_model_and_firmware(self, hass: HomeAssistant, register_speaker):
+        """Three same-model speakers cost one request; another model gets its own."""
+        pros = [_make_speaker(register_speaker, name) for name in ("A", "B", "C")]
+        mini = _make_speaker(register_speaker, "D", model="WiiM_Mini", firmware="4.6.0")
+        mini.player.get_device_info.return_value = _device_info("4.6.0", new=None)
+
+        cache = await _refresh(hass, [*pros, mini])
+
+        assert cache.checks == 2
+        assert sum(c.player.get_device_info.await_count for c in pros) == 1
+        pro = cache.get("WiiM_Pro", "4.8.1")
+        assert pro.update_available is True
+        assert pro.latest_version == "4.8.2"
+        assert cache.get("WiiM_Mini", "4.6.0").latest_version is None
+        for coordinator in [*pros, mini]:
+            coordinator.async_update_listeners.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_next_speaker_answers_when_first_fails(self, hass: HomeAssistant, register_speaker):
+        """An unreachable speaker does not leave its model unchecked."""
+        first, second = (_make_speaker(register_speaker, name) for name in ("A", "B"))
+        first.player.get_device_info.side_effect = WiiMConnectionError("timeout")
+
+        cache = await _refresh(hass, [first, second])
+
+        assert cache.checks == 2
+        assert cache.failures == 1
+        assert cache.get("WiiM_Pro", "4.8.1").checked_host == "B.local"
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors_do_not_stop_other_models(self, hass: HomeAssistant, register_speaker):
+        """Transport errors move on to the next speaker; a parse error skips only its model."""
+        first, second = (_make_speaker(register_speaker, name) for name in ("A", "B"))
+        first.player.get_device_info.side_effect = TimeoutError
+        broken = _make_speaker(register_speaker, "C", model="WiiM_Amp", firmware="4.9.0")
+        broken.player.get_device_info.return_value = SimpleNamespace(firmware="4.9.0")
+        mini = _make_speaker(register_speaker, "D", model="WiiM_Mini", firmware="4.6.0")
+        mini.player.get_device_info.return_value = _device_info("4.6.0", new=None)
+
+        cache = await _refresh(hass, [first, second, broken, mini])
+
+        assert cache.get("WiiM_Pro", "4.8.1").checked_host == "B.local"
+        assert cache.get("WiiM_Amp", "4.9.0") is None
+        assert cache.get("WiiM_Mini", "4.6.0") is not None
+        broken.async_update_listeners.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_skips_offline_and_installing_speakers(self, hass: HomeAssistant, register_speaker):
+        """Speakers that are down or mid-install are neither asked nor notified."""
+        offline = _make_speaker(register_speaker, "A")
+        offline.last_update_success = False
+        installing = _make_speaker(register_speaker, "B")
+        hass.data[DOMAIN]["B"][DATA_FIRMWARE_UPDATE].in_progress = True
+
+        cache = await _refresh(hass, [offline, installing])
+
+        assert cache.checks == 0
+        offline.async_update_listeners.assert_not_called()
+        installing.async_update_listeners.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_result_filed_under_reported_firmware(self, hass: HomeAssistant, register_speaker):
+        """A speaker that updated since its last poll does not mislabel the old firmware."""
+        coordinator = _make_speaker(register_speaker, "A")
+        coordinator.player.get_device_info.return_value = _device_info("4.8.2", new=None)
+
+        cache = await _refresh(hass, [coordinator])
+
+        assert cache.get("WiiM_Pro", "4.8.1") is None
+        assert cache.get("WiiM_Pro", "4.8.2").update_available is False
+        coordinator.async_update_listeners.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_start_checks_in_background_and_stop_cancels(self, hass: HomeAssistant):
+        """Starting runs a first check once HA is up; stop removes the schedule; start is idempotent."""
+        cache = FirmwareCheckCache(hass)
+        with patch.object(cache, "async_refresh", AsyncMock()) as refresh:
+            cache.async_start()
+            cache.async_start()
+            await hass.async_block_till_done()
+
+        refresh.assert_awaited_once()
+        assert len(cache._unsubs) == 2
+        cache.async_stop()
+        assert not cache._unsubs
+
+    @pytest.mark.asyncio
+    async def test_first_speaker_starts_the_schedule(self, hass: HomeAssistant, register_speaker):
+        """Setup does not start the check; the first speaker does, and it is checked."""
+        await async_setup_firmware_check(hass)
+        cache = get_firmware_check(hass)
+        assert not cache._unsubs
+
+        coordinator = _make_speaker(register_speaker, "A")
+        with patch.object(hass.config_entries, "async_entries", return_value=[coordinator.entry]):
+            cache.async_speaker_added(coordinator)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        coordinator.player.get_device_info.assert_awaited_once()
+        assert cache.get("WiiM_Pro", "4.8.1") is not None
+        cache.async_stop()
+
+    @pytest.mark.asyncio
+    async def test_later_speaker_checked_only_when_pair_uncached(self, hass: HomeAssistant, register_speaker):
+        """A speaker set up after startup gets a check for its pair unless one is cached."""
+        first = _make_speaker(register_speaker, "A")
+        cache = await _refresh(hass, [first])
+        first.player.get_device_info.reset_mock()
+        same = _make_speaker(register_speaker, "B")
+        other = _make_speaker(register_speaker, "C", firmware="4.7.0")
+        other.player.get_device_info.return_value = _device_info("4.7.0")
+
+        with (
+            patch.object(cache, "async_refresh", AsyncMock()),
+            patch.object(hass.config_entries, "async_entries", return_value=[first.entry, same.entry, other.entry]),
+        ):
+            cache.async_start()
+            await hass.async_block_till_done(wait_background_tasks=True)
+            cache.async_speaker_added(same)
+            cache.async_speaker_added(other)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        first.player.get_device_info.assert_not_awaited()
+        same.player.get_device_info.assert_not_awaited()
+        other.player.get_device_info.assert_awaited_once()
+        assert cache.get("WiiM_Pro", "4.7.0") is not None
+        other.async_update_listeners.assert_called_once()
+        cache.async_stop()
+
+    @pytest.mark.asyncio
+    async def test_last_unload_stops_check_without_coordinator(self, hass: HomeAssistant):
+        """Unloading the last entry stops the check even when the entry has no coordinator."""
+        from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+        from custom_components.wiim import async_unload_entry
+
+        cache = FirmwareCheckCache(hass)
+        entry = MockConfigEntry(domain=DOMAIN, data={"host": "192.168.1.10"})
+        hass.data[DOMAIN] = {DATA_FIRMWARE_CHECK: cache, entry.entry_id: {}}
+        with (
+            patch.object(cache, "async_stop") as stop,
+            patch.object(hass.config_entries, "async_unload_platforms", AsyncMock(return_value=True)),
+        ):
+            assert await async_unload_entry(hass, entry)
+
+        stop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_setup_stores_cache(self, hass: HomeAssistant):
+        """Setup registers the cache in hass.data."""
+        await async_setup_firmware_check(hass)
+        assert get_firmware_check(hass) is hass.data[DOMAIN][DATA_FIRMWARE_CHECK]
@@ -0,0 +1,364 @@
+"""Unit tests for the WiiM fleet firmware rollout service."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.wiim import async_unload_entry
+from custom_components.wiim.const import DATA_FIRMWARE_UPDATE, DATA_ROLLOUT, DATA_ROLLOUT_SENSOR, DOMAIN
+from custom_components.wiim.firmware_rollout import (
+    STATUS_FAILED,
+    STATUS_INSTALLING,
+    STATUS_SKIPPED,
+    STATUS_UPDATED,
+    plan_rollout,
+)
+from custom_components.wiim.sensor import WiiMFirmwareRolloutSensor
+from custom_components.wiim.sensor import async_setup_entry as async_setup_sensors
+from custom_components.wiim.services import (
+    SERVICE_FIRMWARE_ROLLOUT,
+    SERVICE_FIRMWARE_ROLLOUT_STATUS,
+    async_setup_services,
+)
+
+
+def _make_speaker(hass: HomeAssistant, register_speaker, name: str, *, ready: bool = True, install=None):
+    """Register a speaker on 4.6.1 whose update installs 4.6.2, or runs ``install`` instead."""
+    coordinator = register_speaker(name, firmware="4.6.1", update_available=ready)
+    entity = hass.data[DOMAIN][name][DATA_FIRMWARE_UPDATE]
+
+    async def _install() -> bool:
+        if install is not None:
+            return await install(entity)
+        entity.installed_version = "4.6.2"
+        return True
+
+    entity.async_install_and_wait = AsyncMock(side_effect=_install)
+    return coordinator, entity
+
+
+@pytest.fixture
+async def services(hass: HomeAssistant):
+    """Register domain services."""
+    await async_setup_services(hass)
+
+
+class TestPlanRollout:
+    """Canary selection and wave split."""
+
+    def test_waves_respect_max_parallel(self, hass: HomeAssistant, register_speaker):
+        """The first speaker by name is the canary; the rest split into waves."""
+        coordinators = [_make_speaker(hass, register_speaker, name)[0] for name in ("E", "D", "C", "B", "A")]
+        idle, _entity = _make_speaker(hass, register_speaker, "Z", ready=False)
+
+        rollout, not_eligible = plan_rollout(hass, [*coordinators, idle], max_parallel=2)
+
+        assert rollout.canary.name == "A"
+        assert [[device.name for device in wave] for wave in rollout.waves] == [["B", "C"], ["D", "E"]]
+        assert not_eligible == ["Z"]
+
+    def test_explicit_canary(self, hass: HomeAssistant, register_speaker):
+        """A requested canary goes first even when it is not first by name."""
+        coordinators = [_make_speaker(hass, register_speaker, name)[0] for name in ("A", "B", "C")]
+
+        rollout, _ = plan_rollout(hass, coordinators, max_parallel=5, canary=coordinators[2])
+
+        assert rollout.canary.name == "C"
+        assert [[device.name for device in wave] for wave in rollout.waves] == [["A", "B"]]
+
+    def test_no_ready_update_raises(self, hass: HomeAssistant, register_speaker):
+        """Nothing to install is an error."""
+        coordinator, _entity = _make_speaker(hass, register_speaker, "A", ready=False)
+        with pytest.raises(HomeAssistantError, match="No targeted WiiM speaker"):
+            plan_rollout(hass, [coordinator], max_parallel=2)
+
+
+class TestRolloutRun:
+    """Running a rollout end to end."""
+
+    @pytest.mark.asyncio
+    async def test_installs_in_capped_waves_after_canary(self, hass: HomeAssistant, register_speaker):
+        """The canary finishes alone, then at most max_parallel install at once."""
+        active = peak = 0
+        order: list[str] = []
+
+        async def _install(entity) -> bool:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            order.append(entity.name)
+            await asyncio.sleep(0.01)
+            active -= 1
+            entity.installed_version = "4.6.2"
+            return True
+
+        coordinators = []
+        for name in ("A", "B", "C", "D", "E"):
+            coordinator, entity = _make_speaker(hass, register_speaker, name, install=_install)
+            entity.name = name
+            coordinators.append(coordinator)
+
+        rollout, _ = plan_rollout(hass, coordinators, max_parallel=2)
+        await rollout.async_run()
+
+        assert order[0] == "A"
+        assert peak == 2
+        assert rollout.phase == "completed"
+        assert all(device.status == STATUS_UPDATED for device in rollout.devices)
+        assert rollout.canary.from_version == "4.6.1"
+        assert rollout.canary.to_version == "4.6.2"
+        # The canary is checked once before each of the two waves
+        assert coordinators[0].async_refresh.await_count == 2
+
+        summary = rollout.as_dict()
+        assert summary["progress"] == 100
+        assert summary["counts"][STATUS_UPDATED] == 5
+
+    @pytest.mark.asyncio
+    async def test_canary_failure_halts_rollout(self, hass: HomeAssistant, register_speaker):
+        """A canary that does not change firmware stops everything else."""
+
+        async def _stuck(_entity) -> bool:
+            return False
+
+        canary, _entity = _make_speaker(hass, register_speaker, "A", install=_stuck)
+        others = [_make_speaker(hass, register_speaker, name)[0] for name in ("B", "C")]
+
+        rollout, _ = plan_rollout(hass, [canary, *others], max_parallel=2)
+        await rollout.async_run()
+
+        assert rollout.phase == "halted"
+        assert rollout.canary.status == STATUS_FAILED
+        assert "did not change" in rollout.canary.error
+        assert [device.status for device in rollout.waves[0]] == [STATUS_SKIPPED, STATUS_SKIPPED]
+        assert rollout.as_dict()["counts"][STATUS_FAILED] == 1
+
+    @pytest.mark.asyncio
+    async def test_unexpected_install_error_fails_device_and_halts(self, hass: HomeAssistant, register_speaker):
+        """Any exception from the install marks the speaker failed instead of leaving it installing."""
+
+        async def _timeout(_entity) -> bool:
+            raise TimeoutError
+
+        canary, _entity = _make_speaker(hass, register_speaker, "A", install=_timeout)
+        other, other_entity = _make_speaker(hass, register_speaker, "B")
+
+        rollout, _ = plan_rollout(hass, [canary, other], max_parallel=2)
+        await rollout.async_run()
+
+        assert rollout.phase == "halted"
+        assert rollout.canary.status == STATUS_FAILED
+        assert rollout.canary.error == "TimeoutError"
+        assert rollout.waves[0][0].status == STATUS_SKIPPED
+        other_entity.async_install_and_wait.assert_not_awaited()
+
+    def test_status_keeps_speakers_with_the_same_name(self, hass: HomeAssistant, register_speaker):
+        """Devices are keyed by config entry, so two speakers called the same are both reported."""
+        coordinators = [_make_speaker(hass, register_speaker, entry_id)[0] for entry_id in ("entry-1", "entry-2")]
+        for coordinator in coordinators:
+            coordinator.player.name = "Living Room"
+
+        rollout, _ = plan_rollout(hass, coordinators, max_parallel=1)
+        devices = rollout.as_dict()["devices"]
+
+        assert set(devices) == {"entry-1", "entry-2"}
+        assert [device["name"] for device in devices.values()] == ["Living Room", "Living Room"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_fails_installing_speakers(self, hass: HomeAssistant, register_speaker):
+        """Cancelling mid-install leaves no speaker stuck in installing."""
+        started = asyncio.Event()
+
+        async def _hang(_entity) -> bool:
+            started.set()
+            await asyncio.Event().wait()
+            return True
+
+        canary, _entity = _make_speaker(hass, register_speaker, "A", install=_hang)
+        other, _other_entity = _make_speaker(hass, register_speaker, "B")
+
+        rollout, _ = plan_rollout(hass, [canary, other], max_parallel=2)
+        task = asyncio.create_task(rollout.async_run())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert rollout.phase == "cancelled"
+        assert rollout.canary.status == STATUS_FAILED
+        assert "cancelled" in rollout.canary.error
+        assert rollout.waves[0][0].status == STATUS_SKIPPED
+        assert rollout.as_dict()["counts"][STATUS_INSTALLING] == 0
+
+    @pytest.mark.asyncio
+    async def test_unreachable_canary_gates_next_wave(self, hass: HomeAssistant, register_speaker):
+        """A wave does not start while the canary is unreachable after its update."""
+        canary, _entity = _make_speaker(hass, register_speaker, "A")
+        canary.last_update_success = False
+        other, other_entity = _make_speaker(hass, register_speaker, "B")
+
+        rollout, _ = plan_rollout(hass, [canary, other], max_parallel=2)
+        await rollout.async_run()
+
+        assert rollout.phase == "halted"
+        assert rollout.canary.status == STATUS_UPDATED
+        assert rollout.waves[0][0].status == STATUS_SKIPPED
+        other_entity.async_install_and_wait.assert_not_awaited()
+
+
+class TestRolloutSensor:
+    """The integration-wide rollout progress sensor."""
+
+    @pytest.mark.asyncio
+    async def test_sensor_tracks_phase_counts_and_wave(self, hass: HomeAssistant, register_speaker):
+        """The running rollout writes progress, counts and the current wave to the sensor."""
+        sensor = WiiMFirmwareRolloutSensor()
+        sensor.hass = hass
+        sensor.entity_id = "sensor.wiim_firmware_rollout"
+        hass.data.setdefault(DOMAIN, {})[DATA_ROLLOUT_SENSOR] = sensor
+        seen: list[dict] = []
+
+        async def _install(entity) -> bool:
+            state = hass.states.get(sensor.entity_id)
+            seen.append({"state": state.state, **state.attributes})
+            if entity is failing:
+                return False
+            entity.installed_version = "4.6.2"
+            return True
+
+        coordinators = []
+        for name in ("A", "B", "C"):
+            coordinator, entity = _make_speaker(hass, register_speaker, name, install=_install)
+            coordinators.append(coordinator)
+        failing = entity
+
+        rollout, _ = plan_rollout(hass, coordinators, max_parallel=1)
+        hass.data[DOMAIN][DATA_ROLLOUT] = rollout
+        await rollout.async_run()
+
+        # While wave 1 (B) installs, the canary is done and C is still waiting
+        assert seen[1]["phase"] == "wave 1/2"
+        assert seen[1]["wave"] == 1
+        assert (seen[1]["done"], seen[1]["failed"], seen[1]["remaining"]) == (1, 0, 2)
+        assert seen[1]["installing_devices"] == ["B"]
+
+        state = hass.states.get(sensor.entity_id)
+        assert sensor.unique_id == f"{DOMAIN}_firmware_rollout"
+        assert state.state == "100"
+        assert state.attributes["phase"] == "halted"
+        assert state.attributes["wave"] == 2
+        assert (state.attributes["done"], state.attributes["failed"], state.attributes["remaining"]) == (2, 1, 0)
+        assert state.attributes["failed_devices"] == ["C"]
+
+    @pytest.mark.asyncio
+    async def test_sensor_created_once_per_integration(self, hass: HomeAssistant, register_speaker):
+        """Only the first entry's sensor platform adds the rollout sensor."""
+        added: list = []
+        for name in ("A", "B"):
+            coordinator, _entity = _make_speaker(hass, register_speaker, name)
+            coordinator.entry.unique_id = coordinator.entry.title = name
+            coordinator.player.supports_audio_output = False
+            await async_setup_sensors(hass, coordinator.entry, added.extend)
+
+        rollout_sensors = [entity for entity in added if isinstance(entity, WiiMFirmwareRolloutSensor)]
+        assert len(rollout_sensors) == 1
+        assert hass.data[DOMAIN][DATA_ROLLOUT_SENSOR] is rollout_sensors[0]
+
+        rollout_sensors[0].hass = hass
+        await rollout_sensors[0].async_will_remove_from_hass()
+        assert DATA_ROLLOUT_SENSOR not in hass.data[DOMAIN]
+
+    @pytest.mark.asyncio
+    async def test_sensor_moves_to_next_speaker_when_owner_unloads(self, hass: HomeAssistant, register_speaker):
+        """Unloading the entry that holds the rollout sensor hands it to another loaded speaker."""
+        added: dict[str, list] = {}
+        entries = []
+        for name in ("A", "B"):
+            coordinator, _entity = _make_speaker(hass, register_speaker, name)
+            coordinator.entry.unique_id = coordinator.entry.title = name
+            coordinator.entry.domain = DOMAIN
+            coordinator.player.supports_audio_output = False
+            entries.append(coordinator.entry)
+            await async_setup_sensors(hass, coordinator.entry, added.setdefault(name, []).extend)
+        owner = hass.data[DOMAIN][DATA_ROLLOUT_SENSOR]
+        assert owner in added["A"]
+
+        owner.hass = hass
+        await owner.async_will_remove_from_hass()
+        with (
+            patch("custom_components.wiim.get_enabled_platforms", return_value=[]),
+            patch.object(hass.config_entries, "async_unload_platforms", AsyncMock(return_value=True)),
+            patch.object(hass.config_entries, "async_entries", return_value=entries[1:]),
+        ):
+            assert await async_unload_entry(hass, entries[0])
+
+        moved = [entity for entity in added["B"] if isinstance(entity, WiiMFirmwareRolloutSensor)]
+        assert len(moved) == 1
+        assert hass.data[DOMAIN][DATA_ROLLOUT_SENSOR] is moved[0]
+
+
+class TestFirmwareRolloutService:
+    """The wiim.firmware_rollout action."""
+
+    @pytest.mark.asyncio
+    async def test_service_returns_plan_and_rejects_second_rollout(
+        self, hass: HomeAssistant, register_speaker, services
+    ):
+        """The plan is returned at once; a second call while running is rejected."""
+        release = asyncio.Event()
+
+        async def _slow(entity) -> bool:
+            await release.wait()
+            entity.installed_version = "4.6.2"
+            return True
+
+        entries = []
+        for name in ("A", "B", "C"):
+            coordinator, _entity = _make_speaker(hass, register_speaker, name, install=_slow)
+            entries.append(coordinator.entry)
+
+        with patch.object(hass.config_entries, "async_entries", return_value=entries):
+            response = await hass.services.async_call(
+                DOMAIN, SERVICE_FIRMWARE_ROLLOUT, {"max_parallel": 1}, blocking=True, return_response=True
+            )
+            assert response == {"canary": "A", "waves": [["B"], ["C"]], "not_eligible": []}
+            assert hass.data[DOMAIN][DATA_ROLLOUT].running
+
+            with pytest.raises(HomeAssistantError, match="already running"):
+                await hass.services.async_call(
+                    DOMAIN, SERVICE_FIRMWARE_ROLLOUT, {}, blocking=True, return_response=True
+                )
+
+            status = await hass.services.async_call(
+                DOMAIN, SERVICE_FIRMWARE_ROLLOUT_STATUS, {}, blocking=True, return_response=True
+            )
+            assert status["phase"] == "canary"
+            assert status["devices"]["A"] == {
+                "name": "A",
+                "status": "installing",
+                "from_version": "4.6.1",
+                "to_version": None,
+                "error": None,
+            }
+
+            release.set()
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert hass.data[DOMAIN][DATA_ROLLOUT].phase == "completed"
+        status = await hass.services.async_call(
+            DOMAIN, SERVICE_FIRMWARE_ROLLOUT_STATUS, {}, blocking=True, return_response=True
+        )
+        assert status["phase"] == "completed"
+        assert status["counts"]["updated"] == 3
+
+    @pytest.mark.asyncio
+    async def test_status_without_rollout(self, hass: HomeAssistant, services):
+        """The status action answers before any rollout has started."""
+        hass.data.setdefault(DOMAIN, {})
+        status = await hass.services.async_call(
+            DOMAIN, SERVICE_FIRMWARE_ROLLOUT_STATUS, {}, blocking=True, return_response=True
+        )
+        assert status == {"phase": "none"}
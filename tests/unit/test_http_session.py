@@ -0,0 +1,66 @@
+"""Unit tests for the integration-owned HTTP connection pool."""
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.coordinator import WiiMCoordinator
+from custom_components.wiim.http_session import (
+    CONNECTIONS_PER_HOST,
+    KEEPALIVE_SECONDS,
+    MAX_CONNECTIONS,
+    HostConnectionStats,
+    async_get_http_pool,
+    get_existing_http_pool,
+    get_http_pool,
+)
+from tests.simulator import SimulatorFleet
+
+
+def test_reuse_rate():
+    """The rate is the share of reused connections, and undefined before any request."""
+    assert HostConnectionStats().reuse_rate is None
+    assert HostConnectionStats(created=1, reused=3).reuse_rate == 0.75
+
+
+async def test_pool_is_shared_and_closed_with_home_assistant(hass: HomeAssistant):
+    """Flows and entries get one pool with one SSL context; it closes with Home Assistant."""
+    assert get_existing_http_pool(hass) is None
+    pool = await async_get_http_pool(hass)
+
+    assert get_http_pool(hass) is pool
+    assert (await async_get_http_pool(hass)).ssl_context is pool.ssl_context is not None
+    connector = pool.session.connector
+    assert connector.limit_per_host == CONNECTIONS_PER_HOST
+    # A 200-speaker fleet refreshing at once is never queued behind the overall cap.
+    assert connector.limit == MAX_CONNECTIONS >= 200 * CONNECTIONS_PER_HOST
+    assert connector._keepalive_timeout == KEEPALIVE_SECONDS  # noqa: SLF001
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert pool.session.closed
+
+
+async def test_coordinator_polls_reuse_one_connection(hass: HomeAssistant, socket_enabled):
+    """Consecutive polls of a speaker go over the same pooled connection."""
+    async with SimulatorFleet(1) as fleet:
+        speaker = fleet.speakers[0]
+        entry = MockConfigEntry(domain=DOMAIN, data={"host": speaker.address}, unique_id=speaker.uuid)
+        entry.add_to_hass(hass)
+        coordinator = WiiMCoordinator(hass, speaker.host, entry=entry, port=speaker.port, protocol="http", timeout=1)
+
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        await coordinator.async_shutdown()
+
+    pool = get_http_pool(hass)
+    stats = pool.host_stats(speaker.host)
+    assert stats.created == 1
+    assert stats.reused >= 1
+
+    diagnostics = pool.as_dict({"Kitchen": speaker.host})
+    assert diagnostics["devices"]["Kitchen"].items() >= stats.as_dict().items()
+    assert diagnostics["devices"]["Kitchen"]["rate_limit"]["endpoints"][str(speaker.port)]["requests"] >= 2
+    assert diagnostics["total"]["created"] == 1
+    assert speaker.host not in str(diagnostics)
@@ -760,7 +760,7 @@ class TestCapabilityCacheRefresh:
         entry.add_to_hass(hass)
 
         monkeypatch.setattr(
-            "custom_components.wiim.discover_devices",
+            "pywiim.discovery.discover_devices",
             AsyncMock(
                 return_value=[
                     DiscoveredDevice(
@@ -793,7 +793,7 @@ class TestCapabilityCacheRefresh:
         entry.add_to_hass(hass)
 
         monkeypatch.setattr(
-            "custom_components.wiim.discover_devices",
+            "pywiim.discovery.discover_devices",
             AsyncMock(
                 return_value=[
                     DiscoveredDevice(
@@ -0,0 +1,123 @@
+"""Unit tests for the opt-in event-loop blocking monitor."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.coordinator import WiiMCoordinator
+from custom_components.wiim.loop_monitor import LOOP_MONITOR, LoopMonitor, monitored
+from custom_components.wiim.services import SERVICE_LOOP_MONITOR, async_setup_services
+
+
+@pytest.fixture(autouse=True)
+def _reset_monitor():
+    """The monitor is a module-level singleton; leave it disabled and empty."""
+    yield
+    LOOP_MONITOR.disable()
+    LOOP_MONITOR.reset()
+
+
+class _Owner:
+    entity_id = "media_player.kitchen"
+
+    @monitored()
+    def work(self, delay: float = 0.0) -> str:
+        if delay:
+            time.sleep(delay)
+        return "done"
+
+
+def test_disabled_monitor_records_nothing():
+    """Monitored calls pass through untouched while the monitor is off."""
+    assert _Owner().work() == "done"
+    assert LOOP_MONITOR.as_dict()["sites"] == {}
+
+
+def test_enabled_monitor_records_site_stats_and_slow_calls():
+    """Per-site stats use the qualified name; slow calls carry owner and stack."""
+    LOOP_MONITOR.enable()
+    owner = _Owner()
+    owner.work()
+    owner.work(0.002)
+
+    report = LOOP_MONITOR.as_dict()
+    site = report["sites"]["_Owner.work"]
+    assert site["calls"] == 2
+    assert site["max_ms"] >= 2.0
+    slowest = report["slowest_calls"][0]
+    assert slowest["site"] == "_Owner.work"
+    assert slowest["owner"] == "media_player.kitchen"
+    assert slowest["duration_ms"] == site["max_ms"]
+    assert any("test_enabled_monitor_records_site_stats_and_slow_calls" in frame for frame in slowest["stack"])
+
+
+def test_slowest_buffer_is_bounded_and_sorted():
+    """Only the slowest ``max_slow_calls`` calls are kept, slowest first."""
+    monitor = LoopMonitor(max_slow_calls=3)
+    for duration in (1.0, 5.0, 2.0, 4.0, 3.0, 0.5):
+        monitor.record("site", duration)
+
+    report = monitor.as_dict()
+    assert [call["duration_ms"] for call in report["slowest_calls"]] == [5.0, 4.0, 3.0]
+    assert report["sites"]["site"]["calls"] == 6
+    assert report["sites"]["site"]["total_ms"] == 15.5
+
+
+def test_slow_call_warns_even_when_buffer_is_full(caplog):
+    """Every call over the threshold is logged, not only those entering the slowest buffer."""
+    monitor = LoopMonitor(max_slow_calls=1)
+    monitor.record("site", 500.0)
+    monitor.record("site", 60.0)
+
+    assert len(monitor.as_dict()["slowest_calls"]) == 1
+    assert sum("blocked the event loop" in record.message for record in caplog.records) == 2
+
+
+def test_only_outermost_monitored_call_is_timed():
+    """A monitored call made inside another one is not counted separately."""
+
+    class _Nested(_Owner):
+        @monitored()
+        def outer(self) -> str:
+            return self.work(0.002)
+
+    LOOP_MONITOR.enable()
+    owner = _Nested()
+    owner.outer()
+    owner.work()
+
+    report = LOOP_MONITOR.as_dict()
+    assert report["sites"]["test_only_outermost_monitored_call_is_timed.<locals>._Nested.outer"]["calls"] == 1
+    assert report["sites"]["_Owner.work"]["calls"] == 1
+    assert report["sites"]["_Owner.work"]["max_ms"] < 2.0
+
+
+def test_monitored_keeps_callback_marker():
+    """Wrapping a ``@callback`` keeps it recognised as a loop callback."""
+    assert getattr(WiiMCoordinator._on_player_state_changed, "_hass_callback", False)
+
+
+async def test_loop_monitor_action_toggles_and_reports(hass: HomeAssistant):
+    """``wiim.loop_monitor`` enables, resets and returns the report."""
+    await async_setup_services(hass)
+
+    report = await hass.services.async_call(
+        DOMAIN, SERVICE_LOOP_MONITOR, {"enabled": True}, blocking=True, return_response=True
+    )
+    assert report["enabled"] is True
+    assert LOOP_MONITOR.enabled
+
+    coordinator = MagicMock()
+    coordinator.name = "WiiM Kitchen"
+    WiiMCoordinator._on_player_state_changed(coordinator)
+    report = await hass.services.async_call(DOMAIN, SERVICE_LOOP_MONITOR, {}, blocking=True, return_response=True)
+    assert report["sites"]["WiiMCoordinator._on_player_state_changed"]["calls"] == 1
+
+    report = await hass.services.async_call(
+        DOMAIN, SERVICE_LOOP_MONITOR, {"enabled": False, "reset": True}, blocking=True, return_response=True
+    )
+    assert report["enabled"] is False
+    assert report["sites"] == {}
@@ -1,13 +1,28 @@
 """Unit tests for WiiM Media Player - testing volume and core functionality."""
 
+import importlib
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 
+from custom_components.wiim.announce_queue import AnnouncementQueue
+from custom_components.wiim.browse_cache import BrowseCache
 from custom_components.wiim.const import CONF_VOLUME_STEP, DEFAULT_VOLUME_STEP
 from custom_components.wiim.media_player import WiiMMediaPlayer
+from custom_components.wiim.queue_cache import QueueCache
+
+
+@pytest.fixture(autouse=True)
+def import_modules_directly():
+    """Most tests give the entity a MagicMock hass, which has no import cache for lazy imports."""
+
+    async def _import(_hass, name):
+        return importlib.import_module(name)
+
+    with patch("custom_components.wiim.media_player.async_import_module", side_effect=_import):
+        yield
 
 
 @pytest.fixture
@@ -42,6 +57,9 @@ def mock_coordinator():
     coordinator.player.set_mute = AsyncMock(return_value=True)
     coordinator.player.clear_playlist = AsyncMock(return_value=True)
     coordinator.player.clear_queue = AsyncMock(return_value=True)
+    coordinator.announcement_queue = AnnouncementQueue("test", default_hold=0)
+    coordinator.browse_cache = BrowseCache()
+    coordinator.queue_cache = QueueCache()
     return coordinator
 
 
@@ -774,6 +792,7 @@ class TestWiiMMediaPlayerPlayMedia:
         mock_result = NotificationPlaybackResult(method_used="prompt", source_before="wifi", likely_interrupted=False)
         mock_coordinator.player.play_notification = AsyncMock(return_value=mock_result)
         media_player.hass = MagicMock()
+        media_player.hass.data = {}  # no announcement cache set up
         media_player.entity_id = "media_player.test"
 
         await media_player.async_play_media("music", "http://example.com/announce.mp3", **{ATTR_MEDIA_ANNOUNCE: True})
@@ -797,6 +816,7 @@ class TestWiiMMediaPlayerPlayMedia:
         )
         mock_coordinator.player.play_notification = AsyncMock(return_value=mock_result)
         media_player.hass = MagicMock()
+        media_player.hass.data = {}  # no announcement cache set up
         media_player.entity_id = "media_player.test"
 
         await media_player.async_play_media("music", "http://example.com/announce.mp3", **{ATTR_MEDIA_ANNOUNCE: True})
@@ -1296,6 +1316,66 @@ class TestWiiMMediaPlayerExtraState:
         assert attrs["queue_position"] is None
         assert attrs["queue_count"] is None
 
+    def test_volatile_attributes_not_recorded_with_option(self, media_player, mock_coordinator, mock_config_entry):
+        """Playback flags and queue position stay out of the recorder only with the recorder-friendly option."""
+        from custom_components.wiim.media_player import WiiMRecorderFriendlyMediaPlayer
+
+        friendly = WiiMRecorderFriendlyMediaPlayer(mock_coordinator, mock_config_entry)
+        recorded = media_player._Entity__combined_unrecorded_attributes
+        unrecorded = friendly._Entity__combined_unrecorded_attributes
+        for key in ("is_playing", "is_paused", "is_buffering", "play_state", "queue_position", "queue_count"):
+            assert key not in recorded
+            assert key in unrecorded
+        # The media player component's own exclusions still apply to both
+        assert "media_position" in recorded
+        assert "media_position" in unrecorded
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("recorder_friendly", [False, True])
+    async def test_setup_picks_player_class_from_option(
+        self, hass, mock_coordinator, mock_config_entry, recorder_friendly
+    ):
+        """Only speakers with the recorder-friendly option get the class that skips playback flags."""
+        from custom_components.wiim.const import CONF_RECORDER_FRIENDLY_ATTRIBUTES, DOMAIN
+        from custom_components.wiim.media_player import WiiMRecorderFriendlyMediaPlayer, async_setup_entry
+
+        mock_config_entry.options = {CONF_RECORDER_FRIENDLY_ATTRIBUTES: recorder_friendly}
+        hass.data[DOMAIN] = {mock_config_entry.entry_id: {"coordinator": mock_coordinator}}
+        added: list = []
+        with (
+            patch("homeassistant.helpers.entity_platform.async_get_current_platform"),
+            patch("custom_components.wiim.media_player.register_media_player_services"),
+        ):
+            await async_setup_entry(hass, mock_config_entry, added.extend)
+
+        assert isinstance(added[0], WiiMMediaPlayer)
+        assert isinstance(added[0], WiiMRecorderFriendlyMediaPlayer) is recorder_friendly
+
+    def test_recorder_friendly_attributes_drop_static_details(self, media_player, mock_coordinator, mock_config_entry):
+        """The recorder-friendly option leaves out model, firmware, IP, MAC and capabilities."""
+        from custom_components.wiim.const import CONF_RECORDER_FRIENDLY_ATTRIBUTES
+
+        mock_coordinator.player.role = "solo"
+        mock_coordinator.player.queue_position = 2
+        mock_coordinator.player.queue_count = 5
+        mock_config_entry.options = {CONF_RECORDER_FRIENDLY_ATTRIBUTES: True}
+
+        attrs = media_player.extra_state_attributes
+
+        for key in (
+            "device_model",
+            "firmware_version",
+            "ip_address",
+            "mac_address",
+            "music_assistant_compatible",
+            "integration_purpose",
+            "capabilities",
+        ):
+            assert key not in attrs
+        assert attrs["group_role"] == "solo"
+        assert attrs["queue_position"] == 2
+        assert attrs["queue_count"] == 5
+
 
 class TestWiiMMediaPlayerHelperFunctions:
     """Test helper functions."""
@@ -1380,6 +1460,73 @@ class TestWiiMMediaPlayerBrowse:
         assert result.children[0].title == "Preset 1"
         assert result.children[1].title == "Good Number"
 
+    @pytest.mark.asyncio
+    async def test_async_browse_media_root_cached(self, media_player, mock_coordinator):
+        """Browsing the root twice only asks Home Assistant for media sources once."""
+        media_player.hass = MagicMock()
+        mock_coordinator.player.supports_queue_browse = False
+        browse = AsyncMock(return_value=SimpleNamespace(children=[]))
+
+        with patch("custom_components.wiim.media_player.media_source.async_browse_media", new=browse):
+            first = await media_player.async_browse_media()
+            second = await media_player.async_browse_media()
+
+        assert first is second
+        browse.assert_awaited_once()
+        stats = mock_coordinator.browse_cache.as_dict()
+        assert stats["browse_count"] == 2
+        assert stats["hits"] == 1
+        assert stats["last_browse_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_async_browse_media_presets_rebuilt_when_presets_change(self, media_player, mock_coordinator):
+        """The preset folder is cached until pywiim reports different preset data."""
+        mock_coordinator.player.supports_presets = True
+        mock_coordinator.player.presets_full_data = True
+        mock_coordinator.player.presets = [{"name": "Jazz FM", "number": 1}]
+
+        first = await media_player.async_browse_media("presets", "")
+        assert await media_player.async_browse_media("presets", "") is first
+
+        mock_coordinator.player.presets = [{"name": "Rock FM", "number": 1}]
+        updated = await media_player.async_browse_media("presets", "")
+
+        assert updated is not first
+        assert updated.children[0].title == "Rock FM"
+
+    @pytest.mark.asyncio
+    async def test_async_browse_media_queue_pages(self, media_player, mock_coordinator):
+        """Queue browsing returns one page of playable items plus a link to the next page."""
+        from custom_components.wiim.media_player import QUEUE_BROWSE_PAGE_SIZE
+
+        mock_coordinator.player.supports_queue_browse = True
+        mock_coordinator.player.queue_count = 60
+        mock_coordinator.player.queue_position = 0
+        mock_coordinator.player.get_queue = AsyncMock(
+            return_value=[{"position": i, "title": f"Song {i}", "artist": "Band"} for i in range(60)]
+        )
+
+        first = await media_player.async_browse_media("queue", "0")
+        second = await media_player.async_browse_media("queue", first.children[-1].media_content_id)
+
+        assert len(first.children) == QUEUE_BROWSE_PAGE_SIZE + 1
+        assert first.children[0].title == "Song 0 - Band"
+        assert first.children[0].media_content_type == "queue_item"
+        assert first.children[-1].title == "More…"
+        assert [child.media_content_id for child in second.children] == [str(i) for i in range(50, 60)]
+        # PlayQueue-style backend returned the whole queue once; the second page came from the cache
+        mock_coordinator.player.get_queue.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_play_media_queue_item_jumps_to_position(self, media_player, mock_coordinator):
+        """Selecting a queue item in the browser plays from that queue position."""
+        mock_coordinator.player.supports_queue_add = True
+        mock_coordinator.player.play_queue = AsyncMock()
+
+        await media_player.async_play_media("queue_item", "7")
+
+        mock_coordinator.player.play_queue.assert_awaited_once_with(7)
+
 
 class TestWiiMMediaPlayerSourceEdgeCases:
     """Test source selection edge cases."""
@@ -1575,6 +1722,7 @@ class TestWiiMMediaPlayerPlayMediaEdgeCases:
         mock_result = NotificationPlaybackResult(method_used="prompt", source_before="wifi", likely_interrupted=False)
         mock_coordinator.player.play_notification = AsyncMock(return_value=mock_result)
         media_player.hass = MagicMock()
+        media_player.hass.data = {}  # no announcement cache set up
         media_player.entity_id = "media_player.test"
 
         mock_sourced_media = MagicMock()
@@ -1583,7 +1731,7 @@ class TestWiiMMediaPlayerPlayMediaEdgeCases:
         with patch.object(media_source, "is_media_source_id", return_value=True):
             with patch.object(media_source, "async_resolve_media", return_value=mock_sourced_media):
                 with patch(
-                    "custom_components.wiim.media_player.async_process_play_media_url",
+                    "custom_components.wiim.announce.async_process_play_media_url",
                     return_value="http://example.com/announce.mp3",
                 ):
                     await media_player.async_play_media("music", "media-source://test", **{ATTR_MEDIA_ANNOUNCE: True})
@@ -1612,7 +1760,7 @@ class TestWiiMMediaPlayerPlayMediaEdgeCases:
         with patch.object(media_source, "is_media_source_id", return_value=True):
             with patch.object(media_source, "async_resolve_media", return_value=mock_sourced_media):
                 with patch(
-                    "custom_components.wiim.media_player.async_process_play_media_url",
+                    "custom_components.wiim.announce.async_process_play_media_url",
                     side_effect=NoURLAvailableError("no url"),
                 ):
                     with pytest.raises(
@@ -2040,12 +2188,32 @@ class TestWiiMMediaPlayerServiceHandlers:
             },
         ]
         mock_coordinator.player.get_queue = AsyncMock(return_value=mock_queue)
+        mock_coordinator.player.queue_count = 2
 
         result = await media_player.async_get_queue()
 
-        assert result == {"queue": mock_queue}
+        assert result == {"queue": mock_queue, "offset": 0, "limit": 0, "total": 2}
         mock_coordinator.player.get_queue.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_async_get_queue_cached_until_modified(self, media_player, mock_coordinator):
+        """Repeated get_queue calls hit the cache; removing an item invalidates it."""
+        mock_coordinator.player.supports_queue_browse = True
+        mock_coordinator.player.supports_queue_add = True
+        mock_coordinator.player.queue_count = 3
+        mock_coordinator.player.queue_position = 0
+        mock_coordinator.player.remove_from_queue = AsyncMock()
+        mock_coordinator.player.get_queue = AsyncMock(return_value=[{"position": 1}, {"position": 2}])
+
+        first = await media_player.async_get_queue(offset=1, limit=2)
+        second = await media_player.async_get_queue(offset=1, limit=2)
+        assert first["queue"] == second["queue"]
+        mock_coordinator.player.get_queue.assert_awaited_once_with(starting_index=1, requested_count=2)
+
+        await media_player.async_remove_from_queue(2)
+        await media_player.async_get_queue(offset=1, limit=2)
+        assert mock_coordinator.player.get_queue.await_count == 2
+
 
 class TestWiiMMediaPlayerEdgeCases:
     """Test edge cases and error conditions."""
@@ -0,0 +1,129 @@
+"""Unit tests for the Prometheus metrics endpoint."""
+
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pywiim.exceptions import WiiMConnectionError, WiiMRequestError
+
+from custom_components.wiim.command_stats import DeviceMetrics, Histogram
+from custom_components.wiim.const import CONF_PROMETHEUS_METRICS, DOMAIN
+from custom_components.wiim.coordinator import WiiMCoordinator
+from custom_components.wiim.entity import WiimEntity
+from custom_components.wiim.metrics import async_setup_metrics, render_metrics
+from tests.simulator import SimulatorFleet
+
+
+@pytest.fixture(autouse=True)
+def _allow_loopback(socket_enabled):
+    """The simulator listens on real loopback sockets."""
+
+
+def test_histogram_buckets_are_upper_inclusive():
+    """A value equal to a bound lands in that bucket; larger values go to +Inf."""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(5.65)
+
+
+def test_consecutive_poll_failures_reset_on_success():
+    """Failed polls count up until the next successful poll."""
+    metrics = DeviceMetrics()
+    metrics.record_poll(0.2, "unreachable")
+    metrics.record_poll(0.2, "unreachable")
+    assert metrics.consecutive_poll_failures == 2
+    metrics.record_poll(0.1)
+    assert metrics.consecutive_poll_failures == 0
+    assert metrics.polls == {"ok": 1, "unreachable": 2}
+
+
+async def _coordinator(
+    hass: HomeAssistant, fleet: SimulatorFleet, index: int = 0, exported: bool = True
+) -> WiiMCoordinator:
+    speaker = fleet.speakers[index]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": speaker.address},
+        options={CONF_PROMETHEUS_METRICS: exported},
+        unique_id=speaker.uuid,
+    )
+    entry.add_to_hass(hass)
+    coordinator = WiiMCoordinator(hass, speaker.host, entry=entry, port=speaker.port, protocol="http", timeout=1)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {"coordinator": coordinator}
+    return coordinator
+
+
+async def test_polls_and_commands_are_rendered(hass: HomeAssistant):
+    """Polls and wiim_command outcomes show up per device in Prometheus text format."""
+    async with SimulatorFleet(1) as fleet:
+        coordinator = await _coordinator(hass, fleet)
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+        entity = WiimEntity(coordinator, MagicMock())
+        async with entity.wiim_command("set volume"):
+            pass
+        with pytest.raises(HomeAssistantError):
+            async with entity.wiim_command("play"):
+                raise WiiMRequestError("Invalid response")
+        await coordinator.async_shutdown()
+
+    text = render_metrics(hass)
+    device = f'device="{fleet.speakers[0].host}",name="Sim Speaker 000"'
+    assert f'wiim_polls_total{{{device},outcome="ok"}} 2' in text
+    assert f"wiim_poll_duration_seconds_count{{{device}}} 2" in text
+    assert f'wiim_poll_duration_seconds_bucket{{{device},le="+Inf"}} 2' in text
+    assert f'wiim_commands_total{{{device},outcome="ok"}} 1' in text
+    assert f'wiim_commands_total{{{device},outcome="WiiMRequestError"}} 1' in text
+    assert f"wiim_available{{{device}}} 1" in text
+    assert text.count("# TYPE wiim_polls_total counter") == 1
+    assert f"wiim_queue_cache_hits_total{{{device}}} 0" in text
+
+
+async def test_only_speakers_with_the_option_are_exported(hass: HomeAssistant):
+    """Speakers without the Prometheus Metrics option are left out of the output."""
+    async with SimulatorFleet(2) as fleet:
+        await _coordinator(hass, fleet, 0)
+        await _coordinator(hass, fleet, 1, exported=False)
+
+    assert render_metrics(hass).count("wiim_available{") == 1
+
+
+async def test_unreachable_poll_is_classified(hass: HomeAssistant):
+    """Connection failures are counted as ``unreachable`` and raise the failure gauge."""
+    async with SimulatorFleet(1) as fleet:
+        coordinator = await _coordinator(hass, fleet)
+        coordinator.player.refresh = AsyncMock(side_effect=WiiMConnectionError("Cannot connect to host"))
+        await coordinator.async_refresh()
+        await coordinator.async_shutdown()
+
+    assert coordinator.metrics.polls.get("unreachable") == 1
+    assert coordinator.metrics.consecutive_poll_failures == 1
+
+
+async def test_view_requires_auth(hass: HomeAssistant, hass_client, hass_client_no_auth):
+    """The endpoint serves Prometheus text to authenticated clients only."""
+    await async_setup_component(hass, "http", {})
+    with patch.object(hass.http, "register_view", wraps=hass.http.register_view) as register_view:
+        await async_setup_metrics(hass)
+        await async_setup_metrics(hass)
+    register_view.assert_called_once()
+
+    anonymous = await hass_client_no_auth()
+    assert (await anonymous.get("/api/wiim/metrics")).status == HTTPStatus.UNAUTHORIZED
+
+    client = await hass_client()
+    assert (await client.get("/api/wiim/metrics")).status == HTTPStatus.NOT_FOUND
+
+    async with SimulatorFleet(1) as fleet:
+        await _coordinator(hass, fleet)
+    response = await client.get("/api/wiim/metrics")
+    assert response.status == HTTPStatus.OK
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
@@ -10,6 +10,7 @@ from custom_components.wiim.number import (
     WiiMSubwooferLevelNumber,
     async_setup_entry,
 )
+from custom_components.wiim.single_flight import SingleFlight
 
 
 @pytest.fixture
@@ -28,6 +29,7 @@ def mock_config_entry():
 def mock_coordinator():
     """Create a mock coordinator."""
     coordinator = MagicMock()
+    coordinator.single_flight = SingleFlight()
     coordinator.data = {"player": MagicMock()}
     coordinator.last_update_success = True
     coordinator.async_request_refresh = AsyncMock()
@@ -0,0 +1,86 @@
+"""Unit tests for the on-demand ``wiim.profile`` action."""
+
+import asyncio
+import cProfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.models import PlayerStatus
+from custom_components.wiim.profiler import DATA_PROFILER, summarize_profile
+from custom_components.wiim.services import SERVICE_PROFILE, async_setup_services
+
+
+@pytest.fixture(autouse=True)
+def _config_dir(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Keep profile files out of the shared testing config directory."""
+    hass.config.config_dir = str(tmp_path)
+
+
+def _wiim_work() -> None:
+    """Run some integration code so the profile has WiiM frames."""
+    for _ in range(50):
+        PlayerStatus.model_validate({"play_status": "play", "vol": 30})
+
+
+def test_summary_keeps_only_wiim_frames():
+    """Functions outside custom_components.wiim / pywiim are left out of the summary."""
+    profile = cProfile.Profile()
+    profile.enable()
+    _wiim_work()
+    sorted(range(1000))
+    profile.disable()
+
+    summary = summarize_profile(profile, top=5)
+    assert summary["wiim_functions"] > 0
+    assert len(summary["top_functions"]) <= 5
+    assert all("wiim" in row["function"] for row in summary["top_functions"])
+    cumulative = [row["cumulative_ms"] for row in summary["top_functions"]]
+    assert cumulative == sorted(cumulative, reverse=True)
+
+
+async def test_profile_action_writes_files_and_returns_summary(hass: HomeAssistant):
+    """The action profiles for ``duration`` seconds, writes .prof/.txt and returns top functions."""
+    await async_setup_services(hass)
+
+    async def _busy_sleep(_seconds: float) -> None:
+        _wiim_work()
+
+    with patch("custom_components.wiim.profiler.asyncio.sleep", _busy_sleep):
+        result = await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE, {"duration": 1, "top": 3}, blocking=True, return_response=True
+        )
+
+    assert result["duration_seconds"] == 1
+    assert Path(result["profile_file"]).parent == Path(hass.config.config_dir)
+    assert Path(result["profile_file"]).is_file()
+    assert "models.py" in Path(result["report_file"]).read_text()
+    assert 0 < len(result["top_functions"]) <= 3
+    assert hass.data[DOMAIN][DATA_PROFILER] is False
+
+
+async def test_profile_action_rejects_concurrent_runs(hass: HomeAssistant):
+    """Only one profile can run at a time."""
+    await async_setup_services(hass)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _blocking_sleep(_seconds: float) -> None:
+        started.set()
+        await release.wait()
+
+    with patch("custom_components.wiim.profiler.asyncio.sleep", _blocking_sleep):
+        first = hass.async_create_task(
+            hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"duration": 5}, blocking=True, return_response=True)
+        )
+        await started.wait()
+        with pytest.raises(HomeAssistantError, match="already running"):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_PROFILE, {"duration": 5}, blocking=True, return_response=True
+            )
+        release.set()
+        await first
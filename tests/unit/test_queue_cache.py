@@ -0,0 +1,59 @@
+"""Unit tests for the per-device queue page cache."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.wiim.queue_cache import QueueCache
+
+
+def _player(items: list[dict]) -> MagicMock:
+    player = MagicMock()
+    player.queue_count = len(items)
+    player.queue_position = 0
+    player.get_queue = AsyncMock(return_value=items)
+    return player
+
+
+class TestQueueCache:
+    """Test page caching and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_page_cached_until_queue_changes(self):
+        """A page is fetched once until queue_count or queue_position changes."""
+        cache = QueueCache()
+        player = _player([{"position": 10}, {"position": 11}])
+
+        await cache.async_get_page(player, 10, 2)
+        await cache.async_get_page(player, 10, 2)
+        assert player.get_queue.await_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        player.queue_position = 1
+        await cache.async_get_page(player, 10, 2)
+        assert player.get_queue.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self):
+        """Our own queue edits drop cached pages even if the counters look the same."""
+        cache = QueueCache()
+        player = _player([{"position": 0}])
+
+        await cache.async_get_page(player)
+        cache.invalidate()
+        await cache.async_get_page(player)
+
+        assert player.get_queue.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_response_is_sliced(self):
+        """Backends that ignore pagination are fetched once and sliced locally."""
+        cache = QueueCache()
+        player = _player([{"position": i} for i in range(10)])
+
+        page = await cache.async_get_page(player, 4, 3)
+        later = await cache.async_get_page(player, 8, 3)
+
+        assert [item["position"] for item in page] == [4, 5, 6]
+        assert [item["position"] for item in later] == [8, 9]
+        assert player.get_queue.await_count == 1
@@ -0,0 +1,184 @@
+"""Unit tests for per-speaker adaptive rate limits."""
+
+import errno
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiim.http_session import get_http_pool
+from custom_components.wiim.rate_limit import (
+    MAX_WAIT_SECONDS,
+    PROFILE_AUDIO_PRO_ORIGINAL,
+    PROFILE_DEFAULT,
+    PROFILE_LEGACY,
+    PROFILES,
+    RECOVERY_INTERVAL_SECONDS,
+    AdaptiveTokenBucket,
+    HostRateLimits,
+    is_overload_error,
+    profile_for_capabilities,
+)
+from tests.simulator import FaultProfile, SimulatorFleet
+
+_MONOTONIC = "custom_components.wiim.rate_limit.time.monotonic"
+
+
+@pytest.mark.parametrize(
+    ("capabilities", "profile"),
+    [
+        (None, PROFILE_DEFAULT),
+        ({"vendor": "wiim", "is_legacy_device": False}, PROFILE_DEFAULT),
+        ({"vendor": "linkplay_generic", "is_legacy_device": True}, PROFILE_LEGACY),
+        ({"vendor": "audio_pro", "audio_pro_generation": "mkii", "is_legacy_device": False}, PROFILE_DEFAULT),
+        (
+            {"vendor": "audio_pro", "audio_pro_generation": "original", "is_legacy_device": True},
+            PROFILE_AUDIO_PRO_ORIGINAL,
+        ),
+    ],
+)
+def test_profile_for_capabilities(capabilities, profile):
+    """First-generation Audio Pro and legacy firmware get lower limits."""
+    assert profile_for_capabilities(capabilities) == profile
+
+
+def test_overload_errors():
+    """Resets and refusals count as overload; timeouts and HTTP errors do not."""
+    key = aiohttp.client_reqrep.ConnectionKey("10.0.0.2", 80, False, True, None, None, None)
+    assert is_overload_error(aiohttp.ServerDisconnectedError())
+    assert is_overload_error(aiohttp.ClientConnectorError(key, ConnectionRefusedError(errno.ECONNREFUSED, "refused")))
+    assert is_overload_error(aiohttp.ClientOSError(errno.ECONNRESET, "reset"))
+    assert not is_overload_error(TimeoutError())
+    assert not is_overload_error(aiohttp.ClientOSError(errno.EHOSTUNREACH, "no route"))
+
+
+class TestAdaptiveTokenBucket:
+    """Waiting, back-off and recovery."""
+
+    @pytest.mark.asyncio
+    async def test_waits_once_burst_is_used(self):
+        """Requests beyond the burst wait for the refill, never longer than the cap."""
+        profile = PROFILES[PROFILE_AUDIO_PRO_ORIGINAL]
+        with patch(_MONOTONIC, return_value=100.0), patch("asyncio.sleep", AsyncMock()) as sleep:
+            bucket = AdaptiveTokenBucket(PROFILE_AUDIO_PRO_ORIGINAL)
+            waits = [await bucket.async_acquire() for _ in range(int(profile.burst) + 12)]
+
+        assert waits[: int(profile.burst)] == [0.0] * int(profile.burst)
+        assert waits[int(profile.burst)] == pytest.approx(1 / profile.rate)
+        assert max(waits) == MAX_WAIT_SECONDS
+        assert sleep.await_count == bucket.delayed == 12
+
+    @pytest.mark.asyncio
+    async def test_default_profile_limits_only_while_backed_off(self):
+        """Healthy WiiM speakers never wait; a back-off limits them until recovered."""
+        profile = PROFILES[PROFILE_DEFAULT]
+        with patch(_MONOTONIC, return_value=100.0), patch("asyncio.sleep", AsyncMock()) as sleep:
+            bucket = AdaptiveTokenBucket()
+            for _ in range(int(profile.burst) * 3):
+                await bucket.async_acquire()
+            sleep.assert_not_awaited()
+
+            bucket.record_success()
+            bucket.record_overload()
+            assert bucket.limited
+            assert bucket.rate == profile.rate / 2
+            for _ in range(3):
+                await bucket.async_acquire()
+            sleep.assert_awaited()
+
+        for step in range(1, 6):
+            with patch(_MONOTONIC, return_value=100.0 + step * RECOVERY_INTERVAL_SECONDS):
+                bucket.record_success()
+        assert bucket.rate == profile.rate
+        assert not bucket.limited
+
+    def test_overload_halves_rate_once_per_burst_and_recovers_slowly(self):
+        """Failures halve the rate down to the minimum; successes step it back up."""
+        with patch(_MONOTONIC, return_value=100.0):
+            bucket = AdaptiveTokenBucket(PROFILE_LEGACY)
+            profile = bucket.profile
+            bucket.record_success()
+            bucket.record_overload()
+            bucket.record_overload()
+        assert bucket.rate == profile.rate / 2
+        assert (bucket.overload_errors, bucket.backoffs) == (2, 1)
+        assert bucket.tokens <= 1
+
+        for step in range(1, 10):
+            with patch(_MONOTONIC, return_value=100.0 + step * 2):
+                bucket.record_overload()
+        assert bucket.rate == profile.min_rate
+
+        now = 120.0
+        with patch(_MONOTONIC, return_value=now + 1):
+            bucket.record_success()
+        assert bucket.rate == profile.min_rate
+        with patch(_MONOTONIC, return_value=now + RECOVERY_INTERVAL_SECONDS):
+            bucket.record_success()
+        assert bucket.rate == pytest.approx(profile.min_rate + profile.rate / 10)
+
+    def test_profile_change_keeps_back_off(self):
+        """A new profile applies at once unless the rate is backed off."""
+        bucket = AdaptiveTokenBucket()
+        bucket.set_profile(PROFILE_LEGACY)
+        assert bucket.rate == PROFILES[PROFILE_LEGACY].rate
+
+        bucket.record_success()
+        bucket.record_overload()
+        bucket.set_profile(PROFILE_DEFAULT)
+        assert bucket.rate == PROFILES[PROFILE_LEGACY].rate / 2
+
+
+@pytest.mark.asyncio
+async def test_endpoint_that_never_answered_is_not_limited():
+    """Refusals from a closed port neither lower the rate nor delay later requests."""
+    bucket = AdaptiveTokenBucket(PROFILE_AUDIO_PRO_ORIGINAL)
+    bucket.record_overload()
+    assert bucket.overload_errors == 1
+    assert bucket.backoffs == 0
+    assert bucket.rate == bucket.profile.rate
+
+    with patch("asyncio.sleep", AsyncMock()) as sleep:
+        for _ in range(10):
+            await bucket.async_acquire()
+    sleep.assert_not_awaited()
+
+
+def test_profiles_are_per_host_and_buckets_per_endpoint():
+    """Configuring a host updates its existing endpoints and later ones."""
+    limits = HostRateLimits()
+    limits.bucket("10.0.0.2", 443)
+    limits.configure("10.0.0.2", {"vendor": "linkplay_generic", "is_legacy_device": True})
+
+    assert limits.bucket("10.0.0.2", 443).profile_name == PROFILE_LEGACY
+    assert limits.bucket("10.0.0.2", 80).profile_name == PROFILE_LEGACY
+    assert limits.bucket("10.0.0.3", 80).profile_name == PROFILE_DEFAULT
+    assert set(limits.host_dict("10.0.0.2")["endpoints"]) == {"80", "443"}
+
+
+async def test_pool_backs_off_on_dropped_connections(hass: HomeAssistant, socket_enabled):
+    """A speaker that starts dropping connections lowers its rate; one that answers does not."""
+    pool = get_http_pool(hass)
+
+    async def _get(speaker) -> None:
+        url = f"http://{speaker.host}:{speaker.port}/httpapi.asp?command=getStatusEx"
+        try:
+            async with pool.session.get(url) as resp:
+                await resp.read()
+        except aiohttp.ClientError:
+            pass
+
+    async with SimulatorFleet(2) as fleet:
+        flaky, healthy = fleet.speakers
+        await _get(flaky)
+        fleet.set_faults(flaky, FaultProfile(loss=1.0))
+        await _get(flaky)
+        await _get(healthy)
+
+    flaky_bucket = pool.rate_limits.get(flaky.host, flaky.port)
+    healthy_bucket = pool.rate_limits.get(healthy.host, healthy.port)
+    assert flaky_bucket.backoffs == 1
+    assert flaky_bucket.rate < flaky_bucket.profile.rate
+    assert healthy_bucket.backoffs == 0
+    assert healthy_bucket.rate == healthy_bucket.profile.rate
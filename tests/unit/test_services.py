@@ -12,11 +12,18 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.wiim.const import DOMAIN
 from custom_components.wiim.services import (
+    SERVICE_ANNOUNCE,
     SERVICE_CLEAR_SLEEP_TIMER,
+    SERVICE_FIRMWARE_ROLLOUT,
+    SERVICE_FIRMWARE_ROLLOUT_STATUS,
+    SERVICE_LOOP_MONITOR,
+    SERVICE_PROFILE,
     SERVICE_REBOOT_DEVICE,
+    SERVICE_RESTORE,
     SERVICE_SCAN_BLUETOOTH,
     SERVICE_SET_CHANNEL_BALANCE,
     SERVICE_SET_SLEEP_TIMER,
+    SERVICE_SNAPSHOT,
     SERVICE_SYNC_TIME,
     SERVICE_UPDATE_ALARM,
     async_setup_services,
@@ -332,6 +339,17 @@ class TestActionYAMLSync:
             SERVICE_SET_CHANNEL_BALANCE,
         }
 
+        # Domain actions (registered once from async_setup via services.async_setup_services)
+        domain_actions = {
+            SERVICE_SNAPSHOT,
+            SERVICE_RESTORE,
+            SERVICE_ANNOUNCE,
+            SERVICE_LOOP_MONITOR,
+            SERVICE_PROFILE,
+            SERVICE_FIRMWARE_ROLLOUT,
+            SERVICE_FIRMWARE_ROLLOUT_STATUS,
+        }
+
         # Verify all YAML actions are either registered or in media_player.py
         yaml_action_names = set(services_yaml_content.keys())
 
@@ -342,7 +360,7 @@ class TestActionYAMLSync:
                     f"Action '{action_name}' is defined in services.yaml but registration code not found in "
                     f"media_player.py::async_setup_entry. This will cause 'unknown action' errors."
                 )
-            elif action_name in platform_actions:
+            elif action_name in platform_actions or action_name in domain_actions:
                 # Should be registered via EntityServiceDescription pattern
                 assert action_name in wiim_services, (
                     f"Action '{action_name}' is defined in services.yaml but not registered in Python code. "
@@ -415,7 +433,10 @@ class TestActionYAMLSync:
 
         for action_name, action_def in services_yaml_content.items():
             assert isinstance(action_def, dict), f"Action '{action_name}' should be a dictionary"
-            # Each action should have a target (for entity selection in UI)
+            # Each action should have a target (for entity selection in UI),
+            # except integration-wide debug actions that act on no speaker
+            if action_name in (SERVICE_LOOP_MONITOR, SERVICE_PROFILE, SERVICE_FIRMWARE_ROLLOUT_STATUS):
+                continue
             assert "target" in action_def, f"Action '{action_name}' should have a 'target' for entity selection"
 
     def test_strings_json_services_structure(self, strings_json_content):
@@ -453,12 +474,17 @@ class TestAsyncSetupServices:
     """Test async_setup_services function."""
 
     @pytest.mark.asyncio
-    async def test_async_setup_services_noop(self, hass: HomeAssistant):
-        """Test that async_setup_services completes without error (legacy compatibility)."""
-        # Should complete without raising
+    async def test_async_setup_services_registers_domain_actions(self, hass: HomeAssistant):
+        """Test that async_setup_services registers the fleet-wide domain actions."""
         await async_setup_services(hass)
-        # Function is now a no-op - services are registered via platform in media_player.py
-        # This function exists for backward compatibility only
+
+        assert hass.services.has_service(DOMAIN, SERVICE_SNAPSHOT)
+        assert hass.services.has_service(DOMAIN, SERVICE_RESTORE)
+        assert hass.services.has_service(DOMAIN, SERVICE_ANNOUNCE)
+        assert hass.services.has_service(DOMAIN, SERVICE_LOOP_MONITOR)
+        assert hass.services.has_service(DOMAIN, SERVICE_PROFILE)
+        assert hass.services.has_service(DOMAIN, SERVICE_FIRMWARE_ROLLOUT)
+        assert hass.services.has_service(DOMAIN, SERVICE_FIRMWARE_ROLLOUT_STATUS)
 
 
 class TestRegisterMediaPlayerServices:
@@ -0,0 +1,108 @@
+"""Tests for the local LinkPlay device simulator, driven by a real pywiim client."""
+
+import pytest
+from pywiim import WiiMClient
+from pywiim.exceptions import WiiMError
+
+from tests.simulator import FaultProfile, SimulatorFleet, SimulatorProcess, VirtualSpeaker
+
+
+def _client(speaker: VirtualSpeaker) -> WiiMClient:
+    return WiiMClient(speaker.host, port=speaker.port, protocol="http", timeout=1)
+
+
+@pytest.fixture(autouse=True)
+def _allow_loopback(socket_enabled):
+    """The simulator listens on real loopback sockets."""
+
+
+class TestSimulator:
+    """Test the simulated httpapi.asp surface pywiim relies on."""
+
+    @pytest.mark.asyncio
+    async def test_status_and_player_commands(self):
+        """Device info, volume and EQ round-trip through the simulator."""
+        async with SimulatorFleet(3) as fleet:
+            speaker = fleet.speakers[1]
+            client = _client(speaker)
+            try:
+                info = await client.get_device_info_model()
+                assert info.uuid == speaker.uuid
+                assert info.name == "Sim Speaker 001"
+
+                await client.set_volume(0.42)
+                await client.set_eq_preset("Rock")
+                status = await client.get_player_status()
+            finally:
+                await client.close()
+
+        assert speaker.volume == 42
+        assert status["volume"] == 42
+        assert speaker.eq_preset == "Rock"
+        assert speaker.requests["getStatusEx"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_join_and_ungroup(self):
+        """A slave joined by master IP shows up in the master's slave list."""
+        async with SimulatorFleet(3) as fleet:
+            master, slave = fleet.speakers[0], fleet.speakers[2]
+            slave_client, master_client = _client(slave), _client(master)
+            try:
+                await slave_client.join_slave(master.ip)
+                assert await master_client.get_slaves() == [slave.ip]
+                assert (await slave_client.get_device_info())["master_uuid"] == master.uuid
+
+                await master_client.leave_group()
+                assert await master_client.get_slaves() == []
+            finally:
+                await slave_client.close()
+                await master_client.close()
+
+        assert slave.master is None
+
+    @pytest.mark.asyncio
+    async def test_offline_speaker_raises(self):
+        """Dropped connections surface as pywiim errors."""
+        async with SimulatorFleet(2, faults=FaultProfile(offline_windows=[(0, 3600)])) as fleet:
+            fleet.set_faults(fleet.speakers[1], FaultProfile(latency=0.01))
+            offline, online = _client(fleet.speakers[0]), _client(fleet.speakers[1])
+            try:
+                with pytest.raises(WiiMError):
+                    await offline.get_device_info()
+                assert (await online.get_device_info())["uuid"] == fleet.speakers[1].uuid
+            finally:
+                await offline.close()
+                await online.close()
+
+    @pytest.mark.asyncio
+    async def test_fleet_in_child_process(self):
+        """A fleet in a child process serves its printed addresses and accepts group joins over HTTP."""
+        with SimulatorProcess(2, seed=1) as simulator:
+            master, slave = simulator.speakers
+            client = WiiMClient(master.host, port=master.port, protocol="http", timeout=1)
+            try:
+                await simulator.async_join(slave, master)
+                assert await client.get_slaves() == [slave.ip]
+            finally:
+                await client.close()
+
+    def test_firmware_update_timeline(self, monkeypatch):
+        """Download, install and reboot phases advance with time."""
+        speaker = VirtualSpeaker(0, new_firmware="5.0.1")
+        now = [1000.0]
+        monkeypatch.setattr("tests.simulator.device.time.monotonic", lambda: now[0])
+
+        assert speaker.handle("getStatusEx", lambda ip: None)["VersionUpdate"] == "1"
+        assert speaker.handle("getMvRemoteUpdateStart", lambda ip: None) == "OK"
+        assert speaker.handle("getMvRemoteUpdateStatus", lambda ip: None) == {"status": "25"}
+
+        now[0] += 4.0
+        assert speaker.handle("getMvRomBurnPrecent", lambda ip: None) == {"status": "1", "progress": "50"}
+
+        now[0] += 3.0
+        assert speaker.rebooting is True
+
+        now[0] += 3.0
+        assert speaker.rebooting is False
+        assert speaker.firmware == "5.0.1"
+        assert speaker.handle("getStatusEx", lambda ip: None)["VersionUpdate"] == "0"
@@ -0,0 +1,94 @@
+"""Unit tests for single-flight read de-duplication."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.wiim.single_flight import SingleFlight, async_shared_read
+
+
+def _slow_read(result=None, *, error: Exception | None = None):
+    calls: list[tuple] = []
+
+    async def _read(*args):
+        calls.append(args)
+        await asyncio.sleep(0.01)
+        if error is not None:
+            raise error
+        return result if result is not None else {"args": args}
+
+    return _read, calls
+
+
+class TestSingleFlight:
+    """Sharing, keys, errors and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_reads_share_one_request(self):
+        """Callers that arrive while a read is running get its result."""
+        flight = SingleFlight()
+        read, calls = _slow_read({"firmware": "4.8.1"})
+
+        results = await asyncio.gather(*(flight.async_call("get_device_info", read) for _ in range(3)))
+
+        assert len(calls) == 1
+        assert results[0] is results[1] is results[2]
+        assert flight.as_dict() == {"get_device_info": {"requests": 1, "shared": 2}}
+
+    @pytest.mark.asyncio
+    async def test_different_arguments_and_later_reads_are_not_shared(self):
+        """The key includes the arguments; a finished read is not cached."""
+        flight = SingleFlight()
+        read, calls = _slow_read()
+
+        await asyncio.gather(flight.async_call("get_preset", read, 1), flight.async_call("get_preset", read, 2))
+        await flight.async_call("get_preset", read, 1)
+
+        assert calls == [(1,), (2,), (1,)]
+        assert flight.stats["get_preset"].shared == 0
+
+    @pytest.mark.asyncio
+    async def test_error_is_raised_to_every_caller(self):
+        """A failed read fails every caller that shared it."""
+        flight = SingleFlight()
+        read, calls = _slow_read(error=ConnectionError("unreachable"))
+
+        results = await asyncio.gather(
+            flight.async_call("get_subwoofer_status", read),
+            flight.async_call("get_subwoofer_status", read),
+            return_exceptions=True,
+        )
+
+        assert len(calls) == 1
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_read(self):
+        """Cancelling the first caller leaves the read running for the others."""
+        flight = SingleFlight()
+        read, calls = _slow_read({"level": 3})
+
+        first = asyncio.create_task(flight.async_call("get_subwoofer_status", read))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.async_call("get_subwoofer_status", read))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == {"level": 3}
+        assert first.cancelled()
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_read_calls_player_method():
+    """Reads go through the coordinator's single-flight layer."""
+    player = MagicMock()
+    player.get_subwoofer_status = AsyncMock(return_value={"status": 1})
+    coordinator = SimpleNamespace(player=player, single_flight=SingleFlight())
+
+    assert await async_shared_read(coordinator, "get_subwoofer_status") == {"status": 1}
+    assert coordinator.single_flight.stats["get_subwoofer_status"].requests == 1
+
+    player.get_subwoofer_status.assert_awaited_once_with()
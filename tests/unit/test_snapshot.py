@@ -0,0 +1,237 @@
+"""Unit tests for WiiM fleet snapshot / restore services."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.wiim.const import DOMAIN
+from custom_components.wiim.services import SERVICE_RESTORE, SERVICE_SNAPSHOT, async_setup_services
+from custom_components.wiim.snapshot import DATA_SNAPSHOTS, capture_speaker
+from tests.fixtures.realistic_player import create_realistic_player
+
+
+def _make_speaker(register_speaker, entry_id: str, host: str, uuid: str, **kwargs):
+    """Register a speaker with a realistic player under ``entry_id``."""
+    player = create_realistic_player(host=host, **kwargs)
+    player.uuid = uuid
+    player.name = f"Speaker {uuid}"
+    player.is_playing = False
+    player.is_paused = False
+    player.join_group = AsyncMock()
+    player.leave_group = AsyncMock()
+    player.play_url = AsyncMock()
+    return register_speaker(entry_id, player=player).entry, player
+
+
+@pytest.fixture
+async def fleet(hass: HomeAssistant, register_speaker):
+    """Two solo speakers with domain services registered."""
+    entry_a, player_a = _make_speaker(register_speaker, "entry_a", "192.168.1.10", "uuid-a", source="wifi")
+    entry_b, player_b = _make_speaker(register_speaker, "entry_b", "192.168.1.11", "uuid-b", source="line_in")
+    await async_setup_services(hass)
+    with patch.object(hass.config_entries, "async_entries", return_value=[entry_a, entry_b]):
+        yield player_a, player_b
+
+
+def _reset_calls(*players) -> None:
+    for player in players:
+        for method in (
+            "set_volume",
+            "set_mute",
+            "set_source",
+            "set_eq_preset",
+            "join_group",
+            "leave_group",
+            "play_url",
+        ):
+            getattr(player, method).reset_mock()
+
+
+class TestCaptureSpeaker:
+    """Test snapshot capture from cached Player state."""
+
+    def test_capture_solo_speaker(self):
+        """Solo speaker captures levels and source with no master."""
+        player = create_realistic_player(volume_level=0.3, is_muted=True, source="line_in")
+        player.is_playing = False
+        player.is_paused = False
+        player.eq_preset = "Rock"
+
+        snap = capture_speaker(player)
+
+        assert snap.volume == 0.3
+        assert snap.muted is True
+        assert snap.source == "line_in"
+        assert snap.eq_preset == "Rock"
+        assert snap.master is None
+        assert snap.media_url is None
+
+    def test_capture_slave_records_master_key(self):
+        """Slave speaker records its master's uuid."""
+        master = create_realistic_player(host="192.168.1.10", role="master")
+        master.uuid = "master-uuid"
+        slave = create_realistic_player(host="192.168.1.11", role="slave")
+        slave.group = MagicMock(master=master)
+
+        assert capture_speaker(slave).master == "master-uuid"
+
+    def test_capture_url_only_when_playing(self):
+        """The tracked URL is only captured while playing or paused."""
+        player = create_realistic_player()
+        player.media_content_id = "http://radio.example/stream"
+        player.is_playing = False
+        player.is_paused = False
+        assert capture_speaker(player).media_url is None
+
+        player.is_playing = True
+        snap = capture_speaker(player)
+        assert snap.media_url == "http://radio.example/stream"
+        assert snap.playing is True
+
+
+class TestSnapshotRestoreServices:
+    """Test wiim.snapshot / wiim.restore domain services."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_captures_all_speakers(self, hass: HomeAssistant, fleet):
+        """No target snapshots every configured speaker."""
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_SNAPSHOT, {"name": "movie"}, blocking=True, return_response=True
+        )
+
+        assert set(response["speakers"]) == {"uuid-a", "uuid-b"}
+        assert "movie" in hass.data[DOMAIN][DATA_SNAPSHOTS]
+
+    @pytest.mark.asyncio
+    async def test_restore_unchanged_sends_no_commands(self, hass: HomeAssistant, fleet):
+        """Restoring an unchanged fleet is a no-op."""
+        player_a, player_b = fleet
+        await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {}, blocking=True)
+
+        response = await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {}, blocking=True, return_response=True)
+
+        assert response["changed"] == {}
+        assert response["unchanged"] == ["uuid-a", "uuid-b"]
+        for player in fleet:
+            player.set_volume.assert_not_called()
+            player.set_source.assert_not_called()
+            player.join_group.assert_not_called()
+            player.leave_group.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_restore_applies_only_differences(self, hass: HomeAssistant, fleet):
+        """Only speakers and settings that drifted are touched."""
+        player_a, player_b = fleet
+        await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {}, blocking=True)
+
+        player_a.volume_level = 0.9
+        player_a.is_muted = True
+        player_b.source = "bluetooth"
+        _reset_calls(player_a, player_b)
+
+        response = await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {}, blocking=True, return_response=True)
+
+        player_a.set_volume.assert_awaited_once_with(0.5)
+        player_a.set_mute.assert_awaited_once_with(False)
+        player_a.set_source.assert_not_called()
+        player_b.set_source.assert_awaited_once_with("line_in")
+        player_b.set_volume.assert_not_called()
+        assert response["changed"] == {"uuid-a": ["set volume", "set mute"], "uuid-b": ["set source"]}
+
+    @pytest.mark.asyncio
+    async def test_restore_topology_before_levels(self, hass: HomeAssistant, fleet):
+        """Group changes run before volume changes and use the master's Player."""
+        player_a, player_b = fleet
+        player_b.is_slave = True
+        player_b.is_solo = False
+        player_b.group = MagicMock(master=player_a)
+        await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {}, blocking=True)
+
+        order: list[str] = []
+        player_b.is_slave = False
+        player_b.group = None
+        player_b.volume_level = 0.1
+        player_b.join_group = AsyncMock(side_effect=lambda _m: order.append("join"))
+        player_b.set_volume = AsyncMock(side_effect=lambda _v: order.append("volume"))
+
+        await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {}, blocking=True)
+
+        player_b.join_group.assert_awaited_once_with(player_a)
+        assert order == ["join", "volume"]
+
+    @pytest.mark.asyncio
+    async def test_restore_leaves_before_joins(self, hass: HomeAssistant, fleet):
+        """A snapshot master that is now someone's slave leaves before its slaves join it."""
+        player_a, player_b = fleet
+        player_b.is_slave = True
+        player_b.is_solo = False
+        player_b.group = MagicMock(master=player_a)
+        await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {}, blocking=True)
+
+        # Roles swapped since the snapshot: A is now B's slave.
+        player_b.is_slave = False
+        player_b.is_master = True
+        player_b.group = MagicMock(master=player_b)
+        player_a.is_slave = True
+        player_a.is_solo = False
+        player_a.group = MagicMock(master=player_b)
+
+        order: list[str] = []
+
+        def _leave(player, name: str):
+            async def _left() -> None:
+                await asyncio.sleep(0.01)
+                order.append(f"{name} leave")
+                player.is_slave = player.is_master = False
+                player.group = None
+
+            return _left
+
+        player_a.leave_group = AsyncMock(side_effect=_leave(player_a, "a"))
+        player_b.leave_group = AsyncMock(side_effect=_leave(player_b, "b"))
+        player_b.join_group = AsyncMock(side_effect=lambda _m: order.append("b join"))
+
+        response = await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {}, blocking=True, return_response=True)
+
+        assert sorted(order[:2]) == ["a leave", "b leave"]
+        assert order[2:] == ["b join"]
+        player_b.join_group.assert_awaited_once_with(player_a)
+        assert response["changed"]["uuid-b"][:2] == ["leave group", "join group"]
+
+    @pytest.mark.asyncio
+    async def test_restore_replays_url_on_master(self, hass: HomeAssistant, fleet):
+        """A speaker that was playing a URL restarts it when it moved on."""
+        player_a, _player_b = fleet
+        player_a.is_playing = True
+        player_a.media_content_id = "http://radio.example/stream"
+        await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {}, blocking=True)
+
+        player_a.is_playing = False
+        await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {}, blocking=True)
+
+        player_a.play_url.assert_awaited_once_with("http://radio.example/stream")
+        player_a.set_source.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_restore_reports_failures_per_speaker(self, hass: HomeAssistant, fleet):
+        """One failing speaker does not stop the others."""
+        player_a, player_b = fleet
+        await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {}, blocking=True)
+
+        player_a.volume_level = 0.9
+        player_b.volume_level = 0.9
+        player_a.set_volume = AsyncMock(side_effect=RuntimeError("offline"))
+
+        response = await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {}, blocking=True, return_response=True)
+
+        assert response["failed"] == {"uuid-a": ["set volume: offline"]}
+        assert response["changed"] == {"uuid-b": ["set volume"]}
+
+    @pytest.mark.asyncio
+    async def test_restore_unknown_snapshot_raises(self, hass: HomeAssistant, fleet):
+        """Restoring a snapshot that was never taken is an error."""
+        with pytest.raises(HomeAssistantError, match="No WiiM snapshot named 'missing'"):
+            await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {"name": "missing"}, blocking=True)
@@ -0,0 +1,101 @@
+"""Unit tests for the config-flow subnet scan."""
+
+import socket
+import ssl
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.wiim import subnet_scan
+from custom_components.wiim.subnet_scan import (
+    MAX_SCAN_HOSTS,
+    ScanHit,
+    async_probe_host,
+    async_scan_range,
+    async_validate_hit,
+    entry_data_for,
+    scan_hosts,
+)
+from tests.simulator import SimulatorFleet
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestScanHosts:
+    """Range parsing."""
+
+    def test_host_addresses_of_range(self):
+        """Network and broadcast addresses are left out; host bits are tolerated."""
+        assert scan_hosts("192.168.1.5/30") == ["192.168.1.5", "192.168.1.6"]
+        assert len(scan_hosts("10.0.0.0/24")) == 254
+
+    @pytest.mark.parametrize("cidr", ["10.0.0.0/21", "fd00::/120", "not-a-range"])
+    def test_rejects_large_ipv6_and_invalid_ranges(self, cidr):
+        """Ranges above the limit, IPv6 and garbage raise ValueError."""
+        with pytest.raises(ValueError):
+            scan_hosts(cidr)
+
+    def test_largest_allowed_range(self):
+        """A /22 is the largest range accepted."""
+        assert len(scan_hosts("10.0.0.0/22")) == MAX_SCAN_HOSTS - 2
+
+
+class TestProbeAgainstSimulator:
+    """Probing real loopback sockets."""
+
+    @pytest.mark.asyncio
+    async def test_probe_finds_endpoint_and_validates_it(self, socket_enabled, monkeypatch):
+        """Closed ports are skipped; the answering endpoint is validated with capabilities."""
+        async with SimulatorFleet(1) as fleet, aiohttp.ClientSession() as session:
+            speaker = fleet.speakers[0]
+            monkeypatch.setattr(subnet_scan, "_PROBE_PORTS", ((_closed_port(), "https"), (speaker.port, "http")))
+
+            hit = await async_probe_host(session, "127.0.0.1")
+            assert hit == ScanHit("127.0.0.1", speaker.port, "http")
+            assert speaker.requests["getStatusEx"] == 1
+
+            device, capabilities = await async_validate_hit(session, hit)
+
+        assert device.validated is True
+        assert device.uuid == speaker.uuid
+        assert device.name == speaker.name
+        assert capabilities
+
+    @pytest.mark.asyncio
+    async def test_scan_range_skips_silent_hosts(self, socket_enabled, monkeypatch):
+        """A range with nothing listening yields no hits."""
+        monkeypatch.setattr(subnet_scan, "_PROBE_PORTS", ((_closed_port(), "http"),))
+        async with aiohttp.ClientSession() as session:
+            assert await async_scan_range(session, ["127.0.0.1"]) == []
+
+    @pytest.mark.asyncio
+    async def test_https_probe_uses_client_ssl_context(self, monkeypatch):
+        """HTTPS ports are probed with the pool's SSL context, plain HTTP without one."""
+        monkeypatch.setattr(subnet_scan, "_async_port_open", AsyncMock(return_value=True))
+        response = MagicMock(status=500)
+        session = MagicMock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        ssl_context = ssl.create_default_context()
+
+        assert await async_probe_host(session, "192.168.1.20", ssl_context) is None
+
+        assert [call.kwargs["ssl"] for call in session.get.call_args_list] == [ssl_context, ssl_context, False]
+
+
+def test_entry_data_prefills_endpoint_and_capabilities():
+    """Entry data carries the endpoint and a capability cache for the installed pywiim."""
+    hit = ScanHit("192.168.1.20", 443, "https")
+
+    data = entry_data_for(hit, {"firmware_version": "4.8.1", "supports_eq": True}, "2.3.6")
+
+    assert data["host"] == "192.168.1.20"
+    assert data["endpoint"] == "https://192.168.1.20:443"
+    assert data["capabilities"]["supports_eq"] is True
+    assert data["capabilities_cache_meta"] == {"pywiim_version": "2.3.6", "firmware_version": "4.8.1"}
+    assert "capabilities" not in entry_data_for(hit, {}, "2.3.6")
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from homeassistant.config_entries import ConfigEntry
 
+from custom_components.wiim.single_flight import SingleFlight
 from custom_components.wiim.switch import (
     WiiMMainSpeakerBassSwitch,
     WiiMSubwooferSwitch,
@@ -30,6 +31,7 @@ def mock_config_entry():
 def mock_coordinator():
     """Create a mock coordinator."""
     coordinator = MagicMock()
+    coordinator.single_flight = SingleFlight()
     coordinator.data = {"player": MagicMock()}
     coordinator.last_update_success = True
     coordinator.async_request_refresh = AsyncMock()
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from homeassistant.core import HomeAssistant
 
+from custom_components.wiim.single_flight import SingleFlight
 from custom_components.wiim.system_health import system_health_info
 
 
@@ -40,6 +41,7 @@ class TestSystemHealth:
 
         # Create mock coordinators
         mock_coordinator1 = MagicMock()
+        mock_coordinator1.single_flight = SingleFlight()
         mock_coordinator1.last_update_success = True
         mock_coordinator1.data = {}
         mock_player1 = MagicMock()
@@ -47,8 +49,10 @@ class TestSystemHealth:
         mock_player1.is_slave = False
         mock_coordinator1.data["player"] = mock_player1
         mock_coordinator1.player = mock_player1  # Also set directly for compatibility
+        mock_player1.get_device_info = AsyncMock()
 
         mock_coordinator2 = MagicMock()
+        mock_coordinator2.single_flight = SingleFlight()
         mock_coordinator2.last_update_success = False
         mock_coordinator2.data = {}
         mock_player2 = MagicMock()
@@ -56,6 +60,7 @@ class TestSystemHealth:
         mock_player2.is_slave = True
         mock_coordinator2.data["player"] = mock_player2
         mock_coordinator2.player = mock_player2  # Also set directly for compatibility
+        mock_player2.get_device_info = AsyncMock(side_effect=Exception("Connection error"))
 
         mock_entry = MagicMock()
         mock_entry.domain = "wiim"
@@ -80,6 +85,7 @@ class TestSystemHealth:
         from custom_components.wiim.system_health import _check_device_health
 
         mock_coordinator = MagicMock()
+        mock_coordinator.single_flight = SingleFlight()
         mock_coordinator.player = MagicMock()
         mock_coordinator.player.get_device_info = AsyncMock()
         from datetime import timedelta
@@ -88,8 +94,9 @@ class TestSystemHealth:
 
         health = await _check_device_health(mock_coordinator)
 
-        assert "OK" in health
-        assert "polling" in health
+        assert health.ok
+        assert health.latency_ms is not None
+        assert not health.reused_poll
         mock_coordinator.player.get_device_info.assert_called_once()
 
     @pytest.mark.asyncio
@@ -100,6 +107,7 @@ class TestSystemHealth:
         from custom_components.wiim.system_health import _check_device_health
 
         mock_coordinator = MagicMock()
+        mock_coordinator.single_flight = SingleFlight()
         mock_coordinator.player = MagicMock()
         mock_coordinator.player.get_device_info = AsyncMock(side_effect=Exception("Connection error"))
         from datetime import timedelta
@@ -108,8 +116,8 @@ class TestSystemHealth:
 
         health = await _check_device_health(mock_coordinator)
 
-        assert "Error" in health
-        assert "Connection error" in health
+        assert not health.ok
+        assert "Connection error" in health.error
 
     @pytest.mark.asyncio
     async def test_system_health_pywiim_version(self, hass: HomeAssistant):
@@ -161,3 +169,85 @@ class TestSystemHealth:
 
                     assert health_info["pywiim_version"] == "9.9.9"
                     hass.async_add_executor_job.assert_awaited_once()
+
+
+def _fleet_coordinator(name: str, *, delay: float = 0.0, fail: bool = False, polled_ago: float | None = None):
+    """Coordinator whose ``get_device_info`` sleeps ``delay`` (or fails); optionally polled recently."""
+    import asyncio
+    import time
+
+    coordinator = MagicMock()
+    coordinator.single_flight = SingleFlight()
+    coordinator.data = {}
+    coordinator.last_update_success = not fail
+    coordinator.last_poll_at = time.monotonic() - polled_ago if polled_ago is not None else None
+    coordinator.last_poll_ms = 12.0
+    coordinator.player.name = name
+
+    async def _get_device_info():
+        await asyncio.sleep(delay)
+        if fail:
+            raise Exception("Connection error")
+
+    coordinator.player.get_device_info = AsyncMock(side_effect=_get_device_info)
+    return coordinator
+
+
+class TestFleetProbe:
+    """Parallel fleet probe reported by system health."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_fresh_polls_and_reports_latency(self, hass: HomeAssistant):
+        """Recently polled devices are not re-probed; stats and slowest devices are reported."""
+        fresh = _fleet_coordinator("Fresh", polled_ago=1.0)
+        stale = _fleet_coordinator("Stale", delay=0.02, polled_ago=60.0)
+        broken = _fleet_coordinator("Broken", fail=True)
+
+        with patch("custom_components.wiim.system_health.get_all_coordinators", return_value=[fresh, stale, broken]):
+            info = await system_health_info(hass)
+
+        fresh.player.get_device_info.assert_not_called()
+        stale.player.get_device_info.assert_awaited_once()
+        assert info["reachable_devices"] == "2/3"
+        assert info["probe_reused_polls"] == 1
+        # Only the real probe (Stale, ~20 ms) counts; Fresh's 12 ms poll is reported on its own
+        assert info["probe_latency_median_ms"] >= 20
+        assert info["probe_latency_p95_ms"] >= 20
+        assert info["reused_poll_median_ms"] == 12
+        assert info["slowest_devices"].startswith("Broken (Connection error), Stale (")
+
+    @pytest.mark.asyncio
+    async def test_deadline_and_concurrency_bound(self, hass: HomeAssistant):
+        """Devices pending at the deadline time out; at most PROBE_CONCURRENCY run at once."""
+        import asyncio
+
+        from custom_components.wiim import system_health
+
+        active = peak = 0
+
+        async def _tracked():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        fleet = [_fleet_coordinator(f"Speaker {i}") for i in range(20)]
+        for coordinator in fleet:
+            coordinator.player.get_device_info = AsyncMock(side_effect=_tracked)
+        # The shared read outlives the probe deadline; release it before the test ends.
+        release = asyncio.Event()
+        hung = _fleet_coordinator("Hung")
+        hung.player.get_device_info = AsyncMock(side_effect=release.wait)
+
+        with (
+            patch.object(system_health, "PROBE_DEADLINE_SECONDS", 0.5),
+            patch("custom_components.wiim.system_health.get_all_coordinators", return_value=[*fleet, hung]),
+        ):
+            info = await system_health_info(hass)
+
+        assert info["reachable_devices"] == "20/21"
+        assert peak <= system_health.PROBE_CONCURRENCY
+        assert info["slowest_devices"].startswith("Hung (timed out)")
+        release.set()
+        await asyncio.sleep(0.01)
@@ -10,6 +10,8 @@ import pytest
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import HomeAssistantError
 
+from custom_components.wiim.single_flight import SingleFlight
+
 
 def _attach_client_capabilities(player: MagicMock, capabilities: dict) -> None:
     player.client = MagicMock()
@@ -26,8 +28,10 @@ def _firmware_entity(
     from custom_components.wiim.update import WiiMFirmwareUpdateEntity
 
     coordinator = MagicMock()
+    coordinator.single_flight = SingleFlight()
     coordinator.async_refresh = AsyncMock()
     coordinator.last_update_success = True
+    coordinator.device_info_at = None
     coordinator.player = MagicMock()
     coordinator.player.host = "192.168.1.100"
     coordinator.player.name = "Test WiiM"
@@ -48,6 +52,7 @@ def _firmware_entity(
 
     entity = WiiMFirmwareUpdateEntity(coordinator, entry)
     entity.hass = MagicMock()
+    entity.hass.data = {}
     entity.async_write_ha_state = MagicMock()
     def _bg(_hass: object, coro: object, _name: str, eager_start: bool = True) -> MagicMock:
         if hasattr(coro, "close"):
@@ -68,6 +73,7 @@ class TestFirmwareUpdateEntity:
         from custom_components.wiim.update import WiiMFirmwareUpdateEntity
 
         coordinator = MagicMock()
+        coordinator.single_flight = SingleFlight()
         coordinator.player = MagicMock()
         coordinator.player.host = "192.168.1.100"
 
@@ -90,6 +96,7 @@ class TestFirmwareUpdateEntity:
         from custom_components.wiim.update import WiiMFirmwareUpdateEntity
 
         coordinator = MagicMock()
+        coordinator.single_flight = SingleFlight()
         coordinator.player = MagicMock()
         coordinator.player.host = "192.168.1.100"
         coordinator.player.device_info = None
@@ -114,6 +121,7 @@ class TestFirmwareUpdateEntity:
         from custom_components.wiim.update import WiiMFirmwareUpdateEntity
 
         coordinator = MagicMock()
+        coordinator.single_flight = SingleFlight()
         coordinator.player = MagicMock()
         coordinator.player.host = "192.168.1.100"
         coordinator.player.device_info = None
@@ -136,6 +144,7 @@ class TestFirmwareUpdateEntity:
         from custom_components.wiim.update import WiiMFirmwareUpdateEntity
 
         coordinator = MagicMock()
+        coordinator.single_flight = SingleFlight()
         coordinator.player = MagicMock()
         coordinator.player.host = "192.168.1.100"
         coordinator.player.device_info = None
@@ -152,6 +161,31 @@ class TestFirmwareUpdateEntity:
         assert entity.update_available is False
         assert entity.latest_version == "Linkplay.4.8.738046"
 
+    def test_shared_firmware_check_overrides_player_device_info(self) -> None:
+        """A cached per-model check wins over the speaker's own device info unless that is newer."""
+        from custom_components.wiim.const import DOMAIN
+        from custom_components.wiim.firmware_check import DATA_FIRMWARE_CHECK, FirmwareCheckResult
+
+        coordinator, _entry, entity = _firmware_entity(update_available=False, latest="0")
+        coordinator.player.model = "WiiM_Pro"
+        cache = MagicMock()
+        cache.get.return_value = FirmwareCheckResult(True, "Linkplay.4.8.738046", 0.0, "192.168.1.101")
+        entity.hass.data = {DOMAIN: {DATA_FIRMWARE_CHECK: cache}}
+
+        assert entity.update_available is True
+        assert entity.latest_version == "Linkplay.4.8.738046"
+        cache.get.assert_called_with("WiiM_Pro", "Linkplay.4.8.731953")
+
+        # Device info fetched after the shared check wins.
+        coordinator.device_info_at = 1.0
+        assert entity.update_available is False
+        assert entity.latest_version == "Linkplay.4.8.731953"
+
+        coordinator.device_info_at = None
+        cache.get.return_value = None
+        assert entity.update_available is False
+        assert entity.latest_version == "Linkplay.4.8.731953"
+
     @pytest.mark.asyncio
     async def test_async_install_starts_background_tracking(self) -> None:
         """async_install should start the device update then return while still installing."""
@@ -171,6 +205,23 @@ class TestFirmwareUpdateEntity:
         entry.async_create_background_task.assert_called_once()
         assert entry.async_create_background_task.call_args.kwargs["eager_start"] is False
 
+    @pytest.mark.asyncio
+    async def test_async_install_and_wait_reports_firmware_change(self) -> None:
+        """async_install_and_wait should wait for tracking and return its result."""
+        coordinator, entry, entity = _firmware_entity()
+
+        async def _track() -> bool:
+            return True
+
+        def _bg(_hass: object, coro: object, _name: str, eager_start: bool = True):
+            coro.close()
+            return asyncio.ensure_future(_track())
+
+        entry.async_create_background_task = MagicMock(side_effect=_bg)
+
+        assert await entity.async_install_and_wait() is True
+        coordinator.player.install_firmware_update.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_async_install_raises_when_already_in_progress(self) -> None:
         """A second install click should fail while the first is still running."""
@@ -218,34 +269,144 @@ class TestFirmwareUpdateEntity:
         assert entity.update_percentage == 50
 
     @pytest.mark.asyncio
-    async def test_async_track_install_reports_progress_and_completes_on_firmware_change(
+    async def test_async_track_install_walks_phases_and_verifies_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Tracking goes flashing -> rebooting -> verifying with one cheap call per poll."""
+        import custom_components.wiim.update as update_mod
+
+        monkeypatch.setattr(update_mod, "_INSTALL_POLL_INTERVAL_SECONDS", 0)
+        monkeypatch.setattr(update_mod, "_INSTALL_TIMEOUT_SECONDS", 2)
+
+        coordinator, _entry, entity = _firmware_entity()
+        phases: list[str | None] = []
+        percentages: list[int | None] = []
+
+        replies: list[dict | Exception] = [{"progress": "0"}, {"progress": "50"}, {"progress": "100"}, TimeoutError()]
+
+        async def _status() -> dict:
+            phases.append(entity.install_phase)
+            percentages.append(entity.update_percentage)
+            reply = replies[len(phases) - 1]
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+
+        coordinator.player.get_update_install_status = AsyncMock(side_effect=_status)
+        # Closed once the status call fails (rebooting), then open again.
+        port_open = iter([False, True])
+        entity._async_port_open = AsyncMock(side_effect=lambda: next(port_open))
+        coordinator.player.get_device_info = AsyncMock(return_value=MagicMock(firmware="Linkplay.4.8.738046"))
+
+        async def _refresh(*_args: object, **_kwargs: object) -> None:
+            coordinator.player.firmware = "Linkplay.4.8.738046"
+
+        coordinator.player.refresh = AsyncMock(side_effect=_refresh)
+
+        entity._installing = True
+        assert await entity._async_track_install() is True
+
+        assert phases == ["downloading", "downloading", "flashing", "flashing"]
+        assert percentages[-1] == 100
+        assert entity._async_port_open.await_count == 2
+        coordinator.player.get_device_info.assert_awaited_once()
+        coordinator.player.refresh.assert_awaited_once_with(full=True)
+        coordinator.async_set_updated_data.assert_called_once()
+        assert entity.in_progress is False
+        assert entity.install_phase is None
+        assert coordinator.update_interval == timedelta(seconds=5)
+
+    @pytest.mark.asyncio
+    async def test_async_track_install_probes_tcp_while_unreachable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Once the status call fails and the port is closed, only TCP probes run until it opens."""
+        import custom_components.wiim.update as update_mod
+
+        monkeypatch.setattr(update_mod, "_INSTALL_POLL_INTERVAL_SECONDS", 0)
+        monkeypatch.setattr(update_mod, "_INSTALL_TIMEOUT_SECONDS", 2)
+
+        coordinator, _entry, entity = _firmware_entity()
+        coordinator.player.get_update_install_status = AsyncMock(side_effect=TimeoutError)
+        port_open = iter([False, False, False, True, True])
+        entity._async_port_open = AsyncMock(side_effect=lambda: next(port_open))
+        # The port opens before HTTP answers, then the new version is reported.
+        coordinator.player.get_device_info = AsyncMock(
+            side_effect=[TimeoutError(), MagicMock(firmware="Linkplay.4.8.738046")]
+        )
+
+        entity._installing = True
+        assert await entity._async_track_install() is True
+
+        coordinator.player.get_update_install_status.assert_awaited_once()
+        assert entity._async_port_open.await_count == 5
+        assert coordinator.player.get_device_info.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_track_install_rides_out_transient_status_timeout(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        """Install tracking should update progress and finish when firmware changes."""
+        """One status timeout mid-flash, with the port still open, keeps reading progress."""
         import custom_components.wiim.update as update_mod
 
         monkeypatch.setattr(update_mod, "_INSTALL_POLL_INTERVAL_SECONDS", 0)
         monkeypatch.setattr(update_mod, "_INSTALL_TIMEOUT_SECONDS", 2)
 
         coordinator, _entry, entity = _firmware_entity()
-        coordinator.player.get_update_install_status = AsyncMock(return_value={"progress": "50"})
+        phases: list[str | None] = []
+        replies: list[dict | Exception] = [
+            {"progress": "30"},
+            TimeoutError(),
+            {"progress": "60"},
+            {"progress": "100"},
+            TimeoutError(),
+        ]
+
+        async def _status() -> dict:
+            phases.append(entity.install_phase)
+            reply = replies[len(phases) - 1]
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+
+        coordinator.player.get_update_install_status = AsyncMock(side_effect=_status)
+        # Open during the transient timeout, closed for the reboot, then back up.
+        port_open = iter([True, False, True])
+        entity._async_port_open = AsyncMock(side_effect=lambda: next(port_open))
+        coordinator.player.get_device_info = AsyncMock(return_value=MagicMock(firmware="Linkplay.4.8.738046"))
+        percentages: list[int | None] = []
+        write_state = entity.async_write_ha_state
+        entity.async_write_ha_state = MagicMock(
+            side_effect=lambda: percentages.append(entity.update_percentage) or write_state()
+        )
 
-        async def _refresh_side_effect(*_args: object, **_kwargs: object) -> None:
-            coordinator.player.firmware = "Linkplay.4.8.738046"
+        entity._installing = True
+        assert await entity._async_track_install() is True
 
-        coordinator.player.refresh = AsyncMock(side_effect=_refresh_side_effect)
-        coordinator.async_set_updated_data = MagicMock()
+        assert phases == ["downloading", "flashing", "flashing", "flashing", "flashing"]
+        assert 60 in percentages
+        assert entity._async_port_open.await_count == 3
+        coordinator.player.get_device_info.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_async_track_install_verifies_when_progress_never_reported(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A speaker that never reports burn progress is still checked periodically."""
+        import custom_components.wiim.update as update_mod
+
+        monkeypatch.setattr(update_mod, "_INSTALL_POLL_INTERVAL_SECONDS", 0)
+        monkeypatch.setattr(update_mod, "_INSTALL_TIMEOUT_SECONDS", 2)
+        monkeypatch.setattr(update_mod, "_VERIFY_EVERY_POLLS", 3)
+
+        coordinator, _entry, entity = _firmware_entity()
+        coordinator.player.get_update_install_status = AsyncMock(return_value={"status": "0", "progress": "0"})
+        coordinator.player.get_device_info = AsyncMock(return_value=MagicMock(firmware="Linkplay.4.8.738046"))
 
         entity._installing = True
-        await entity._async_track_install()
+        assert await entity._async_track_install() is True
 
-        assert entity.update_percentage is None
-        assert entity.in_progress is False
-        assert coordinator.update_interval == timedelta(seconds=5)
-        assert entity.async_write_ha_state.call_count >= 1
+        assert coordinator.player.get_update_install_status.await_count == 4
+        coordinator.player.get_device_info.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_async_track_install_does_not_finish_when_update_flag_clears(
+    async def test_async_track_install_does_not_finish_without_new_firmware(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Clearing VersionUpdate without a new firmware string is not completion.
@@ -259,28 +420,22 @@ class TestFirmwareUpdateEntity:
         monkeypatch.setattr(update_mod, "_INSTALL_TIMEOUT_SECONDS", 0.05)
 
         coordinator, _entry, entity = _firmware_entity()
-        coordinator.player.firmware_update_available = True
-
-        async def _refresh_side_effect(*_args: object, **_kwargs: object) -> None:
-            coordinator.player.firmware_update_available = False
-            coordinator.player.latest_firmware_version = None
-
-        coordinator.player.refresh = AsyncMock(side_effect=_refresh_side_effect)
-        coordinator.async_set_updated_data = MagicMock()
+        coordinator.player.firmware_update_available = False
+        coordinator.player.latest_firmware_version = None
+        coordinator.player.get_update_install_status = AsyncMock(side_effect=TimeoutError)
+        entity._async_port_open = AsyncMock(return_value=True)
+        coordinator.player.get_device_info = AsyncMock(return_value=MagicMock(firmware="Linkplay.4.8.731953"))
 
         entity._installing = True
-        await entity._async_track_install()
+        assert await entity._async_track_install() is False
 
-        assert coordinator.player.refresh.call_count >= 2
-        coordinator.player.refresh.assert_called_with(full=True)
-        assert coordinator.player.firmware == "Linkplay.4.8.731953"
+        assert coordinator.player.get_device_info.await_count >= 2
+        coordinator.player.refresh.assert_not_called()
         assert entity.in_progress is False
         assert coordinator.update_interval == timedelta(seconds=5)
 
     @pytest.mark.asyncio
-    async def test_async_track_install_pauses_coordinator_polling(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
+    async def test_async_track_install_pauses_coordinator_polling(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """OTA tracking should pause coordinator polls so they cannot cancel it."""
         import custom_components.wiim.update as update_mod
 
@@ -290,15 +445,19 @@ class TestFirmwareUpdateEntity:
         coordinator, _entry, entity = _firmware_entity()
         seen_intervals: list[object] = []
 
-        async def _refresh_side_effect(*_args: object, **_kwargs: object) -> None:
+        async def _status() -> dict:
             seen_intervals.append(coordinator.update_interval)
-            coordinator.player.firmware = "Linkplay.4.8.738046"
+            raise TimeoutError
+
+        coordinator.player.get_update_install_status = AsyncMock(side_effect=_status)
+        entity._async_port_open = AsyncMock(return_value=True)
+        coordinator.player.get_device_info = AsyncMock(return_value=MagicMock(firmware="Linkplay.4.8.738046"))
 
-        coordinator.player.refresh = AsyncMock(side_effect=_refresh_side_effect)
         entity._installing = True
         await entity._async_track_install()
 
-        assert seen_intervals == [None]
+        # Repeated failures with the port still open count as the reboot.
+        assert seen_intervals == [None] * update_mod._STATUS_FAILURES_BEFORE_REBOOT
         assert coordinator.update_interval == timedelta(seconds=5)
 
     @pytest.mark.asyncio
@@ -341,6 +500,7 @@ class TestUpdatePlatformSetup:
         config_entry.title = "Test WiiM"
 
         coordinator = MagicMock()
+        coordinator.single_flight = SingleFlight()
         coordinator.player = MagicMock()
         coordinator.player.name = "Test WiiM"
         _attach_client_capabilities(coordinator.player, {"supports_firmware_install": True})
@@ -367,6 +527,7 @@ class TestUpdatePlatformSetup:
         config_entry.title = "Test WiiM"
 
         coordinator = MagicMock()
+        coordinator.single_flight = SingleFlight()
         coordinator.player = MagicMock()
         coordinator.player.name = "Test WiiM"
         _attach_client_capabilities(coordinator.player, {"supports_firmware_install": False})
@@ -376,3 +537,71 @@ class TestUpdatePlatformSetup:
         await async_setup_entry(hass, config_entry, async_add_entities)
 
         async_add_entities.assert_not_called()
+
+
+class TestInstallTrackingAgainstSimulator:
+    """Install tracking over real loopback sockets (simulator and TCP probe)."""
+
+    @pytest.mark.asyncio
+    async def test_tracks_simulated_ota_with_few_requests(
+        self, socket_enabled, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The simulated OTA finishes and no full status sweep runs during the install."""
+        from pywiim import Player, WiiMClient
+
+        import custom_components.wiim.update as update_mod
+        import tests.simulator.device as sim_device
+        from custom_components.wiim.update import WiiMFirmwareUpdateEntity
+        from tests.simulator import SimulatorFleet
+
+        monkeypatch.setattr(sim_device, "UPDATE_DOWNLOAD_SECONDS", 0.2)
+        monkeypatch.setattr(sim_device, "UPDATE_INSTALL_SECONDS", 0.3)
+        monkeypatch.setattr(sim_device, "UPDATE_REBOOT_SECONDS", 0.3)
+        monkeypatch.setattr(update_mod, "_INSTALL_POLL_INTERVAL_SECONDS", 0.05)
+        monkeypatch.setattr(update_mod, "_INSTALL_TIMEOUT_SECONDS", 10)
+
+        async with SimulatorFleet(1) as fleet:
+            speaker = fleet.speakers[0]
+            speaker.new_firmware = "5.0.1"
+            player = Player(WiiMClient(speaker.host, port=speaker.port, protocol="http", timeout=1))
+            try:
+                await player.refresh(full=True)
+                coordinator = MagicMock()
+                coordinator.single_flight = SingleFlight()
+                coordinator.player = player
+                coordinator.update_interval = timedelta(seconds=5)
+                entry = MagicMock(spec=ConfigEntry)
+                entry.unique_id = speaker.uuid
+                entry.title = speaker.name
+                entity = WiiMFirmwareUpdateEntity(coordinator, entry)
+                entity.async_write_ha_state = MagicMock()
+                start = entity.installed_version
+
+                await player.install_firmware_update()
+                speaker.requests.clear()
+                entity._installing = True
+                assert await entity._async_track_install() is True
+            finally:
+                await player.client.close()
+
+        assert start != "5.0.1"
+        assert entity.installed_version == "5.0.1"
+        # Only the final refresh asks for the player status.
+        assert speaker.requests["getPlayerStatusEx"] <= 1
+        assert speaker.requests["getMvRomBurnPrecent"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_port_probe_opens_no_http_request(self, socket_enabled) -> None:
+        """The reboot probe only connects; a closed port reports False."""
+        _coordinator, _entry, entity = _firmware_entity()
+        connections: list[object] = []
+        server = await asyncio.start_server(lambda _r, w: connections.append(w.close()), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        entity.player.host = "127.0.0.1"
+        entity.player.port = port
+        try:
+            assert await entity._async_port_open() is True
+        finally:
+            server.close()
+            await server.wait_closed()
+        assert await entity._async_port_open() is False
@@ -0,0 +1,115 @@
+"""Unit tests for the config-flow validation cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pywiim.discovery import DiscoveredDevice
+
+from custom_components.wiim.validation_cache import (
+    FAILURE_TTL_SECONDS,
+    VALIDATION_TTL_SECONDS,
+    ValidationCache,
+    get_validation_cache,
+)
+
+
+def _validator(calls: list[str], *, fail: set[str] | None = None, delay: float = 0):
+    async def _validate(host: str) -> DiscoveredDevice:
+        calls.append(host)
+        await asyncio.sleep(delay)
+        if fail and host in fail:
+            raise ValueError(f"{host} is not a WiiM device")
+        return DiscoveredDevice(ip=host, uuid=f"uuid-{host}", validated=True)
+
+    return _validate
+
+
+class TestValidationCache:
+    """TTL, in-flight sharing and bounded batches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_validation(self):
+        """Callers that arrive while a host is validating wait for that validation."""
+        cache = ValidationCache()
+        calls: list[str] = []
+        validate = _validator(calls, delay=0.01)
+
+        first, second = await asyncio.gather(
+            cache.async_validate("10.0.0.2", validate), cache.async_validate("10.0.0.2", validate)
+        )
+
+        assert calls == ["10.0.0.2"]
+        assert first is second
+        assert cache.stats.joined_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_results_expire(self):
+        """Successes are reused until their TTL, then validated again."""
+        cache = ValidationCache()
+        calls: list[str] = []
+        validate = _validator(calls)
+
+        with patch("custom_components.wiim.validation_cache.time.monotonic", return_value=100.0):
+            await cache.async_validate("10.0.0.2", validate)
+            await cache.async_validate("10.0.0.2", validate)
+        assert calls == ["10.0.0.2"]
+        assert cache.stats.cache_hits == 1
+
+        with patch(
+            "custom_components.wiim.validation_cache.time.monotonic", return_value=100.0 + VALIDATION_TTL_SECONDS
+        ):
+            assert cache.get("10.0.0.2") is None
+            await cache.async_validate("10.0.0.2", validate)
+        assert calls == ["10.0.0.2", "10.0.0.2"]
+
+    @pytest.mark.asyncio
+    async def test_failures_cached_briefly_and_force_bypasses(self):
+        """A failure is re-raised from cache for a short time unless forced."""
+        cache = ValidationCache()
+        calls: list[str] = []
+        validate = _validator(calls, fail={"10.0.0.9"})
+
+        with patch("custom_components.wiim.validation_cache.time.monotonic", return_value=100.0):
+            for _ in range(2):
+                with pytest.raises(ValueError):
+                    await cache.async_validate("10.0.0.9", validate)
+            assert calls == ["10.0.0.9"]
+
+            with pytest.raises(ValueError):
+                await cache.async_validate("10.0.0.9", validate, force=True)
+            assert len(calls) == 2
+
+        with patch("custom_components.wiim.validation_cache.time.monotonic", return_value=100.0 + FAILURE_TTL_SECONDS):
+            with pytest.raises(ValueError):
+                await cache.async_validate("10.0.0.9", validate)
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_validate_many_is_bounded_and_drops_failures(self):
+        """Batches never exceed the limit and leave out hosts that fail."""
+        cache = ValidationCache()
+        active = peak = 0
+
+        async def _validate(host: str) -> DiscoveredDevice:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if host.endswith(".9"):
+                raise ValueError("not a speaker")
+            return DiscoveredDevice(ip=host, validated=True)
+
+        hosts = [f"10.0.0.{index}" for index in range(1, 10)]
+        results = await cache.async_validate_many([*hosts, "10.0.0.1"], _validate, limit=3)
+
+        assert peak == 3
+        assert sorted(results) == sorted(hosts[:-1])
+        assert cache.stats.validations == 9
+
+    @pytest.mark.asyncio
+    async def test_cache_is_shared_per_hass(self, hass: HomeAssistant):
+        """Every flow of one Home Assistant instance gets the same cache."""
+        assert get_validation_cache(hass) is get_validation_cache(hass)